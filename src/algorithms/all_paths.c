@@ -176,7 +176,9 @@ AllPathsCtx *AllPathsCtx_New
 	Record r,
 	FT_FilterNode *ft,
 	uint edge_idx,
-	bool shortest_paths
+	bool shortest_paths,
+	GrB_Matrix M,
+	GrB_Matrix MT
 ) {
 	ASSERT(src != NULL);
 
@@ -201,6 +203,11 @@ AllPathsCtx *AllPathsCtx_New
 	ctx->dst            =  dst;
 	ctx->shortest_paths =  shortest_paths;
 	ctx->visited        =  NULL;
+	ctx->M              =  M;
+	ctx->MT             =  MT;
+	ctx->src_levels     =  NULL;
+	ctx->dest_levels    =  NULL;
+	ctx->src_depth      =  0;
 
 	_AllPathsCtx_EnsureLevelArrayCap(ctx, 0, 1);
 	_AllPathsCtx_AddConnectionToLevel(ctx, 0, src, NULL);
@@ -305,6 +312,8 @@ void AllPathsCtx_Free(AllPathsCtx *ctx) {
 	Path_Free(ctx->path);
 	array_free(ctx->neighbors);
 	if(ctx->visited) GrB_Vector_free(&ctx->visited);
+	if(ctx->src_levels) GrB_Vector_free(&ctx->src_levels);
+	if(ctx->dest_levels) GrB_Vector_free(&ctx->dest_levels);
 	rm_free(ctx);
 	ctx = NULL;
 }
@@ -43,6 +43,11 @@ typedef struct {
 	uint edge_idx;              // Record index of the edge alias, only used for edge filtering.
 	bool shortest_paths;        // Only collect shortest paths.
 	GrB_Vector visited;         // Visited nodes in shortest path.
+	GrB_Matrix M;               // [optional] Traversed matrix, searched for shortest paths from both ends.
+	GrB_Matrix MT;              // [optional] Transpose of M.
+	GrB_Vector src_levels;      // Distance of each node from the source, when searched from both ends.
+	GrB_Vector dest_levels;     // Distance of each node to the destination, when searched from both ends.
+	int64_t src_depth;          // Deepest level searched from the source.
 } AllPathsCtx;
 
 // Create a new All paths context object.
@@ -58,7 +63,9 @@ AllPathsCtx *AllPathsCtx_New(
 	Record r,            // Record the traversal is being performed upon.
 	FT_FilterNode *ft,   // FilterTree of predicates to be applied to traversed edges.
 	uint edge_idx,       // Record index of the edge alias.
-	bool shortest_paths  // Only collect shortest paths.
+	bool shortest_paths, // Only collect shortest paths.
+	GrB_Matrix M,        // [optional] Traversed matrix, enables searching shortest paths from both ends.
+	GrB_Matrix MT        // [optional] Transpose of M.
 );
 
 void addNeighbors
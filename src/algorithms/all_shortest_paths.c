@@ -6,9 +6,71 @@
 
 #include "RG.h"
 #include "all_shortest_paths.h"
+#include "bidirectional_bfs.h"
 #include "../util/arr.h"
 #include "../util/rmalloc.h"
 
+// find the minimum length between `src` and `dest` by growing a frontier
+// from both ends over the traversed matrix, see BidirectionalBFS
+// keeps the distance of each reached node from `src` and to `dest`
+// such that `AllShortestPaths_NextPath` expands only nodes on a shortest path
+static int _AllShortestPaths_FindMinimumLengthBidirectional
+(
+	AllPathsCtx *ctx,   // context of the all shortest path
+	Node *src,          // source node
+	Node *dest          // destination node
+) {
+	GrB_Info info;
+	UNUSED(info);
+
+	int64_t len = BidirectionalBFS(&ctx->src_levels, NULL, &ctx->dest_levels,
+			NULL, NULL, ctx->M, ctx->MT, ENTITY_GET_ID(src),
+			ENTITY_GET_ID(dest), ctx->maxLen - 1);
+
+	// `src` is no longer required at the first level
+	array_clear(ctx->levels[0]);
+
+	if(len == -1) return 0;  // indicate `dest` wasn't reached
+
+	info = GrB_Vector_reduce_INT64(&ctx->src_depth, NULL, GrB_MAX_MONOID_INT64,
+			ctx->src_levels, NULL);
+	ASSERT(info == GrB_SUCCESS);
+
+	return len + 1;  // switch from edge count to node count
+}
+
+// check if a node reached at `depth` while backtracking from `dest` to `src`
+// lies on a shortest path
+static bool _AllShortestPaths_OnShortestPath
+(
+	const AllPathsCtx *ctx,
+	NodeID id,
+	uint32_t depth
+) {
+	GrB_Info info;
+
+	// search was performed from the source only
+	if(ctx->src_levels == NULL) {
+		// consider only previously discovered nodes
+		bool x;
+		info = GrB_Vector_extractElement_BOOL(&x, ctx->visited, id);
+		return (info == GrB_SUCCESS);
+	}
+
+	// the node is `depth` edges away from `dest`
+	// it must be the remaining number of edges away from `src`
+	// each level is checked against the search which reached it
+	int64_t level;
+	int64_t remaining = ctx->minLen - 1 - depth;
+	if(remaining <= ctx->src_depth) {
+		info = GrB_Vector_extractElement_INT64(&level, ctx->src_levels, id);
+		return (info == GrB_SUCCESS && level == remaining);
+	}
+
+	info = GrB_Vector_extractElement_INT64(&level, ctx->dest_levels, id);
+	return (info == GrB_SUCCESS && level == depth);
+}
+
 // run BFS from `src` untill `dest` is rached
 // add all nodes visited during traversal except for nodes in
 // `dest` level, so it can be used later on in `AllShortestPaths_NextPath`
@@ -23,6 +85,13 @@ int AllShortestPaths_FindMinimumLength
 	ASSERT(dest != NULL);
 	ASSERT(ENTITY_GET_ID(&ctx->levels[0]->node) == ENTITY_GET_ID(src));
 
+	// search from both ends when edges aren't filtered
+	// a search from both ends can't find cycles leading back to `src`
+	if(ctx->M != NULL && ctx->ft == NULL &&
+	   ENTITY_GET_ID(src) != ENTITY_GET_ID(dest)) {
+		return _AllShortestPaths_FindMinimumLengthBidirectional(ctx, src, dest);
+	}
+
 	int    depth  = 0;
 	NodeID destID = ENTITY_GET_ID(dest);
 
@@ -128,15 +197,14 @@ Path *AllShortestPaths_NextPath
 	while (depth < ctx->maxLen) {
 		if (array_len(ctx->levels[depth]) > 0) {
 			// get a new node from the frontier
-			bool is_visited;
 			LevelConnection frontierConnection = array_pop(ctx->levels[depth]);
 			Node frontierNode = frontierConnection.node;
 			NodeID frontierID = ENTITY_GET_ID(&frontierNode);
-			GrB_Info info = GrB_Vector_extractElement_BOOL(&is_visited,
-					ctx->visited, frontierID);
 
-			// consider only previously discovered nodes
-			if(info == GrB_NO_VALUE) continue;
+			// consider only nodes on a shortest path
+			if(!_AllShortestPaths_OnShortestPath(ctx, frontierID, depth)) {
+				continue;
+			}
 
 			// if we reached to the end of the path and this node is not the
 			// dst node continue
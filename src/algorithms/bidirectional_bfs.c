@@ -0,0 +1,286 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "bidirectional_bfs.h"
+
+// BFS growing from one end of the path
+typedef struct {
+	GrB_Matrix M;     // matrix expanding the frontier
+	GrB_Vector q;     // current frontier
+	GrB_Vector pi;    // pi(i) is i's neighbour on the way back to the root
+	GrB_Vector v;     // v(i) is the distance of i from the root
+	GrB_Index nq;     // number of nodes in the current frontier
+	int64_t level;    // distance of the current frontier from the root
+} _Search;
+
+static void _Search_Init
+(
+	_Search *s,
+	GrB_Matrix M,
+	GrB_Type type,
+	GrB_Index n,
+	GrB_Index root
+) {
+	GrB_Info info;
+	UNUSED(info);
+
+	s->M     = M;
+	s->nq    = 1;
+	s->level = 0;
+
+	// pi(root) = root denotes the root of the BFS tree
+	info = GrB_Vector_new(&s->pi, type, n);
+	ASSERT(info == GrB_SUCCESS);
+	info = GxB_set(s->pi, GxB_SPARSITY_CONTROL, GxB_BITMAP);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_Vector_setElement(s->pi, root, root);
+	ASSERT(info == GrB_SUCCESS);
+
+	info = GrB_Vector_new(&s->v, type, n);
+	ASSERT(info == GrB_SUCCESS);
+	info = GxB_set(s->v, GxB_SPARSITY_CONTROL, GxB_BITMAP);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_Vector_setElement(s->v, 0, root);
+	ASSERT(info == GrB_SUCCESS);
+
+	info = GrB_Vector_new(&s->q, type, n);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_Vector_setElement(s->q, root, root);
+	ASSERT(info == GrB_SUCCESS);
+}
+
+// advance the frontier by a single level
+static void _Search_Expand
+(
+	_Search *s,
+	GrB_Semiring semiring,
+	GrB_Index n
+) {
+	GrB_Info info;
+	UNUSED(info);
+
+	// q'{!pi} = q'*M, q(i) is set to the node which introduced i
+	info = GrB_vxm(s->q, s->pi, NULL, semiring, s->q, s->M, GrB_DESC_RSC);
+	ASSERT(info == GrB_SUCCESS);
+
+	info = GrB_Vector_nvals(&s->nq, s->q);
+	ASSERT(info == GrB_SUCCESS);
+
+	s->level++;
+	if(s->nq == 0) return;
+
+	// pi{q} = q
+	info = GrB_assign(s->pi, s->q, NULL, s->q, GrB_ALL, n, GrB_DESC_S);
+	ASSERT(info == GrB_SUCCESS);
+
+	// v{q} = level
+	info = GrB_assign(s->v, s->q, NULL, s->level, GrB_ALL, n, GrB_DESC_S);
+	ASSERT(info == GrB_SUCCESS);
+}
+
+// check if the frontier of 's' reached a node visited by 'other'
+// sets 'meet' to such a node
+static bool _Search_Meet
+(
+	const _Search *s,
+	const _Search *other,
+	GrB_Index *meet
+) {
+	GrB_Info info;
+	UNUSED(info);
+
+	GrB_Index n;
+	info = GrB_Vector_size(&n, s->q);
+	ASSERT(info == GrB_SUCCESS);
+
+	GrB_Vector I;
+	info = GrB_Vector_new(&I, GrB_BOOL, n);
+	ASSERT(info == GrB_SUCCESS);
+
+	// I = q .* other.pi
+	info = GrB_Vector_eWiseMult_BinaryOp(I, NULL, NULL, GxB_PAIR_BOOL, s->q,
+			other->pi, NULL);
+	ASSERT(info == GrB_SUCCESS);
+
+	GrB_Index nvals;
+	info = GrB_Vector_nvals(&nvals, I);
+	ASSERT(info == GrB_SUCCESS);
+
+	if(nvals > 0) {
+		// any common node lies on a shortest path
+		GxB_Iterator it;
+		info = GrB_wait(I, GrB_MATERIALIZE);
+		ASSERT(info == GrB_SUCCESS);
+		info = GxB_Iterator_new(&it);
+		ASSERT(info == GrB_SUCCESS);
+		info = GxB_Vector_Iterator_attach(it, I, NULL);
+		ASSERT(info == GrB_SUCCESS);
+		info = GxB_Vector_Iterator_seek(it, 0);
+		ASSERT(info == GrB_SUCCESS);
+		*meet = GxB_Vector_Iterator_getIndex(it);
+		GxB_Iterator_free(&it);
+	}
+
+	GrB_free(&I);
+	return (nvals > 0);
+}
+
+static void _Search_Free
+(
+	_Search *s,
+	GrB_Vector *level,
+	GrB_Vector *parent
+) {
+	GrB_free(&s->q);
+
+	if(level != NULL) *level = s->v;
+	else GrB_free(&s->v);
+
+	if(parent != NULL) *parent = s->pi;
+	else GrB_free(&s->pi);
+}
+
+// C += M
+static void _AccumulateMatrix
+(
+	GrB_Matrix C,
+	RG_Matrix M
+) {
+	GrB_Info info;
+	UNUSED(info);
+
+	GrB_Matrix m;
+	info = RG_Matrix_export(&m, M);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_eWiseAdd(C, NULL, NULL, GxB_ANY_PAIR_BOOL, C, m, NULL);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_free(&m);
+	ASSERT(info == GrB_SUCCESS);
+}
+
+void BidirectionalBFS_Matrices
+(
+	GrB_Matrix *A,
+	GrB_Matrix *AT,
+	Graph *g,
+	const int *relations,
+	uint relation_count,
+	GRAPH_EDGE_DIR dir
+) {
+	ASSERT(A != NULL);
+	ASSERT(g != NULL);
+
+	GrB_Info info;
+	UNUSED(info);
+
+	GrB_Index dim = Graph_RequiredMatrixDim(g);
+
+	// R holds the relationships, RT their transpose
+	// both maintained by the graph
+	GrB_Matrix R;
+	GrB_Matrix RT;
+	info = GrB_Matrix_new(&R, GrB_BOOL, dim, dim);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_Matrix_new(&RT, GrB_BOOL, dim, dim);
+	ASSERT(info == GrB_SUCCESS);
+
+	for(uint i = 0; i < relation_count; i++) {
+		_AccumulateMatrix(R, Graph_GetRelationMatrix(g, relations[i], false));
+		_AccumulateMatrix(RT, Graph_GetRelationMatrix(g, relations[i], true));
+	}
+
+	switch(dir) {
+		case GRAPH_EDGE_DIR_OUTGOING:
+			break;
+		case GRAPH_EDGE_DIR_INCOMING: {
+			GrB_Matrix tmp = R;
+			R  = RT;
+			RT = tmp;
+			break;
+		}
+		case GRAPH_EDGE_DIR_BOTH:
+			// an undirected traversal is symmetric
+			info = GrB_eWiseAdd(R, NULL, NULL, GxB_ANY_PAIR_BOOL, R, RT, NULL);
+			ASSERT(info == GrB_SUCCESS);
+			info = GrB_free(&RT);
+			ASSERT(info == GrB_SUCCESS);
+			info = GrB_Matrix_dup(&RT, R);
+			ASSERT(info == GrB_SUCCESS);
+			break;
+		default:
+			ASSERT(false && "unexpected traversal direction");
+			break;
+	}
+
+	*A = R;
+	if(AT != NULL) *AT = RT;
+	else GrB_free(&RT);
+}
+
+int64_t BidirectionalBFS
+(
+	GrB_Vector *src_level,
+	GrB_Vector *src_parent,
+	GrB_Vector *dest_level,
+	GrB_Vector *dest_parent,
+	GrB_Index *meet,
+	GrB_Matrix A,
+	GrB_Matrix AT,
+	GrB_Index src,
+	GrB_Index dest,
+	GrB_Index max_level
+) {
+	ASSERT(A  != NULL);
+	ASSERT(AT != NULL);
+
+	GrB_Info info;
+	UNUSED(info);
+
+	GrB_Index n;
+	info = GrB_Matrix_nrows(&n, A);
+	ASSERT(info == GrB_SUCCESS);
+
+	// use the ANY_SECONDI semiring, either 32 or 64-bit depending on
+	// the number of nodes in the graph, see LG_BreadthFirstSearch_SSGrB
+	GrB_Type type = (n > INT32_MAX) ? GrB_INT64 : GrB_INT32;
+	GrB_Semiring semiring = (n > INT32_MAX) ?
+		GxB_ANY_SECONDI_INT64 : GxB_ANY_SECONDI_INT32;
+
+	// the forward search follows A from 'src'
+	// the backward search follows AT from 'dest'
+	_Search fwd;
+	_Search bwd;
+	_Search_Init(&fwd, A, type, n, src);
+	_Search_Init(&bwd, AT, type, n, dest);
+
+	GrB_Index _meet = src;
+	int64_t len = (src == dest) ? 0 : -1;
+
+	while(len == -1) {
+		if(max_level != 0 && fwd.level + bwd.level >= max_level) break;
+
+		// expand the smaller frontier
+		_Search *s     = (fwd.nq <= bwd.nq) ? &fwd : &bwd;
+		_Search *other = (s == &fwd) ? &bwd : &fwd;
+
+		_Search_Expand(s, semiring, n);
+
+		// frontier depleted, 'dest' is unreachable
+		if(s->nq == 0) break;
+
+		// as searches didn't meet before this step, the first node reached
+		// by both lies on a shortest path
+		if(_Search_Meet(s, other, &_meet)) len = fwd.level + bwd.level;
+	}
+
+	if(meet != NULL) *meet = _meet;
+
+	_Search_Free(&fwd, src_level, src_parent);
+	_Search_Free(&bwd, dest_level, dest_parent);
+
+	return len;
+}
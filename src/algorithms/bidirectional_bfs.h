@@ -0,0 +1,42 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#pragma once
+
+#include "../graph/graph.h"
+#include "GraphBLAS.h"
+
+// build the boolean matrix traversed by a bidirectional BFS and its transpose
+// A(i,j) is set if j is reachable from i by a single edge of one of the
+// given relationship types, following direction 'dir'
+// caller is responsible for freeing the returned matrices
+void BidirectionalBFS_Matrices
+(
+	GrB_Matrix *A,             // [output] traversed matrix
+	GrB_Matrix *AT,            // [optional output] transpose of A
+	Graph *g,                  // graph
+	const int *relations,      // relationship types, GRAPH_NO_RELATION for any
+	uint relation_count,       // number of relationship types
+	GRAPH_EDGE_DIR dir         // traversal direction
+);
+
+// find the length of a shortest path from 'src' to 'dest'
+// by growing a BFS frontier from each end until the two meet
+// at every step the smaller of the two frontiers is expanded
+// returns -1 if 'dest' isn't reachable within 'max_level' hops
+int64_t BidirectionalBFS
+(
+	GrB_Vector *src_level,     // [optional] distance from 'src' to node i
+	GrB_Vector *src_parent,    // [optional] node i's predecessor on a path from 'src'
+	GrB_Vector *dest_level,    // [optional] distance from node i to 'dest'
+	GrB_Vector *dest_parent,   // [optional] node i's successor on a path to 'dest'
+	GrB_Index *meet,           // [optional] node at which both searches met
+	GrB_Matrix A,              // traversed matrix
+	GrB_Matrix AT,             // transpose of A
+	GrB_Index src,             // path source
+	GrB_Index dest,            // path destination
+	GrB_Index max_level        // maximum path length, 0 for unlimited
+);
@@ -0,0 +1,125 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "reachable_nodes.h"
+#include "../util/rmalloc.h"
+
+ReachableNodesCtx *ReachableNodesCtx_New
+(
+	GrB_Matrix M
+) {
+	ASSERT(M != NULL);
+
+	GrB_Info info;
+	UNUSED(info);
+
+	GrB_Index n;
+	info = GrB_Matrix_nrows(&n, M);
+	ASSERT(info == GrB_SUCCESS);
+
+	ReachableNodesCtx *ctx = rm_calloc(1, sizeof(ReachableNodesCtx));
+
+	ctx->M        = M;
+	ctx->depleted = true;
+
+	info = GrB_Vector_new(&ctx->q, GrB_BOOL, n);
+	ASSERT(info == GrB_SUCCESS);
+
+	info = GrB_Vector_new(&ctx->reached, GrB_BOOL, n);
+	ASSERT(info == GrB_SUCCESS);
+	info = GxB_set(ctx->reached, GxB_SPARSITY_CONTROL, GxB_BITMAP);
+	ASSERT(info == GrB_SUCCESS);
+
+	info = GxB_Iterator_new(&ctx->it);
+	ASSERT(info == GrB_SUCCESS);
+
+	return ctx;
+}
+
+void ReachableNodesCtx_Reset
+(
+	ReachableNodesCtx *ctx,
+	EntityID src,
+	uint minLen,
+	uint maxLen
+) {
+	ASSERT(ctx    != NULL);
+	ASSERT(src    != INVALID_ENTITY_ID);
+	ASSERT(minLen <= 1);
+
+	GrB_Info info;
+	UNUSED(info);
+
+	GrB_Index n;
+	info = GrB_Vector_size(&n, ctx->reached);
+	ASSERT(info == GrB_SUCCESS);
+
+	info = GrB_Vector_clear(ctx->reached);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_Vector_clear(ctx->q);
+	ASSERT(info == GrB_SUCCESS);
+	info = GrB_Vector_setElement_BOOL(ctx->q, true, src);
+	ASSERT(info == GrB_SUCCESS);
+
+	// src isn't marked as reached, such that a cycle leading back to it
+	// is discovered, expanding src again introduces no new nodes
+	for(uint level = 1; level <= maxLen; level++) {
+		// q'{!reached} = q'*M
+		info = GrB_vxm(ctx->q, ctx->reached, NULL, GxB_ANY_PAIR_BOOL, ctx->q,
+				ctx->M, GrB_DESC_RSC);
+		ASSERT(info == GrB_SUCCESS);
+
+		GrB_Index nq;
+		info = GrB_Vector_nvals(&nq, ctx->q);
+		ASSERT(info == GrB_SUCCESS);
+		if(nq == 0) break;
+
+		// reached{q} = true
+		info = GrB_assign(ctx->reached, ctx->q, NULL, true, GrB_ALL, n,
+				GrB_DESC_S);
+		ASSERT(info == GrB_SUCCESS);
+	}
+
+	// a traversal of zero length reaches src
+	if(minLen == 0) {
+		info = GrB_Vector_setElement_BOOL(ctx->reached, true, src);
+		ASSERT(info == GrB_SUCCESS);
+	}
+
+	info = GrB_wait(ctx->reached, GrB_MATERIALIZE);
+	ASSERT(info == GrB_SUCCESS);
+
+	info = GxB_Vector_Iterator_attach(ctx->it, ctx->reached, NULL);
+	ASSERT(info == GrB_SUCCESS);
+	info = GxB_Vector_Iterator_seek(ctx->it, 0);
+	ctx->depleted = (info != GrB_SUCCESS);
+}
+
+EntityID ReachableNodesCtx_NextNode
+(
+	ReachableNodesCtx *ctx
+) {
+	if(ctx == NULL || ctx->depleted) return INVALID_ENTITY_ID;
+
+	EntityID id = GxB_Vector_Iterator_getIndex(ctx->it);
+	ctx->depleted = (GxB_Vector_Iterator_next(ctx->it) != GrB_SUCCESS);
+
+	return id;
+}
+
+void ReachableNodesCtx_Free
+(
+	ReachableNodesCtx *ctx
+) {
+	if(ctx == NULL) return;
+
+	GxB_Iterator_free(&ctx->it);
+	GrB_free(&ctx->q);
+	GrB_free(&ctx->reached);
+
+	rm_free(ctx);
+}
@@ -0,0 +1,54 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#pragma once
+
+#include "../../deps/GraphBLAS/Include/GraphBLAS.h"
+#include "../graph/entities/node.h"
+
+// collects the distinct nodes reachable from 'src'
+// by expanding a BFS frontier one level at a time
+// each iteration (call to ReachableNodesCtx_NextNode)
+// returns a reachable node, every node is returned once
+// regardless of the number of paths leading to it
+//
+// only nodes at distance minLen..maxLen are of interest
+// as a node reached by a longer path is also reached by a shortest one
+// minLen must not exceed 1
+
+typedef struct {
+	GrB_Matrix M;         // matrix describing connections
+	GrB_Vector q;         // current frontier
+	GrB_Vector reached;   // nodes reached from src
+	GxB_Iterator it;      // iterator over reached nodes
+	bool depleted;        // all reached nodes were returned
+} ReachableNodesCtx;
+
+ReachableNodesCtx *ReachableNodesCtx_New
+(
+	GrB_Matrix M   // matrix describing connections
+);
+
+// collect nodes reachable from 'src'
+void ReachableNodesCtx_Reset
+(
+	ReachableNodesCtx *ctx,  // reachable nodes context to reset
+	EntityID src,            // source node from which to traverse
+	uint minLen,             // minimum traversal depth, either 0 or 1
+	uint maxLen              // maximum traversal depth
+);
+
+// produce next reachable node
+// returns INVALID_ENTITY_ID once all reachable nodes were produced
+EntityID ReachableNodesCtx_NextNode
+(
+	ReachableNodesCtx *ctx
+);
+
+void ReachableNodesCtx_Free
+(
+	ReachableNodesCtx *ctx
+);
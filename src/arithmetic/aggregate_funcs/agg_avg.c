@@ -100,6 +100,46 @@ void Avg_Finalize
 	}
 }
 
+// merge partial averages
+void Avg_Merge
+(
+	AggregateCtx *dest,
+	AggregateCtx *src
+) {
+	AvgCtx *src_ctx = src->private_data;
+	if(src_ctx == NULL || src_ctx->count == 0) return;
+
+	AvgCtx *dest_ctx = dest->private_data;
+	if(dest_ctx == NULL) {
+		dest_ctx = dest->private_data = rm_calloc(1, sizeof(AvgCtx));
+	}
+
+	size_t count = dest_ctx->count + src_ctx->count;
+
+	if(dest_ctx->overflow || src_ctx->overflow ||
+	   ABOUT_TO_OVERFLOW(dest_ctx->total, src_ctx->total)) {
+		// combine the two averages, weighted by their counts
+		// once overflowed, 'total' is the average
+		long double dest_avg = (dest_ctx->overflow) ?
+			dest_ctx->total : dest_ctx->total / (long double)dest_ctx->count;
+		long double src_avg = (src_ctx->overflow) ?
+			src_ctx->total : src_ctx->total / (long double)src_ctx->count;
+
+		// dest might be empty
+		if(dest_ctx->count == 0) dest_avg = 0;
+
+		dest_ctx->total =
+			dest_avg * ((long double)dest_ctx->count / (long double)count) +
+			src_avg  * ((long double)src_ctx->count  / (long double)count);
+		dest_ctx->overflow = true;
+	} else {
+		// no overflow
+		dest_ctx->total += src_ctx->total;
+	}
+
+	dest_ctx->count = count;
+}
+
 AggregateCtx *Avg_PrivateData(void)
 {
 	AggregateCtx *ctx = rm_malloc(sizeof(AggregateCtx));
@@ -120,6 +160,7 @@ void Register_AVG(void) {
 	ret_type = T_NULL | T_DOUBLE;
 	func_desc = AR_AggFuncDescNew("avg", AGG_AVG, 1, 1, types, ret_type,
 			rm_free, Avg_Finalize, Avg_PrivateData);
+	AR_AggFuncSetMerge(func_desc, Avg_Merge);
 
 	AR_RegFunc(func_desc);
 }
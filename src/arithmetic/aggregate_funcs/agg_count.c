@@ -25,6 +25,15 @@ AggregateResult AGG_COUNT(SIValue *argv, int argc, void *private_data) {
 	return AGGREGATE_OK;
 }
 
+// merge partial counts
+void Count_Merge
+(
+	AggregateCtx *dest,
+	AggregateCtx *src
+) {
+	dest->result.longval += src->result.longval;
+}
+
 AggregateCtx *Count_PrivateData(void)
 {
 	AggregateCtx *ctx = rm_malloc(sizeof(AggregateCtx));
@@ -45,6 +54,7 @@ void Register_COUNT(void) {
 	ret_type = T_INT64;
 	func_desc = AR_AggFuncDescNew("count", AGG_COUNT, 1, 1, types, ret_type,
 			NULL, NULL, Count_PrivateData);
+	AR_AggFuncSetMerge(func_desc, Count_Merge);
 	AR_RegFunc(func_desc);
 }
 
@@ -40,6 +40,18 @@ AR_FuncDesc *AR_AggFuncDescNew
 	return desc;
 }
 
+// set the routine merging partial aggregation contexts
+void AR_AggFuncSetMerge
+(
+	AR_FuncDesc *func_desc,
+	AR_Func_Merge merge
+) {
+	ASSERT(func_desc != NULL);
+	ASSERT(func_desc->aggregate);
+
+	func_desc->callbacks.merge = merge;
+}
+
 // TODO: might be deprecated?
 // routine for cloning a generic aggregate function context
 void *Aggregate_Clone(void *orig) {
@@ -72,6 +84,21 @@ void Aggregate_Finalize
 	}
 }
 
+// merge partial aggregation context 'src' into 'dest'
+void Aggregate_Merge
+(
+	AR_FuncDesc *func_desc,
+	AggregateCtx *dest,
+	AggregateCtx *src
+) {
+	ASSERT(src       != NULL);
+	ASSERT(dest      != NULL);
+	ASSERT(func_desc != NULL);
+	ASSERT(func_desc->callbacks.merge != NULL);
+
+	func_desc->callbacks.merge(dest, src);
+}
+
 // get aggregated result
 SIValue Aggregate_GetResult
 (
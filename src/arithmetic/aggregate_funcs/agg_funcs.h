@@ -27,6 +27,15 @@ AR_FuncDesc *AR_AggFuncDescNew
 	AR_Func_PrivateData private_data    // generate private data
 );
 
+// set the routine merging partial aggregation contexts
+// aggregation functions which define a merge routine can be computed
+// in parallel, each thread aggregating a subset of the input
+void AR_AggFuncSetMerge
+(
+	AR_FuncDesc *func_desc,  // aggregation function descriptor
+	AR_Func_Merge merge      // merge routine
+);
+
 // register all aggregation funcitons
 void Register_AggFuncs(void);
 
@@ -49,6 +58,14 @@ void Aggregate_Finalize
 	AggregateCtx *ctx
 );
 
+// merge partial aggregation context 'src' into 'dest'
+void Aggregate_Merge
+(
+	AR_FuncDesc *func_desc,
+	AggregateCtx *dest,
+	AggregateCtx *src
+);
+
 // free aggregation context
 void Aggregate_Free
 (
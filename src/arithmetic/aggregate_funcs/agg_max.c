@@ -28,6 +28,22 @@ AggregateResult AGG_MAX(SIValue *argv, int argc, void *private_data) {
 	return AGGREGATE_OK;
 }
 
+// merge partial max, keep the greater of the two
+void Max_Merge
+(
+	AggregateCtx *dest,
+	AggregateCtx *src
+) {
+	if(SI_TYPE(src->result) == T_NULL) return;
+
+	int compared_null;
+	if((SIValue_Compare(dest->result, src->result, &compared_null) < 0) ||
+	   (compared_null == COMPARED_NULL)) {
+		SIValue_Free(dest->result);
+		dest->result = SI_TransferOwnership(&src->result);
+	}
+}
+
 AggregateCtx *Max_PrivateData(void)
 {
 	AggregateCtx *ctx = rm_malloc(sizeof(AggregateCtx));
@@ -48,6 +64,7 @@ void Register_MAX(void) {
 	ret_type = SI_ALL;
 	func_desc = AR_AggFuncDescNew("max", AGG_MAX, 1, 1, types, ret_type, NULL,
 			NULL, Max_PrivateData);
+	AR_AggFuncSetMerge(func_desc, Max_Merge);
 	AR_RegFunc(func_desc);
 }
 
@@ -28,6 +28,22 @@ AggregateResult AGG_MIN(SIValue *argv, int argc, void *private_data) {
 	return AGGREGATE_OK;
 }
 
+// merge partial min, keep the lesser of the two
+void Min_Merge
+(
+	AggregateCtx *dest,
+	AggregateCtx *src
+) {
+	if(SI_TYPE(src->result) == T_NULL) return;
+
+	int compared_null;
+	if((SIValue_Compare(dest->result, src->result, &compared_null) > 0) ||
+	   (compared_null == COMPARED_NULL)) {
+		SIValue_Free(dest->result);
+		dest->result = SI_TransferOwnership(&src->result);
+	}
+}
+
 AggregateCtx *Min_PrivateData(void)
 {
 	AggregateCtx *ctx = rm_malloc(sizeof(AggregateCtx));
@@ -48,6 +64,7 @@ void Register_MIN(void) {
 	ret_type = SI_ALL;
 	func_desc = AR_AggFuncDescNew("min", AGG_MIN, 1, 1, types, ret_type, NULL,
 			NULL, Min_PrivateData);
+	AR_AggFuncSetMerge(func_desc, Min_Merge);
 	AR_RegFunc(func_desc);
 }
 
@@ -25,6 +25,15 @@ AggregateResult AGG_SUM(SIValue *argv, int argc, void *private_data) {
 	return AGGREGATE_OK;
 }
 
+// merge partial sums
+void SUM_Merge
+(
+	AggregateCtx *dest,
+	AggregateCtx *src
+) {
+	dest->result.doubleval += src->result.doubleval;
+}
+
 AggregateCtx *SUM_PrivateData(void)
 {
 	AggregateCtx *ctx = rm_malloc(sizeof(AggregateCtx));
@@ -45,6 +54,7 @@ void Register_SUM(void) {
 	ret_type = T_NULL | T_DOUBLE;
 	func_desc = AR_AggFuncDescNew("sum", AGG_SUM, 1, 1, types, ret_type, NULL,
 			NULL, SUM_PrivateData);
+	AR_AggFuncSetMerge(func_desc, SUM_Merge);
 	AR_RegFunc(func_desc);
 }
 
@@ -656,6 +656,51 @@ SIValue AR_EXP_FinalizeAggregations
 	return AR_EXP_Evaluate(root, r);
 }
 
+void AR_EXP_MergeAggregations
+(
+	AR_ExpNode *dest,
+	AR_ExpNode *src
+) {
+	ASSERT(src  != NULL);
+	ASSERT(dest != NULL);
+	ASSERT(dest->type == src->type);
+
+	if(AGGREGATION_NODE(dest)) {
+		Aggregate_Merge(dest->op.f, dest->op.private_data,
+				src->op.private_data);
+		// return, aggregation nodes cannot contain nested aggregation nodes
+		return;
+	}
+
+	if(AR_EXP_IsOperation(dest)) {
+		ASSERT(NODE_CHILD_COUNT(dest) == NODE_CHILD_COUNT(src));
+		for(int i = 0; i < NODE_CHILD_COUNT(dest); i++) {
+			AR_EXP_MergeAggregations(NODE_CHILD(dest, i), NODE_CHILD(src, i));
+		}
+	}
+}
+
+bool AR_EXP_AggregationsMergeable
+(
+	AR_ExpNode *root
+) {
+	ASSERT(root != NULL);
+
+	if(AGGREGATION_NODE(root)) {
+		// distinct aggregations track the values seen by each part
+		return (root->op.f->callbacks.merge != NULL &&
+				!AR_EXP_PerformsDistinct(root));
+	}
+
+	if(AR_EXP_IsOperation(root)) {
+		for(int i = 0; i < NODE_CHILD_COUNT(root); i++) {
+			if(!AR_EXP_AggregationsMergeable(NODE_CHILD(root, i))) return false;
+		}
+	}
+
+	return true;
+}
+
 void AR_EXP_CollectEntities(AR_ExpNode *root, rax *aliases) {
 	if(AR_EXP_IsOperation(root)) {
 		for(int i = 0; i < root->op.child_count; i ++) {
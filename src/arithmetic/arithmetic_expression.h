@@ -112,6 +112,14 @@ void AR_EXP_Aggregate(AR_ExpNode *root, const Record r);
 // and evaluates the expression
 SIValue AR_EXP_FinalizeAggregations(AR_ExpNode *root, const Record r);
 
+// merge the partial aggregations of 'src' into 'dest'
+// both expressions are expected to be clones of the same expression
+void AR_EXP_MergeAggregations(AR_ExpNode *dest, AR_ExpNode *src);
+
+// returns true if all aggregations within the expression tree
+// can be computed in parts and merged
+bool AR_EXP_AggregationsMergeable(AR_ExpNode *root);
+
 //------------------------------------------------------------------------------
 // Utility functions
 //------------------------------------------------------------------------------
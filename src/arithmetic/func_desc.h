@@ -34,12 +34,17 @@ typedef void *(*AR_Func_Clone)(void *orig);
 // AR_Func_PrivateData - function pointer to a routine which produce function's private data
 typedef AggregateCtx *(*AR_Func_PrivateData)(void);
 
+// AR_Func_Merge - function pointer to a routine for merging a partial aggregation
+// context into another
+typedef void (*AR_Func_Merge)(AggregateCtx *dest, AggregateCtx *src);
+
 // aggregation function callbacks
 typedef struct {
 	AR_Func_Free free;                  // [optional] function pointer to cleanup routine
 	AR_Func_Clone clone;                // [optional] function pointer to clone routine
 	AR_Func_Finalize finalize;          // [optional] function pointer to finalizing aggregate value routine
 	AR_Func_PrivateData private_data;   // function pointer to private data generator
+	AR_Func_Merge merge;                // [optional] function pointer to partial aggregations merge routine
 } AR_FuncCBs;
 
 typedef struct {
@@ -12,7 +12,7 @@
 #include "../../util/rmalloc.h"
 #include "../../configuration/config.h"
 #include "../../datatypes/path/sipath_builder.h"
-#include "../../algorithms/LAGraph/LAGraph_bfs.h"
+#include "../../algorithms/bidirectional_bfs.h"
 
 /* Creates a path from a given sequence of graph entities.
  * The first argument is the ast node represents the path.
@@ -71,6 +71,7 @@ void ShortestPath_Free(void *ctx_ptr) {
 	if(ctx->reltype_names) array_free(ctx->reltype_names);
 	if(ctx->free_matrices) {
 		GrB_free(&ctx->R);
+		GrB_free(&ctx->TR);
 	}
 	rm_free(ctx);
 }
@@ -91,6 +92,7 @@ void *ShortestPath_Clone(void *orig) {
 	else ctx_clone->reltype_names = NULL;
 	// Do not clone matrix data
 	ctx_clone->R = GrB_NULL;
+	ctx_clone->TR = GrB_NULL;
 	ctx_clone->free_matrices = false;
 
 	return ctx_clone;
@@ -109,8 +111,9 @@ SIValue AR_SHORTEST_PATH(SIValue *argv, int argc, void *private_data) {
 	GrB_Info res;
 	UNUSED(res);
 	Edge *edges = NULL;
-	GrB_Vector V = GrB_NULL;  // vector of results
-	GrB_Vector PI = GrB_NULL; // vector backtracking results to their parents
+	NodeID *ids = NULL;                 // nodes along the path
+	GrB_Vector src_parent = GrB_NULL;   // predecessor of each node reached from src
+	GrB_Vector dest_parent = GrB_NULL;  // successor of each node reaching dest
 	GraphContext *gc = QueryCtx_GetGraphCtx();
 
 	GrB_Index max_level = (ctx->maxHops == EDGE_LENGTH_INF) ? 0 : ctx->maxHops;
@@ -130,88 +133,74 @@ SIValue AR_SHORTEST_PATH(SIValue *argv, int argc, void *private_data) {
 			ctx->reltype_count = array_len(ctx->reltypes);
 		}
 
-		// Get edge matrix and transpose matrix, if available.
-		if(ctx->reltypes == NULL) {
-			// No edge types were specified, use the overall adjacency matrix.
-			ctx->free_matrices = true;
-			res = RG_Matrix_export(&ctx->R, Graph_GetAdjacencyMatrix(gc->g,
-						false));
-			ASSERT(res == GrB_SUCCESS);
-		} else if(ctx->reltype_count == 0) {
-			// If edge types were specified but none were valid,
-			// use the zero matrix
-			ctx->free_matrices = true;
-			res = RG_Matrix_export(&ctx->R, Graph_GetZeroMatrix(gc->g));
-			ASSERT(res == GrB_SUCCESS);
-		} else if(ctx->reltype_count == 1) {
-			ctx->free_matrices = true;
-			res = RG_Matrix_export(&ctx->R, Graph_GetRelationMatrix(gc->g,
-						ctx->reltypes[0], false));
-			ASSERT(res == GrB_SUCCESS);
-		} else {
-			// we have multiple edge types, combine them into a boolean matrix
-			ctx->free_matrices = true;
-			GrB_Index dims = Graph_RequiredMatrixDim(gc->g);
-			res = GrB_Matrix_new(&ctx->R, GrB_BOOL, dims, dims);
-			ASSERT(res == GrB_SUCCESS);
-
-			for(uint i = 0; i < ctx->reltype_count; i ++) {
-				GrB_Matrix adj;
-				res = RG_Matrix_export(&adj, Graph_GetRelationMatrix(gc->g,
-							ctx->reltypes[i], false));
-				ASSERT(res == GrB_SUCCESS);
-				res = GrB_eWiseAdd(ctx->R, GrB_NULL, GrB_NULL,
-						GxB_ANY_PAIR_BOOL, ctx->R, adj, GrB_NULL);
-				ASSERT(res == GrB_SUCCESS);
-				res = GrB_Matrix_free(&adj);
-				ASSERT(res == GrB_SUCCESS);
-			}
-
-			GrB_Index nrows;
-			res = GrB_Matrix_nrows(&nrows, ctx->R);
-			ASSERT(res == GrB_SUCCESS);
-		}
+		// Build the traversed matrix and its transpose.
+		// If no edge types were specified, use the overall adjacency matrix,
+		// if edge types were specified but none were valid, use the zero matrix.
+		int any_relation = GRAPH_NO_RELATION;
+		const int *relations = (ctx->reltypes == NULL) ?
+			&any_relation : ctx->reltypes;
+		uint relation_count = (ctx->reltypes == NULL) ? 1 : ctx->reltype_count;
+
+		ctx->free_matrices = true;
+		BidirectionalBFS_Matrices(&ctx->R, &ctx->TR, gc->g, relations,
+				relation_count, GRAPH_EDGE_DIR_OUTGOING);
 	}
 
-	// Invoke the BFS algorithm
-	res = LG_BreadthFirstSearch_SSGrB(&V, &PI, ctx->R, src_id, &dest_id,
-		max_level);
-	ASSERT(res == GrB_SUCCESS);
-	ASSERT(V != GrB_NULL);
-	ASSERT(PI != GrB_NULL);
+	// Search from both ends until the two searches meet.
+	GrB_Index meet;
+	int64_t path_len = BidirectionalBFS(NULL, &src_parent, NULL, &dest_parent,
+			&meet, ctx->R, ctx->TR, src_id, dest_id, max_level);
 
 	SIValue p = SI_NullVal();
 
-	// The length of the path is equal to the level of the destination node
-	GrB_Index path_len;
-	res = GrB_Vector_extractElement(&path_len, V, dest_id);
-	if(res == GrB_NO_VALUE) goto cleanup; // no path found
+	if(path_len == -1) goto cleanup; // no path found
 
 	// Only emit a path with no edges if minHops is 0
 	if(path_len == 0 && ctx->minHops != 0) goto cleanup;
 
-	/* Build path in reverse, starting by appending the destination node.
-	 * The path is built in reverse because we have the destination's parent
-	 * in the PI array, and can use this to backtrack until we reach the source. */
+	/* Collect the nodes along the path, the first half is collected in reverse
+	 * by backtracking from the meeting node to the source, the second half
+	 * by following successors from the meeting node to the destination. */
+	ids = rm_malloc(sizeof(NodeID) * (path_len + 1));
+	uint meet_idx = 0;
+	GrB_Index id = meet;
+	while(id != src_id) {
+		meet_idx++;
+		res = GrB_Vector_extractElement(&id, src_parent, id);
+		ASSERT(res == GrB_SUCCESS);
+	}
+
+	id = meet;
+	for(int64_t i = meet_idx; i >= 0; i--) {
+		ids[i] = id;
+		if(i > 0) {
+			res = GrB_Vector_extractElement(&id, src_parent, id);
+			ASSERT(res == GrB_SUCCESS);
+		}
+	}
+
+	id = meet;
+	for(int64_t i = meet_idx + 1; i <= path_len; i++) {
+		res = GrB_Vector_extractElement(&id, dest_parent, id);
+		ASSERT(res == GrB_SUCCESS);
+		ids[i] = id;
+	}
+	ASSERT(ids[0] == src_id && ids[path_len] == dest_id);
+
 	p = SIPathBuilder_New(path_len);
-	SIPathBuilder_AppendNode(p, SI_Node(destNode));
+	SIPathBuilder_AppendNode(p, SI_Node(srcNode));
 
 	edges = array_new(Edge, 1);
 
-	NodeID id = destNode->id;
-	for(uint i = 0; i < path_len; i ++) {
+	for(int64_t i = 0; i < path_len; i ++) {
 		array_clear(edges);
-		GrB_Index parent_id;
-		// Find the parent of the reached node.
-		GrB_Info res = GrB_Vector_extractElement(&parent_id, PI, id);
-		ASSERT(res == GrB_SUCCESS);
 
-		// Retrieve edges connecting the parent node to the current node.
+		// Retrieve edges connecting the current node to the next one.
 		if(ctx->reltype_count == 0) {
-			Graph_GetEdgesConnectingNodes(gc->g, parent_id, id, GRAPH_NO_RELATION, &edges);
+			Graph_GetEdgesConnectingNodes(gc->g, ids[i], ids[i + 1], GRAPH_NO_RELATION, &edges);
 		} else {
 			for(uint j = 0; j < ctx->reltype_count; j ++) {
-				Graph_GetEdgesConnectingNodes(gc->g, parent_id, id, ctx->reltypes[j], &edges);
+				Graph_GetEdgesConnectingNodes(gc->g, ids[i], ids[i + 1], ctx->reltypes[j], &edges);
 				if(array_len(edges) > 0) break;
 			}
 		}
@@ -220,19 +209,20 @@ SIValue AR_SHORTEST_PATH(SIValue *argv, int argc, void *private_data) {
 		SIPathBuilder_AppendEdge(p, SI_Edge(&edges[0]), false);
 
 		// Append the reached node to the path.
-		id = edges[0].srcNodeID;
-		Node n = GE_NEW_NODE();
-		Graph_GetNode(gc->g, id, &n);
-		SIPathBuilder_AppendNode(p, SI_Node(&n));
+		if(i == path_len - 1) {
+			SIPathBuilder_AppendNode(p, SI_Node(destNode));
+		} else {
+			Node n = GE_NEW_NODE();
+			Graph_GetNode(gc->g, ids[i + 1], &n);
+			SIPathBuilder_AppendNode(p, SI_Node(&n));
+		}
 	}
 
-	// Reverse the path so it starts at the source
-	Path_Reverse(p.ptrval);
-
 cleanup:
-	if(V) GrB_free(&V);
-	if(PI) GrB_free(&PI);
+	if(src_parent) GrB_free(&src_parent);
+	if(dest_parent) GrB_free(&dest_parent);
 	if(edges) array_free(edges);
+	if(ids) rm_free(ids);
 
 	return p;
 }
@@ -16,7 +16,8 @@ typedef struct {
 	int *reltypes;               /* Relationship type IDs */
 	uint reltype_count;          /* Number of traversed relationship types */
 	GrB_Matrix R;                /* Traversed relationship matrix */
-	bool free_matrices;          /* If true, R will ultimately be freed */
+	GrB_Matrix TR;               /* Transpose of the traversed relationship matrix */
+	bool free_matrices;          /* If true, R and TR will ultimately be freed */
 } ShortestPathCtx;
 
 void Register_PathFuncs();
@@ -0,0 +1,294 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "ast_normalize.h"
+#include <ctype.h>
+#include <string.h>
+#include <strings.h>
+#include <stdbool.h>
+
+// kind of the last token emitted
+typedef enum {
+	TOKEN_NONE,     // no token was emitted yet
+	TOKEN_IDENT,    // identifier, keyword or parameter
+	TOKEN_LITERAL,  // string or numeric literal
+	TOKEN_STAR,     // '*'
+	TOKEN_RANGE,    // '..'
+	TOKEN_DOT,      // '.'
+	TOKEN_PUNCT,    // any other symbol
+} TokenKind;
+
+// keywords affecting literals lifting
+typedef enum {
+	KW_NONE,
+	KW_RETURN,
+	KW_WITH,
+	KW_STARTS,
+	KW_ENDS,
+	KW_SKIP,
+	KW_LIMIT,
+	KW_CLAUSE,  // keyword terminating a projection
+} Keyword;
+
+static Keyword _keyword
+(
+	const char *token,
+	size_t len
+) {
+	#define KW(str) (len == strlen(str) && strncasecmp(token, str, len) == 0)
+
+	if(KW("RETURN")) return KW_RETURN;
+	if(KW("WITH"))   return KW_WITH;
+	if(KW("STARTS")) return KW_STARTS;
+	if(KW("ENDS"))   return KW_ENDS;
+	if(KW("SKIP"))   return KW_SKIP;
+	if(KW("LIMIT"))  return KW_LIMIT;
+
+	if(KW("WHERE")  || KW("MATCH")  || KW("OPTIONAL") || KW("CREATE") ||
+	   KW("MERGE")  || KW("DELETE") || KW("DETACH")   || KW("SET")    ||
+	   KW("REMOVE") || KW("UNWIND") || KW("CALL")     || KW("FOREACH") ||
+	   KW("UNION")) {
+		return KW_CLAUSE;
+	}
+
+	#undef KW
+	return KW_NONE;
+}
+
+static inline bool _is_ident_char
+(
+	char c
+) {
+	return isalnum((unsigned char)c) || c == '_' || (unsigned char)c >= 0x80;
+}
+
+// scan a numeric literal starting at 'i'
+// returns the position following the literal
+// 'valid' is set to false if the token isn't a well formed number
+// 'integer' is set to true if the literal is an integer
+static size_t _scan_number
+(
+	const char *q,
+	size_t i,
+	bool *valid,
+	bool *integer
+) {
+	*valid   = true;
+	*integer = true;
+
+	if(q[i] == '0' && (q[i+1] == 'x' || q[i+1] == 'X')) {
+		// hexadecimal
+		i += 2;
+		while(isxdigit((unsigned char)q[i])) i++;
+	} else {
+		while(isdigit((unsigned char)q[i])) i++;
+
+		// fraction, avoid consuming a range e.g. 1..3
+		if(q[i] == '.' && isdigit((unsigned char)q[i+1])) {
+			*integer = false;
+			i++;
+			while(isdigit((unsigned char)q[i])) i++;
+		}
+
+		// exponent
+		if(q[i] == 'e' || q[i] == 'E') {
+			size_t j = i + 1;
+			if(q[j] == '+' || q[j] == '-') j++;
+			if(isdigit((unsigned char)q[j])) {
+				*integer = false;
+				i = j;
+				while(isdigit((unsigned char)q[i])) i++;
+			}
+		}
+	}
+
+	// number followed by identifier characters e.g. 1abc
+	if(_is_ident_char(q[i])) {
+		*valid = false;
+		while(_is_ident_char(q[i])) i++;
+	}
+
+	return i;
+}
+
+// scan a quoted token starting at 'i', either a string or an escaped name
+// returns the position following the closing quote
+// 'valid' is set to false if the token isn't terminated
+static size_t _scan_quoted
+(
+	const char *q,
+	size_t i,
+	bool *valid
+) {
+	char quote = q[i++];
+	while(q[i] != '\0') {
+		if(q[i] == quote) {
+			// `` within an escaped name represents a single backtick
+			if(quote == '`' && q[i+1] == '`') {
+				i += 2;
+				continue;
+			}
+			*valid = true;
+			return i + 1;
+		}
+		// skip escaped character within a string
+		if(quote != '`' && q[i] == '\\' && q[i+1] != '\0') i++;
+		i++;
+	}
+
+	*valid = false;
+	return i;
+}
+
+// skip whitespaces and comments starting at 'i'
+// returns the position of the next token
+static size_t _skip_whitespaces
+(
+	const char *q,
+	size_t i
+) {
+	while(q[i] != '\0') {
+		if(isspace((unsigned char)q[i])) {
+			i++;
+		} else if(q[i] == '/' && q[i+1] == '/') {
+			// line comment
+			while(q[i] != '\0' && q[i] != '\n') i++;
+		} else if(q[i] == '/' && q[i+1] == '*') {
+			// block comment
+			i += 2;
+			while(q[i] != '\0' && !(q[i] == '*' && q[i+1] == '/')) i++;
+			if(q[i] != '\0') i += 2;
+		} else {
+			break;
+		}
+	}
+	return i;
+}
+
+sds AST_NormalizeQuery
+(
+	const char *query,
+	sds *params
+) {
+	ASSERT(query  != NULL);
+	ASSERT(params != NULL);
+
+	sds       out        = sdsempty();
+	sds       lits       = NULL;
+	uint      nlits      = 0;
+	int       depth      = 0;           // nesting level of (, [, {
+	int       proj_depth = -1;          // nesting level of current projection
+	Keyword   prev_kw    = KW_NONE;     // last keyword encountered
+	TokenKind prev       = TOKEN_NONE;  // last token emitted
+	size_t    i          = _skip_whitespaces(query, 0);
+
+	while(query[i] != '\0') {
+		size_t start = i;
+		bool   literal = false;  // token is a literal which can be lifted
+		bool   integer = false;  // token is an integer literal
+		bool   valid   = true;
+
+		char c = query[i];
+		if(c == '\'' || c == '"') {
+			i = _scan_quoted(query, i, &valid);
+			literal = valid;
+		} else if(c == '`') {
+			i = _scan_quoted(query, i, &valid);
+		} else if(isdigit((unsigned char)c)) {
+			i = _scan_number(query, i, &valid, &integer);
+			literal = valid;
+			// number is a range boundary e.g. [*1..3]
+			if(query[i] == '.' && query[i+1] == '.') literal = false;
+		} else if(_is_ident_char(c) || c == '$') {
+			i++;
+			while(_is_ident_char(query[i])) i++;
+		} else if(c == '.' && query[i+1] == '.') {
+			i += 2;
+		} else {
+			i++;
+		}
+
+		size_t len = i - start;
+
+		if(literal) {
+			// keep literals within projections as projected expressions
+			// are named after their text, literals following a '*', '..'
+			// or '.' are either range boundaries or part of a property access
+			// SKIP and LIMIT accept only integers, keep other types such that
+			// they're reported by validation
+			if(proj_depth != -1         ||
+			   prev == TOKEN_STAR       ||
+			   prev == TOKEN_RANGE      ||
+			   prev == TOKEN_DOT        ||
+			   (prev == TOKEN_IDENT && (prev_kw == KW_SKIP || prev_kw == KW_LIMIT)
+				&& !integer)) {
+				literal = false;
+			}
+		}
+
+		if(literal) {
+			// replace literal with a parameter
+			if(lits == NULL) lits = sdsempty();
+			lits = sdscatprintf(lits, " %s%u=", AST_NORMALIZE_PARAM_PREFIX,
+					nlits);
+			lits = sdscatlen(lits, query + start, len);
+			out = sdscatprintf(out, "$%s%u", AST_NORMALIZE_PARAM_PREFIX, nlits);
+			nlits++;
+			prev = TOKEN_LITERAL;
+		} else {
+			out = sdscatlen(out, query + start, len);
+
+			if(_is_ident_char(c) && !isdigit((unsigned char)c)) {
+				// identifier or keyword
+				Keyword kw = _keyword(query + start, len);
+				if(kw == KW_RETURN || (kw == KW_WITH &&
+							prev_kw != KW_STARTS && prev_kw != KW_ENDS)) {
+					// entering a projection
+					proj_depth = depth;
+				} else if(depth == proj_depth &&
+						(kw == KW_CLAUSE || kw == KW_SKIP || kw == KW_LIMIT)) {
+					// projection ended
+					proj_depth = -1;
+				}
+				prev_kw = kw;
+				prev = TOKEN_IDENT;
+			} else if(c == '$' || c == '`') {
+				prev_kw = KW_NONE;
+				prev = TOKEN_IDENT;
+			} else if(c == '\'' || c == '"' || isdigit((unsigned char)c)) {
+				prev = TOKEN_LITERAL;
+			} else if(len == 2) {
+				prev = TOKEN_RANGE;
+			} else {
+				if(c == '(' || c == '[' || c == '{') {
+					depth++;
+				} else if(c == ')' || c == ']' || c == '}') {
+					depth--;
+					// projection ended e.g. FOREACH(... | ... RETURN ...)
+					if(depth < proj_depth) proj_depth = -1;
+				}
+
+				if(c == '*')      prev = TOKEN_STAR;
+				else if(c == '.') prev = TOKEN_DOT;
+				else              prev = TOKEN_PUNCT;
+			}
+		}
+
+		// collapse whitespaces and comments into a single space
+		// unless within a projection, as projected expressions
+		// are named after their text
+		size_t next = _skip_whitespaces(query, i);
+		if(next != i && query[next] != '\0') {
+			if(proj_depth != -1) out = sdscatlen(out, query + i, next - i);
+			else out = sdscat(out, " ");
+		}
+		i = next;
+	}
+
+	*params = lits;
+	return out;
+}
@@ -0,0 +1,30 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#pragma once
+
+#include "../util/sds/sds.h"
+
+// prefix of parameters introduced by query normalization
+#define AST_NORMALIZE_PARAM_PREFIX "__lit"
+
+// normalize query string prior to an execution-plan cache lookup
+// comments are removed, whitespaces are collapsed and literals are lifted
+// into hidden parameters, such that queries differing only by their
+// literal values share the same normalized form
+//
+// literals are kept as is where lifting them would alter the query
+// e.g. unaliased projections, variable length ranges
+//
+// returns the normalized query and sets 'params' to a list of
+// name=value pairs declaring the lifted literals
+// or NULL if no literals were lifted
+// caller is responsible for freeing both using sdsfree
+sds AST_NormalizeQuery
+(
+	const char *query,  // query string, excluding parameters
+	sds *params         // [output] lifted literals
+);
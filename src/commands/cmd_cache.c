@@ -0,0 +1,87 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "commands.h"
+#include "../util/cache/cache.h"
+#include "../graph/graphcontext.h"
+
+// GRAPH.CACHE STATS <graph>
+// GRAPH.CACHE RESET <graph>
+
+// reply with a single statistic, [name, value]
+static void _ReplyWithStat
+(
+	RedisModuleCtx *ctx,
+	const char *name,
+	long long value
+) {
+	RedisModule_ReplyWithArray(ctx, 2);
+	RedisModule_ReplyWithCString(ctx, name);
+	RedisModule_ReplyWithLongLong(ctx, value);
+}
+
+// reply with a single timing statistic, [name, milliseconds]
+static void _ReplyWithTimeStat
+(
+	RedisModuleCtx *ctx,
+	const char *name,
+	uint64_t usec
+) {
+	RedisModule_ReplyWithArray(ctx, 2);
+	RedisModule_ReplyWithCString(ctx, name);
+	RedisModule_ReplyWithDouble(ctx, usec / 1000.0);
+}
+
+static void _Cache_Stats
+(
+	RedisModuleCtx *ctx,
+	Cache *cache
+) {
+	uint size;
+	CacheStats stats;
+	Cache_GetStats(cache, &stats, &size);
+
+	RedisModule_ReplyWithArray(ctx, 8);
+	_ReplyWithStat(ctx, "hits", stats.hits);
+	_ReplyWithStat(ctx, "misses", stats.misses);
+	_ReplyWithStat(ctx, "evictions", stats.evictions);
+	_ReplyWithStat(ctx, "size", size);
+	_ReplyWithStat(ctx, "capacity", cache->cap);
+	_ReplyWithTimeStat(ctx, "parse_time", stats.parse_time);
+	_ReplyWithTimeStat(ctx, "plan_time", stats.plan_time);
+	_ReplyWithTimeStat(ctx, "clone_time", stats.copy_time);
+}
+
+int Graph_Cache(RedisModuleCtx *ctx, RedisModuleString **argv, int argc) {
+	// GRAPH.CACHE <subcommand> <graph>
+	if(argc != 3) return RedisModule_WrongArity(ctx);
+
+	const char *subcmd = RedisModule_StringPtrLen(argv[1], NULL);
+	bool stats = (strcasecmp(subcmd, "STATS") == 0);
+	bool reset = (strcasecmp(subcmd, "RESET") == 0);
+
+	if(!stats && !reset) {
+		RedisModule_ReplyWithError(ctx, "Unknown subcommand for GRAPH.CACHE");
+		return REDISMODULE_OK;
+	}
+
+	GraphContext *gc = GraphContext_Retrieve(ctx, argv[2], true, false);
+	// if GraphContext is null, key access failed and an error been emitted
+	if(!gc) return REDISMODULE_ERR;
+
+	Cache *cache = GraphContext_GetCache(gc);
+
+	if(stats) {
+		_Cache_Stats(ctx, cache);
+	} else {
+		Cache_ResetStats(cache);
+		RedisModule_ReplyWithSimpleString(ctx, "OK");
+	}
+
+	GraphContext_DecreaseRefCount(gc);
+	return REDISMODULE_OK;
+}
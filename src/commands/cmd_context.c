@@ -27,7 +27,8 @@ CommandCtx *CommandCtx_New
 	ExecutorThread thread,
 	bool replicated_command,
 	bool compact,
-	long long timeout
+	long long timeout,
+	long long cursor_count
 ) {
 	CommandCtx *context = rm_malloc(sizeof(CommandCtx));
 	context->bc = bc;
@@ -36,6 +37,7 @@ CommandCtx *CommandCtx_New
 	context->thread = thread;
 	context->compact = compact;
 	context->timeout = timeout;
+	context->cursor_count = cursor_count;
 	context->command_name = NULL;
 	context->graph_ctx = graph_ctx;
 	context->replicated_command = replicated_command;
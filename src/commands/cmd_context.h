@@ -28,6 +28,7 @@ typedef struct {
 	bool compact;                   // Whether this query was issued with the compact flag.
 	ExecutorThread thread;          // Which thread executes this command
 	long long timeout;              // The query timeout, if specified.
+	long long cursor_count;         // Cursor batch size, 0 if no cursor was requested.
 } CommandCtx;
 
 // Create a new command context.
@@ -41,7 +42,8 @@ CommandCtx *CommandCtx_New
 	ExecutorThread thread,          // Which thread executes this command
 	bool replicated_command,        // Whether this instance was spawned by a replication command.
 	bool compact,                   // Whether this query was issued with the compact flag.
-	long long timeout               // The query timeout, if specified.
+	long long timeout,              // The query timeout, if specified.
+	long long cursor_count          // Cursor batch size, 0 if no cursor was requested.
 );
 
 // Tracks given 'ctx' such that in case of a crash we will be able to report
@@ -0,0 +1,190 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "../errors.h"
+#include "commands.h"
+#include "cmd_context.h"
+#include "query_cursor.h"
+#include "../query_ctx.h"
+#include "../graph/graph.h"
+#include "../util/rmalloc.h"
+#include "../util/thpool/pools.h"
+#include "../util/blocked_client.h"
+
+// GRAPH.CURSOR READ <graph> <cursor_id> [COUNT <count>]
+// GRAPH.CURSOR DEL <graph> <cursor_id>
+
+// arguments passed to a cursor read job
+typedef struct {
+	CommandCtx *command_ctx;  // command context
+	QueryCursor *cursor;      // acquired cursor to read from
+	uint64_t count;           // maximum number of records to emit
+} CursorReadCtx;
+
+// read next batch of records from cursor
+static void _Cursor_Read
+(
+	void *args
+) {
+	ASSERT(args != NULL);
+
+	CursorReadCtx  *read_ctx     =  args;
+	QueryCursor    *cursor       =  read_ctx->cursor;
+	CommandCtx     *command_ctx  =  read_ctx->command_ctx;
+	GraphContext   *gc           =  cursor->gc;
+	ResultSet      *set          =  cursor->result_set;
+	ExecutionPlan  *plan         =  cursor->exec_ctx->plan;
+	RedisModuleCtx *rm_ctx       =  CommandCtx_GetRedisCtx(command_ctx);
+	bool           depleted      =  true;
+
+	CommandCtx_TrackCtx(command_ctx);
+
+	// restore cursor's query context
+	QueryCtx_SetTLS(cursor->query_ctx);
+	QueryCtx_SetGlobalExecutionCtx(command_ctx);
+	cursor->query_ctx->query_data.query = cursor->query;
+	QueryCtx_BeginTimer();
+
+	// reply to the current client
+	set->ctx = rm_ctx;
+
+	Graph_AcquireReadLock(gc->g);
+
+	// the graph had been modified since the cursor was created
+	// the execution plan might be referring to invalid data
+	if(Graph_GetWriteEpoch(gc->g) != cursor->graph_epoch) {
+		ErrorCtx_SetError("Cursor invalidated, graph was modified");
+	} else {
+		Graph_SetMatrixPolicy(gc->g, SYNC_POLICY_FLUSH_RESIZE);
+
+		// set the read timeout if one was specified
+		CronTaskHandle timeout_task = 0;
+		if(cursor->timeout != 0) {
+			timeout_task = Query_SetTimeOut(cursor->timeout, plan);
+		}
+
+		depleted = ExecutionPlan_ExecuteBatch(plan, read_ctx->count);
+
+		// abort timeout if set
+		if(timeout_task != 0) Cron_AbortTask(timeout_task);
+
+		// emit error if read timed out
+		if(ExecutionPlan_Drained(plan)) ErrorCtx_SetError("Query timed out");
+	}
+
+	// discard cursor once it is depleted or had failed
+	bool keep = (!depleted && !ErrorCtx_EncounteredError());
+
+	ResultSet_ReplyWithCursor(set, (keep) ? cursor->id : 0);
+
+	Graph_ReleaseLock(gc->g);
+
+	// clean up
+	QueryCtx_RemoveFromTLS();
+	if(keep) {
+		QueryCursor_Release(cursor);
+	} else {
+		QueryCursor_Free(cursor);
+	}
+
+	GraphContext_DecreaseRefCount(CommandCtx_GetGraphContext(command_ctx));
+	CommandCtx_Free(command_ctx);
+	ErrorCtx_Clear();
+	rm_free(read_ctx);
+}
+
+int Graph_Cursor(RedisModuleCtx *ctx, RedisModuleString **argv, int argc) {
+	// GRAPH.CURSOR <subcommand> <graph> <cursor_id> [COUNT <count>]
+	if(argc != 4 && argc != 6) return RedisModule_WrongArity(ctx);
+
+	const char *subcmd = RedisModule_StringPtrLen(argv[1], NULL);
+	bool read = (strcasecmp(subcmd, "READ") == 0);
+	bool del  = (strcasecmp(subcmd, "DEL")  == 0);
+
+	if(!read && !del) {
+		RedisModule_ReplyWithError(ctx, "Unknown subcommand for GRAPH.CURSOR");
+		return REDISMODULE_OK;
+	}
+
+	if(del && argc != 4) return RedisModule_WrongArity(ctx);
+
+	long long id;
+	if(RedisModule_StringToLongLong(argv[3], &id) != REDISMODULE_OK || id <= 0) {
+		RedisModule_ReplyWithError(ctx, "Failed to parse cursor ID");
+		return REDISMODULE_OK;
+	}
+
+	long long count = 0;
+	if(argc == 6) {
+		const char *arg = RedisModule_StringPtrLen(argv[4], NULL);
+		if(strcasecmp(arg, "COUNT") != 0 ||
+		   RedisModule_StringToLongLong(argv[5], &count) != REDISMODULE_OK ||
+		   count <= 0) {
+			RedisModule_ReplyWithError(ctx, "Failed to parse cursor count value");
+			return REDISMODULE_OK;
+		}
+	}
+
+	GraphContext *gc = GraphContext_Retrieve(ctx, argv[2], true, false);
+	// if GraphContext is null, key access failed and an error been emitted
+	if(!gc) return REDISMODULE_ERR;
+
+	QueryCursor *cursor = QueryCursor_Acquire(gc, id);
+	if(cursor == NULL) {
+		RedisModule_ReplyWithError(ctx, "Cursor not found");
+		GraphContext_DecreaseRefCount(gc);
+		return REDISMODULE_OK;
+	}
+
+	if(del) {
+		QueryCursor_Free(cursor);
+		GraphContext_DecreaseRefCount(gc);
+		RedisModule_ReplyWithSimpleString(ctx, "OK");
+		return REDISMODULE_OK;
+	}
+
+	// read using cursor's default count if one wasn't specified
+	if(count == 0) count = cursor->count;
+
+	// reads issued within a LUA script or multi exec block must
+	// run on Redis main thread, others can run on a reader thread
+	int flags = RedisModule_GetContextFlags(ctx);
+	ExecutorThread exec_thread = (flags & (REDISMODULE_CTX_FLAGS_MULTI         |
+										   REDISMODULE_CTX_FLAGS_LUA           |
+										   REDISMODULE_CTX_FLAGS_DENY_BLOCKING |
+										   REDISMODULE_CTX_FLAGS_LOADING)) ?
+								 EXEC_THREAD_MAIN : EXEC_THREAD_READER;
+
+	CursorReadCtx *read_ctx = rm_malloc(sizeof(CursorReadCtx));
+	read_ctx->count  = count;
+	read_ctx->cursor = cursor;
+
+	if(exec_thread == EXEC_THREAD_MAIN) {
+		read_ctx->command_ctx = CommandCtx_New(ctx, NULL, argv[0], NULL, gc,
+				exec_thread, false, false, 0, 0);
+		read_ctx->command_ctx->query = rm_strdup(cursor->query);
+		_Cursor_Read(read_ctx);
+	} else {
+		RedisModuleBlockedClient *bc = RedisGraph_BlockClient(ctx);
+		read_ctx->command_ctx = CommandCtx_New(NULL, bc, argv[0], NULL, gc,
+				exec_thread, false, false, 0, 0);
+		read_ctx->command_ctx->query = rm_strdup(cursor->query);
+
+		if(ThreadPools_AddWorkReader(_Cursor_Read, read_ctx) == THPOOL_QUEUE_FULL) {
+			// report an error once our workers thread pool internal queue
+			// is full, this error usually happens when the server is
+			// under heavy load and is unable to catch up
+			RedisModule_ReplyWithError(ctx, "Max pending queries exceeded");
+			QueryCursor_Release(cursor);
+			GraphContext_DecreaseRefCount(gc);
+			CommandCtx_Free(read_ctx->command_ctx);
+			rm_free(read_ctx);
+		}
+	}
+
+	return REDISMODULE_OK;
+}
@@ -12,19 +12,27 @@
 #include "../configuration/config.h"
 
 #define GRAPH_VERSION_MISSING -1
+#define CURSOR_DEFAULT_COUNT 1000  // default number of records per cursor read
 
 // Command handler function pointer.
 typedef void(*Command_Handler)(void *args);
 
 // Read configuration flags, returning REDIS_MODULE_ERR if flag parsing failed.
 static int _read_flags(RedisModuleString **argv, int argc, bool *compact,
-					   long long *timeout, uint *graph_version, char **errmsg) {
+					   long long *timeout, uint *graph_version,
+					   long long *cursor_count, char **errmsg) {
 
 	ASSERT(compact);
 	ASSERT(timeout);
+	ASSERT(cursor_count);
+
+	bool cursor = false;
+	bool count_specified = false;
+	long long count = CURSOR_DEFAULT_COUNT;
 
 	// set defaults
 	*compact = false;  // verbose
+	*cursor_count = 0; // no cursor
 	*graph_version = GRAPH_VERSION_MISSING;
 	Config_Option_get(Config_TIMEOUT, timeout);
 
@@ -73,8 +81,41 @@ static int _read_flags(RedisModuleString **argv, int argc, bool *compact,
 				asprintf(errmsg, "Failed to parse query timeout value");
 				return REDISMODULE_ERR;
 			}
+
+			continue;
+		}
+
+		// stream result-set via a cursor
+		if(!strcasecmp(arg, "cursor")) {
+			cursor = true;
+			continue;
+		}
+
+		// number of records to emit per cursor read
+		if(!strcasecmp(arg, "count")) {
+			int err = REDISMODULE_ERR;
+			if(i < argc - 1) {
+				i++; // Set the current argument to the count value.
+				err = RedisModule_StringToLongLong(argv[i], &count);
+			}
+
+			// Emit error on missing, non-positive, or non-numeric count values.
+			if(err != REDISMODULE_OK || count <= 0) {
+				asprintf(errmsg, "Failed to parse cursor count value");
+				return REDISMODULE_ERR;
+			}
+
+			count_specified = true;
 		}
 	}
+
+	if(count_specified && !cursor) {
+		asprintf(errmsg, "COUNT is only valid in combination with CURSOR");
+		return REDISMODULE_ERR;
+	}
+
+	if(cursor) *cursor_count = count;
+
 	return REDISMODULE_OK;
 }
 
@@ -100,7 +141,7 @@ static inline bool _validate_command_arity(GRAPH_Commands cmd, int arity) {
 		case CMD_EXPLAIN:
 		case CMD_PROFILE:
 			// Expect a command, graph name, a query, and optional config flags.
-			return arity >= 3 && arity <= 8;
+			return arity >= 3 && arity <= 11;
 		case CMD_SLOWLOG:
 			// Expect just a command and graph name.
 			return arity == 2;
@@ -161,6 +202,7 @@ int CommandDispatch(RedisModuleCtx *ctx, RedisModuleString **argv, int argc) {
 	bool compact;
 	uint version;
 	long long timeout;
+	long long cursor_count;
 	CommandCtx *context = NULL;
 
 	RedisModuleString *graph_name = argv[1];
@@ -171,7 +213,8 @@ int CommandDispatch(RedisModuleCtx *ctx, RedisModuleString **argv, int argc) {
 	if(_validate_command_arity(cmd, argc) == false) return RedisModule_WrongArity(ctx);
 
 	// parse additional arguments
-	int res = _read_flags(argv, argc, &compact, &timeout, &version, &errmsg);
+	int res = _read_flags(argv, argc, &compact, &timeout, &version,
+			&cursor_count, &errmsg);
 	if(res == REDISMODULE_ERR) {
 		// emit error and exit if argument parsing failed
 		RedisModule_ReplyWithError(ctx, errmsg);
@@ -210,13 +253,13 @@ int CommandDispatch(RedisModuleCtx *ctx, RedisModuleString **argv, int argc) {
 	if(exec_thread == EXEC_THREAD_MAIN) {
 		// run query on Redis main thread
 		context = CommandCtx_New(ctx, NULL, argv[0], query, gc, exec_thread,
-								 is_replicated, compact, timeout);
+								 is_replicated, compact, timeout, cursor_count);
 		handler(context);
 	} else {
 		// run query on a dedicated thread
 		RedisModuleBlockedClient *bc = RedisGraph_BlockClient(ctx);
 		context = CommandCtx_New(NULL, bc, argv[0], query, gc, exec_thread,
-								 is_replicated, compact, timeout);
+								 is_replicated, compact, timeout, cursor_count);
 
 		if(ThreadPools_AddWorkReader(handler, context) == THPOOL_QUEUE_FULL) {
 			// Report an error once our workers thread pool internal queue
@@ -13,10 +13,22 @@
 #include "../query_ctx.h"
 #include "../graph/graph.h"
 #include "../util/rmalloc.h"
+#include "../util/simple_timer.h"
 #include "../util/cache/cache.h"
+#include "../configuration/config.h"
 #include "../util/thpool/pools.h"
 #include "../execution_plan/execution_plan.h"
 #include "execution_ctx.h"
+#include "query_cursor.h"
+#include <pthread.h>
+
+// max number of milliseconds a group commit may hold the GIL and the graph's
+// write lock, queries not executed within this budget are committed by a
+// subsequent group
+#define GROUP_COMMIT_MAX_TIME 5
+
+// GraphContext type as it is registered at Redis
+extern RedisModuleType *GraphContextRedisModuleType;
 
 // GraphQueryCtx stores the allocations required to execute a query.
 typedef struct {
@@ -28,8 +40,13 @@ typedef struct {
 	bool readonly_query;      // read only query
 	bool profile;             // profile query
 	CronTaskHandle timeout;   // timeout cron task
+	bool group_commit;        // query is committed as part of a group
 } GraphQueryCtx;
 
+// write queries pending to be committed by the writer thread
+static GraphQueryCtx **_pending_writes = NULL;
+static pthread_mutex_t _pending_writes_lock = PTHREAD_MUTEX_INITIALIZER;
+
 static GraphQueryCtx *GraphQueryCtx_New
 (
 	GraphContext *graph_ctx,
@@ -50,6 +67,7 @@ static GraphQueryCtx *GraphQueryCtx_New
 	ctx->readonly_query  =  readonly_query;
 	ctx->profile         =  profile;
 	ctx->timeout         =  timeout;
+	ctx->group_commit    =  false;
 
 	return ctx;
 }
@@ -100,7 +118,7 @@ static void _index_operation(RedisModuleCtx *ctx, GraphContext *gc, AST *ast,
 		}
 
 		// populate the index only when at least one attribute was introduced
-		if(index_added) Index_Construct(idx, gc->g);
+		if(index_added) GraphContext_ConstructIndex(gc, idx);
 
 		QueryCtx_UnlockCommit(NULL);
 	} else if(exec_type == EXECUTION_TYPE_INDEX_DROP) {
@@ -168,12 +186,19 @@ static void _ExecuteQuery(void *args) {
 	AST             *ast          =  exec_ctx->ast;
 	ExecutionPlan   *plan         =  exec_ctx->plan;
 	ExecutionType   exec_type     =  exec_ctx->exec_type;
+	QueryCursor     *cursor       =  NULL;
+	uint            pool_depth    =  0;
+
+	// stream result-set via a cursor if one was requested
+	bool use_cursor = (!profile && command_ctx->cursor_count > 0);
 
 	// if we have migrated to a writer thread,
 	// update thread-local storage and track the CommandCtx
 	if(command_ctx->thread == EXEC_THREAD_WRITER) {
 		QueryCtx_SetTLS(query_ctx);
 		CommandCtx_TrackCtx(command_ctx);
+		// commit locks are held by the group
+		if(gq_ctx->group_commit) QueryCtx_JoinGroupCommit();
 	}
 
 	// instantiate the query ResultSet
@@ -194,12 +219,13 @@ static void _ExecuteQuery(void *args) {
 	} else {
 		/* if this is a writer query `we need to re-open the graph key with write flag
 		 * this notifies Redis that the key is "dirty" any watcher on that key will
-		 * be notified */
-		CommandCtx_ThreadSafeContextLock(command_ctx);
+		 * be notified
+		 * a group commit is already holding the GIL */
+		if(!gq_ctx->group_commit) CommandCtx_ThreadSafeContextLock(command_ctx);
 		{
 			GraphContext_MarkWriter(rm_ctx, gc);
 		}
-		CommandCtx_ThreadSafeContextUnlock(command_ctx);
+		if(!gq_ctx->group_commit) CommandCtx_ThreadSafeContextUnlock(command_ctx);
 	}
 
 	if(exec_type == EXECUTION_TYPE_QUERY) {  // query operation
@@ -212,6 +238,20 @@ static void _ExecuteQuery(void *args) {
 			ExecutionPlan_Profile(plan);
 			if(!ErrorCtx_EncounteredError()) ExecutionPlan_Print(plan, rm_ctx);
 		}
+		else if(use_cursor) {
+			// produce the first batch of records
+			bool depleted = ExecutionPlan_ExecuteBatch(plan,
+					command_ctx->cursor_count);
+
+			// keep the plan around if there are more records to produce
+			if(!depleted && !ErrorCtx_EncounteredError() &&
+			   !ExecutionPlan_Drained(plan)) {
+				cursor = QueryCursor_Register(command_ctx->query, gc,
+						query_ctx, exec_ctx, result_set,
+						Graph_GetWriteEpoch(gc->g), command_ctx->cursor_count,
+						command_ctx->timeout);
+			}
+		}
 		else {
 			result_set = ExecutionPlan_Execute(plan);
 		}
@@ -222,8 +262,11 @@ static void _ExecuteQuery(void *args) {
 		// emit error if query timed out
 		if(ExecutionPlan_Drained(plan)) ErrorCtx_SetError("Query timed out");
 
-		ExecutionPlan_Free(plan);
-		exec_ctx->plan = NULL;
+		// plan is owned by the cursor
+		if(cursor == NULL) {
+			ExecutionPlan_Free(plan);
+			exec_ctx->plan = NULL;
+		}
 	} else if(exec_type == EXECUTION_TYPE_INDEX_CREATE ||
 			  exec_type == EXECUTION_TYPE_INDEX_DROP) {
 		_index_operation(rm_ctx, gc, ast, exec_type);
@@ -240,7 +283,11 @@ static void _ExecuteQuery(void *args) {
 	
 	QueryCtx_ForceUnlockCommit();
 
-	if(!profile || ErrorCtx_EncounteredError()) {
+	if(use_cursor) {
+		// send first batch of records back to client
+		// followed by the cursor ID, 0 if result-set was fully consumed
+		ResultSet_ReplyWithCursor(result_set, (cursor) ? cursor->id : 0);
+	} else if(!profile || ErrorCtx_EncounteredError()) {
 		// if we encountered an error, ResultSet_Reply will emit the error
 		// send result-set back to client
 		ResultSet_Reply(result_set);
@@ -253,16 +300,221 @@ static void _ExecuteQuery(void *args) {
 	SlowLog_Add(slowlog, command_ctx->command_name, command_ctx->query,
 				QueryCtx_GetExecutionTime(), NULL);
 
+	// determine if the cached execution plan pool should be replenished
+	// pool depth is capped by the number of reader threads
+	char *cache_key = NULL;
+	if(cursor == NULL && exec_type == EXECUTION_TYPE_QUERY &&
+	   !gq_ctx->group_commit && !ErrorCtx_EncounteredError()) {
+		uint64_t pool_size;
+		Config_Option_get(Config_PLAN_POOL_SIZE, &pool_size);
+		uint readers = ThreadPools_ReadersCount();
+		pool_depth = (pool_size < readers) ? pool_size : readers;
+		if(pool_depth > 0) {
+			// query string is freed along with the execution context
+			cache_key = rm_strdup(query_ctx->query_data.query_no_params);
+		}
+	}
+
 	// clean up
-	ExecutionCtx_Free(exec_ctx);
-	GraphContext_DecreaseRefCount(gc);
-	CommandCtx_Free(command_ctx);
-	QueryCtx_Free(); // reset the QueryCtx and free its allocations
+	if(cursor != NULL) {
+		// execution context, query context, result-set and graph reference
+		// are owned by the cursor
+		QueryCtx_RemoveFromTLS();
+		QueryCursor_Release(cursor);
+	} else {
+		ExecutionCtx_Free(exec_ctx);
+		ResultSet_Free(result_set);
+	}
+	if(gq_ctx->group_commit) {
+		// client is unblocked once the entire group is committed
+		CommandCtx_UntrackCtx(command_ctx);
+	} else {
+		CommandCtx_Free(command_ctx); // unblocks the client
+	}
 	ErrorCtx_Clear();
-	ResultSet_Free(result_set);
+
+	if(cursor == NULL) {
+		// the client had been replied to, clone the next execution plan
+		// such that it is ready for the next execution of this query
+		if(cache_key != NULL) {
+			ExecutionCtx_ReplenishPool(cache_key, pool_depth);
+			ErrorCtx_Clear();
+			rm_free(cache_key);
+		}
+		GraphContext_DecreaseRefCount(gc);
+		QueryCtx_Free(); // reset the QueryCtx and free its allocations
+	}
+
 	GraphQueryCtx_Free(gq_ctx);
 }
 
+//------------------------------------------------------------------------------
+// Group commit
+//------------------------------------------------------------------------------
+
+// remove a group of write queries from the pending queue
+// the group consists of queued queries against the same graph as the first
+// queued query, in their queue order, up to 'max' queries
+static GraphQueryCtx **_PendingWrites_PopGroup(uint64_t max) {
+	GraphQueryCtx **group = array_new(GraphQueryCtx *, 1);
+
+	pthread_mutex_lock(&_pending_writes_lock);
+
+	uint n = array_len(_pending_writes);
+	if(n > 0) {
+		GraphQueryCtx *head = _pending_writes[0];
+		array_append(group, head);
+
+		// index operations are committed on their own
+		uint j = 1;
+		bool grouping = (head->exec_ctx->exec_type == EXECUTION_TYPE_QUERY);
+		for(uint i = 1; i < n; i++) {
+			GraphQueryCtx *gq_ctx = _pending_writes[i];
+			if(grouping && gq_ctx->graph_ctx == head->graph_ctx) {
+				// preserve the order of the graph's queries, stop grouping
+				// once an index operation is encountered
+				if(gq_ctx->exec_ctx->exec_type == EXECUTION_TYPE_QUERY) {
+					array_append(group, gq_ctx);
+					grouping = (array_len(group) < max);
+					continue;
+				}
+				grouping = false;
+			}
+			// keep query pending
+			_pending_writes[j++] = gq_ctx;
+		}
+		_pending_writes = array_trimm_len(_pending_writes, j);
+	}
+
+	pthread_mutex_unlock(&_pending_writes_lock);
+
+	return group;
+}
+
+// return queries to the front of the pending queue, preserving their order
+static void _PendingWrites_PushBack
+(
+	GraphQueryCtx **queries,  // queries to return
+	uint n                    // number of queries
+) {
+	pthread_mutex_lock(&_pending_writes_lock);
+
+	uint pending = array_len(_pending_writes);
+	for(uint i = 0; i < n; i++) array_append(_pending_writes, NULL);
+	memmove(_pending_writes + n, _pending_writes,
+			sizeof(GraphQueryCtx *) * pending);
+	memcpy(_pending_writes, queries, sizeof(GraphQueryCtx *) * n);
+
+	pthread_mutex_unlock(&_pending_writes_lock);
+}
+
+// acquire the locks required for committing the group
+// 1. GIL
+// 2. graph key opened for writing
+// 3. graph write lock
+// returns false if the graph key had been modified
+static bool _GroupCommit_Lock
+(
+	GraphContext *gc,         // graph context
+	CommandCtx *command_ctx,  // command context of the group's first query
+	RedisModuleKey **key      // [output] opened graph key
+) {
+	RedisModuleCtx *rm_ctx = CommandCtx_GetRedisCtx(command_ctx);
+
+	CommandCtx_ThreadSafeContextLock(command_ctx);
+
+	RedisModuleString *graph_id = RedisModule_CreateString(rm_ctx,
+			gc->graph_name, strlen(gc->graph_name));
+	*key = RedisModule_OpenKey(rm_ctx, graph_id, REDISMODULE_WRITE);
+	RedisModule_FreeString(rm_ctx, graph_id);
+
+	if(RedisModule_KeyType(*key) == REDISMODULE_KEYTYPE_EMPTY ||
+	   RedisModule_ModuleTypeGetType(*key) != GraphContextRedisModuleType ||
+	   RedisModule_ModuleTypeGetValue(*key) != gc) {
+		RedisModule_CloseKey(*key);
+		CommandCtx_ThreadSafeContextUnlock(command_ctx);
+		return false;
+	}
+
+	Graph_AcquireWriteLock(gc->g);
+	return true;
+}
+
+// release the locks acquired by _GroupCommit_Lock
+static void _GroupCommit_Unlock
+(
+	GraphContext *gc,         // graph context
+	CommandCtx *command_ctx,  // command context of the group's first query
+	RedisModuleKey *key       // opened graph key
+) {
+	Graph_ReleaseLock(gc->g);
+	RedisModule_CloseKey(key);
+	CommandCtx_ThreadSafeContextUnlock(command_ctx);
+}
+
+// executes a group of write queries under a single lock acquisition
+// each query keeps its own undo-log, such that a failing query is rolled
+// back without affecting the rest of the group
+// clients are replied to once the entire group is committed
+// as the GIL is held throughout, the group is cut short once it exceeds
+// GROUP_COMMIT_MAX_TIME, its remaining queries are returned to the queue
+// each queued query schedules a group, as such a following group picks them up
+static void _ExecuteWriteGroup(void *args) {
+	uint64_t group_size;
+	Config_Option_get(Config_GROUP_COMMIT_SIZE, &group_size);
+
+	GraphQueryCtx **group = _PendingWrites_PopGroup(group_size);
+	uint n = array_len(group);
+
+	// queued queries had already been committed by a previous group
+	if(n == 0) {
+		array_free(group);
+		return;
+	}
+
+	// queries free their GraphQueryCtx once executed
+	// retain the graph and command contexts until the group is committed
+	GraphContext *gc = group[0]->graph_ctx;
+	CommandCtx *command_ctxs[n];
+	for(uint i = 0; i < n; i++) command_ctxs[i] = group[i]->command_ctx;
+
+	// a single query or the graph key was modified, execute individually
+	RedisModuleKey *key = NULL;
+	if(n == 1 || !_GroupCommit_Lock(gc, command_ctxs[0], &key)) {
+		for(uint i = 0; i < n; i++) _ExecuteQuery(group[i]);
+		array_free(group);
+		return;
+	}
+
+	GraphContext_IncreaseRefCount(gc);
+
+	double tic[2];
+	simple_tic(tic);
+
+	uint executed = 0;
+	while(executed < n) {
+		group[executed]->group_commit = true;
+		_ExecuteQuery(group[executed++]);
+		if(simple_toc(tic) * 1000 >= GROUP_COMMIT_MAX_TIME) break;
+	}
+
+	if(executed < n) {
+		_PendingWrites_PushBack(group + executed, n - executed);
+		n = executed;
+	}
+
+	// synchronize matrices once for the entire group
+	Graph_ApplyAllPending(gc->g, false);
+
+	_GroupCommit_Unlock(gc, command_ctxs[0], key);
+
+	// reply to each client
+	for(uint i = 0; i < n; i++) CommandCtx_Free(command_ctxs[i]);
+	GraphContext_DecreaseRefCount(gc);
+
+	array_free(group);
+}
+
 static void _DelegateWriter(GraphQueryCtx *gq_ctx) {
 	ASSERT(gq_ctx != NULL);
 
@@ -281,8 +533,24 @@ static void _DelegateWriter(GraphQueryCtx *gq_ctx) {
 	// update execution thread to writer
 	gq_ctx->command_ctx->thread = EXEC_THREAD_WRITER;
 
+	uint64_t group_size;
+	Config_Option_get(Config_GROUP_COMMIT_SIZE, &group_size);
+
 	// dispatch work to the writer thread
-	int res = ThreadPools_AddWorkWriter(_ExecuteQuery, gq_ctx, 0);
+	int res;
+	if(group_size > 1) {
+		// queue query, the writer thread commits queued queries in groups
+		pthread_mutex_lock(&_pending_writes_lock);
+		if(_pending_writes == NULL) {
+			_pending_writes = array_new(GraphQueryCtx *, group_size);
+		}
+		array_append(_pending_writes, gq_ctx);
+		pthread_mutex_unlock(&_pending_writes_lock);
+
+		res = ThreadPools_AddWorkWriter(_ExecuteWriteGroup, NULL, 0);
+	} else {
+		res = ThreadPools_AddWorkWriter(_ExecuteQuery, gq_ctx, 0);
+	}
 	ASSERT(res == 0);
 }
 
@@ -323,6 +591,12 @@ void _query(bool profile, void *args) {
 		goto cleanup;
 	}
 
+	// cursors are restricted to read-only queries
+	if(!profile && !readonly && command_ctx->cursor_count > 0) {
+		ErrorCtx_SetError("CURSOR is only supported for read-only queries");
+		goto cleanup;
+	}
+
 	CronTaskHandle timeout_task = 0;
 
 	// set the query timeout if one was specified
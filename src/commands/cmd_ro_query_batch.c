@@ -0,0 +1,196 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "../errors.h"
+#include "commands.h"
+#include "cmd_context.h"
+#include "../query_ctx.h"
+#include "../graph/graph.h"
+#include "../util/rmalloc.h"
+#include "../util/thpool/pools.h"
+#include "../util/blocked_client.h"
+#include "../configuration/config.h"
+
+// GRAPH.RO_QUERY_BATCH <graph> <query> [<query> ...] [--compact]
+
+// arguments passed to a batch job
+typedef struct {
+	CommandCtx *command_ctx;  // command context
+	char **queries;           // queries to execute
+	uint query_count;         // number of queries
+	long long timeout;        // per query timeout
+} QueryBatchCtx;
+
+// execute a single query of the batch and reply with its result-set
+// expecting the graph read lock to be held
+static void _QueryBatch_ExecuteQuery
+(
+	CommandCtx *command_ctx,  // command context
+	const char *query,        // query to execute
+	long long timeout         // query timeout
+) {
+	GraphContext   *gc       = CommandCtx_GetGraphContext(command_ctx);
+	RedisModuleCtx *rm_ctx   = CommandCtx_GetRedisCtx(command_ctx);
+	ResultSet      *set      = NULL;
+	ExecutionCtx   *exec_ctx = NULL;
+
+	QueryCtx_SetGlobalExecutionCtx(command_ctx);
+	QueryCtx_BeginTimer();
+
+	// build an execution plan or retrieve it from the cache
+	exec_ctx = ExecutionCtx_FromQuery(query);
+	if(exec_ctx == NULL) goto cleanup;
+
+	if(exec_ctx->exec_type != EXECUTION_TYPE_QUERY ||
+	   !AST_ReadOnly(exec_ctx->ast->root)) {
+		ErrorCtx_SetError("graph.RO_QUERY_BATCH is to be executed only on read-only queries");
+		goto cleanup;
+	}
+
+	ResultSetFormatterType format = (command_ctx->compact) ?
+		FORMATTER_COMPACT : FORMATTER_VERBOSE;
+	set = NewResultSet(rm_ctx, format);
+	if(exec_ctx->cached) ResultSet_CachedExecution(set);
+	QueryCtx_SetResultSet(set);
+
+	ExecutionPlan *plan = exec_ctx->plan;
+	CronTaskHandle timeout_task = 0;
+	if(timeout != 0) timeout_task = Query_SetTimeOut(timeout, plan);
+
+	ExecutionPlan_PreparePlan(plan);
+	set = ExecutionPlan_Execute(plan);
+
+	// abort timeout if set
+	if(timeout_task != 0) Cron_AbortTask(timeout_task);
+
+	// emit error if query timed out
+	if(ExecutionPlan_Drained(plan)) ErrorCtx_SetError("Query timed out");
+
+	ExecutionPlan_Free(plan);
+	exec_ctx->plan = NULL;
+
+cleanup:
+	// reply with either the result-set or the query's error
+	if(set != NULL) ResultSet_Reply(set);
+	else ErrorCtx_EmitException();
+
+	// log query to slowlog
+	if(set != NULL) {
+		SlowLog *slowlog = GraphContext_GetSlowLog(gc);
+		SlowLog_Add(slowlog, command_ctx->command_name, query,
+					QueryCtx_GetExecutionTime(), NULL);
+	}
+
+	ExecutionCtx_Free(exec_ctx);
+	if(set != NULL) ResultSet_Free(set);
+	ErrorCtx_Clear();
+	QueryCtx_Free(); // reset the QueryCtx and free its allocations
+}
+
+// execute all queries of the batch under a single read lock
+static void _QueryBatch_Execute
+(
+	void *args
+) {
+	ASSERT(args != NULL);
+
+	QueryBatchCtx  *batch_ctx    =  args;
+	CommandCtx     *command_ctx  =  batch_ctx->command_ctx;
+	GraphContext   *gc           =  CommandCtx_GetGraphContext(command_ctx);
+	RedisModuleCtx *rm_ctx       =  CommandCtx_GetRedisCtx(command_ctx);
+
+	CommandCtx_TrackCtx(command_ctx);
+
+	// reply with a result-set per query
+	RedisModule_ReplyWithArray(rm_ctx, batch_ctx->query_count);
+
+	Graph_AcquireReadLock(gc->g);
+
+	// set policy after lock acquisition,
+	// avoid resetting policies between readers and writers
+	Graph_SetMatrixPolicy(gc->g, SYNC_POLICY_FLUSH_RESIZE);
+
+	for(uint i = 0; i < batch_ctx->query_count; i++) {
+		// track the currently executing query
+		command_ctx->query = batch_ctx->queries[i];
+		_QueryBatch_ExecuteQuery(command_ctx, batch_ctx->queries[i],
+				batch_ctx->timeout);
+	}
+	// queries are owned by the batch context
+	command_ctx->query = NULL;
+
+	Graph_ReleaseLock(gc->g);
+
+	// clean up
+	GraphContext_DecreaseRefCount(gc);
+	CommandCtx_Free(command_ctx); // unblocks the client
+	for(uint i = 0; i < batch_ctx->query_count; i++) {
+		rm_free(batch_ctx->queries[i]);
+	}
+	rm_free(batch_ctx->queries);
+	rm_free(batch_ctx);
+}
+
+int Graph_ROQueryBatch(RedisModuleCtx *ctx, RedisModuleString **argv, int argc) {
+	// GRAPH.RO_QUERY_BATCH <graph> <query> [<query> ...] [--compact]
+	if(argc < 3) return RedisModule_WrongArity(ctx);
+
+	// compact result-sets
+	int query_count = argc - 2;
+	const char *last = RedisModule_StringPtrLen(argv[argc - 1], NULL);
+	bool compact = (strcasecmp(last, "--compact") == 0);
+	if(compact) query_count--;
+
+	if(query_count == 0) return RedisModule_WrongArity(ctx);
+
+	GraphContext *gc = GraphContext_Retrieve(ctx, argv[1], true, true);
+	// if GraphContext is null, key access failed and an error been emitted
+	if(!gc) return REDISMODULE_ERR;
+
+	QueryBatchCtx *batch_ctx = rm_malloc(sizeof(QueryBatchCtx));
+	batch_ctx->query_count = query_count;
+	batch_ctx->queries = rm_malloc(sizeof(char *) * query_count);
+	for(int i = 0; i < query_count; i++) {
+		const char *query = RedisModule_StringPtrLen(argv[i + 2], NULL);
+		batch_ctx->queries[i] = rm_strdup(query);
+	}
+	Config_Option_get(Config_TIMEOUT, &batch_ctx->timeout);
+
+	// batches issued within a LUA script or multi exec block must
+	// run on Redis main thread, others can run on a reader thread
+	int flags = RedisModule_GetContextFlags(ctx);
+	ExecutorThread exec_thread = (flags & (REDISMODULE_CTX_FLAGS_MULTI         |
+										   REDISMODULE_CTX_FLAGS_LUA           |
+										   REDISMODULE_CTX_FLAGS_DENY_BLOCKING |
+										   REDISMODULE_CTX_FLAGS_LOADING)) ?
+								 EXEC_THREAD_MAIN : EXEC_THREAD_READER;
+
+	if(exec_thread == EXEC_THREAD_MAIN) {
+		batch_ctx->command_ctx = CommandCtx_New(ctx, NULL, argv[0], NULL, gc,
+				exec_thread, false, compact, batch_ctx->timeout, 0);
+		_QueryBatch_Execute(batch_ctx);
+	} else {
+		RedisModuleBlockedClient *bc = RedisGraph_BlockClient(ctx);
+		batch_ctx->command_ctx = CommandCtx_New(NULL, bc, argv[0], NULL, gc,
+				exec_thread, false, compact, batch_ctx->timeout, 0);
+
+		if(ThreadPools_AddWorkReader(_QueryBatch_Execute, batch_ctx) ==
+				THPOOL_QUEUE_FULL) {
+			// report an error once our workers thread pool internal queue
+			// is full, this error usually happens when the server is
+			// under heavy load and is unable to catch up
+			RedisModule_ReplyWithError(ctx, "Max pending queries exceeded");
+			GraphContext_DecreaseRefCount(gc);
+			CommandCtx_Free(batch_ctx->command_ctx);
+			for(int i = 0; i < query_count; i++) rm_free(batch_ctx->queries[i]);
+			rm_free(batch_ctx->queries);
+			rm_free(batch_ctx);
+		}
+	}
+
+	return REDISMODULE_OK;
+}
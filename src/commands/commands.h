@@ -7,6 +7,7 @@
 #pragma once
 
 #include "../query_ctx.h"
+#include "../util/cron.h"
 #include "execution_ctx.h"
 #include "cmd_bulk_insert.h"
 
@@ -24,7 +25,10 @@ typedef enum {
 	CMD_PROFILE        = 6,
 	CMD_BULK_INSERT    = 7,
 	CMD_SLOWLOG        = 8,
-	CMD_LIST           = 9
+	CMD_LIST           = 9,
+	CMD_CURSOR         = 10,
+	CMD_CACHE          = 11,
+	CMD_RO_QUERY_BATCH = 12
 } GRAPH_Commands;
 
 //------------------------------------------------------------------------------
@@ -39,4 +43,10 @@ int Graph_List(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
 int Graph_Debug(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
 int Graph_Delete(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
 int Graph_Config(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
+int Graph_Cursor(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
+int Graph_Cache(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
+int Graph_ROQueryBatch(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
 int CommandDispatch(RedisModuleCtx *ctx, RedisModuleString **argv, int argc);
+
+// set timeout for query execution
+CronTaskHandle Query_SetTimeOut(uint timeout, ExecutionPlan *plan);
@@ -8,7 +8,13 @@
 #include "RG.h"
 #include "../errors.h"
 #include "../query_ctx.h"
+#include "../ast/ast_normalize.h"
+#include "../configuration/config.h"
+#include "../arithmetic/arithmetic_expression.h"
+#include "../util/simple_timer.h"
 #include "../execution_plan/execution_plan_clone.h"
+#include <ctype.h>
+#include <strings.h>
 
 static ExecutionType _GetExecutionTypeFromAST(AST *ast) {
 	const cypher_astnode_type_t root_type = cypher_astnode_type(ast->root);
@@ -26,6 +32,7 @@ static ExecutionCtx *_ExecutionCtx_New(AST *ast, ExecutionPlan *plan,
 
 	exec_ctx->ast       = ast;
 	exec_ctx->plan      = plan;
+	exec_ctx->query     = NULL;
 	exec_ctx->cached    = false;
 	exec_ctx->exec_type = exec_type;
 
@@ -40,6 +47,7 @@ ExecutionCtx *ExecutionCtx_Clone(ExecutionCtx *orig) {
 	QueryCtx_SetAST(execution_ctx->ast);
 
 	execution_ctx->plan      = ExecutionPlan_Clone(orig->plan);
+	execution_ctx->query     = NULL;
 	execution_ctx->cached    = orig->cached;
 	execution_ctx->exec_type = orig->exec_type;
 
@@ -53,7 +61,6 @@ static AST *_ExecutionCtx_ParseAST(const char *query_string,
 	if(ErrorCtx_EncounteredError() || query_parse_result == NULL) {
 		parse_result_free(query_parse_result);
 		query_parse_result = NULL;
-		parse_result_free(params_parse_result);
 		return NULL;
 	}
 
@@ -64,6 +71,83 @@ static AST *_ExecutionCtx_ParseAST(const char *query_string,
 	return ast;
 }
 
+// estimate the cost of building an execution plan by its number of operations
+// a deterministic measure, such that cache eviction doesn't depend on timing
+static uint64_t _ExecutionCtx_PlanCost(const OpBase *root) {
+	uint64_t cost = 1;
+	for(uint i = 0; i < root->childCount; i++) {
+		cost += _ExecutionCtx_PlanCost(root->children[i]);
+	}
+	return cost;
+}
+
+static void _ParameterFreeCallback(void *param_val) {
+	AR_EXP_Free(param_val);
+}
+
+// normalize query prior to cache lookup, lifting literals into parameters
+// returns true if the query was normalized, in which case 'query_string' is
+// set to the normalized query and 'params_parse_result' is replaced with a
+// parse result declaring both the lifted literals and the original parameters
+static bool _ExecutionCtx_Normalize
+(
+	const char *query,                          // original query
+	const char **query_string,                  // query without parameters
+	cypher_parse_result_t **params_parse_result // parameters parse result
+) {
+	sds lits = NULL;
+	sds normalized = AST_NormalizeQuery(*query_string, &lits);
+	QueryCtx *ctx = QueryCtx_GetQueryCtx();
+
+	if(lits != NULL) {
+		// declare lifted literals ahead of the original parameters
+		// CYPHER __lit0=1 a=2 MATCH ...
+		const char *original = query;
+		while(isspace(*original)) original++;
+		if(strncasecmp(original, "CYPHER", 6) == 0 && isspace(original[6])) {
+			original += 6;
+		} else if(ctx->query_data.params != NULL) {
+			// failed to locate original parameters, avoid normalization
+			sdsfree(normalized);
+			sdsfree(lits);
+			return false;
+		}
+
+		sds params_query = sdscatfmt(sdsnew("CYPHER"), "%S %s", lits, original);
+
+		// detach original parameters
+		rax *params = ctx->query_data.params;
+		ctx->query_data.params = NULL;
+
+		const char *body;
+		cypher_parse_result_t *res = parse_params(params_query, &body);
+		sdsfree(params_query);
+		sdsfree(lits);
+
+		if(res == NULL) {
+			// failed to parse lifted literals, restore original parameters
+			ErrorCtx_Clear();
+			ctx->query_data.params = params;
+			sdsfree(normalized);
+			return false;
+		}
+
+		// discard original parameters
+		if(params != NULL) raxFreeWithCallback(params, _ParameterFreeCallback);
+		parse_result_free(*params_parse_result);
+		*params_parse_result = res;
+
+		// query body is now owned by the new parse result
+		*query_string = body;
+	}
+
+	// normalized query is owned by the query context
+	ctx->query_data.query_normalized = rm_strdup(normalized);
+	sdsfree(normalized);
+
+	return true;
+}
+
 ExecutionCtx *ExecutionCtx_FromQuery(const char *query) {
 	ASSERT(query != NULL);
 
@@ -84,8 +168,22 @@ ExecutionCtx *ExecutionCtx_FromQuery(const char *query) {
 		ErrorCtx_SetError("Error: empty query.");
 		return NULL;
 	}
-	// update query context with the query without params
 	QueryCtx *ctx = QueryCtx_GetQueryCtx();
+
+	// lift literals into parameters, such that queries which differ only
+	// by their literal values will share the same cache entry
+	bool auto_parameterize = false;
+	Config_Option_get(Config_AUTO_PARAMETERIZE, &auto_parameterize);
+
+	const char *original_query_string = query_string;
+	if(auto_parameterize) {
+		if(_ExecutionCtx_Normalize(query, &original_query_string,
+					&params_parse_result)) {
+			query_string = ctx->query_data.query_normalized;
+		}
+	}
+
+	// update query context with the query without params
 	ctx->query_data.query_no_params = query_string;
 
 	GraphContext *gc = QueryCtx_GetGraphCtx();
@@ -94,6 +192,8 @@ ExecutionCtx *ExecutionCtx_FromQuery(const char *query) {
 	// Check the cache to see if we already have a cached context for this query.
 	ret = Cache_GetValue(cache, query_string);
 	if(ret) {
+		// pre-cloned contexts haven't set their AST in thread local storage
+		QueryCtx_SetAST(ret->ast);
 		// Set parameters parse result in the execution ast.
 		AST_SetParamsParseResult(ret->ast, params_parse_result);
 		ret->cached = true;
@@ -101,9 +201,22 @@ ExecutionCtx *ExecutionCtx_FromQuery(const char *query) {
 	}
 
 	// No cached execution plan, try to parse the query.
+	double tic[2];
+	simple_tic(tic);
 	AST *ast = _ExecutionCtx_ParseAST(query_string, params_parse_result);
+
+	if(!ast && query_string != original_query_string) {
+		// normalized query failed to parse, fallback to the original query
+		// such that errors are reported against the query as it was issued
+		ErrorCtx_Clear();
+		query_string = original_query_string;
+		ctx->query_data.query_no_params = query_string;
+		ast = _ExecutionCtx_ParseAST(query_string, params_parse_result);
+	}
+
 	// if query parsing failed, return NULL
 	if(!ast) {
+		parse_result_free(params_parse_result);
 		// if no error has been set, emit one now
 		if(!ErrorCtx_EncounteredError()) {
 			ErrorCtx_SetError("Error: could not parse query");
@@ -114,7 +227,10 @@ ExecutionCtx *ExecutionCtx_FromQuery(const char *query) {
 	ExecutionType exec_type = _GetExecutionTypeFromAST(ast);
 	// In case of valid query, create execution plan, and cache it and the AST.
 	if(exec_type == EXECUTION_TYPE_QUERY) {
+		double parse_time = simple_toc(tic);
+		simple_tic(tic);
 		ExecutionPlan *plan = NewExecutionPlan();
+		double plan_time = simple_toc(tic);
 
 		// TODO: there must be a better way to understand if the execution-plan
 		// was constructed correctly,
@@ -129,18 +245,38 @@ ExecutionCtx *ExecutionCtx_FromQuery(const char *query) {
 		}
 		ExecutionCtx *exec_ctx_to_cache = _ExecutionCtx_New(ast, plan,
 															exec_type);
+		// keep the original query, such that the plan can be rebuilt
+		// when the cache is warmed up
+		exec_ctx_to_cache->query = rm_strdup(query);
+		uint64_t cost = _ExecutionCtx_PlanCost(plan->root);
+		Cache_TrackBuildTime(cache, parse_time * 1000000, plan_time * 1000000);
 		ExecutionCtx *exec_ctx_from_cache = Cache_SetGetValue(cache,
-															  query_string, exec_ctx_to_cache);
+															  query_string, exec_ctx_to_cache, cost);
 		return exec_ctx_from_cache;
 	} else {
 		return _ExecutionCtx_New(ast, NULL, exec_type);
 	}
 }
 
+void ExecutionCtx_ReplenishPool(const char *query, uint depth) {
+	ASSERT(query != NULL);
+
+	if(depth == 0) return;
+
+	GraphContext *gc = QueryCtx_GetGraphCtx();
+	Cache *cache = GraphContext_GetCache(gc);
+
+	// cloning modifies the AST held by the query context, restore it afterwards
+	AST *ast = QueryCtx_GetAST();
+	Cache_Replenish(cache, query, depth);
+	QueryCtx_SetAST(ast);
+}
+
 void ExecutionCtx_Free(ExecutionCtx *ctx) {
 	if(ctx == NULL) return;
 	if(ctx->plan != NULL) ExecutionPlan_Free(ctx->plan);
 	if(ctx->ast != NULL) AST_Free(ctx->ast);
+	if(ctx->query != NULL) rm_free(ctx->query);
 
 	rm_free(ctx);
 }
@@ -24,6 +24,7 @@ typedef enum {
 typedef struct {
 	AST *ast;                   // AST
 	bool cached;                // cache hit/miss
+	char *query;                // query the cached context was built from
 	ExecutionPlan *plan;        // execution plan
 	ExecutionType exec_type;    // execution type: query, index create/delete
 } ExecutionCtx;
@@ -42,6 +43,15 @@ ExecutionCtx *ExecutionCtx_FromQuery(const char *query);
  */
 ExecutionCtx *ExecutionCtx_Clone(ExecutionCtx *ctx);
 
+/**
+ * @brief  Pre-clone the cached execution ctx of a query into its cache entry pool,
+ *         such that subsequent executions of the query are served without cloning.
+ * @note   Should be called once the client had been replied to.
+ * @param  *query: Cache key of the executed query, as set in the query context.
+ * @param  depth: Maximum number of pre-cloned contexts kept per cached query.
+ */
+void ExecutionCtx_ReplenishPool(const char *query, uint depth);
+
 /**
  * @brief  Free an ExecutionCTX struct and its inner fields.
  * @param  *ctx: ExecutionCTX struct
@@ -0,0 +1,189 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "query_cursor.h"
+#include "../util/arr.h"
+#include "../util/cron.h"
+#include "../util/rmalloc.h"
+#include <pthread.h>
+
+// interval in miliseconds between consecutive idle cursors sweeps
+#define CURSOR_SWEEP_INTERVAL 1000
+
+static rax *cursors = NULL;     // registered cursors, keyed by cursor ID
+static uint64_t next_id = 1;    // next cursor ID, 0 is reserved
+static pthread_mutex_t lock = PTHREAD_MUTEX_INITIALIZER;
+
+// free cursor and its internals
+// cursor is expected to be removed from the registry
+static void _QueryCursor_Free
+(
+	QueryCursor *cursor
+) {
+	ASSERT(cursor != NULL);
+
+	// the execution plan and result-set may access
+	// the query context via thread local storage
+	QueryCtx_SetTLS(cursor->query_ctx);
+
+	ExecutionCtx_Free(cursor->exec_ctx);
+	ResultSet_Free(cursor->result_set);
+	QueryCtx_Free(); // free the QueryCtx and remove it from TLS
+	GraphContext_DecreaseRefCount(cursor->gc);
+
+	rm_free(cursor->query);
+	rm_free(cursor);
+}
+
+// discard cursors which have been idle for too long
+static void _QueryCursors_Sweep
+(
+	void *pdata
+) {
+	time_t now = time(NULL);
+	QueryCursor **expired = array_new(QueryCursor *, 0);
+
+	pthread_mutex_lock(&lock);
+	{
+		raxIterator it;
+		raxStart(&it, cursors);
+		raxSeek(&it, "^", NULL, 0);
+		while(raxNext(&it)) {
+			QueryCursor *cursor = it.data;
+			if(cursor->busy) continue;
+			if(difftime(now, cursor->last_access) * 1000 < CURSOR_IDLE_TIMEOUT) {
+				continue;
+			}
+			array_append(expired, cursor);
+		}
+		raxStop(&it);
+
+		uint n = array_len(expired);
+		for(uint i = 0; i < n; i++) {
+			QueryCursor *cursor = expired[i];
+			raxRemove(cursors, (unsigned char *)&cursor->id, sizeof(cursor->id),
+					NULL);
+		}
+	}
+	pthread_mutex_unlock(&lock);
+
+	uint n = array_len(expired);
+	for(uint i = 0; i < n; i++) _QueryCursor_Free(expired[i]);
+	array_free(expired);
+
+	// reschedule sweep
+	Cron_AddTask(CURSOR_SWEEP_INTERVAL, _QueryCursors_Sweep, NULL);
+}
+
+void QueryCursors_Init(void) {
+	ASSERT(cursors == NULL);
+
+	cursors = raxNew();
+	Cron_AddTask(CURSOR_SWEEP_INTERVAL, _QueryCursors_Sweep, NULL);
+}
+
+QueryCursor *QueryCursor_Register
+(
+	const char *query,
+	GraphContext *gc,
+	QueryCtx *query_ctx,
+	ExecutionCtx *exec_ctx,
+	ResultSet *result_set,
+	uint64_t graph_epoch,
+	uint64_t count,
+	long long timeout
+) {
+	ASSERT(gc         != NULL);
+	ASSERT(query      != NULL);
+	ASSERT(exec_ctx   != NULL);
+	ASSERT(query_ctx  != NULL);
+	ASSERT(result_set != NULL);
+	ASSERT(count      > 0);
+
+	QueryCursor *cursor = rm_malloc(sizeof(QueryCursor));
+
+	cursor->gc           =  gc;
+	cursor->busy         =  true;
+	cursor->count        =  count;
+	cursor->timeout      =  timeout;
+	cursor->query        =  rm_strdup(query);
+	cursor->exec_ctx     =  exec_ctx;
+	cursor->query_ctx    =  query_ctx;
+	cursor->result_set   =  result_set;
+	cursor->graph_epoch  =  graph_epoch;
+	cursor->last_access  =  time(NULL);
+
+	// the query context refers to the query string
+	query_ctx->query_data.query = cursor->query;
+
+	pthread_mutex_lock(&lock);
+	{
+		cursor->id = next_id++;
+		raxInsert(cursors, (unsigned char *)&cursor->id, sizeof(cursor->id),
+				cursor, NULL);
+	}
+	pthread_mutex_unlock(&lock);
+
+	return cursor;
+}
+
+QueryCursor *QueryCursor_Acquire
+(
+	GraphContext *gc,
+	uint64_t id
+) {
+	ASSERT(gc != NULL);
+
+	QueryCursor *cursor = NULL;
+
+	pthread_mutex_lock(&lock);
+	{
+		void *v = raxFind(cursors, (unsigned char *)&id, sizeof(id));
+		if(v != raxNotFound) {
+			cursor = v;
+			if(cursor->busy || cursor->gc != gc) {
+				cursor = NULL;
+			} else {
+				cursor->busy = true;
+			}
+		}
+	}
+	pthread_mutex_unlock(&lock);
+
+	return cursor;
+}
+
+void QueryCursor_Release
+(
+	QueryCursor *cursor
+) {
+	ASSERT(cursor != NULL);
+	ASSERT(cursor->busy == true);
+
+	pthread_mutex_lock(&lock);
+	{
+		cursor->busy = false;
+		cursor->last_access = time(NULL);
+	}
+	pthread_mutex_unlock(&lock);
+}
+
+void QueryCursor_Free
+(
+	QueryCursor *cursor
+) {
+	ASSERT(cursor != NULL);
+
+	pthread_mutex_lock(&lock);
+	{
+		raxRemove(cursors, (unsigned char *)&cursor->id, sizeof(cursor->id),
+				NULL);
+	}
+	pthread_mutex_unlock(&lock);
+
+	_QueryCursor_Free(cursor);
+}
@@ -0,0 +1,72 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#pragma once
+
+#include "../query_ctx.h"
+#include "execution_ctx.h"
+#include "../resultset/resultset.h"
+#include "../graph/graphcontext.h"
+#include <time.h>
+
+// number of miliseconds a cursor can remain idle before it is discarded
+#define CURSOR_IDLE_TIMEOUT 300000
+
+// QueryCursor holds the state of a partially consumed read-only query
+// allowing a client to fetch the query's result-set in chunks
+typedef struct {
+	uint64_t id;             // cursor ID
+	char *query;             // query string
+	GraphContext *gc;        // graph context, cursor holds a reference
+	QueryCtx *query_ctx;     // query context
+	ExecutionCtx *exec_ctx;  // execution context, holds the execution plan
+	ResultSet *result_set;   // result-set
+	uint64_t graph_epoch;    // graph write epoch at the time of creation
+	uint64_t count;          // default number of records to emit per read
+	long long timeout;       // per read timeout, 0 if no timeout was specified
+	time_t last_access;      // last time cursor was accessed
+	bool busy;               // cursor is being read from
+} QueryCursor;
+
+// initialize cursors registry
+// should be called once on module load, after CRON had started
+void QueryCursors_Init(void);
+
+// register a new cursor, the cursor takes ownership over
+// the query context, execution context, result-set and graph reference
+// the returned cursor is acquired by the caller
+QueryCursor *QueryCursor_Register
+(
+	const char *query,       // query string
+	GraphContext *gc,        // graph context
+	QueryCtx *query_ctx,     // query context
+	ExecutionCtx *exec_ctx,  // execution context
+	ResultSet *result_set,   // result-set
+	uint64_t graph_epoch,    // graph write epoch
+	uint64_t count,          // default number of records to emit per read
+	long long timeout        // per read timeout
+);
+
+// retrieve cursor by ID and mark it as busy
+// returns NULL if cursor doesn't exists, is in use
+// or is associated with a different graph
+QueryCursor *QueryCursor_Acquire
+(
+	GraphContext *gc,  // graph context
+	uint64_t id        // cursor ID
+);
+
+// release a previously acquired cursor
+void QueryCursor_Release
+(
+	QueryCursor *cursor  // cursor to release
+);
+
+// remove cursor from registry and free it
+void QueryCursor_Free
+(
+	QueryCursor *cursor  // cursor to free
+);
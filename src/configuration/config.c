@@ -49,6 +49,21 @@
 // size of node creation buffer
 #define NODE_CREATION_BUFFER "NODE_CREATION_BUFFER"
 
+// whether query literals should be lifted into parameters
+#define AUTO_PARAMETERIZE "AUTO_PARAMETERIZE"
+
+// number of pre-cloned execution plans kept per cached query
+#define PLAN_POOL_SIZE "PLAN_POOL_SIZE"
+
+// number of cached queries persisted for warmup
+#define CACHE_WARMUP_SIZE "CACHE_WARMUP_SIZE"
+
+// max number of write queries committed together
+#define GROUP_COMMIT_SIZE "GROUP_COMMIT_SIZE"
+
+// max number of threads scanning for a single query
+#define PARALLEL_SCAN_THREADS "PARALLEL_SCAN_THREADS"
+
 //------------------------------------------------------------------------------
 // Configuration defaults
 //------------------------------------------------------------------------------
@@ -70,6 +85,11 @@ typedef struct {
 	int64_t query_mem_capacity;        // Max mem(bytes) that query/thread can utilize at any given time
 	uint64_t node_creation_buffer;     // Number of extra node creations to buffer as margin in matrices
 	int64_t delta_max_pending_changes; // number of pending changed befor RG_Matrix flushed
+	bool auto_parameterize;            // If true, query literals are lifted into parameters.
+	uint64_t plan_pool_size;           // Number of pre-cloned execution plans per cached query.
+	uint64_t cache_warmup_size;        // Number of cached queries persisted for warmup.
+	uint64_t group_commit_size;        // Max number of write queries committed together.
+	uint64_t parallel_scan_threads;    // Max number of threads scanning for a single query.
 	Config_on_change cb;               // callback function which being called when config param changed
 } RG_Config;
 
@@ -266,6 +286,66 @@ uint64_t Config_node_creation_buffer_get(void) {
 	return config.node_creation_buffer;
 }
 
+//------------------------------------------------------------------------------
+// auto parameterize
+//------------------------------------------------------------------------------
+
+void Config_auto_parameterize_set(bool auto_parameterize) {
+	config.auto_parameterize = auto_parameterize;
+}
+
+bool Config_auto_parameterize_get(void) {
+	return config.auto_parameterize;
+}
+
+//------------------------------------------------------------------------------
+// plan pool size
+//------------------------------------------------------------------------------
+
+void Config_plan_pool_size_set(uint64_t plan_pool_size) {
+	config.plan_pool_size = plan_pool_size;
+}
+
+uint64_t Config_plan_pool_size_get(void) {
+	return config.plan_pool_size;
+}
+
+//------------------------------------------------------------------------------
+// cache warmup size
+//------------------------------------------------------------------------------
+
+void Config_cache_warmup_size_set(uint64_t cache_warmup_size) {
+	config.cache_warmup_size = cache_warmup_size;
+}
+
+uint64_t Config_cache_warmup_size_get(void) {
+	return config.cache_warmup_size;
+}
+
+//------------------------------------------------------------------------------
+// group commit size
+//------------------------------------------------------------------------------
+
+void Config_group_commit_size_set(uint64_t group_commit_size) {
+	config.group_commit_size = group_commit_size;
+}
+
+uint64_t Config_group_commit_size_get(void) {
+	return config.group_commit_size;
+}
+
+//------------------------------------------------------------------------------
+// parallel scan threads
+//------------------------------------------------------------------------------
+
+void Config_parallel_scan_threads_set(uint64_t parallel_scan_threads) {
+	config.parallel_scan_threads = parallel_scan_threads;
+}
+
+uint64_t Config_parallel_scan_threads_get(void) {
+	return config.parallel_scan_threads;
+}
+
 bool Config_Contains_field(const char *field_str, Config_Option_Field *field) {
 	ASSERT(field_str != NULL);
 
@@ -291,6 +371,16 @@ bool Config_Contains_field(const char *field_str, Config_Option_Field *field) {
 		f = Config_DELTA_MAX_PENDING_CHANGES;
 	} else if(!(strcasecmp(field_str, NODE_CREATION_BUFFER))) {
 		f = Config_NODE_CREATION_BUFFER;
+	} else if(!(strcasecmp(field_str, AUTO_PARAMETERIZE))) {
+		f = Config_AUTO_PARAMETERIZE;
+	} else if(!(strcasecmp(field_str, PLAN_POOL_SIZE))) {
+		f = Config_PLAN_POOL_SIZE;
+	} else if(!(strcasecmp(field_str, CACHE_WARMUP_SIZE))) {
+		f = Config_CACHE_WARMUP_SIZE;
+	} else if(!(strcasecmp(field_str, GROUP_COMMIT_SIZE))) {
+		f = Config_GROUP_COMMIT_SIZE;
+	} else if(!(strcasecmp(field_str, PARALLEL_SCAN_THREADS))) {
+		f = Config_PARALLEL_SCAN_THREADS;
 	} else {
 		return false;
 	}
@@ -346,6 +436,26 @@ const char *Config_Field_name(Config_Option_Field field) {
 			name = NODE_CREATION_BUFFER;
 			break;
 
+		case Config_AUTO_PARAMETERIZE:
+			name = AUTO_PARAMETERIZE;
+			break;
+
+		case Config_PLAN_POOL_SIZE:
+			name = PLAN_POOL_SIZE;
+			break;
+
+		case Config_CACHE_WARMUP_SIZE:
+			name = CACHE_WARMUP_SIZE;
+			break;
+
+		case Config_GROUP_COMMIT_SIZE:
+			name = GROUP_COMMIT_SIZE;
+			break;
+
+		case Config_PARALLEL_SCAN_THREADS:
+			name = PARALLEL_SCAN_THREADS;
+			break;
+
 		//----------------------------------------------------------------------
 		// invalid option
 		//----------------------------------------------------------------------
@@ -398,6 +508,21 @@ void _Config_SetToDefaults(void) {
 
 	// the amount of empty space to reserve for node creations in matrices
 	config.node_creation_buffer = NODE_CREATION_BUFFER_DEFAULT;
+
+	// query literals are not lifted into parameters by default
+	config.auto_parameterize = false;
+
+	// execution plans are not pre-cloned by default
+	config.plan_pool_size = PLAN_POOL_SIZE_DEFAULT;
+
+	// cached queries are not persisted by default
+	config.cache_warmup_size = CACHE_WARMUP_SIZE_DEFAULT;
+
+	// write queries are committed individually by default
+	config.group_commit_size = GROUP_COMMIT_SIZE_DEFAULT;
+
+	// by default scans are performed by a single thread
+	config.parallel_scan_threads = PARALLEL_SCAN_THREADS_DEFAULT;
 }
 
 int Config_Init(RedisModuleCtx *ctx, RedisModuleString **argv, int argc) {
@@ -605,6 +730,76 @@ bool Config_Option_get(Config_Option_Field field, ...) {
 		}
 		break;
 
+		//----------------------------------------------------------------------
+		// lift query literals into parameters
+		//----------------------------------------------------------------------
+
+		case Config_AUTO_PARAMETERIZE: {
+			va_start(ap, field);
+			bool *auto_parameterize = va_arg(ap, bool *);
+			va_end(ap);
+
+			ASSERT(auto_parameterize != NULL);
+			(*auto_parameterize) = Config_auto_parameterize_get();
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// number of pre-cloned execution plans per cached query
+		//----------------------------------------------------------------------
+
+		case Config_PLAN_POOL_SIZE: {
+			va_start(ap, field);
+			uint64_t *plan_pool_size = va_arg(ap, uint64_t *);
+			va_end(ap);
+
+			ASSERT(plan_pool_size != NULL);
+			(*plan_pool_size) = Config_plan_pool_size_get();
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// number of cached queries persisted for warmup
+		//----------------------------------------------------------------------
+
+		case Config_CACHE_WARMUP_SIZE: {
+			va_start(ap, field);
+			uint64_t *cache_warmup_size = va_arg(ap, uint64_t *);
+			va_end(ap);
+
+			ASSERT(cache_warmup_size != NULL);
+			(*cache_warmup_size) = Config_cache_warmup_size_get();
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// max number of write queries committed together
+		//----------------------------------------------------------------------
+
+		case Config_GROUP_COMMIT_SIZE: {
+			va_start(ap, field);
+			uint64_t *group_commit_size = va_arg(ap, uint64_t *);
+			va_end(ap);
+
+			ASSERT(group_commit_size != NULL);
+			(*group_commit_size) = Config_group_commit_size_get();
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// max number of threads scanning for a single query
+		//----------------------------------------------------------------------
+
+		case Config_PARALLEL_SCAN_THREADS: {
+			va_start(ap, field);
+			uint64_t *parallel_scan_threads = va_arg(ap, uint64_t *);
+			va_end(ap);
+
+			ASSERT(parallel_scan_threads != NULL);
+			(*parallel_scan_threads) = Config_parallel_scan_threads_get();
+		}
+		break;
+
 		//----------------------------------------------------------------------
 		// invalid option
 		//----------------------------------------------------------------------
@@ -768,6 +963,66 @@ bool Config_Option_set(Config_Option_Field field, const char *val) {
 		}
 		break;
 
+		//----------------------------------------------------------------------
+		// lift query literals into parameters
+		//----------------------------------------------------------------------
+
+		case Config_AUTO_PARAMETERIZE: {
+			bool auto_parameterize;
+			if(!_Config_ParseYesNo(val, &auto_parameterize)) return false;
+
+			Config_auto_parameterize_set(auto_parameterize);
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// number of pre-cloned execution plans per cached query
+		//----------------------------------------------------------------------
+
+		case Config_PLAN_POOL_SIZE: {
+			long long plan_pool_size;
+			if(!_Config_ParseNonNegativeInteger(val, &plan_pool_size)) return false;
+
+			Config_plan_pool_size_set(plan_pool_size);
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// number of cached queries persisted for warmup
+		//----------------------------------------------------------------------
+
+		case Config_CACHE_WARMUP_SIZE: {
+			long long cache_warmup_size;
+			if(!_Config_ParseNonNegativeInteger(val, &cache_warmup_size)) return false;
+
+			Config_cache_warmup_size_set(cache_warmup_size);
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// max number of write queries committed together
+		//----------------------------------------------------------------------
+
+		case Config_GROUP_COMMIT_SIZE: {
+			long long group_commit_size;
+			if(!_Config_ParseNonNegativeInteger(val, &group_commit_size)) return false;
+
+			Config_group_commit_size_set(group_commit_size);
+		}
+		break;
+
+		//----------------------------------------------------------------------
+		// max number of threads scanning for a single query
+		//----------------------------------------------------------------------
+
+		case Config_PARALLEL_SCAN_THREADS: {
+			long long parallel_scan_threads;
+			if(!_Config_ParseNonNegativeInteger(val, &parallel_scan_threads)) return false;
+
+			Config_parallel_scan_threads_set(parallel_scan_threads);
+		}
+		break;
+
 		//----------------------------------------------------------------------
 		// invalid option
 		//----------------------------------------------------------------------
@@ -15,6 +15,10 @@
 #define VKEY_ENTITY_COUNT_UNLIMITED        UINT64_MAX
 #define DELTA_MAX_PENDING_CHANGES_DEFAULT  10000
 #define NODE_CREATION_BUFFER_DEFAULT       16384
+#define PLAN_POOL_SIZE_DEFAULT             0
+#define CACHE_WARMUP_SIZE_DEFAULT          0
+#define GROUP_COMMIT_SIZE_DEFAULT          1
+#define PARALLEL_SCAN_THREADS_DEFAULT      1
 
 typedef enum {
 	Config_TIMEOUT                   = 0,     // timeout value for queries
@@ -28,7 +32,12 @@ typedef enum {
 	Config_QUERY_MEM_CAPACITY        = 8,     // max mem(bytes) that query/thread can utilize at any given time
 	Config_DELTA_MAX_PENDING_CHANGES = 9,     // number of pending changes before RG_Matrix flushed
 	Config_NODE_CREATION_BUFFER      = 10,    // size of buffer to maintain as margin in matrices
-	Config_END_MARKER                = 11
+	Config_AUTO_PARAMETERIZE         = 11,    // lift query literals into parameters
+	Config_PLAN_POOL_SIZE            = 12,    // number of pre-cloned plans per cached query
+	Config_CACHE_WARMUP_SIZE         = 13,    // number of cached queries persisted for warmup
+	Config_GROUP_COMMIT_SIZE         = 14,    // max number of write queries committed together
+	Config_PARALLEL_SCAN_THREADS     = 15,    // max number of threads scanning for a single query
+	Config_END_MARKER                = 16
 } Config_Option_Field;
 
 // callback function, invoked once configuration changes as a result of
@@ -36,14 +45,19 @@ typedef enum {
 typedef void (*Config_on_change)(Config_Option_Field type);
 
 // Run-time configurable fields
-#define RUNTIME_CONFIG_COUNT 6
+#define RUNTIME_CONFIG_COUNT 11
 static const Config_Option_Field RUNTIME_CONFIGS[] = {
 	Config_RESULTSET_MAX_SIZE,
 	Config_TIMEOUT,
 	Config_MAX_QUEUED_QUERIES,
 	Config_QUERY_MEM_CAPACITY,
 	Config_DELTA_MAX_PENDING_CHANGES,
-	Config_VKEY_MAX_ENTITY_COUNT
+	Config_VKEY_MAX_ENTITY_COUNT,
+	Config_AUTO_PARAMETERIZE,
+	Config_PLAN_POOL_SIZE,
+	Config_CACHE_WARMUP_SIZE,
+	Config_GROUP_COMMIT_SIZE,
+	Config_PARALLEL_SCAN_THREADS
 };
 
 // Set module-level configurations to defaults or to user arguments where provided.
@@ -351,9 +351,25 @@ ExecutionPlan *NewExecutionPlan(void) {
 	return plan;
 }
 
+// evaluate LIMIT and SKIP expressions against the current query parameters
+// the plan might have been cloned ahead of time, while serving a different
+// query, in which case these were evaluated using outdated parameters
+static void _ExecutionPlan_EvaluateBounds(OpBase *root) {
+	if(root->type == OPType_LIMIT) {
+		LimitOp_EvaluateLimit((OpLimit *)root);
+	} else if(root->type == OPType_SKIP) {
+		SkipOp_EvaluateSkip((OpSkip *)root);
+	}
+
+	for(int i = 0; i < root->childCount; i++) {
+		_ExecutionPlan_EvaluateBounds(root->children[i]);
+	}
+}
+
 void ExecutionPlan_PreparePlan(ExecutionPlan *plan) {
 	// Plan should be prepared only once.
 	ASSERT(!plan->prepared);
+	_ExecutionPlan_EvaluateBounds(plan->root);
 	optimizePlan(plan);
 	QueryCtx_SetLastWriter(_ExecutionPlan_FindLastWriter(plan->root));
 	plan->prepared = true;
@@ -400,7 +416,8 @@ static void _ExecutionPlanInit(OpBase *root) {
 	_ExecutionPlan_InitRecordPool((ExecutionPlan *)root->plan);
 
 	// Initialize the operation if necessary.
-	if(root->init) root->init(root);
+	if(root->init && !root->op_initialized) root->init(root);
+	root->op_initialized = true;
 
 	// Continue initializing downstream operations.
 	for(int i = 0; i < root->childCount; i++) {
@@ -424,13 +441,38 @@ ResultSet *ExecutionPlan_Execute(ExecutionPlan *plan) {
 
 	ExecutionPlan_Init(plan);
 
-	Record r = NULL;
-	// Execute the root operation and free the processed Record until the data stream is depleted.
-	while((r = OpBase_Consume(plan->root)) != NULL) ExecutionPlan_ReturnRecord(r->owner, r);
+	uint n;
+	Record batch[OP_BATCH_SIZE];
+	// Execute the root operation and free the processed Records until the data stream is depleted.
+	while((n = OpBase_ConsumeBatch(plan->root, batch, OP_BATCH_SIZE)) > 0) {
+		for(uint i = 0; i < n; i++) ExecutionPlan_ReturnRecord(batch[i]->owner, batch[i]);
+	}
 
 	return QueryCtx_GetResultSet();
 }
 
+bool ExecutionPlan_ExecuteBatch(ExecutionPlan *plan, uint64_t n) {
+	ASSERT(plan->prepared)
+	// set an exception-handling breakpoint to capture run-time errors
+	int encountered_error = SET_EXCEPTION_HANDLER();
+
+	// encountered a run-time error - consider plan as depleted
+	if(encountered_error) return true;
+
+	// operations are initialized only once, on the first batch
+	ExecutionPlan_Init(plan);
+
+	Record r = NULL;
+	// pull at most n records from the root operation
+	for(uint64_t i = 0; i < n; i++) {
+		r = OpBase_Consume(plan->root);
+		if(r == NULL) return true;
+		ExecutionPlan_ReturnRecord(r->owner, r);
+	}
+
+	return false;
+}
+
 //------------------------------------------------------------------------------
 // Execution plan draining
 //------------------------------------------------------------------------------
@@ -450,6 +492,7 @@ bool ExecutionPlan_Drained(ExecutionPlan *plan) {
 
 static void _ExecutionPlan_Drain(OpBase *root) {
 	root->consume = deplete_consume;
+	root->consume_batch = NULL;
 	for(int i = 0; i < root->childCount; i++) {
 		_ExecutionPlan_Drain(root->children[i]);
 	}
@@ -58,6 +58,11 @@ void ExecutionPlan_Init(ExecutionPlan *plan);
 /* Executes plan */
 ResultSet *ExecutionPlan_Execute(ExecutionPlan *plan);
 
+/* Executes plan, pulling at most n records from its root operation.
+ * Can be called repeatedly to resume a paused plan.
+ * Returns true once the plan is depleted or an error was encountered. */
+bool ExecutionPlan_ExecuteBatch(ExecutionPlan *plan, uint64_t n);
+
 /* Checks if execution plan been drained */
 bool ExecutionPlan_Drained(ExecutionPlan *plan);
 
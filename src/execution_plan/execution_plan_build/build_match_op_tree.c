@@ -55,7 +55,10 @@ static void _ExecutionPlan_ProcessQueryGraph
 		uint expCount = array_len(exps);
 
 		// Reorder exps, to the most performant arrangement of evaluation.
-		orderExpressions(qg, exps, &expCount, ft, bound_vars);
+		// rows[0] is the estimated number of scanned nodes
+		// rows[j + 1] the estimated number of records produced by exps[j]
+		double rows[expCount + 1];
+		orderExpressions(qg, exps, &expCount, ft, bound_vars, rows);
 
 		// Create the SCAN operation that will be the tail of the traversal chain.
 		QGNode *src = QueryGraph_GetNodeByAlias(qg, AlgebraicExpression_Src(exps[0]));
@@ -77,11 +80,13 @@ static void _ExecutionPlan_ProcessQueryGraph
 			// resolve source node by performing label scan
 			NodeScanCtx ctx = NODE_CTX_NEW(alias, label, label_id);
 			root = tail = NewNodeByLabelScanOp(plan, ctx);
+			tail->estimated_rows = rows[0];
 
 			// first operand has been converted into a label scan op
 			AlgebraicExpression_Free(ae_src);
 		} else {
 			root = tail = NewAllNodeScanOp(plan, src->alias);
+			tail->estimated_rows = rows[0];
 			// free expression source
 			// in-case there are additional patterns to traverse
 			if(array_len(cc->edges) == 0) {
@@ -126,6 +131,7 @@ static void _ExecutionPlan_ProcessQueryGraph
 			} else {
 				root = NewCondTraverseOp(plan, gc->g, exp);
 			}
+			root->estimated_rows = rows[j + 1];
 			// Insert the new traversal op at the root of the chain.
 			ExecutionPlan_AddOp(root, tail);
 			tail = root;
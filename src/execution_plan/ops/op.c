@@ -30,10 +30,12 @@ void OpBase_Init(OpBase *op, OPType type, const char *name, fpInit init, fpConsu
 	op->op_initialized = false;
 	op->modifies = NULL;
 	op->writer = writer;
+	op->estimated_rows = -1;
 
 	// Function pointers.
 	op->init = init;
 	op->consume = consume;
+	op->consume_batch = NULL;
 	op->reset = reset;
 	op->toString = toString;
 	op->clone = clone;
@@ -45,6 +47,27 @@ inline Record OpBase_Consume(OpBase *op) {
 	return op->consume(op);
 }
 
+uint OpBase_ConsumeBatch
+(
+	OpBase *op,
+	Record *batch,
+	uint cap
+) {
+	ASSERT(op    != NULL);
+	ASSERT(cap   > 0);
+	ASSERT(batch != NULL);
+
+	// profiled operations are consumed one record at a time
+	// such that each record is accounted for
+	if(op->consume_batch != NULL && op->stats == NULL) {
+		return op->consume_batch(op, batch, cap);
+	}
+
+	uint n = 0;
+	while(n < cap && (batch[n] = OpBase_Consume(op)) != NULL) n++;
+	return n;
+}
+
 int OpBase_Modifies(OpBase *op, const char *alias) {
 	if(!op->modifies) op->modifies = array_new(const char *, 1);
 	array_append(op->modifies, alias);
@@ -126,6 +149,10 @@ void OpBase_ToString(const OpBase *op, sds *buff) {
 	else *buff = sdscatprintf(*buff, "%s", op->name);
 
 	if(op->stats) _OpBase_StatsToString(op, buff);
+	else if(op->estimated_rows >= 0) {
+		*buff = sdscatprintf(*buff, " | Estimated rows: %.0f",
+				op->estimated_rows);
+	}
 }
 
 Record OpBase_Profile(OpBase *op) {
@@ -151,6 +178,11 @@ void OpBase_UpdateConsume(OpBase *op, fpConsume consume) {
 	else op->consume = consume;
 }
 
+void OpBase_UpdateConsumeBatch(OpBase *op, fpConsumeBatch consume_batch) {
+	ASSERT(op != NULL);
+	op->consume_batch = consume_batch;
+}
+
 inline Record OpBase_CreateRecord(const OpBase *op) {
 	return ExecutionPlan_BorrowRecord((struct ExecutionPlan *)op->plan);
 }
@@ -171,8 +203,11 @@ inline void OpBase_DeleteRecord(Record r) {
 }
 
 OpBase *OpBase_Clone(const struct ExecutionPlan *plan, const OpBase *op) {
-	if(op->clone) return op->clone(plan, op);
-	return NULL;
+	if(!op->clone) return NULL;
+
+	OpBase *clone = op->clone(plan, op);
+	clone->estimated_rows = op->estimated_rows;
+	return clone;
 }
 
 void OpBase_Free(OpBase *op) {
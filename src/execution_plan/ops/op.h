@@ -16,6 +16,9 @@
 
 #define OP_REQUIRE_NEW_DATA(opRes) (opRes & (OP_DEPLETED | OP_REFRESH)) > 0
 
+// max number of records exchanged between operations in a single batch
+#define OP_BATCH_SIZE 128
+
 typedef enum {
 	OPType_ALL_NODE_SCAN,
 	OPType_NODE_BY_LABEL_SCAN,
@@ -107,6 +110,7 @@ struct ExecutionPlan;
 typedef void (*fpFree)(struct OpBase *);
 typedef OpResult(*fpInit)(struct OpBase *);
 typedef Record(*fpConsume)(struct OpBase *);
+typedef uint(*fpConsumeBatch)(struct OpBase *, Record *, uint);
 typedef OpResult(*fpReset)(struct OpBase *);
 typedef void (*fpToString)(const struct OpBase *, sds *);
 typedef struct OpBase *(*fpClone)(const struct ExecutionPlan *, const struct OpBase *);
@@ -124,6 +128,7 @@ struct OpBase {
 	fpReset reset;              // Reset operation state.
 	fpClone clone;              // Operation clone.
 	fpConsume consume;          // Produce next record.
+	fpConsumeBatch consume_batch; // [optional] Produce next batch of records.
 	fpConsume profile;          // Profiled version of consume.
 	fpToString toString;        // Operation string representation.
 	const char *name;           // Operation name.
@@ -132,6 +137,7 @@ struct OpBase {
 	struct OpBase **children;   // Child operations.
 	const char **modifies;      // List of entities this op modifies.
 	OpStats *stats;             // Profiling statistics.
+	double estimated_rows;      // Estimated number of records produced, negative if unknown.
 	struct OpBase *parent;      // Parent operations.
 	const struct ExecutionPlan *plan; // ExecutionPlan this operation is part of.
 	bool writer;             // Indicates this is a writer operation.
@@ -144,6 +150,17 @@ void OpBase_Init(OpBase *op, OPType type, const char *name, fpInit init, fpConsu
 				 const struct ExecutionPlan *plan);
 void OpBase_Free(OpBase *op);       // Free op.
 Record OpBase_Consume(OpBase *op);  // Consume op.
+
+// consume up to 'cap' records from op into 'batch'
+// returns the number of records produced, 0 once op is depleted
+// operations which don't produce batches are consumed one record at a time
+uint OpBase_ConsumeBatch
+(
+	OpBase *op,    // operation to consume from
+	Record *batch, // [output] produced records
+	uint cap       // max number of records to produce
+);
+
 Record OpBase_Profile(OpBase *op);  // Profile op.
 
 void OpBase_ToString(const OpBase *op, sds *buff);
@@ -176,6 +193,9 @@ bool OpBase_IsWriter(OpBase *op);
 // Update operation consume function.
 void OpBase_UpdateConsume(OpBase *op, fpConsume consume);
 
+// Update operation batch consume function, NULL disables batching.
+void OpBase_UpdateConsumeBatch(OpBase *op, fpConsumeBatch consume_batch);
+
 // Creates a new record that will be populated during execution.
 Record OpBase_CreateRecord(const OpBase *op);
 
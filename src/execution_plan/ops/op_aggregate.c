@@ -7,10 +7,17 @@
 #include "op_aggregate.h"
 #include "RG.h"
 #include "op_sort.h"
+#include "op_filter.h"
+#include "op_all_node_scan.h"
+#include "op_node_by_label_scan.h"
+#include "shared/morsel_functions.h"
+#include "../../errors.h"
 #include "../../util/arr.h"
 #include "../../query_ctx.h"
 #include "../../util/rmalloc.h"
 #include "../../grouping/group.h"
+#include "../../util/thpool/pools.h"
+#include "../../configuration/config.h"
 
 /* Forward declarations. */
 static Record AggregateConsume(OpBase *opBase);
@@ -99,11 +106,24 @@ static XXH64_hash_t _HashCode(const SIValue *v, size_t n) {
 	return XXH64_digest(&state);
 }
 
+// accounts for a newly created group
+// switch to spilling once the memory budget is exhausted
+static void _TrackGroup(OpAggregate *op) {
+	if(!SpillBudget_Add(&op->budget)) return;
+	if(op->spill != NULL || op->key_count == 0) return;
+	// all hash bits were consumed, keep aggregating in memory
+	if(op->spill_depth >= SPILL_MAX_DEPTH) return;
+
+	op->spill = SpillPartitions_New(op->spill_depth);
+}
+
 // retrieves group under which given record belongs to,
 // creates group if one doesn't exists
+// returns NULL if the group isn't in memory and the record was spilled
 static Group *_GetGroup(OpAggregate *op, Record r) {
 	XXH64_hash_t hash;
 	bool free_key_exps = true;
+	Group *group = NULL;
 
 	// construct group key
 	_ComputeGroupKey(op, r);
@@ -113,8 +133,10 @@ static Group *_GetGroup(OpAggregate *op, Record r) {
 		op->group = _CreateGroup(op, r);
 		hash = _HashCode(op->group_keys, op->key_count);
 		CacheGroupAdd(op->groups, hash, op->group);
+		_TrackGroup(op);
 		// key expressions are owned by the new group and don't need to be freed
 		free_key_exps = false;
+		group = op->group;
 		goto cleanup;
 	}
 
@@ -126,19 +148,32 @@ static Group *_GetGroup(OpAggregate *op, Record r) {
 	}
 
 	// see if we can reuse last accessed group
-	if(reuseLastAccessedGroup) goto cleanup;
+	if(reuseLastAccessedGroup) {
+		group = op->group;
+		goto cleanup;
+	}
 
 	// can't reuse last accessed group, lookup group by identifier key
 	hash = _HashCode(op->group_keys, op->key_count);
-	op->group = CacheGroupGet(op->groups, hash);
-	if(!op->group) {
+	group = CacheGroupGet(op->groups, hash);
+	if(!group) {
+		if(op->spill != NULL) {
+			// memory budget exhausted, spill record
+			// it will be aggregated once in-memory groups are handed out
+			SpillPartitions_Add(op->spill, hash, r);
+			goto cleanup;
+		}
+
 		// Group does not exists, create it.
-		op->group = _CreateGroup(op, r);
-		CacheGroupAdd(op->groups, hash, op->group);
+		group = _CreateGroup(op, r);
+		CacheGroupAdd(op->groups, hash, group);
+		_TrackGroup(op);
 		// key expressions are owned by the new group and don't need to be freed
 		free_key_exps = false;
 	}
 
+	op->group = group;
+
 cleanup:
 	// free the keys that have been computed during this function
 	// if they have not been used to build a new group
@@ -146,16 +181,16 @@ cleanup:
 		for(uint i = 0; i < op->key_count; i++) SIValue_Free(op->group_keys[i]);
 	}
 
-	return op->group;
+	return group;
 }
 
 static void _aggregateRecord(OpAggregate *op, Record r) {
 	// get group
 	Group *group = _GetGroup(op, r);
-	ASSERT(group != NULL);
 
 	// aggregate group exps
-	for(uint i = 0; i < op->aggregate_count; i++) {
+	// group is missing if record was spilled
+	for(uint i = 0; group != NULL && i < op->aggregate_count; i++) {
 		AR_ExpNode *exp = group->aggregationFunctions[i];
 		AR_EXP_Aggregate(exp, r);
 	}
@@ -164,6 +199,389 @@ static void _aggregateRecord(OpAggregate *op, Record r) {
 	OpBase_DeleteRecord(r);
 }
 
+// free in-memory groups
+static void _FreeGroups(OpAggregate *op) {
+	if(op->group_iter) {
+		CacheGroupIterator_Free(op->group_iter);
+		op->group_iter = NULL;
+	}
+
+	FreeGroupCache(op->groups);
+	op->groups = CacheGroupNew();
+	op->group = NULL;
+	SpillBudget_Reset(&op->budget);
+}
+
+// queue partitions spilled while aggregating the current input
+static void _QueueSpill(OpAggregate *op) {
+	if(op->spill == NULL) return;
+
+	if(op->pending == NULL) op->pending = array_new(SpillPartitions *, 1);
+	array_append(op->pending, op->spill);
+	op->spill = NULL;
+}
+
+// replace in-memory groups with the groups of the next spilled partition
+// returns false if there are no more partitions to aggregate
+static bool _AggregatePartition(OpAggregate *op) {
+	while(op->pending != NULL && array_len(op->pending) > 0) {
+		SpillPartitions *partitions = array_tail(op->pending);
+		SpillFile *f = SpillPartitions_Next(partitions);
+		if(f == NULL) {
+			SpillPartitions_Free(array_pop(op->pending));
+			continue;
+		}
+
+		_FreeGroups(op);
+
+		// records within a partition share the current level hash bits
+		// overflowing records are partitioned by the next level bits
+		Record r;
+		op->spill_depth = partitions->depth + 1;
+		while((r = SpillFile_ReadRecord(f)) != NULL) _aggregateRecord(op, r);
+		SpillFile_Free(f);
+
+		_QueueSpill(op);
+		op->group_iter = CacheGroupIter(op->groups);
+		return true;
+	}
+
+	return false;
+}
+
+// free spilled partitions
+static void _FreeSpill(OpAggregate *op) {
+	if(op->spill) {
+		SpillPartitions_Free(op->spill);
+		op->spill = NULL;
+	}
+
+	if(op->pending) {
+		array_free_cb(op->pending, SpillPartitions_Free);
+		op->pending = NULL;
+	}
+
+	op->spill_depth = 0;
+}
+
+//------------------------------------------------------------------------------
+// parallel aggregation
+//------------------------------------------------------------------------------
+
+// state of a thread aggregating morsels of a node scan
+typedef struct {
+	OpAggregate *op;          // aggregate operation
+	Graph *g;                 // scanned graph
+	RG_Matrix L;              // scanned label matrix, NULL when scanning all nodes
+	RG_MatrixTupleIter iter;  // label matrix iterator
+	uint nodeRecIdx;          // scanned node position within record
+	Record r;                 // record populated with the scanned node
+	FT_FilterNode **filters;  // filters applied to scanned nodes
+	AR_ExpNode **key_exps;    // group key expressions
+	SIValue *group_keys;      // group key of the current record
+	Group *group;             // last accessed group
+	CacheGroup *groups;       // partial groups
+} AggregateWorker;
+
+// returns the scan operation feeding this aggregation if the aggregation
+// can be computed in parallel, NULL otherwise
+// the aggregation must consume from a label or an all nodes scan either
+// directly or through filters, and all of its aggregations must be mergeable
+static OpBase *_ParallelScanOp
+(
+	OpAggregate *op,          // aggregate operation
+	FT_FilterNode ***filters  // [output] filters between scan and aggregation
+) {
+	// profiled plans report per operation statistics
+	if(op->op.childCount != 1 || op->op.stats != NULL) return NULL;
+
+	for(uint i = 0; i < op->aggregate_count; i++) {
+		if(!AR_EXP_AggregationsMergeable(op->aggregate_exps[i])) return NULL;
+	}
+
+	OpBase *child = op->op.children[0];
+	*filters = array_new(FT_FilterNode *, 0);
+	while(child->type == OPType_FILTER) {
+		array_append(*filters, ((OpFilter *)child)->filterTree);
+		child = child->children[0];
+	}
+
+	// a label scan restricted to an ID range has its ID filter removed
+	// morsels cover the entire label, scan serially
+	bool id_range = child->type == OPType_NODE_BY_LABEL_SCAN &&
+		((NodeByLabelScan *)child)->id_range != NULL;
+
+	if((child->type == OPType_NODE_BY_LABEL_SCAN ||
+		child->type == OPType_ALL_NODE_SCAN) &&
+	   child->childCount == 0 && !id_range) {
+		return child;
+	}
+
+	array_free(*filters);
+	*filters = NULL;
+	return NULL;
+}
+
+static AggregateWorker *_AggregateWorker_New
+(
+	OpAggregate *op,          // aggregate operation
+	Graph *g,                 // scanned graph
+	RG_Matrix L,              // scanned label matrix
+	uint nodeRecIdx,          // scanned node position within record
+	rax *mapping,             // record mapping
+	FT_FilterNode **filters   // filters applied to scanned nodes
+) {
+	AggregateWorker *w = rm_calloc(1, sizeof(AggregateWorker));
+
+	w->op          =  op;
+	w->g           =  g;
+	w->L           =  L;
+	w->nodeRecIdx  =  nodeRecIdx;
+	w->r           =  Record_New(mapping);
+	w->groups      =  CacheGroupNew();
+
+	if(L != NULL) {
+		GrB_Info info = RG_MatrixTupleIter_attach(&w->iter, L);
+		ASSERT(info == GrB_SUCCESS);
+	}
+
+	// expressions are evaluated concurrently, each worker uses its own clones
+	uint filter_count = array_len(filters);
+	w->filters = array_new(FT_FilterNode *, filter_count);
+	for(uint i = 0; i < filter_count; i++) {
+		array_append(w->filters, FilterTree_Clone(filters[i]));
+	}
+
+	w->key_exps = array_new(AR_ExpNode *, op->key_count);
+	for(uint i = 0; i < op->key_count; i++) {
+		array_append(w->key_exps, AR_EXP_Clone(op->key_exps[i]));
+	}
+
+	if(op->key_count) w->group_keys = rm_malloc(op->key_count * sizeof(SIValue));
+
+	return w;
+}
+
+// retrieves the partial group under which the worker's record belongs to,
+// creates group if one doesn't exists
+static Group *_AggregateWorker_GetGroup
+(
+	AggregateWorker *w
+) {
+	OpAggregate *op = w->op;
+
+	// construct group key
+	for(uint i = 0; i < op->key_count; i++) {
+		w->group_keys[i] = AR_EXP_Evaluate(w->key_exps[i], w->r);
+	}
+
+	// see if we can reuse last accessed group
+	bool reuse = (w->group != NULL);
+	for(uint i = 0; reuse && i < op->key_count; i++) {
+		reuse = (SIValue_Compare(w->group->keys[i], w->group_keys[i], NULL) == 0);
+	}
+
+	if(!reuse) {
+		XXH64_hash_t hash = _HashCode(w->group_keys, op->key_count);
+		w->group = CacheGroupGet(w->groups, hash);
+		if(w->group == NULL) {
+			// create a new group, key values are owned by the group
+			SIValue *keys = rm_malloc(sizeof(SIValue) * op->key_count);
+			for(uint i = 0; i < op->key_count; i++) {
+				keys[i] = SI_TransferOwnership(&w->group_keys[i]);
+				SIValue_Persist(&keys[i]);
+			}
+
+			// partial groups don't keep a representative record
+			w->group = NewGroup(keys, op->key_count, _build_aggregate_exps(op),
+					op->aggregate_count, NULL);
+			CacheGroupAdd(w->groups, hash, w->group);
+			return w->group;
+		}
+	}
+
+	for(uint i = 0; i < op->key_count; i++) SIValue_Free(w->group_keys[i]);
+
+	return w->group;
+}
+
+// filter and aggregate a scanned node
+static void _AggregateWorker_Process
+(
+	AggregateWorker *w,  // worker
+	Node n               // scanned node
+) {
+	Record_AddNode(w->r, w->nodeRecIdx, n);
+
+	uint filter_count = array_len(w->filters);
+	for(uint i = 0; i < filter_count; i++) {
+		if(FilterTree_applyFilters(w->filters[i], w->r) != FILTER_PASS) return;
+	}
+
+	Group *group = _AggregateWorker_GetGroup(w);
+	for(uint i = 0; i < w->op->aggregate_count; i++) {
+		AR_EXP_Aggregate(group->aggregationFunctions[i], w->r);
+	}
+}
+
+// scan, filter and aggregate nodes with IDs within [start, end)
+static void _AggregateMorsel
+(
+	void *worker,
+	uint64_t start,
+	uint64_t end
+) {
+	AggregateWorker *w = worker;
+
+	if(w->L != NULL) {
+		// label scan
+		GrB_Index id;
+		GrB_Info info = RG_MatrixTupleIter_iterate_range(&w->iter, start,
+				end - 1);
+		ASSERT(info == GrB_SUCCESS);
+
+		while(RG_MatrixTupleIter_next_BOOL(&w->iter, &id, NULL, NULL) ==
+				GrB_SUCCESS) {
+			Node n = GE_NEW_NODE();
+			Graph_GetNode(w->g, id, &n);
+			_AggregateWorker_Process(w, n);
+		}
+	} else {
+		// all nodes scan, skip deleted nodes
+		for(NodeID id = start; id < end; id++) {
+			Node n = GE_NEW_NODE();
+			if(!Graph_GetNode(w->g, id, &n)) continue;
+			_AggregateWorker_Process(w, n);
+		}
+	}
+}
+
+// merge the worker's partial groups into the operation's groups
+static void _AggregateWorker_Merge
+(
+	AggregateWorker *w
+) {
+	Group *partial;
+	OpAggregate *op = w->op;
+	CacheGroupIterator *it = CacheGroupIter(w->groups);
+
+	while(CacheGroupIterNext(it, &partial)) {
+		XXH64_hash_t hash = _HashCode(partial->keys, op->key_count);
+		Group *group = CacheGroupGet(op->groups, hash);
+		if(group == NULL) {
+			// first occurrence of group, move it
+			CacheGroupAdd(op->groups, hash, partial);
+			continue;
+		}
+
+		for(uint i = 0; i < op->aggregate_count; i++) {
+			AR_EXP_MergeAggregations(group->aggregationFunctions[i],
+					partial->aggregationFunctions[i]);
+		}
+		FreeGroup(partial);
+	}
+
+	CacheGroupIterator_Free(it);
+
+	// groups were either moved or freed
+	FreeGroupCacheShallow(w->groups);
+	w->groups = NULL;
+}
+
+static void _AggregateWorker_Free
+(
+	AggregateWorker *w
+) {
+	if(w->L != NULL) {
+		GrB_Info info = RG_MatrixTupleIter_detach(&w->iter);
+		ASSERT(info == GrB_SUCCESS);
+	}
+
+	if(w->groups) FreeGroupCache(w->groups);
+	if(w->group_keys) rm_free(w->group_keys);
+
+	array_free_cb(w->filters, FilterTree_Free);
+	array_free_cb(w->key_exps, AR_EXP_Free);
+
+	Record_Free(w->r);
+	rm_free(w);
+}
+
+// aggregate the operation's input in parallel
+// splitting the scanned ID range into morsels, each morsel is scanned,
+// filtered and aggregated into partial groups by one of the participating
+// threads, partial groups are merged once all morsels are processed
+// returns false if the aggregation isn't eligible for parallel execution
+static bool _ParallelAggregate
+(
+	OpAggregate *op
+) {
+	uint64_t threads;
+	Config_Option_get(Config_PARALLEL_SCAN_THREADS, &threads);
+	threads = MIN(threads, ThreadPools_ReadersCount());
+	if(threads <= 1) return false;
+
+	FT_FilterNode **filters = NULL;
+	OpBase *scan = _ParallelScanOp(op, &filters);
+	if(scan == NULL) return false;
+
+	uint64_t n;
+	uint nodeRecIdx;
+	RG_Matrix L = NULL;
+	Graph *g = QueryCtx_GetGraph();
+
+	if(scan->type == OPType_NODE_BY_LABEL_SCAN) {
+		NodeByLabelScan *label_scan = (NodeByLabelScan *)scan;
+		GraphContext *gc = QueryCtx_GetGraphCtx();
+		Schema *schema = GraphContext_GetSchema(gc, label_scan->n.label,
+				SCHEMA_NODE);
+		if(schema == NULL) {
+			// missing label, nothing to scan
+			array_free(filters);
+			return false;
+		}
+
+		GrB_Index nrows;
+		L = Graph_GetLabelMatrix(g, schema->id);
+		GrB_Info info = RG_Matrix_nrows(&nrows, L);
+		ASSERT(info == GrB_SUCCESS);
+
+		n = nrows;
+		nodeRecIdx = label_scan->nodeRecIdx;
+	} else {
+		n = Graph_UncompactedNodeCount(g);
+		nodeRecIdx = ((AllNodeScan *)scan)->nodeRecIdx;
+	}
+
+	// not worth parallelizing a single morsel
+	if(n <= MORSEL_SIZE) {
+		array_free(filters);
+		return false;
+	}
+
+	rax *mapping = ExecutionPlan_GetMappings(scan->plan);
+	void **workers = rm_malloc(sizeof(AggregateWorker *) * threads);
+	for(uint i = 0; i < threads; i++) {
+		workers[i] = _AggregateWorker_New(op, g, L, nodeRecIdx, mapping,
+				filters);
+	}
+
+	bool success = Morsels_Process(n, threads - 1, workers, _AggregateMorsel,
+			op->op.plan);
+
+	for(uint i = 0; i < threads; i++) {
+		if(success) _AggregateWorker_Merge(workers[i]);
+		_AggregateWorker_Free(workers[i]);
+	}
+	rm_free(workers);
+	array_free(filters);
+
+	// propagate run-time error
+	if(!success) ErrorCtx_RaiseRuntimeException(NULL);
+
+	return true;
+}
+
 // returns a record populated with group data
 static Record _handoff
 (
@@ -193,6 +611,10 @@ static Record _handoff
 		Record_AddScalar(r, rec_idx, res);
 	}
 
+	// groups are freed before spilled partitions are aggregated
+	// record can't share values with them
+	if(op->pending != NULL) Record_PersistScalars(r);
+
 	return r;
 }
 
@@ -201,6 +623,9 @@ OpBase *NewAggregateOp(const ExecutionPlan *plan, AR_ExpNode **exps, bool should
 	op->group = NULL;
 	op->group_iter = NULL;
 	op->group_keys = NULL;
+	op->spill = NULL;
+	op->pending = NULL;
+	op->spill_depth = 0;
 	op->groups = CacheGroupNew();
 	op->should_cache_records = should_cache_records;
 
@@ -236,9 +661,19 @@ static Record AggregateConsume
 	OpBase *opBase
 ) {
 	OpAggregate *op = (OpAggregate *)opBase;
-	if(op->group_iter) return _handoff(op);
-
 	Record r;
+
+	if(op->group_iter) {
+		// hand out in-memory groups, then aggregate spilled partitions
+		while((r = _handoff(op)) == NULL) {
+			if(!_AggregatePartition(op)) return NULL;
+		}
+		return r;
+	}
+
+	// records of groups exceeding the memory budget are spilled to disk
+	SpillBudget_Init(&op->budget);
+
 	if(op->op.childCount == 0) {
 		// RETURN max (1)
 		// create a 'fake' record
@@ -247,14 +682,20 @@ static Record AggregateConsume
 	} else {
 		OpBase *child = op->op.children[0];
 		// eager consumption!
-		while((r = OpBase_Consume(child))) _aggregateRecord(op, r);
+		if(!_ParallelAggregate(op)) {
+			uint n;
+			Record batch[OP_BATCH_SIZE];
+			while((n = OpBase_ConsumeBatch(child, batch, OP_BATCH_SIZE)) > 0) {
+				for(uint i = 0; i < n; i++) _aggregateRecord(op, batch[i]);
+			}
+		}
 	}
 
 	// did we processed any records?
 	// does aggregation contains keys?
 	// e.g.
 	// MATCH (n:N) WHERE n.noneExisting = 2 RETURN count(n)
-	if(raxSize(op->groups) == 0 && op->key_count == 0) {
+	if(CacheGroupCount(op->groups) == 0 && op->key_count == 0) {
 		// no data was processed and aggregation doesn't have a key
 		// in this case we want to return aggregation default value
 		// aggregate on an empty record
@@ -278,10 +719,13 @@ static Record AggregateConsume
 		OpBase_DeleteRecord(r);
 	}
 
+	// queue records spilled while consuming
+	_QueueSpill(op);
+
 	// create group iterator
 	op->group_iter = CacheGroupIter(op->groups);
 
-	return _handoff(op);
+	return AggregateConsume(opBase);
 }
 
 static OpResult AggregateReset(OpBase *opBase) {
@@ -297,6 +741,8 @@ static OpResult AggregateReset(OpBase *opBase) {
 
 	op->group = NULL;
 
+	_FreeSpill(op);
+
 	return OP_OK;
 }
 
@@ -344,6 +790,8 @@ static void AggregateFree(OpBase *opBase) {
 		op->groups = NULL;
 	}
 
+	_FreeSpill(op);
+
 	if(op->record_offsets) {
 		array_free(op->record_offsets);
 		op->record_offsets = NULL;
@@ -8,6 +8,7 @@
 
 #include "op.h"
 #include "../execution_plan.h"
+#include "shared/spill_functions.h"
 #include "../../grouping/group_cache.h"
 #include "../../arithmetic/arithmetic_expression.h"
 
@@ -16,13 +17,17 @@ typedef struct {
 	uint *record_offsets;               // record IDs for key and aggregate exps
 	AR_ExpNode **key_exps;              // array of expressions used to calculate the group key
 	AR_ExpNode **aggregate_exps;        // array of expressions that aggregate data for each key
-	rax *groups;                        // map of all groups built by this operation
+	CacheGroup *groups;                 // map of all groups built by this operation
 	Group *group;                       // last accessed group
 	SIValue *group_keys;                // array of values that represent a key associated with a Group of aggregations
 	CacheGroupIterator *group_iter;     // iterator for walking all groups
 	uint key_count;                     // number of key expressions
 	uint aggregate_count;               // number of aggregating expressions
 	bool should_cache_records;          // records should be cached if we're sorting after aggregation
+	SpillBudget budget;                 // decides when records of new groups are spilled
+	SpillPartitions *spill;             // records spilled while aggregating current input
+	SpillPartitions **pending;          // spilled partitions yet to be aggregated
+	uint spill_depth;                   // partitioning depth of current input spills
 } OpAggregate;
 
 OpBase *NewAggregateOp(const ExecutionPlan *plan, AR_ExpNode **exps, bool should_cache_records);
@@ -11,6 +11,7 @@
 /* Forward declarations. */
 static OpResult AllNodeScanInit(OpBase *opBase);
 static Record AllNodeScanConsume(OpBase *opBase);
+static uint AllNodeScanConsumeBatch(OpBase *opBase, Record *batch, uint cap);
 static Record AllNodeScanConsumeFromChild(OpBase *opBase);
 static OpResult AllNodeScanReset(OpBase *opBase);
 static OpBase *AllNodeScanClone(const ExecutionPlan *plan, const OpBase *opBase);
@@ -36,8 +37,12 @@ OpBase *NewAllNodeScanOp(const ExecutionPlan *plan, const char *alias) {
 
 static OpResult AllNodeScanInit(OpBase *opBase) {
 	AllNodeScan *op = (AllNodeScan *)opBase;
-	if(opBase->childCount > 0) OpBase_UpdateConsume(opBase, AllNodeScanConsumeFromChild);
-	else op->iter = Graph_ScanNodes(QueryCtx_GetGraph());
+	if(opBase->childCount > 0) {
+		OpBase_UpdateConsume(opBase, AllNodeScanConsumeFromChild);
+	} else {
+		op->iter = Graph_ScanNodes(QueryCtx_GetGraph());
+		OpBase_UpdateConsumeBatch(opBase, AllNodeScanConsumeBatch);
+	}
 	return OP_OK;
 }
 
@@ -89,6 +94,23 @@ static Record AllNodeScanConsume(OpBase *opBase) {
 	return r;
 }
 
+static uint AllNodeScanConsumeBatch(OpBase *opBase, Record *batch, uint cap) {
+	AllNodeScan *op = (AllNodeScan *)opBase;
+
+	uint n = 0;
+	while(n < cap) {
+		Node node = GE_NEW_NODE();
+		node.attributes = DataBlockIterator_Next(op->iter, &node.id);
+		if(node.attributes == NULL) break;
+
+		Record r = OpBase_CreateRecord(opBase);
+		Record_AddNode(r, op->nodeRecIdx, node);
+		batch[n++] = r;
+	}
+
+	return n;
+}
+
 static OpResult AllNodeScanReset(OpBase *op) {
 	AllNodeScan *allNodeScan = (AllNodeScan *)op;
 	if(allNodeScan->iter) DataBlockIterator_Reset(allNodeScan->iter);
@@ -12,6 +12,7 @@
 #include "../../graph/graphcontext.h"
 #include "../../algorithms/all_paths.h"
 #include "../../algorithms/all_neighbors.h"
+#include "../../algorithms/bidirectional_bfs.h"
 #include "../../query_ctx.h"
 
 /* Forward declarations. */
@@ -19,6 +20,7 @@ static OpResult CondVarLenTraverseInit(OpBase *opBase);
 static OpResult CondVarLenTraverseReset(OpBase *opBase);
 static Record CondVarLenTraverseConsume(OpBase *opBase);
 static Record CondVarLenTraverseOptimizedConsume(OpBase *opBase);
+static Record CondVarLenTraverseReachableConsume(OpBase *opBase);
 static OpBase *CondVarLenTraverseClone(const ExecutionPlan *plan, const OpBase *opBase);
 static void CondVarLenTraverseFree(OpBase *opBase);
 
@@ -53,6 +55,71 @@ static void _setupTraversedRelations(CondVarLenTraverse *op) {
 	}
 }
 
+// look up memoized results of src, returns true if src was memoized
+// in which case results are replayed from the memo
+// otherwise results of src are recorded as they're produced
+static bool _MemoLookup
+(
+	CondVarLenTraverse *op,
+	EntityID src
+) {
+	op->memoIdx   = 0;
+	op->memoEntry = NULL;
+	if(op->memo == NULL) return false;
+
+	op->memoEntry = VarLenMemo_Lookup(op->memo, src);
+	if(op->memoEntry != NULL) return true;
+
+	VarLenMemo_Record(op->memo, src);
+	return false;
+}
+
+// produce next destination of the current source
+// returns INVALID_ENTITY_ID once all destinations were produced
+static EntityID _NextDestination
+(
+	CondVarLenTraverse *op
+) {
+	VarLenMemoEntry *e = op->memoEntry;
+	if(e != NULL) {
+		if(op->memoIdx < array_len(e->dests)) return e->dests[op->memoIdx++];
+		return INVALID_ENTITY_ID;
+	}
+
+	EntityID id = (op->reachableNodesCtx != NULL)
+		? ReachableNodesCtx_NextNode(op->reachableNodesCtx)
+		: AllNeighborsCtx_NextNeighbor(op->allNeighborsCtx);
+
+	if(op->memo != NULL) {
+		if(id != INVALID_ENTITY_ID) VarLenMemo_RecordDestination(op->memo, id);
+		else VarLenMemo_Commit(op->memo);
+	}
+
+	return id;
+}
+
+// produce next path of the current source
+// returns NULL once all paths were produced
+static Path *_NextPath
+(
+	CondVarLenTraverse *op
+) {
+	VarLenMemoEntry *e = op->memoEntry;
+	if(e != NULL) {
+		if(op->memoIdx < array_len(e->paths)) return e->paths[op->memoIdx++];
+		return NULL;
+	}
+
+	Path *p = AllPathsCtx_NextPath(op->allPathsCtx);
+
+	if(op->memo != NULL) {
+		if(p != NULL) VarLenMemo_RecordPath(op->memo, p);
+		else VarLenMemo_Commit(op->memo);
+	}
+
+	return p;
+}
+
 // Set the traversal direction to match the traversed edge and AlgebraicExpression form.
 static inline void _setTraverseDirection(CondVarLenTraverse *op, const QGEdge *e) {
 	if(e->bidirectional) {
@@ -72,6 +139,12 @@ static inline void CondVarLenTraverseToString(const OpBase *ctx, sds *buf) {
 	CondVarLenTraverse *op = (CondVarLenTraverse *)ctx;
 	AlgebraicExpression_Optimize(&op->ae);
 	TraversalToString(ctx, buf, op->ae);
+	// report memo usage when profiling
+	if(ctx->stats && op->memo) {
+		*buf = sdscatprintf(*buf, " | Memo hits: %llu | Memo evictions: %llu",
+				(unsigned long long)op->memo->hits,
+				(unsigned long long)op->memo->evictions);
+	}
 }
 
 void CondVarLenTraverseOp_ExpandInto(CondVarLenTraverse *op) {
@@ -91,6 +164,11 @@ inline void CondVarLenTraverseOp_SetFilter(CondVarLenTraverse *op,
 	op->ft = ft;
 }
 
+void CondVarLenTraverseOp_DistinctDestinations(CondVarLenTraverse *op) {
+	ASSERT(op != NULL);
+	op->distinctDests = true;
+}
+
 OpBase *NewCondVarLenTraverseOp
 (
 	const ExecutionPlan *plan,
@@ -111,6 +189,14 @@ OpBase *NewCondVarLenTraverseOp
 	op->collect_paths      =  true;
 	op->allNeighborsCtx    =  NULL;
 	op->edgeRelationTypes  =  NULL;
+	op->shortestM          =  NULL;
+	op->shortestMT         =  NULL;
+	op->reachableM         =  NULL;
+	op->distinctDests      =  false;
+	op->reachableNodesCtx  =  NULL;
+	op->memo               =  NULL;
+	op->memoIdx            =  0;
+	op->memoEntry          =  NULL;
 
 	OpBase_Init((OpBase *)op, OPType_CONDITIONAL_VAR_LEN_TRAVERSE,
 				"Conditional Variable Length Traverse", CondVarLenTraverseInit,
@@ -156,6 +242,45 @@ static OpResult CondVarLenTraverseInit(OpBase *opBase) {
 			AlgebraicExpression_Edge(op->ae));
 	uint reltype_count = QGEdge_RelationCount(e);
 
+	// memoize traversal results of each source, such that records sharing
+	// a source node, e.g. following an UNWIND or a join, are served
+	// without re-traversing
+	// results of a source are fixed as long as:
+	// 1. the graph isn't modified by the query
+	// 2. no filters to be applied to pattern, as these may refer
+	//    to other record entries
+	// 3. destination isn't known in advance
+	AST *ast = QueryCtx_GetAST();
+	if(op->ft         == NULL  &&
+	   op->expandInto == false &&
+	   AST_ReadOnly(ast->root)) {
+		op->memo = VarLenMemo_New();
+	}
+
+	// when only distinct destinations are consumed, collect reachable nodes
+	// by expanding a frontier rather than enumerating paths
+	// a node reachable within a number of hops is reachable by a path
+	// which doesn't repeat edges, as long as a minimum of a single hop
+	// is required, as is a cycle leading back to the source
+	//
+	// for this we require:
+	// 1. only distinct destinations are consumed
+	// 2. no filters to be applied to pattern
+	// 3. traversed edge isn't referenced
+	// 4. minimum of at most a single hop
+	// 5. traversal must be directed
+	if(op->distinctDests                        &&
+	   op->ft          == NULL                  && // no filter on path
+	   op->edgesIdx    == -1                    && // edge isn't required
+	   op->expandInto  == false                 && // destination unknown
+	   e->minHops      <= 1                     && // at most a single hop
+	   op->traverseDir != GRAPH_EDGE_DIR_BOTH      // directed
+	  ) {
+		op->collect_paths = false;
+		OpBase_UpdateConsume(opBase, CondVarLenTraverseReachableConsume);
+		return OP_OK;
+	}
+
 	bool  multi_edge  =  true;
 	bool  transpose   =  op->traverseDir != GRAPH_EDGE_DIR_OUTGOING;
 	if(reltype_count == 1) {
@@ -188,8 +313,7 @@ static Record CondVarLenTraverseOptimizedConsume(OpBase *opBase) {
 	Node                dest    =  GE_NEW_NODE();
 	EntityID            dest_id =  INVALID_ENTITY_ID;
 
-	while((dest_id = AllNeighborsCtx_NextNeighbor(op->allNeighborsCtx)) ==
-		  INVALID_ENTITY_ID) {
+	while((dest_id = _NextDestination(op)) == INVALID_ENTITY_ID) {
 		Record childRecord = OpBase_Consume(child);
 		if(!childRecord) return NULL;
 
@@ -219,6 +343,9 @@ static Record CondVarLenTraverseOptimizedConsume(OpBase *opBase) {
 			op->M = op->ae->operand.matrix;
 		}
 
+		// replay destinations of a previously traversed source
+		if(_MemoLookup(op, ENTITY_GET_ID(srcNode))) continue;
+
 		if(op->allNeighborsCtx == NULL) {
 			op->allNeighborsCtx = AllNeighborsCtx_New(srcNode->id, op->M,
 					op->minHops, op->maxHops);
@@ -247,12 +374,69 @@ static Record CondVarLenTraverseOptimizedConsume(OpBase *opBase) {
 	return r;
 }
 
+static Record CondVarLenTraverseReachableConsume(OpBase *opBase) {
+	CondVarLenTraverse  *op     = (CondVarLenTraverse *)opBase;
+	OpBase              *child  =  op->op.children[0];
+	Node                dest    =  GE_NEW_NODE();
+	EntityID            dest_id =  INVALID_ENTITY_ID;
+
+	while((dest_id = _NextDestination(op)) == INVALID_ENTITY_ID) {
+		Record childRecord = OpBase_Consume(child);
+		if(!childRecord) return NULL;
+
+		if(op->r) OpBase_DeleteRecord(op->r);
+		op->r = childRecord;
+
+		Node *srcNode = Record_GetNode(op->r, op->srcNodeIdx);
+		if(srcNode == NULL) {
+			// the child Record may not contain the source node
+			// in scenarios like a failed OPTIONAL MATCH
+			// in this case, delete the Record and try again
+			OpBase_DeleteRecord(op->r);
+			op->r = NULL;
+			continue;
+		}
+
+		// build traversed matrix on first call to consume
+		if(!op->edgeRelationTypes) {
+			_setupTraversedRelations(op);
+			// no relations to traverse, no destination is at least one hop away
+			if(op->edgeRelationCount == 0 && op->minHops > 0) return NULL;
+
+			BidirectionalBFS_Matrices(&op->reachableM, NULL, op->g,
+					op->edgeRelationTypes, op->edgeRelationCount,
+					op->traverseDir);
+			op->reachableNodesCtx = ReachableNodesCtx_New(op->reachableM);
+		}
+
+		// replay destinations of a previously traversed source
+		if(_MemoLookup(op, ENTITY_GET_ID(srcNode))) continue;
+
+		ReachableNodesCtx_Reset(op->reachableNodesCtx, ENTITY_GET_ID(srcNode),
+				op->minHops, op->maxHops);
+	}
+
+	int res = Graph_GetNode(op->g, dest_id, &dest);
+	UNUSED(res);
+	ASSERT(res == true);
+
+	//--------------------------------------------------------------------------
+	// populate output record
+	//--------------------------------------------------------------------------
+
+	// add destination node to record
+	Record r = OpBase_CloneRecord(op->r);
+	Record_AddNode(r, op->destNodeIdx, dest);
+
+	return r;
+}
+
 static Record CondVarLenTraverseConsume(OpBase *opBase) {
 	CondVarLenTraverse  *op     = (CondVarLenTraverse *)opBase;
 	Path                *p      =  NULL;
 	OpBase              *child  =  op->op.children[0];
 
-	while(!(p = AllPathsCtx_NextPath(op->allPathsCtx))) {
+	while(!(p = _NextPath(op))) {
 		Record childRecord = OpBase_Consume(child);
 		if(!childRecord) return NULL;
 
@@ -278,15 +462,26 @@ static Record CondVarLenTraverseConsume(OpBase *opBase) {
 			if(op->edgeRelationCount == 0 && op->minHops > 0) return NULL;
 		}
 
+		// replay paths of a previously traversed source
+		if(_MemoLookup(op, ENTITY_GET_ID(srcNode))) continue;
+
 		Node *destNode = NULL;
 		// The destination node is known in advance if we're performing an ExpandInto.
 		if(op->expandInto) destNode = Record_GetNode(op->r, op->destNodeIdx);
 
+		// shortest paths are searched from both ends over the traversed
+		// matrix and its transpose, unless traversed edges are filtered
+		if(op->shortestPaths && op->ft == NULL && op->shortestM == NULL) {
+			BidirectionalBFS_Matrices(&op->shortestM, &op->shortestMT, op->g,
+					op->edgeRelationTypes, op->edgeRelationCount,
+					op->traverseDir);
+		}
+
 		AllPathsCtx_Free(op->allPathsCtx);
 		op->allPathsCtx = AllPathsCtx_New(srcNode, destNode, op->g,
 				op->edgeRelationTypes, op->edgeRelationCount, op->traverseDir,
 				op->minHops, op->maxHops, op->r, op->ft, op->edgesIdx,
-				op->shortestPaths);
+				op->shortestPaths, op->shortestM, op->shortestMT);
 	}
 
 	//--------------------------------------------------------------------------
@@ -323,6 +518,13 @@ static OpResult CondVarLenTraverseReset(OpBase *ctx) {
 		}
 	}
 
+	// drop remaining reachable nodes of the last source
+	if(op->reachableNodesCtx) op->reachableNodesCtx->depleted = true;
+
+	// memoized results outlive reset, drop incomplete recording
+	op->memoEntry = NULL;
+	if(op->memo) VarLenMemo_Abort(op->memo);
+
 	return OP_OK;
 }
 
@@ -331,6 +533,10 @@ static OpBase *CondVarLenTraverseClone(const ExecutionPlan *plan, const OpBase *
 	CondVarLenTraverse *op = (CondVarLenTraverse *) opBase;
 	OpBase *op_clone = NewCondVarLenTraverseOp(plan, QueryCtx_GetGraph(),
 											   AlgebraicExpression_Clone(op->ae));
+	if(op->distinctDests) {
+		CondVarLenTraverseOp_DistinctDestinations(
+				(CondVarLenTraverse *)op_clone);
+	}
 	return op_clone;
 }
 
@@ -364,6 +570,23 @@ static void CondVarLenTraverseFree(OpBase *ctx) {
 		}
 	}
 
+	if(op->shortestM) {
+		GrB_free(&op->shortestM);
+		GrB_free(&op->shortestMT);
+	}
+
+	if(op->reachableNodesCtx) {
+		ReachableNodesCtx_Free(op->reachableNodesCtx);
+		op->reachableNodesCtx = NULL;
+	}
+
+	if(op->reachableM) GrB_free(&op->reachableM);
+
+	if(op->memo) {
+		VarLenMemo_Free(op->memo);
+		op->memo = NULL;
+	}
+
 	if(op->ft) {
 		FilterTree_Free(op->ft);
 		op->ft = NULL;
@@ -10,6 +10,8 @@
 #include "../execution_plan.h"
 #include "../../graph/graph.h"
 #include "../../algorithms/algorithms.h"
+#include "../../algorithms/reachable_nodes.h"
+#include "shared/var_len_memo.h"
 #include "../../arithmetic/algebraic_expression.h"
 
 /* OP Traverse */
@@ -24,6 +26,8 @@ typedef struct {
 	bool expandInto;                       /* Both src and dest already resolved. */
 	FT_FilterNode *ft;                     /* If not NULL, FilterTree applied to traversed edge. */
 	bool shortestPaths;                    /* Only collect shortest paths. */
+	GrB_Matrix shortestM;                  /* Matrix searched for shortest paths, NULL if edges are filtered. */
+	GrB_Matrix shortestMT;                 /* Transpose of shortestM. */
 	unsigned int minHops;                  /* Maximum number of hops to perform. */
 	unsigned int maxHops;                  /* Maximum number of hops to perform. */
 	int edgeRelationCount;                 /* Length of edgeRelationTypes. */
@@ -34,6 +38,12 @@ typedef struct {
 		AllNeighborsCtx *allNeighborsCtx;  /* Context for collecting all neighbors . */
 	};
 	bool collect_paths;                    /* Whether we must populate the entire path. */
+	bool distinctDests;                    /* Only distinct destinations are required. */
+	GrB_Matrix reachableM;                 /* Traversed matrix when collecting reachable nodes. */
+	ReachableNodesCtx *reachableNodesCtx;  /* Context for collecting distinct reachable nodes. */
+	VarLenMemo *memo;                      /* Memoized results of traversed sources, NULL if disabled. */
+	VarLenMemoEntry *memoEntry;            /* Memoized results being replayed. */
+	uint memoIdx;                          /* Position of next replayed result. */
 	GRAPH_EDGE_DIR traverseDir;            /* Traverse direction. */
 } CondVarLenTraverse;
 
@@ -46,3 +56,8 @@ void CondVarLenTraverseOp_ExpandInto(CondVarLenTraverse *op);
 // Set the FilterTree pointer of a CondVarLenTraverse operation.
 void CondVarLenTraverseOp_SetFilter(CondVarLenTraverse *op, FT_FilterNode *ft);
 
+/* Let operation know only distinct destinations are consumed,
+ * in which case the number of paths leading to a destination is of no interest
+ * and reachable nodes can be collected by expanding a frontier. */
+void CondVarLenTraverseOp_DistinctDestinations(CondVarLenTraverse *op);
+
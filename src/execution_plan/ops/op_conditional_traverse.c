@@ -8,9 +8,14 @@
 #include "RG.h"
 #include "shared/print_functions.h"
 #include "../../query_ctx.h"
+#include "../../configuration/config.h"
 
-// default number of records to accumulate before traversing
+// initial number of records to accumulate before traversing
 #define BATCH_SIZE 16
+// max number of records to accumulate before traversing
+#define BATCH_SIZE_MAX 4096
+// fraction of QUERY_MEM_CAPACITY batched records may occupy
+#define BATCH_MEM_FRACTION 8
 
 /* Forward declarations. */
 static OpResult CondTraverseInit(OpBase *opBase);
@@ -20,7 +25,53 @@ static OpBase *CondTraverseClone(const ExecutionPlan *plan, const OpBase *opBase
 static void CondTraverseFree(OpBase *opBase);
 
 static void CondTraverseToString(const OpBase *ctx, sds *buf) {
-	TraversalToString(ctx, buf, ((const OpCondTraverse *)ctx)->ae);
+	const OpCondTraverse *op = (const OpCondTraverse *)ctx;
+	TraversalToString(ctx, buf, op->ae);
+	// report chosen batch size when profiling
+	if(ctx->stats) *buf = sdscatprintf(*buf, " | Batch size: %u", op->record_cap);
+}
+
+// compute the max number of records a batch may hold
+// bounded by BATCH_SIZE_MAX, a limit set on the operation (record_cap)
+// and by a fraction of the query memory capacity
+static uint _MaxBatchSize(OpCondTraverse *op) {
+	uint max = MIN(op->record_cap, BATCH_SIZE_MAX);
+
+	int64_t mem_capacity;
+	Config_Option_get(Config_QUERY_MEM_CAPACITY, &mem_capacity);
+	if(mem_capacity != QUERY_MEM_CAPACITY_UNLIMITED) {
+		// estimated memory consumption of a batched record
+		rax *mapping = ExecutionPlan_GetMappings(op->op.plan);
+		size_t record_size = sizeof(Record) + sizeof(_Record) +
+			raxSize(mapping) * sizeof(Entry);
+		uint64_t budget = (mem_capacity / BATCH_MEM_FRACTION) / record_size;
+		max = MIN(max, MAX(budget, 1));
+	}
+
+	return max;
+}
+
+// double batch size, up to batch_cap
+// called once a full batch had been processed
+// as the child is likely to produce many more records
+static void _GrowBatch(OpCondTraverse *op) {
+	ASSERT(op->record_count == 0);
+
+	op->record_cap = MIN(op->record_cap * 2, op->batch_cap);
+	op->records = rm_realloc(op->records, op->record_cap * sizeof(Record));
+
+	// resize filter and result matrices to accommodate the new batch size
+	if(op->F != NULL) {
+		GrB_Index ncols;
+		GrB_Info info = RG_Matrix_ncols(&ncols, op->F);
+		ASSERT(info == GrB_SUCCESS);
+
+		info = RG_Matrix_resize(op->F, op->record_cap, ncols);
+		ASSERT(info == GrB_SUCCESS);
+		info = RG_Matrix_resize(op->M, op->record_cap, ncols);
+		ASSERT(info == GrB_SUCCESS);
+		UNUSED(info);
+	}
 }
 
 static void _populate_filter_matrix(OpCondTraverse *op) {
@@ -76,7 +127,7 @@ OpBase *NewCondTraverseOp(const ExecutionPlan *plan, Graph *g, AlgebraicExpressi
 	OpCondTraverse *op = rm_calloc(sizeof(OpCondTraverse), 1);
 	op->graph = g;
 	op->ae = ae;
-	op->record_cap = BATCH_SIZE;
+	op->record_cap = UNLIMITED;
 
 	// Set our Op operations
 	OpBase_Init((OpBase *)op, OPType_CONDITIONAL_TRAVERSE, "Conditional Traverse", CondTraverseInit,
@@ -106,9 +157,9 @@ static OpResult CondTraverseInit(OpBase *opBase) {
 	OpCondTraverse *op = (OpCondTraverse *)opBase;
 	// Create 'records' with this Init function as 'record_cap'
 	// might be set during optimization time (applyLimit)
-	// If cap greater than BATCH_SIZE is specified,
-	// use BATCH_SIZE as the value.
-	if(op->record_cap > BATCH_SIZE) op->record_cap = BATCH_SIZE;
+	// batch size starts at BATCH_SIZE and grows up to 'batch_cap'
+	op->batch_cap = _MaxBatchSize(op);
+	op->record_cap = MIN(op->batch_cap, BATCH_SIZE);
 	op->records = rm_calloc(op->record_cap, sizeof(Record));
 
 	return OP_OK;
@@ -141,7 +192,12 @@ static Record CondTraverseConsume(OpBase *opBase) {
 		/* Run out of tuples, try to get new data.
 		 * Free old records. */
 		op->r = NULL;
+		bool full_batch = (op->record_count == op->record_cap);
 		for(uint i = 0; i < op->record_count; i++) OpBase_DeleteRecord(op->records[i]);
+		op->record_count = 0;
+
+		// Child filled the previous batch, grow batch.
+		if(full_batch && op->record_cap < op->batch_cap) _GrowBatch(op);
 
 		// Ask child operations for data.
 		for(op->record_count = 0; op->record_count < op->record_cap; op->record_count++) {
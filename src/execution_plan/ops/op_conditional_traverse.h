@@ -25,7 +25,8 @@ typedef struct {
 	int srcNodeIdx;             // Source node index into record.
 	int destNodeIdx;            // Destination node index into record.
 	uint record_count;          // Number of held records.
-	uint record_cap;            // Max number of records to process.
+	uint record_cap;            // Current batch size, max number of records to process.
+	uint batch_cap;             // Upper bound on record_cap.
 	Record *records;            // Array of records.
 	Record r;                   // Currently selected record.
 } OpCondTraverse;
@@ -12,6 +12,7 @@
 #include "../execution_plan_build/execution_plan_modify.h"
 
 /* Forward declarations. */
+static OpResult DistinctInit(OpBase *opBase);
 static Record DistinctConsume(OpBase *opBase);
 static OpBase *DistinctClone(const ExecutionPlan *plan, const OpBase *opBase);
 static void DistinctFree(OpBase *opBase);
@@ -50,6 +51,80 @@ static void _updateOffsets(OpDistinct *op, Record r) {
 	}
 }
 
+// queue partitions spilled while processing the current input
+static void _queueSpill(OpDistinct *op) {
+	if(op->spill == NULL) return;
+
+	if(op->pending == NULL) op->pending = array_new(SpillPartitions *, 1);
+	array_append(op->pending, op->spill);
+	op->spill = NULL;
+}
+
+// switch input to the next spilled partition
+// returns false if there are no more partitions to process
+static bool _nextPartition(OpDistinct *op) {
+	while(op->pending != NULL && array_len(op->pending) > 0) {
+		SpillPartitions *partitions = array_tail(op->pending);
+		op->input = SpillPartitions_Next(partitions);
+		if(op->input == NULL) {
+			SpillPartitions_Free(array_pop(op->pending));
+			continue;
+		}
+
+		// records sharing a hash share a partition
+		// values seen by previous partitions are irrelevant
+		raxFree(op->found);
+		op->found = raxNew();
+		SpillBudget_Reset(&op->budget);
+
+		// overflowing records are partitioned by the next level hash bits
+		op->spill_depth = partitions->depth + 1;
+		return true;
+	}
+
+	return false;
+}
+
+// returns the next record to process
+// once child is depleted, records spilled to disk are processed
+static Record _nextRecord(OpDistinct *op) {
+	Record r;
+	OpBase *child = op->op.children[0];
+
+	while(true) {
+		if(op->input != NULL) {
+			r = SpillFile_ReadRecord(op->input);
+			if(r) return r;
+			SpillFile_Free(op->input);
+			op->input = NULL;
+		} else {
+			r = OpBase_Consume(child);
+			if(r) return r;
+		}
+
+		// current input depleted, move on to the next spilled partition
+		_queueSpill(op);
+		if(!_nextPartition(op)) return NULL;
+	}
+}
+
+static void _freeSpill(OpDistinct *op) {
+	if(op->input) {
+		SpillFile_Free(op->input);
+		op->input = NULL;
+	}
+
+	if(op->spill) {
+		SpillPartitions_Free(op->spill);
+		op->spill = NULL;
+	}
+
+	if(op->pending) {
+		array_free_cb(op->pending, SpillPartitions_Free);
+		op->pending = NULL;
+	}
+}
+
 OpBase *NewDistinctOp(const ExecutionPlan *plan, const char **aliases, uint alias_count) {
 	ASSERT(aliases != NULL);
 	ASSERT(alias_count > 0);
@@ -61,22 +136,32 @@ OpBase *NewDistinctOp(const ExecutionPlan *plan, const char **aliases, uint alia
 	op->aliases         =  rm_malloc(alias_count * sizeof(const char *));
 	op->offset_count    =  alias_count;
 	op->offsets         =  rm_calloc(op->offset_count, sizeof(uint));
+	op->spill           =  NULL;
+	op->input           =  NULL;
+	op->pending         =  NULL;
+	op->spill_depth     =  0;
 
 	// Copy aliases into heap array managed by this op
 	memcpy(op->aliases, aliases, alias_count * sizeof(const char *));
 
-	OpBase_Init((OpBase *)op, OPType_DISTINCT, "Distinct", NULL, DistinctConsume,
+	OpBase_Init((OpBase *)op, OPType_DISTINCT, "Distinct", DistinctInit, DistinctConsume,
 				NULL, NULL, DistinctClone, DistinctFree, false, plan);
 
 	return (OpBase *)op;
 }
 
+static OpResult DistinctInit(OpBase *opBase) {
+	OpDistinct *op = (OpDistinct *)opBase;
+	// records exceeding the memory budget are spilled to disk
+	SpillBudget_Init(&op->budget);
+	return OP_OK;
+}
+
 static Record DistinctConsume(OpBase *opBase) {
 	OpDistinct *op = (OpDistinct *)opBase;
-	OpBase *child = op->op.children[0];
 
 	while(true) {
-		Record r = OpBase_Consume(child);
+		Record r = _nextRecord(op);
 		if(!r) return NULL;
 
 		// update offsets if record mapping changed
@@ -94,8 +179,25 @@ static Record DistinctConsume(OpBase *opBase) {
 		}
 
 		unsigned long long const hash = _compute_hash(op, r);
+
+		if(op->spill != NULL) {
+			// memory budget exhausted, only records seen before
+			// can be discarded, spill unseen records
+			if(raxFind(op->found, (unsigned char *) &hash, sizeof(hash)) ==
+					raxNotFound) {
+				SpillPartitions_Add(op->spill, hash, r);
+			}
+			OpBase_DeleteRecord(r);
+			continue;
+		}
+
 		int is_new = raxInsert(op->found, (unsigned char *) &hash, sizeof(hash), NULL, NULL);
-		if(is_new) return r;
+		if(is_new) {
+			if(SpillBudget_Add(&op->budget) && op->spill_depth < SPILL_MAX_DEPTH) {
+				op->spill = SpillPartitions_New(op->spill_depth);
+			}
+			return r;
+		}
 		OpBase_DeleteRecord(r);
 	}
 }
@@ -122,5 +224,7 @@ static void DistinctFree(OpBase *ctx) {
 		rm_free(op->offsets);
 		op->offsets = NULL;
 	}
+
+	_freeSpill(op);
 }
 
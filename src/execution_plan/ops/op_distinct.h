@@ -9,6 +9,7 @@
 #include "op.h"
 #include "rax.h"
 #include "../execution_plan.h"
+#include "shared/spill_functions.h"
 
 typedef struct {
 	OpBase op;
@@ -17,7 +18,11 @@ typedef struct {
 	uint *offsets;         // offsets to expression values
 	const char **aliases;  // expression aliases to distinct by
 	uint offset_count;     // number of offsets
-
+	SpillBudget budget;          // decides when unseen records are spilled
+	SpillPartitions *spill;      // records spilled while processing current input
+	SpillPartitions **pending;   // spilled partitions yet to be processed
+	SpillFile *input;            // spilled partition being processed
+	uint spill_depth;            // partitioning depth of current input spills
 } OpDistinct;
 
 OpBase *NewDistinctOp(const ExecutionPlan *plan, const char **aliases, uint alias_count);
@@ -36,7 +36,7 @@ OpBase *NewEdgeIndexScanOp
 	const ExecutionPlan *plan,
 	Graph *g,
 	QGEdge *e,
-	RSIndex *idx,
+	Index *idx,
 	FT_FilterNode *filter
 ) {
 	// validate inputs
@@ -223,7 +223,7 @@ pull_index:
 	//--------------------------------------------------------------------------
 
 	if(op->iter != NULL && op->child_record != NULL) {
-		while((edgeKey = RediSearch_ResultsIteratorNext(op->iter, op->idx, NULL))
+		while((edgeKey = RediSearch_ResultsIteratorNext(op->iter, op->idx->idx, NULL))
 				!= NULL) {
 			// populate record with edge
 			_UpdateRecord(op, op->child_record, edgeKey);
@@ -292,7 +292,7 @@ pull_index:
 
 		// create iterator
 		ASSERT(rs_query_node != NULL);
-		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx);
+		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx->idx);
 	} else {
 		// build index query only once (first call)
 		// reset it if already initialized
@@ -301,7 +301,7 @@ pull_index:
 			RSQNode *rs_query_node = FilterTreeToQueryNode(
 					&op->unresolved_filters, op->filter, op->idx);
 			ASSERT(rs_query_node != NULL);
-			op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx);
+			op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx->idx);
 		} else {
 			// reset existing iterator
 			RediSearch_ResultsIteratorReset(op->iter);
@@ -325,14 +325,14 @@ static Record EdgeIndexScanConsume
 		RSQNode *rs_query_node = FilterTreeToQueryNode(&op->unresolved_filters,
 				op->filter, op->idx);
 
-		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx);
+		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx->idx);
 	}
 
 	const EdgeIndexKey *edgeKey = NULL;
 
 	// populate the Record with the actual edge
 	Record r = OpBase_CreateRecord((OpBase *)op);
-	while((edgeKey = RediSearch_ResultsIteratorNext(op->iter, op->idx, NULL))
+	while((edgeKey = RediSearch_ResultsIteratorNext(op->iter, op->idx->idx, NULL))
 			!= NULL) {
 		// populate record with edge
 		_UpdateRecord(op, r, edgeKey);
@@ -9,6 +9,7 @@
 
 /* Forward declarations. */
 static Record FilterConsume(OpBase *opBase);
+static uint FilterConsumeBatch(OpBase *opBase, Record *batch, uint cap);
 static OpBase *FilterClone(const ExecutionPlan *plan, const OpBase *opBase);
 static void FilterFree(OpBase *opBase);
 
@@ -19,6 +20,7 @@ OpBase *NewFilterOp(const ExecutionPlan *plan, FT_FilterNode *filterTree) {
 	// Set our Op operations
 	OpBase_Init((OpBase *)op, OPType_FILTER, "Filter", NULL, FilterConsume,
 				NULL, NULL, FilterClone, FilterFree, false, plan);
+	OpBase_UpdateConsumeBatch((OpBase *)op, FilterConsumeBatch);
 
 	return (OpBase *)op;
 }
@@ -42,6 +44,29 @@ static Record FilterConsume(OpBase *opBase) {
 	return r;
 }
 
+/* FilterConsumeBatch consumes a batch of records from child
+ * and compacts it in place to the records passing the filter tree,
+ * returns 0 only once child is depleted. */
+static uint FilterConsumeBatch(OpBase *opBase, Record *batch, uint cap) {
+	OpFilter *filter = (OpFilter *)opBase;
+	OpBase *child = filter->op.children[0];
+
+	uint n = 0;
+	while(n == 0) {
+		uint count = OpBase_ConsumeBatch(child, batch, cap);
+		if(count == 0) break;
+
+		for(uint i = 0; i < count; i++) {
+			Record r = batch[i];
+			/* Pass record through filter tree */
+			if(FilterTree_applyFilters(filter->filterTree, r) == FILTER_PASS) batch[n++] = r;
+			else OpBase_DeleteRecord(r);
+		}
+	}
+
+	return n;
+}
+
 static inline OpBase *FilterClone(const ExecutionPlan *plan, const OpBase *opBase) {
 	ASSERT(opBase->type == OPType_FILTER);
 	OpFilter *op = (OpFilter *)opBase;
@@ -36,6 +36,17 @@ static void _eval_limit(OpLimit *op, AR_ExpNode *limit_exp) {
 	AR_EXP_Free(limit_exp);
 }
 
+void LimitOp_EvaluateLimit(OpLimit *op) {
+	ASSERT(op != NULL);
+	ASSERT(op->limit_exp != NULL);
+
+	// the stored expression is consumed by the evaluation
+	// and replaced with a fresh copy
+	AR_ExpNode *limit_exp = op->limit_exp;
+	op->limit_exp = NULL;
+	_eval_limit(op, limit_exp);
+}
+
 OpBase *NewLimitOp(const ExecutionPlan *plan, AR_ExpNode *limit_exp) {
 	// validate inputs
 	ASSERT(plan != NULL);
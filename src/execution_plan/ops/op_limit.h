@@ -19,3 +19,6 @@ typedef struct {
 // Limits number of produced records
 OpBase *NewLimitOp(const ExecutionPlan *plan, AR_ExpNode *limit_exp);
 
+// re-evaluates the limit expression against the current query parameters
+void LimitOp_EvaluateLimit(OpLimit *op);
+
@@ -6,12 +6,21 @@
 
 #include "op_node_by_index_scan.h"
 #include "../../query_ctx.h"
+#include "../../util/arr.h"
+#include "../../util/qsort.h"
 #include "shared/print_functions.h"
 #include "../../filter_tree/ft_to_rsq.h"
 
+#include <math.h>
+
+// max number of nodes sorted at once by an ordered scan
+// value ranges holding more nodes are split
+#define ORDERED_SCAN_RANGE_CAP 1024
+
 // forward declarations
 static OpResult IndexScanInit(OpBase *opBase);
 static Record IndexScanConsume(OpBase *opBase);
+static Record IndexScanConsumeOrdered(OpBase *opBase);
 static Record IndexScanConsumeFromChild(OpBase *opBase);
 static OpResult IndexScanReset(OpBase *opBase);
 static void IndexScanFree(OpBase *opBase);
@@ -19,10 +28,14 @@ static void IndexScanFree(OpBase *opBase);
 static void IndexScanToString(const OpBase *ctx, sds *buf) {
 	IndexScan *op = (IndexScan *)ctx;
 	ScanToString(ctx, buf, op->n.alias, op->n.label);
+	if(op->sort_attr != NULL) {
+		*buf = sdscatprintf(*buf, " | Ordered by %s.%s %s", op->n.alias,
+				op->sort_attr, op->ascending ? "ASC" : "DESC");
+	}
 }
 
 OpBase *NewIndexScanOp(const ExecutionPlan *plan, Graph *g, NodeScanCtx n,
-		RSIndex *idx, FT_FilterNode *filter) {
+		Index *idx, FT_FilterNode *filter) {
 	// validate inputs
 	ASSERT(g      != NULL);
 	ASSERT(idx    != NULL);
@@ -38,6 +51,12 @@ OpBase *NewIndexScanOp(const ExecutionPlan *plan, Graph *g, NodeScanCtx n,
 	op->child_record         =  NULL;
 	op->unresolved_filters   =  NULL;
 	op->rebuild_index_query  =  false;
+	op->sort_attr            =  NULL;
+	op->sort_attr_id         =  ATTRIBUTE_ID_NONE;
+	op->ascending            =  true;
+	op->ranges               =  NULL;
+	op->ordered              =  NULL;
+	op->ordered_idx          =  0;
 
 	// Set our Op operations
 	OpBase_Init((OpBase *)op, OPType_NODE_BY_INDEX_SCAN, "Node By Index Scan", IndexScanInit, IndexScanConsume,
@@ -60,6 +79,10 @@ static OpResult IndexScanInit(OpBase *opBase) {
 		raxFree(entities);
 
 		OpBase_UpdateConsume(opBase, IndexScanConsumeFromChild);
+	} else if(op->sort_attr != NULL) {
+		GraphContext *gc = QueryCtx_GetGraphCtx();
+		op->sort_attr_id = GraphContext_GetAttributeID(gc, op->sort_attr);
+		OpBase_UpdateConsume(opBase, IndexScanConsumeOrdered);
 	}
 
 	// resolve label ID now if it is still unknown
@@ -97,7 +120,7 @@ pull_index:
 	//--------------------------------------------------------------------------
 
 	if(op->iter != NULL && op->child_record != NULL) {
-		while((nodeId = RediSearch_ResultsIteratorNext(op->iter, op->idx, NULL))
+		while((nodeId = RediSearch_ResultsIteratorNext(op->iter, op->idx->idx, NULL))
 				!= NULL) {
 			// populate record with node
 			_UpdateRecord(op, op->child_record, *nodeId);
@@ -164,7 +187,7 @@ pull_index:
 
 		// create iterator
 		ASSERT(rs_query_node != NULL);
-		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx);
+		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx->idx);
 	} else {
 		// build index query only once (first call)
 		// reset it if already initialized
@@ -172,7 +195,7 @@ pull_index:
 			// first call to consume, create query and iterator
 			RSQNode *rs_query_node = FilterTreeToQueryNode(&op->unresolved_filters, op->filter, op->idx);
 			ASSERT(rs_query_node != NULL);
-			op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx);
+			op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx->idx);
 		} else {
 			// reset existing iterator
 			RediSearch_ResultsIteratorReset(op->iter);
@@ -191,14 +214,14 @@ static Record IndexScanConsume(OpBase *opBase) {
 		RSQNode *rs_query_node = FilterTreeToQueryNode(&op->unresolved_filters,
 				op->filter, op->idx);
 
-		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx);
+		op->iter = RediSearch_GetResultsIterator(rs_query_node, op->idx->idx);
 	}
 
 	const EntityID *nodeId = NULL;
 
 	// populate the Record with the actual node
 	Record r = OpBase_CreateRecord((OpBase *)op);
-	while((nodeId = RediSearch_ResultsIteratorNext(op->iter, op->idx, NULL))
+	while((nodeId = RediSearch_ResultsIteratorNext(op->iter, op->idx->idx, NULL))
 			!= NULL) {
 		// populate record with node
 		_UpdateRecord(op, r, *nodeId);
@@ -213,9 +236,224 @@ static Record IndexScanConsume(OpBase *opBase) {
 	return NULL;
 }
 
+//------------------------------------------------------------------------------
+// ordered scan
+//------------------------------------------------------------------------------
+
+// the index doesn't iterate in value order, instead the ordering attribute's
+// value domain is split into ranges which are queried in order
+// a range holding too many nodes is split in half before its nodes are sorted
+// as such only nodes within ranges reached by the consumer are visited
+
+void IndexScanOp_SetOrder
+(
+	IndexScan *op,
+	const char *attr,
+	bool ascending
+) {
+	ASSERT(op   != NULL);
+	ASSERT(attr != NULL);
+
+	op->sort_attr = attr;
+	op->ascending = ascending;
+}
+
+static int _OrderedNodeCmp
+(
+	const IndexScanOrderedNode *a,
+	const IndexScanOrderedNode *b,
+	const IndexScan *op
+) {
+	int rel = (a->v > b->v) - (a->v < b->v);
+	return op->ascending ? rel : -rel;
+}
+
+// append predicate 'attr OP v' to filter tree
+static FT_FilterNode *_AppendBound
+(
+	const IndexScan *op,
+	FT_FilterNode *root,
+	AST_Operator cmp,
+	double v
+) {
+	AR_ExpNode *entity = AR_EXP_NewVariableOperandNode(op->n.alias);
+	AR_ExpNode *lhs = AR_EXP_NewAttributeAccessNode(entity, op->sort_attr);
+	AR_ExpNode *rhs = AR_EXP_NewConstOperandNode(SI_DoubleVal(v));
+	FT_FilterNode *pred = FilterTree_CreatePredicateFilter(cmp, lhs, rhs);
+
+	FT_FilterNode *and = FilterTree_CreateConditionFilter(OP_AND);
+	FilterTree_AppendLeftChild(and, root);
+	FilterTree_AppendRightChild(and, pred);
+	return and;
+}
+
+// split range at a value strictly within its bounds
+// returns false if range can't be split
+static bool _SplitRange
+(
+	const IndexScanRange *r,
+	IndexScanRange *lower,
+	IndexScanRange *upper
+) {
+	double m;
+	if(isinf(r->lo) && isinf(r->hi)) {
+		m = 0;
+	} else if(isinf(r->lo)) {
+		// grow exponentially towards -inf
+		m = (r->hi > 0) ? 0 : (r->hi * 2) - 1;
+	} else if(isinf(r->hi)) {
+		// grow exponentially towards +inf
+		m = (r->lo < 0) ? 0 : (r->lo * 2) + 1;
+	} else {
+		m = r->lo + (r->hi - r->lo) / 2;
+	}
+
+	if(!(m > r->lo && m < r->hi)) return false;
+
+	*lower = (IndexScanRange){r->lo, m, r->include_lo, false};
+	*upper = (IndexScanRange){m, r->hi, true, r->include_hi};
+	return true;
+}
+
+// collect nodes whose ordering attribute is within range 'r'
+// returns false if range holds more than 'cap' nodes
+static bool _CollectRange
+(
+	IndexScan *op,
+	const IndexScanRange *r,
+	uint cap
+) {
+	// restrict scan's filter to range
+	FT_FilterNode *filter = FilterTree_Clone(op->filter);
+	if(!isinf(r->lo)) {
+		filter = _AppendBound(op, filter, r->include_lo ? OP_GE : OP_GT, r->lo);
+	}
+	if(!isinf(r->hi)) {
+		filter = _AppendBound(op, filter, r->include_hi ? OP_LE : OP_LT, r->hi);
+	}
+
+	if(op->unresolved_filters != NULL) {
+		FilterTree_Free(op->unresolved_filters);
+		op->unresolved_filters = NULL;
+	}
+
+	RSQNode *rs_query_node = FilterTreeToQueryNode(&op->unresolved_filters,
+			filter, op->idx);
+	FilterTree_Free(filter);
+
+	// the iterator read locks the index, free it before handing out records
+	const EntityID *nodeId = NULL;
+	RSResultsIterator *iter = RediSearch_GetResultsIterator(rs_query_node,
+			op->idx->idx);
+
+	array_clear(op->ordered);
+	op->ordered_idx = 0;
+
+	while((nodeId = RediSearch_ResultsIteratorNext(iter, op->idx->idx, NULL))
+			!= NULL) {
+		if(array_len(op->ordered) == cap) {
+			RediSearch_ResultsIteratorFree(iter);
+			return false;
+		}
+
+		Node n = GE_NEW_NODE();
+		Graph_GetNode(op->g, *nodeId, &n);
+		SIValue *v = GraphEntity_GetProperty((GraphEntity *)&n,
+				op->sort_attr_id);
+		ASSERT(SI_TYPE(*v) & SI_NUMERIC);
+
+		IndexScanOrderedNode entry = {*nodeId, SI_GET_NUMERIC(*v)};
+		array_append(op->ordered, entry);
+	}
+
+	RediSearch_ResultsIteratorFree(iter);
+
+	sort_r(op->ordered, array_len(op->ordered), sizeof(IndexScanOrderedNode),
+			(int (*)(const void *, const void *, void *))_OrderedNodeCmp, op);
+
+	return true;
+}
+
+// load the next range of ordered nodes
+// returns false once all ranges were scanned
+static bool _NextRange
+(
+	IndexScan *op
+) {
+	while(array_len(op->ranges) > 0) {
+		IndexScanRange r = array_pop(op->ranges);
+
+		if(_CollectRange(op, &r, ORDERED_SCAN_RANGE_CAP)) return true;
+
+		IndexScanRange lower;
+		IndexScanRange upper;
+		if(!_SplitRange(&r, &lower, &upper)) {
+			// all nodes share the same value, collect them all
+			_CollectRange(op, &r, UINT_MAX);
+			return true;
+		}
+
+		// push next range to scan last
+		if(op->ascending) {
+			array_append(op->ranges, upper);
+			array_append(op->ranges, lower);
+		} else {
+			array_append(op->ranges, lower);
+			array_append(op->ranges, upper);
+		}
+	}
+
+	return false;
+}
+
+static Record IndexScanConsumeOrdered(OpBase *opBase) {
+	IndexScan *op = (IndexScan *)opBase;
+
+	// first call, scan entire value domain
+	if(op->ranges == NULL) {
+		op->ranges = array_new(IndexScanRange, 1);
+		op->ordered = array_new(IndexScanOrderedNode, 0);
+		IndexScanRange r = {-INFINITY, INFINITY, true, true};
+		array_append(op->ranges, r);
+	}
+
+	// attribute doesn't exists, no node is indexed by it
+	if(op->sort_attr_id == ATTRIBUTE_ID_NONE) return NULL;
+
+	Record r = OpBase_CreateRecord((OpBase *)op);
+	while(true) {
+		while(op->ordered_idx < array_len(op->ordered)) {
+			EntityID id = op->ordered[op->ordered_idx++].id;
+			_UpdateRecord(op, r, id);
+			if(_PassUnresolvedFilters(op, r)) return r;
+		}
+
+		if(!_NextRange(op)) break;
+	}
+
+	OpBase_DeleteRecord(r);
+	return NULL;
+}
+
+static void _FreeOrderedState(IndexScan *op) {
+	if(op->ranges) {
+		array_free(op->ranges);
+		op->ranges = NULL;
+	}
+
+	if(op->ordered) {
+		array_free(op->ordered);
+		op->ordered = NULL;
+	}
+
+	op->ordered_idx = 0;
+}
+
 static OpResult IndexScanReset(OpBase *opBase) {
 	IndexScan *op = (IndexScan *)opBase;
 
+	_FreeOrderedState(op);
+
 	if(op->iter) {
 		RediSearch_ResultsIteratorFree(op->iter);
 		op->iter = NULL;
@@ -231,6 +469,8 @@ static OpResult IndexScanReset(OpBase *opBase) {
 
 static void IndexScanFree(OpBase *opBase) {
 	IndexScan *op = (IndexScan *)opBase;
+
+	_FreeOrderedState(op);
 	/* As long as this Index iterator is alive the index is
 	 * read locked, if this index scan operation is part of
 	 * a query which will modified this index we'll be stuck in
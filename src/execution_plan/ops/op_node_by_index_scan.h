@@ -13,20 +13,44 @@
 #include "shared/scan_functions.h"
 #include "redisearch_api.h"
 
+// range of ordering attribute values
+typedef struct {
+	double lo;         // range lower bound
+	double hi;         // range upper bound
+	bool include_lo;   // lower bound is inclusive
+	bool include_hi;   // upper bound is inclusive
+} IndexScanRange;
+
+// node and its ordering attribute value
+typedef struct {
+	EntityID id;  // node ID
+	double v;     // ordering attribute value
+} IndexScanOrderedNode;
+
 typedef struct {
 	OpBase op;
 	Graph *g;
 	bool rebuild_index_query;           // should we rebuild RediSearch index query for each input record
-	RSIndex *idx;                       // index to query
+	Index *idx;                         // index to query
 	NodeScanCtx n;                      // label data of node being scanned
 	uint nodeRecIdx;                    // index of the node being scanned in the Record
 	RSResultsIterator *iter;            // rediSearch iterator over an index with the appropriate filters
 	FT_FilterNode *filter;              // filter from which to compose index query
 	FT_FilterNode *unresolved_filters;  // subset of filter, contains filters that couldn't be resolved by index
 	Record child_record;                // the Record this op acts on if it is not a tap
+	const char *sort_attr;              // attribute nodes are ordered by, NULL if unordered
+	Attribute_ID sort_attr_id;          // ID of ordering attribute
+	bool ascending;                     // ordering direction
+	IndexScanRange *ranges;             // pending ranges of ordering attribute values, next range last
+	IndexScanOrderedNode *ordered;      // ordered nodes of the current range
+	uint ordered_idx;                   // next ordered node to produce
 } IndexScan;
 
 // creates a new IndexScan operation
 OpBase *NewIndexScanOp(const ExecutionPlan *plan, Graph *g, NodeScanCtx n,
-		RSIndex *idx, FT_FilterNode *filter);
+		Index *idx, FT_FilterNode *filter);
+
+// produce nodes ordered by numeric attribute 'attr'
+// the scan's filter must restrict 'attr' to numeric values
+void IndexScanOp_SetOrder(IndexScan *op, const char *attr, bool ascending);
 
@@ -13,6 +13,7 @@
 /* Forward declarations. */
 static OpResult NodeByLabelScanInit(OpBase *opBase);
 static Record NodeByLabelScanConsume(OpBase *opBase);
+static uint NodeByLabelScanConsumeBatch(OpBase *opBase, Record *batch, uint cap);
 static Record NodeByLabelScanConsumeFromChild(OpBase *opBase);
 static Record NodeByLabelScanNoOp(OpBase *opBase);
 static OpResult NodeByLabelScanReset(OpBase *opBase);
@@ -114,6 +115,7 @@ static OpResult NodeByLabelScanInit(OpBase *opBase) {
 		return OP_OK;
 	}
 
+	OpBase_UpdateConsumeBatch(opBase, NodeByLabelScanConsumeBatch);
 	return OP_OK;
 }
 
@@ -196,6 +198,23 @@ static Record NodeByLabelScanConsume(OpBase *opBase) {
 	return r;
 }
 
+static uint NodeByLabelScanConsumeBatch(OpBase *opBase, Record *batch, uint cap) {
+	NodeByLabelScan *op = (NodeByLabelScan *)opBase;
+
+	uint n = 0;
+	GrB_Index nodeId;
+	while(n < cap &&
+		  RG_MatrixTupleIter_next_BOOL(&op->iter, &nodeId, NULL, NULL) ==
+		  GrB_SUCCESS) {
+		Record r = OpBase_CreateRecord(opBase);
+		// Populate the Record with the actual node.
+		_UpdateRecord(op, r, nodeId);
+		batch[n++] = r;
+	}
+
+	return n;
+}
+
 /* This function is invoked when the op has no children and no valid label is requested (either no label, or non existing label).
  * The op simply needs to return NULL */
 static Record NodeByLabelScanNoOp(OpBase *opBase) {
@@ -123,11 +123,12 @@ static Record ProcCallConsume(OpBase *opBase) {
 		Proc_Free(op->procedure);
 		op->procedure = Proc_Get(op->proc_name);
 
-		// at the moment the only two procedures that can modify the graph are:
+		// at the moment the only procedures that can modify the graph are:
 		// proc_fulltext_create_index
 		// proc_fulltext_drop_index
-		// both perform the modification once invoked without returning any
-		// additional data (consume/step) function
+		// proc_analyze
+		// all perform the modification once invoked without modifying
+		// anything in their (consume/step) function
 		// this is why acquiring the write lock as we do below works
 		// we will have to revisit this logic once new "write" procedures are
 		// introduced
@@ -13,6 +13,7 @@
 
 /* Forward declarations. */
 static Record ProjectConsume(OpBase *opBase);
+static uint ProjectConsumeBatch(OpBase *opBase, Record *batch, uint cap);
 static OpResult ProjectReset(OpBase *opBase);
 static OpBase *ProjectClone(const ExecutionPlan *plan, const OpBase *opBase);
 static void ProjectFree(OpBase *opBase);
@@ -29,6 +30,7 @@ OpBase *NewProjectOp(const ExecutionPlan *plan, AR_ExpNode **exps) {
 	// Set our Op operations
 	OpBase_Init((OpBase *)op, OPType_PROJECT, "Project", NULL, ProjectConsume,
 				ProjectReset, NULL, ProjectClone, ProjectFree, false, plan);
+	OpBase_UpdateConsumeBatch((OpBase *)op, ProjectConsumeBatch);
 
 	for(uint i = 0; i < op->exp_count; i ++) {
 		// The projected record will associate values with their resolved name
@@ -40,22 +42,10 @@ OpBase *NewProjectOp(const ExecutionPlan *plan, AR_ExpNode **exps) {
 	return (OpBase *)op;
 }
 
-static Record ProjectConsume(OpBase *opBase) {
-	OpProject *op = (OpProject *)opBase;
-
-	if(op->op.childCount) {
-		OpBase *child = op->op.children[0];
-		op->r = OpBase_Consume(child);
-		if(!op->r) return NULL;
-	} else {
-		// QUERY: RETURN 1+2
-		// Return a single record followed by NULL on the second call.
-		if(op->singleResponse) return NULL;
-		op->singleResponse = true;
-		op->r = OpBase_CreateRecord(opBase);
-	}
-
-	op->projection = OpBase_CreateRecord(opBase);
+// evaluate projected expressions against op->r
+// returns the projected record, op->r is released
+static Record _Project(OpProject *op) {
+	op->projection = OpBase_CreateRecord((OpBase *)op);
 
 	for(uint i = 0; i < op->exp_count; i++) {
 		AR_ExpNode *exp = op->exps[i];
@@ -83,6 +73,44 @@ static Record ProjectConsume(OpBase *opBase) {
 	return projection;
 }
 
+static Record ProjectConsume(OpBase *opBase) {
+	OpProject *op = (OpProject *)opBase;
+
+	if(op->op.childCount) {
+		OpBase *child = op->op.children[0];
+		op->r = OpBase_Consume(child);
+		if(!op->r) return NULL;
+	} else {
+		// QUERY: RETURN 1+2
+		// Return a single record followed by NULL on the second call.
+		if(op->singleResponse) return NULL;
+		op->singleResponse = true;
+		op->r = OpBase_CreateRecord(opBase);
+	}
+
+	return _Project(op);
+}
+
+static uint ProjectConsumeBatch(OpBase *opBase, Record *batch, uint cap) {
+	OpProject *op = (OpProject *)opBase;
+
+	// QUERY: RETURN 1+2
+	if(op->op.childCount == 0) {
+		batch[0] = ProjectConsume(opBase);
+		return (batch[0] != NULL);
+	}
+
+	// project each record of the child's batch in place
+	OpBase *child = op->op.children[0];
+	uint n = OpBase_ConsumeBatch(child, batch, cap);
+	for(uint i = 0; i < n; i++) {
+		op->r = batch[i];
+		batch[i] = _Project(op);
+	}
+
+	return n;
+}
+
 static OpResult ProjectReset(OpBase *opBase) {
 	OpProject *op = (OpProject *)opBase;
 	op->singleResponse = false;
@@ -14,6 +14,7 @@
 
 /* Forward declarations. */
 static Record ResultsConsume(OpBase *opBase);
+static uint ResultsConsumeBatch(OpBase *opBase, Record *batch, uint cap);
 static OpResult ResultsInit(OpBase *opBase);
 static OpBase *ResultsClone(const ExecutionPlan *plan, const OpBase *opBase);
 
@@ -23,6 +24,7 @@ OpBase *NewResultsOp(const ExecutionPlan *plan) {
 	// Set our Op operations
 	OpBase_Init((OpBase *)op, OPType_RESULTS, "Results", ResultsInit, ResultsConsume,
 				NULL, NULL, ResultsClone, NULL, false, plan);
+	OpBase_UpdateConsumeBatch((OpBase *)op, ResultsConsumeBatch);
 
 	return (OpBase *)op;
 }
@@ -61,6 +63,24 @@ static Record ResultsConsume(OpBase *opBase) {
 	return r;
 }
 
+/* Results consume batch operation
+ * appends a batch of records to the result set */
+static uint ResultsConsumeBatch(OpBase *opBase, Record *batch, uint cap) {
+	Results *op = (Results *)opBase;
+
+	// enforce result-set size limit
+	if(op->result_set_size_limit == 0) return 0;
+	if(cap > op->result_set_size_limit) cap = op->result_set_size_limit;
+
+	OpBase *child = op->op.children[0];
+	uint n = OpBase_ConsumeBatch(child, batch, cap);
+	op->result_set_size_limit -= n;
+
+	// append to final result set
+	for(uint i = 0; i < n; i++) ResultSet_AddRecord(op->result_set, batch[i]);
+	return n;
+}
+
 static inline OpBase *ResultsClone(const ExecutionPlan *plan, const OpBase *opBase) {
 	ASSERT(opBase->type == OPType_RESULTS);
 	return NewResultsOp(plan);
@@ -36,6 +36,17 @@ static void _eval_skip(OpSkip *op, AR_ExpNode *skip_exp) {
 	AR_EXP_Free(skip_exp);
 }
 
+void SkipOp_EvaluateSkip(OpSkip *op) {
+	ASSERT(op != NULL);
+	ASSERT(op->skip_exp != NULL);
+
+	// the stored expression is consumed by the evaluation
+	// and replaced with a fresh copy
+	AR_ExpNode *skip_exp = op->skip_exp;
+	op->skip_exp = NULL;
+	_eval_skip(op, skip_exp);
+}
+
 OpBase *NewSkipOp(const ExecutionPlan *plan, AR_ExpNode *skip_exp) {
 	OpSkip *op = rm_malloc(sizeof(OpSkip));
 	op->skip = 0;
@@ -19,3 +19,6 @@ typedef struct {
 // Skips 'n' records.
 OpBase *NewSkipOp(const ExecutionPlan *plan, AR_ExpNode *skip_exp);
 
+// re-evaluates the skip expression against the current query parameters
+void SkipOp_EvaluateSkip(OpSkip *op);
+
@@ -49,6 +49,96 @@ static int _buffer_elem_cmp
 	return _record_cmp(*a, *b, op);
 }
 
+// compares the head records of two runs
+// the heap polls its greatest item, flip comparison to poll smallest record
+static int _run_cmp
+(
+	const SortRun *a,
+	const SortRun *b,
+	OpSort *op
+) {
+	return _record_cmp(b->head, a->head, op);
+}
+
+// sort buffered records and write them to disk as a sorted run
+static void _spill_run
+(
+	OpSort *op
+) {
+	uint count = array_len(op->buffer);
+	sort_r(op->buffer, count, sizeof(Record), (heap_cmp)_buffer_elem_cmp, op);
+
+	SpillFile *run = SpillFile_New();
+	for(uint i = 0; i < count; i++) {
+		SpillFile_WriteRecord(run, op->buffer[i]);
+		OpBase_DeleteRecord(op->buffer[i]);
+	}
+
+	array_clear(op->buffer);
+	array_append(op->runs, run);
+	SpillBudget_Reset(&op->budget);
+}
+
+// prepare spilled runs for a k-way merge
+static void _merge_runs
+(
+	OpSort *op
+) {
+	// spill remaining records as the last run
+	if(array_len(op->buffer) > 0) _spill_run(op);
+
+	uint run_count = array_len(op->runs);
+	op->merge_runs = rm_malloc(sizeof(SortRun) * run_count);
+	op->merge = Heap_new((heap_cmp)_run_cmp, op);
+
+	for(uint i = 0; i < run_count; i++) {
+		SortRun *run = op->merge_runs + i;
+		run->run = op->runs[i];
+		SpillFile_Rewind(run->run);
+		run->head = SpillFile_ReadRecord(run->run);
+		if(run->head != NULL) Heap_offer(&op->merge, run);
+	}
+}
+
+// hands out the smallest head record among all runs
+static Record _merge_next
+(
+	OpSort *op
+) {
+	SortRun *run = Heap_poll(op->merge);
+	if(run == NULL) return NULL;
+
+	Record r = run->head;
+	run->head = SpillFile_ReadRecord(run->run);
+	if(run->head != NULL) Heap_offer(&op->merge, run);
+
+	return r;
+}
+
+// free spilled runs along with any record not yet handed out
+static void _free_runs
+(
+	OpSort *op
+) {
+	if(op->merge) {
+		SortRun *run;
+		while((run = Heap_poll(op->merge)) != NULL) {
+			OpBase_DeleteRecord(run->head);
+		}
+		Heap_free(op->merge);
+		op->merge = NULL;
+	}
+
+	if(op->merge_runs) {
+		rm_free(op->merge_runs);
+		op->merge_runs = NULL;
+	}
+
+	uint run_count = array_len(op->runs);
+	for(uint i = 0; i < run_count; i++) SpillFile_Free(op->runs[i]);
+	array_clear(op->runs);
+}
+
 static void _accumulate
 (
 	OpSort *op,
@@ -57,6 +147,8 @@ static void _accumulate
 	if(op->limit == UNLIMITED) {
 		// not using a heap and there's room for record
 		array_append(op->buffer, r);
+		// spill buffered records once memory budget is exhausted
+		if(SpillBudget_Add(&op->budget)) _spill_run(op);
 		return;
 	}
 
@@ -76,6 +168,7 @@ static void _accumulate
 }
 
 static inline Record _handoff(OpSort *op) {
+	if(op->merge) return _merge_next(op);
 	if(op->record_idx < array_len(op->buffer)) {
 		return op->buffer[op->record_idx++];
 	}
@@ -95,6 +188,9 @@ OpBase *NewSortOp
 	op->skip       = 0;
 	op->limit      = UNLIMITED;
 	op->buffer     = NULL;
+	op->runs       = NULL;
+	op->merge      = NULL;
+	op->merge_runs = NULL;
 	op->record_idx = 0;
 	op->directions = directions;
 
@@ -127,7 +223,10 @@ static OpResult SortInit(OpBase *opBase) {
 		op->heap = Heap_new((heap_cmp)_record_cmp, op);
 	} else {
 		// if all records are being sorted, use quicksort
+		// runs exceeding the memory budget are sorted and spilled to disk
+		op->runs = array_new(SpillFile *, 0);
 		op->buffer = array_new(Record, 32);
+		SpillBudget_Init(&op->budget);
 	}
 
 	return OP_OK;
@@ -142,13 +241,18 @@ static Record SortConsume(OpBase *opBase) {
 	// try to get records
 	OpBase *child = op->op.children[0];
 	bool newData = false;
-	while((r = OpBase_Consume(child))) {
-		_accumulate(op, r);
+	uint n;
+	Record batch[OP_BATCH_SIZE];
+	while((n = OpBase_ConsumeBatch(child, batch, OP_BATCH_SIZE)) > 0) {
+		for(uint i = 0; i < n; i++) _accumulate(op, batch[i]);
 		newData = true;
 	}
 	if(!newData) return NULL;
 
-	if(op->buffer) {
+	if(op->runs && array_len(op->runs) > 0) {
+		// records were spilled, merge sorted runs
+		_merge_runs(op);
+	} else if(op->buffer) {
 		sort_r(op->buffer, array_len(op->buffer), sizeof(Record),
 				(heap_cmp)_buffer_elem_cmp, op);
 	} else {
@@ -186,6 +290,11 @@ static OpResult SortReset(OpBase *ctx) {
 		array_clear(op->buffer);
 	}
 
+	if(op->runs) {
+		_free_runs(op);
+		SpillBudget_Reset(&op->budget);
+	}
+
 	op->record_idx = 0;
 
 	return OP_OK;
@@ -225,6 +334,12 @@ static void SortFree(OpBase *ctx) {
 		op->buffer = NULL;
 	}
 
+	if(op->runs) {
+		_free_runs(op);
+		array_free(op->runs);
+		op->runs = NULL;
+	}
+
 	if(op->record_offsets) {
 		array_free(op->record_offsets);
 		op->record_offsets = NULL;
@@ -9,8 +9,15 @@
 #include "op.h"
 #include "../../util/heap.h"
 #include "../execution_plan.h"
+#include "shared/spill_functions.h"
 #include "../../arithmetic/arithmetic_expression.h"
 
+// sorted run of records spilled to disk
+typedef struct {
+	Record head;     // smallest record not yet handed out
+	SpillFile *run;  // remaining records of the run
+} SortRun;
+
 typedef struct {
 	OpBase op;
 	uint *record_offsets;       // All Record offsets containing values to sort by.
@@ -21,6 +28,10 @@ typedef struct {
 	int *directions;            // Array of sort directions(ascending / desending) for each item.
 	uint record_idx;            // index of current record to return
 	AR_ExpNode **exps;          // Projected expressons.
+	SpillBudget budget;         // Decides when buffered records are spilled.
+	SpillFile **runs;           // Sorted runs spilled to disk.
+	SortRun *merge_runs;        // Head record of each run being merged.
+	heap_t *merge;              // Orders runs by their head record.
 } OpSort;
 
 /* Creates a new Sort operation */
@@ -7,7 +7,6 @@
 #include "op_value_hash_join.h"
 #include "../../value.h"
 #include "../../util/arr.h"
-#include "../../util/qsort.h"
 #include "../../util/rmalloc.h"
 
 // forward declarations
@@ -16,157 +15,96 @@ static OpResult ValueHashJoinReset(OpBase *opBase);
 static OpBase *ValueHashJoinClone(const ExecutionPlan *plan, const OpBase *opBase);
 static void ValueHashJoinFree(OpBase *opBase);
 
-// Determins order between two records by inspecting
-// element stored at postion idx
-static inline int _record_cmp
-(
-	Record *l,
-	Record *r,
-	uint *_idx
-) {
-	uint    idx = *_idx;
-	SIValue lv  = Record_Get(*l, idx);
-	SIValue rv  = Record_Get(*r, idx);
-	return SIValue_Compare(lv, rv, NULL);
-}
+// marks the end of a bucket's chain
+#define NO_RECORD UINT_MAX
+// min number of hash table buckets
+#define MIN_BUCKET_COUNT 16
 
-// performs binary search, returns the leftmost index of a match
-static bool _binarySearchLeftmost
+// retrive the next cached record intersecting with the current
+// right hand side record, if such exists, otherwise returns NULL
+static Record _get_intersecting_record
 (
-	uint *idx,
-	Record *array,
-	uint array_len,
-	int join_key_idx,
-	SIValue v
+	OpValueHashJoin *op
 ) {
-	ASSERT(idx != NULL);
-
-	SIValue x;
-	uint pos = 0;
-	uint left = 0;
-	uint right = array_len;
-
-	while(left < right) {
-		pos = (right + left) / 2;
-		x = Record_Get(array[pos], join_key_idx);
-		if(SIValue_Compare(x, v, NULL) < 0) left = pos + 1;
-		else right = pos;
+	// scan bucket chain, comparing join values of records sharing
+	// the right hand side hash
+	while(op->probe_idx != NO_RECORD) {
+		uint idx = op->probe_idx;
+		op->probe_idx = op->chain[idx];
+
+		if(op->hashes[idx] != op->rhs_hash) continue;
+
+		Record cr = op->cached_records[idx];
+		SIValue x = Record_Get(cr, op->join_value_rec_idx);
+
+		// skip values which are not equal or evaluated to NULL
+		int disjointOrNull = 0;
+		if(SIValue_Compare(x, op->rhs_value, &disjointOrNull) == 0 &&
+		   disjointOrNull != COMPARED_NULL) {
+			return cr;
+		}
 	}
 
-	// make sure value was found
-	*idx = left;
-
-	if(left == array_len) return false;
-
-	x = Record_Get(array[*idx], join_key_idx);
-	// return false if the value wasn't found or evaluated to NULL
-	int disjointOrNull = 0;
-	return (SIValue_Compare(x, v, &disjointOrNull) == 0 &&
-			disjointOrNull != COMPARED_NULL);
+	return NULL;
 }
 
-// performs binary search, returns the rightmost index of a match
-// assuming 'v' exists in 'array'
-static bool _binarySearchRightmost
+// locate the bucket of cached records intersecting with value 'v'
+static void _set_intersection_idx
 (
-	uint *idx,
-	Record *array,
-	uint array_len,
-	int join_key_idx,
+	OpValueHashJoin *op,
 	SIValue v
 ) {
-	ASSERT(idx != NULL);
-
-	SIValue x;
-	uint pos = 0;
-	uint left = 0;
-	uint right = array_len;
-
-	while(left < right) {
-		pos = (right + left) / 2;
-		x = Record_Get(array[pos], join_key_idx);
-		if(SIValue_Compare(v, x, NULL) < 0) right = pos;
-		else left = pos + 1;
-	}
+	op->rhs_value = v;
+	op->probe_idx = NO_RECORD;
 
-	*idx = right - 1;
-	return true;
+	// NULL can't be compared to other values, no intersecting records
+	if(SIValue_IsNull(v)) return;
+
+	op->rhs_hash  = SIValue_HashCode(v);
+	op->probe_idx = op->buckets[op->rhs_hash & op->bucket_mask];
 }
 
-// retrive the next intersecting record
-// if such exists, otherwise returns NULL
-static Record _get_intersecting_record
+// discard current right hand side record and its join value
+static void _discard_rhs_record
 (
 	OpValueHashJoin *op
 ) {
-	// no more intersecting records
-	if(op->intersect_idx == -1 ||
-	   op->number_of_intersections == 0) return NULL;
-
-	Record cr = op->cached_records[op->intersect_idx];
-
-	// update intersection trackers
-	op->intersect_idx++;
-	op->number_of_intersections--;
+	if(op->rhs_rec) {
+		OpBase_DeleteRecord(op->rhs_rec);
+		op->rhs_rec = NULL;
+	}
 
-	return cr;
+	SIValue_Free(op->rhs_value);
+	op->rhs_value = SI_NullVal();
+	op->probe_idx = NO_RECORD;
 }
 
-// look up first intersecting cached record CR position
-// returns false if no intersecting record is found
-static bool _set_intersection_idx
+// builds hash table over cached records
+// records sharing a bucket are chained in their caching order
+static void _build_hash_table
 (
-	OpValueHashJoin *op,
-	SIValue v
+	OpValueHashJoin *op
 ) {
-	op->intersect_idx = -1;
-	op->number_of_intersections = 0;
-	uint record_count = array_len(op->cached_records);
+	ASSERT(op->buckets == NULL);
 
-	uint leftmost_idx  = 0;
-	uint rightmost_idx = 0;
+	uint record_count = array_len(op->cached_records);
 
-	if(!_binarySearchLeftmost(&leftmost_idx, op->cached_records,
-				array_len(op->cached_records), op->join_value_rec_idx, v)) {
-		return false;
+	// keep load factor at most 0.5
+	uint64_t bucket_count = MIN_BUCKET_COUNT;
+	while(bucket_count < (uint64_t)record_count * 2) bucket_count <<= 1;
+
+	op->bucket_mask = bucket_count - 1;
+	op->buckets     = rm_malloc(sizeof(uint) * bucket_count);
+	op->chain       = rm_malloc(sizeof(uint) * MAX(record_count, 1));
+	for(uint64_t i = 0; i < bucket_count; i++) op->buckets[i] = NO_RECORD;
+
+	// insert in reverse order, such that each chain is in caching order
+	for(uint i = record_count; i > 0; i--) {
+		uint idx = i - 1;
+		uint64_t bucket = op->hashes[idx] & op->bucket_mask;
+		op->chain[idx] = op->buckets[bucket];
+		op->buckets[bucket] = idx;
 	}
-
-	// value was found
-	// idx points to the first intersecting record
-	// update number_of_intersections to count how many
-	// records share the same value
-	op->intersect_idx = leftmost_idx;
-
-	// count how many records share the same node
-	// reduce search space by truncating left bound
-	bool found = _binarySearchRightmost(&rightmost_idx,
-			op->cached_records + leftmost_idx, record_count - leftmost_idx,
-			op->join_value_rec_idx, v);
-	UNUSED(found);
-	ASSERT(found == true);
-
-	// compensate index
-	rightmost_idx += leftmost_idx;
-	// +1 consider rightmost_idx == leftmost_idx
-	op->number_of_intersections = rightmost_idx - leftmost_idx + 1;
-	ASSERT(op->number_of_intersections > 0);
-
-	return true;
-}
-
-// sorts cached records by joined value
-void _sort_cached_records
-(
-	OpValueHashJoin *op
-) {
-	uint idx = op->join_value_rec_idx;
-	sort_r(
-			op->cached_records,
-			array_len(op->cached_records),
-			sizeof(Record),
-			(int(*)(const void*, const void*, void*))_record_cmp,
-			&idx
-		);
 }
 
 // caches all records coming from left branch
@@ -178,6 +116,10 @@ void _cache_records
 
 	OpBase *left_child = op->op.children[0];
 	op->cached_records = array_new(Record, 32);
+	op->hashes = array_new(XXH64_hash_t, 32);
+
+	// records exceeding the memory budget are spilled to disk
+	SpillBudget_Init(&op->budget);
 
 	Record r = left_child->consume(left_child);
 	if(!r) return;
@@ -189,16 +131,155 @@ void _cache_records
 
 		// if the joined value is NULL
 		// it cannot be compared to other values - skip this record
-		if(SIValue_IsNull(v)) continue;
+		if(SIValue_IsNull(v)) {
+			OpBase_DeleteRecord(r);
+			continue;
+		}
 
 		// add joined value to record
 		Record_AddScalar(r, op->join_value_rec_idx, v);
+		XXH64_hash_t hash = SIValue_HashCode(v);
 
-		// cache the record
+		if(op->build_spill != NULL) {
+			// memory budget exhausted, spill record
+			SpillPartitions_Add(op->build_spill, hash, r);
+			OpBase_DeleteRecord(r);
+			continue;
+		}
+
+		// cache the record and its join value hash
 		array_append(op->cached_records, r);
+		array_append(op->hashes, hash);
+
+		if(SpillBudget_Add(&op->budget)) {
+			op->build_spill = SpillPartitions_New(0);
+			op->probe_spill = SpillPartitions_New(0);
+		}
 	} while((r = left_child->consume(left_child)));
 }
 
+// free cached records and hash table
+static void _free_cached_records
+(
+	OpValueHashJoin *op
+) {
+	if(op->cached_records) {
+		uint record_count = array_len(op->cached_records);
+		for(uint i = 0; i < record_count; i++) {
+			Record r = op->cached_records[i];
+			OpBase_DeleteRecord(r);
+		}
+		array_free(op->cached_records);
+		op->cached_records = NULL;
+	}
+
+	if(op->hashes) {
+		array_free(op->hashes);
+		op->hashes = NULL;
+	}
+
+	if(op->buckets) {
+		rm_free(op->buckets);
+		op->buckets = NULL;
+	}
+
+	if(op->chain) {
+		rm_free(op->chain);
+		op->chain = NULL;
+	}
+}
+
+// replace cached records with the next spilled partition
+// right hand side records of the partition are probed against it
+// returns false if there are no more partitions to join
+static bool _load_partition
+(
+	OpValueHashJoin *op
+) {
+	while(op->partition_idx < SPILL_PARTITION_COUNT) {
+		uint idx = op->partition_idx++;
+		SpillFile *build = SpillPartitions_Take(op->build_spill, idx);
+		SpillFile *probe = SpillPartitions_Take(op->probe_spill, idx);
+
+		// a partition joins only if both sides spilled records into it
+		if(build == NULL || probe == NULL) {
+			if(build) SpillFile_Free(build);
+			if(probe) SpillFile_Free(probe);
+			continue;
+		}
+
+		_free_cached_records(op);
+		op->cached_records = array_new(Record, SpillFile_RecordCount(build));
+		op->hashes = array_new(XXH64_hash_t, SpillFile_RecordCount(build));
+
+		// spilled records carry their join value
+		Record r;
+		while((r = SpillFile_ReadRecord(build)) != NULL) {
+			SIValue v = Record_Get(r, op->join_value_rec_idx);
+			array_append(op->cached_records, r);
+			array_append(op->hashes, SIValue_HashCode(v));
+		}
+		SpillFile_Free(build);
+
+		_build_hash_table(op);
+		op->probe_input = probe;
+		return true;
+	}
+
+	return false;
+}
+
+// pull the next right hand side record
+// once the right branch is depleted, spilled partitions are joined
+static Record _next_probe_record
+(
+	OpValueHashJoin *op
+) {
+	Record r;
+
+	if(!op->right_depleted) {
+		OpBase *right_child = op->op.children[1];
+		r = right_child->consume(right_child);
+		if(r || op->build_spill == NULL) return r;
+		op->right_depleted = true;
+	}
+
+	while(true) {
+		if(op->probe_input) {
+			r = SpillFile_ReadRecord(op->probe_input);
+			if(r) return r;
+			SpillFile_Free(op->probe_input);
+			op->probe_input = NULL;
+		}
+
+		if(!_load_partition(op)) return NULL;
+	}
+}
+
+// free spilled partitions
+static void _free_spill
+(
+	OpValueHashJoin *op
+) {
+	if(op->probe_input) {
+		SpillFile_Free(op->probe_input);
+		op->probe_input = NULL;
+	}
+
+	if(op->build_spill) {
+		SpillPartitions_Free(op->build_spill);
+		op->build_spill = NULL;
+	}
+
+	if(op->probe_spill) {
+		SpillPartitions_Free(op->probe_spill);
+		op->probe_spill = NULL;
+	}
+
+	op->partition_idx  = 0;
+	op->right_depleted = false;
+}
+
 // string representation of operation
 static void ValueHashJoinToString
 (
@@ -236,12 +317,22 @@ OpBase *NewValueHashJoin
 ) {
 	OpValueHashJoin *op = rm_malloc(sizeof(OpValueHashJoin));
 
-	op->rhs_rec                 = NULL;
-	op->lhs_exp                 = lhs_exp;
-	op->rhs_exp                 = rhs_exp;
-	op->intersect_idx           = -1;
-	op->cached_records          = NULL;
-	op->number_of_intersections = 0;
+	op->chain           =  NULL;
+	op->hashes          =  NULL;
+	op->rhs_rec         =  NULL;
+	op->buckets         =  NULL;
+	op->lhs_exp         =  lhs_exp;
+	op->rhs_exp         =  rhs_exp;
+	op->rhs_hash        =  0;
+	op->rhs_value       =  SI_NullVal();
+	op->probe_idx       =  NO_RECORD;
+	op->bucket_mask     =  0;
+	op->build_spill     =  NULL;
+	op->probe_spill     =  NULL;
+	op->probe_input     =  NULL;
+	op->partition_idx   =  0;
+	op->right_depleted  =  false;
+	op->cached_records  =  NULL;
 
 	// set our Op operations
 	OpBase_Init((OpBase *)op, OPType_VALUE_HASH_JOIN, "Value Hash Join",
@@ -261,65 +352,54 @@ static Record ValueHashJoinConsume
 	OpBase *opBase
 ) {
 	OpValueHashJoin *op = (OpValueHashJoin *)opBase;
-	OpBase *right_child = op->op.children[1];
 
 	// eager, pull from left branch until depleted
+	// and build a hash table over the join values
 	if(op->cached_records == NULL) {
 		_cache_records(op);
-		// sort cache on intersect node ID
-		_sort_cached_records(op);
+		_build_hash_table(op);
 	}
 
 	// try to produce a record:
 	// given a right hand side record R,
 	// evaluate V = exp on R,
-	// see if there are any cached records
-	// which V evaluated to V:
+	// probe the hash table for cached records
+	// which evaluated to V:
 	// X in cached_records and X[idx] = V
 	// return merged record:
 	// X merged with R
 
-	Record l;
-	if(op->number_of_intersections > 0) {
-		while((l = _get_intersecting_record(op))) {
-			// clone cached record before merging rhs
-			Record c = OpBase_CloneRecord(l);
-			Record_Merge(c, op->rhs_rec);
-			return c;
+	while(true) {
+		if(op->rhs_rec) {
+			Record l = _get_intersecting_record(op);
+			if(l) {
+				// clone cached record before merging rhs
+				Record c = OpBase_CloneRecord(l);
+				Record_Merge(c, op->rhs_rec);
+				return c;
+			}
 		}
-	}
 
-	// if we're here there are no more
-	// left hand side records which intersect with R
-	// discard R
-	if(op->rhs_rec) OpBase_DeleteRecord(op->rhs_rec);
+		// if we're here there are no more
+		// left hand side records which intersect with R
+		// discard R
+		_discard_rhs_record(op);
 
-	// try to get new right hand side record
-	// which intersect with a left hand side record
-	while(true) {
 		// pull from right branch
-		op->rhs_rec = right_child->consume(right_child);
+		op->rhs_rec = _next_probe_record(op);
 		if(!op->rhs_rec) return NULL;
 
 		// get value on which we're intersecting
 		SIValue v = AR_EXP_Evaluate(op->rhs_exp, op->rhs_rec);
-
-		bool found_intersection = _set_intersection_idx(op, v);
-		SIValue_Free(v);
-		// no intersection, discard R
-		if(!found_intersection) {
-			OpBase_DeleteRecord(op->rhs_rec);
-			continue;
+		_set_intersection_idx(op, v);
+
+		// record might also intersect with spilled left hand side records
+		// spill it for the partition to be joined later on
+		if(!op->right_depleted && op->build_spill != NULL &&
+		   !SIValue_IsNull(v) &&
+		   SpillPartitions_Contains(op->build_spill, op->rhs_hash)) {
+			SpillPartitions_Add(op->probe_spill, op->rhs_hash, op->rhs_rec);
 		}
-
-		// found atleast one intersecting record
-		l = _get_intersecting_record(op);
-
-		// clone cached record before merging rhs
-		Record c = OpBase_CloneRecord(l);
-		Record_Merge(c, op->rhs_rec);
-
-		return c;
 	}
 }
 
@@ -328,24 +408,11 @@ static OpResult ValueHashJoinReset
 	OpBase *ctx
 ) {
 	OpValueHashJoin *op = (OpValueHashJoin *)ctx;
-	op->intersect_idx = -1;
-	op->number_of_intersections = 0;
 
 	// clear cached records
-	if(op->rhs_rec) {
-		OpBase_DeleteRecord(op->rhs_rec);
-		op->rhs_rec = NULL;
-	}
-
-	if(op->cached_records) {
-		uint record_count = array_len(op->cached_records);
-		for(uint i = 0; i < record_count; i++) {
-			Record r = op->cached_records[i];
-			OpBase_DeleteRecord(r);
-		}
-		array_free(op->cached_records);
-		op->cached_records = NULL;
-	}
+	_discard_rhs_record(op);
+	_free_cached_records(op);
+	_free_spill(op);
 
 	return OP_OK;
 }
@@ -365,20 +432,9 @@ static inline OpBase *ValueHashJoinClone
 static void ValueHashJoinFree(OpBase *ctx) {
 	OpValueHashJoin *op = (OpValueHashJoin *)ctx;
 	// free cached records
-	if(op->rhs_rec) {
-		OpBase_DeleteRecord(op->rhs_rec);
-		op->rhs_rec = NULL;
-	}
-
-	if(op->cached_records) {
-		uint record_count = array_len(op->cached_records);
-		for(uint i = 0; i < record_count; i++) {
-			Record r = op->cached_records[i];
-			OpBase_DeleteRecord(r);
-		}
-		array_free(op->cached_records);
-		op->cached_records = NULL;
-	}
+	_discard_rhs_record(op);
+	_free_cached_records(op);
+	_free_spill(op);
 
 	if(op->lhs_exp) {
 		AR_EXP_Free(op->lhs_exp);
@@ -390,4 +446,3 @@ static void ValueHashJoinFree(OpBase *ctx) {
 		op->rhs_exp = NULL;
 	}
 }
-
@@ -8,17 +8,29 @@
 
 #include "op.h"
 #include "../execution_plan.h"
+#include "shared/spill_functions.h"
 #include "../../arithmetic/arithmetic_expression.h"
 
 typedef struct {
 	OpBase op;
 	Record rhs_rec;                     // Right hand side record.
+	SIValue rhs_value;                  // Join value of right hand side record.
+	XXH64_hash_t rhs_hash;              // Hash of right hand side join value.
 	AR_ExpNode *lhs_exp;                // Left hand side expression to join on.
 	AR_ExpNode *rhs_exp;                // Right hand side expression to join on.
-	int64_t intersect_idx;              // Current intersection, < number_of_intersections
+	uint probe_idx;                     // Next cached record to probe.
+	uint *buckets;                      // Hash table, first cached record of each bucket.
+	uint *chain;                        // Next cached record within the same bucket.
+	XXH64_hash_t *hashes;               // Hash of each cached record join value.
+	uint64_t bucket_mask;               // Number of buckets - 1.
 	Record *cached_records;             // Cached left hand side records.
 	uint join_value_rec_idx;            // position on joined expression within record.
-	int64_t number_of_intersections;    // Number of intersections located.
+	SpillBudget budget;                 // Decides when left hand side records are spilled.
+	SpillPartitions *build_spill;       // Spilled left hand side records.
+	SpillPartitions *probe_spill;       // Right hand side records joining with spilled records.
+	SpillFile *probe_input;             // Right hand side records of joined partition.
+	uint partition_idx;                 // Next spilled partition to join.
+	bool right_depleted;                // Right branch is depleted, joining spilled partitions.
 } OpValueHashJoin;
 
 /* Creates a new ValueHashJoin operation */
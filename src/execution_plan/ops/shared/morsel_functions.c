@@ -0,0 +1,175 @@
+/*
+ * Copyright 2018-2022 Redis Labs Ltd. and Contributors
+ *
+ * This file is available under the Redis Labs Source Available License Agreement
+ */
+
+#include "RG.h"
+#include "morsel_functions.h"
+#include "../../../errors.h"
+#include "../../../query_ctx.h"
+#include "../../../util/rmalloc.h"
+#include "../../../util/thpool/pools.h"
+
+#include <setjmp.h>
+#include <pthread.h>
+
+// state shared by all threads processing the morsels of an ID range
+typedef struct {
+	uint64_t n;                 // size of the ID range
+	uint64_t next;              // start of the next unclaimed morsel
+	uint next_worker;           // next unassigned worker state
+	uint active;                // number of threads processing morsels
+	uint refcount;              // number of references to this job
+	bool done;                  // caller stopped waiting for helpers
+	char *error;                // first run-time error encountered
+	void **workers;             // worker states
+	MorselFunc f;               // morsel processing function
+	const ExecutionPlan *plan;  // plan being executed
+	QueryCtx *query_ctx;        // caller's query context
+	pthread_mutex_t lock;       // guards active, next_worker, done and error
+	pthread_cond_t cond;        // signaled once a helper is done
+} MorselJob;
+
+static void _MorselJob_Release
+(
+	MorselJob *job
+) {
+	// helpers which started after the caller returned hold the last reference
+	if(__atomic_sub_fetch(&job->refcount, 1, __ATOMIC_ACQ_REL) > 0) return;
+
+	pthread_mutex_destroy(&job->lock);
+	pthread_cond_destroy(&job->cond);
+	if(job->error != NULL) rm_free(job->error);
+	rm_free(job);
+}
+
+// claim and process morsels until either all morsels are claimed,
+// a run-time error is encountered or the plan is drained
+static void _Morsels_Process
+(
+	MorselJob *job,  // job
+	void *worker     // worker state
+) {
+	// capture run-time errors raised while processing
+	// restoring the thread's breakpoint once done
+	ErrorCtx *err_ctx = ErrorCtx_Get();
+	jmp_buf *prev_breakpoint = err_ctx->breakpoint;
+	jmp_buf breakpoint;
+	err_ctx->breakpoint = &breakpoint;
+
+	if(setjmp(breakpoint) == 0) {
+		while(__atomic_load_n(&job->error, __ATOMIC_RELAXED) == NULL &&
+			  (job->plan == NULL ||
+			   !ExecutionPlan_Drained((ExecutionPlan *)job->plan))) {
+			uint64_t start = __atomic_fetch_add(&job->next, MORSEL_SIZE,
+					__ATOMIC_RELAXED);
+			if(start >= job->n) break;
+
+			uint64_t end = MIN(start + MORSEL_SIZE, job->n);
+			job->f(worker, start, end);
+		}
+	} else {
+		// encountered a run-time error, keep the first error
+		const char *err = (err_ctx->error != NULL) ?
+			err_ctx->error : "Encountered an error while scanning";
+
+		pthread_mutex_lock(&job->lock);
+		if(job->error == NULL) {
+			__atomic_store_n(&job->error, rm_strdup(err), __ATOMIC_RELAXED);
+		}
+		pthread_mutex_unlock(&job->lock);
+
+		if(err_ctx->error != NULL) {
+			free(err_ctx->error);
+			err_ctx->error = NULL;
+		}
+	}
+
+	err_ctx->breakpoint = prev_breakpoint;
+}
+
+// helper thread entry point
+static void _Morsels_Helper
+(
+	void *arg
+) {
+	MorselJob *job = arg;
+	void *worker = NULL;
+
+	// join unless the caller is done
+	pthread_mutex_lock(&job->lock);
+	if(!job->done) {
+		worker = job->workers[job->next_worker++];
+		job->active++;
+	}
+	pthread_mutex_unlock(&job->lock);
+
+	if(worker != NULL) {
+		if(job->query_ctx != NULL) QueryCtx_SetTLS(job->query_ctx);
+		_Morsels_Process(job, worker);
+		QueryCtx_RemoveFromTLS();
+
+		pthread_mutex_lock(&job->lock);
+		job->active--;
+		if(job->active == 0) pthread_cond_signal(&job->cond);
+		pthread_mutex_unlock(&job->lock);
+	}
+
+	_MorselJob_Release(job);
+}
+
+bool Morsels_Process
+(
+	uint64_t n,
+	uint helpers,
+	void **workers,
+	MorselFunc f,
+	const ExecutionPlan *plan
+) {
+	ASSERT(f       != NULL);
+	ASSERT(workers != NULL);
+
+	MorselJob *job = rm_calloc(1, sizeof(MorselJob));
+
+	job->n            =  n;
+	job->f            =  f;
+	job->plan         =  plan;
+	job->workers      =  workers;
+	job->refcount     =  1;
+	job->query_ctx    =  (plan != NULL) ? QueryCtx_GetQueryCtx() : NULL;
+	job->next_worker  =  1;  // first worker state is used by the caller
+
+	pthread_mutex_init(&job->lock, NULL);
+	pthread_cond_init(&job->cond, NULL);
+
+	// recruit helpers, no point in recruiting more helpers than morsels
+	uint64_t morsel_count = (n + MORSEL_SIZE - 1) / MORSEL_SIZE;
+	helpers = (morsel_count > 1) ? MIN(helpers, morsel_count - 1) : 0;
+	for(uint i = 0; i < helpers; i++) {
+		__atomic_add_fetch(&job->refcount, 1, __ATOMIC_ACQ_REL);
+		if(ThreadPools_AddWorkReader(_Morsels_Helper, job) != 0) {
+			// readers queue is full, process with the helpers recruited so far
+			__atomic_sub_fetch(&job->refcount, 1, __ATOMIC_ACQ_REL);
+			break;
+		}
+	}
+
+	// participate in processing, in case all reader threads are busy
+	// the caller processes all morsels by itself
+	_Morsels_Process(job, workers[0]);
+
+	// wait for active helpers, helpers which haven't started yet
+	// will find the job done
+	pthread_mutex_lock(&job->lock);
+	while(job->active > 0) pthread_cond_wait(&job->cond, &job->lock);
+	job->done = true;
+	pthread_mutex_unlock(&job->lock);
+
+	bool success = (job->error == NULL);
+	if(!success) ErrorCtx_SetError("%s", job->error);
+
+	_MorselJob_Release(job);
+
+	return success;
+}
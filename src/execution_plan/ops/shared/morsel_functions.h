@@ -0,0 +1,43 @@
+/*
+ * Copyright 2018-2022 Redis Labs Ltd. and Contributors
+ *
+ * This file is available under the Redis Labs Source Available License Agreement
+ */
+
+#pragma once
+
+#include "../../execution_plan.h"
+
+// number of IDs a thread claims at a time
+#define MORSEL_SIZE 16384
+
+// process IDs within the range [start, end)
+// 'worker' is the state of the processing thread
+typedef void (*MorselFunc)
+(
+	void *worker,    // worker state
+	uint64_t start,  // first ID of the morsel
+	uint64_t end     // morsel upper bound, excluded
+);
+
+// split the ID range [0, n) into morsels and process them in parallel
+// morsels are processed by the calling thread and by up to 'helpers'
+// reader threads, each participating thread claims morsels until all morsels
+// are processed, such that busy reader threads never delay the caller
+//
+// 'workers' holds helpers + 1 worker states, the first is used by the
+// calling thread and each helper uses one of the others
+//
+// without a plan, e.g. when populating an index, helpers run
+// outside of any query context
+//
+// returns false if a run-time error had been raised by any of the threads
+// in which case the error is set on the calling thread's ErrorCtx
+bool Morsels_Process
+(
+	uint64_t n,                 // size of the ID range
+	uint helpers,               // max number of helper threads
+	void **workers,             // worker states
+	MorselFunc f,               // morsel processing function
+	const ExecutionPlan *plan   // [optional] plan being executed, checked for draining
+);
@@ -0,0 +1,598 @@
+/*
+ * Copyright 2018-2022 Redis Labs Ltd. and Contributors
+ *
+ * This file is available under the Redis Labs Source Available License Agreement
+ */
+
+#include "RG.h"
+#include "spill_functions.h"
+#include "../../../errors.h"
+#include "../../../query_ctx.h"
+#include "../../../util/rmalloc.h"
+#include "../../../datatypes/map.h"
+#include "../../../datatypes/array.h"
+#include "../../../datatypes/path/path.h"
+#include "../../../datatypes/path/sipath.h"
+#include "../../../configuration/config.h"
+#include "../../execution_plan.h"
+
+#include <stdio.h>
+
+// fraction of QUERY_MEM_CAPACITY an operation may buffer before spilling
+#define SPILL_MEM_FRACTION 4
+// min number of items buffered between spills
+#define SPILL_MIN_ITEMS 128
+
+struct SpillFile {
+	FILE *fp;         // temporary file
+	uint64_t count;   // number of records written
+	uint64_t read;    // number of records read
+};
+
+//------------------------------------------------------------------------------
+// serialization
+//------------------------------------------------------------------------------
+
+static void _Spill_Write
+(
+	SpillFile *f,
+	const void *data,
+	size_t size
+) {
+	if(size > 0 && fwrite(data, size, 1, f->fp) != 1) {
+		ErrorCtx_RaiseRuntimeException("Failed to write to spill file");
+	}
+}
+
+static void _Spill_Read
+(
+	SpillFile *f,
+	void *data,
+	size_t size
+) {
+	if(size > 0 && fread(data, size, 1, f->fp) != 1) {
+		ErrorCtx_RaiseRuntimeException("Failed to read from spill file");
+	}
+}
+
+#define WRITE(f, v) _Spill_Write((f), &(v), sizeof(v))
+#define READ(f, v) _Spill_Read((f), &(v), sizeof(v))
+
+static void _WriteString
+(
+	SpillFile *f,
+	const char *s
+) {
+	uint32_t len = strlen(s);
+	WRITE(f, len);
+	_Spill_Write(f, s, len);
+}
+
+static char *_ReadString
+(
+	SpillFile *f
+) {
+	uint32_t len;
+	READ(f, len);
+	char *s = rm_malloc(len + 1);
+	_Spill_Read(f, s, len);
+	s[len] = '\0';
+	return s;
+}
+
+static void _WriteNode
+(
+	SpillFile *f,
+	const Node *n
+) {
+	EntityID id = ENTITY_GET_ID(n);
+	WRITE(f, id);
+}
+
+// nodes are reloaded from the graph by ID
+static Node _ReadNode
+(
+	SpillFile *f
+) {
+	EntityID id;
+	READ(f, id);
+
+	Node n = GE_NEW_NODE();
+	Graph_GetNode(QueryCtx_GetGraph(), id, &n);
+	return n;
+}
+
+static void _WriteEdge
+(
+	SpillFile *f,
+	const Edge *e
+) {
+	EntityID id = ENTITY_GET_ID(e);
+	WRITE(f, id);
+	WRITE(f, e->relationID);
+	WRITE(f, e->srcNodeID);
+	WRITE(f, e->destNodeID);
+}
+
+// edges are reloaded from the graph by ID
+static Edge _ReadEdge
+(
+	SpillFile *f
+) {
+	EntityID id;
+	Edge e = {0};
+
+	READ(f, id);
+	READ(f, e.relationID);
+	READ(f, e.srcNodeID);
+	READ(f, e.destNodeID);
+
+	Graph_GetEdge(QueryCtx_GetGraph(), id, &e);
+
+	if(e.relationID >= 0) {
+		GraphContext *gc = QueryCtx_GetGraphCtx();
+		Schema *s = GraphContext_GetSchemaByID(gc, e.relationID, SCHEMA_EDGE);
+		if(s != NULL) e.relationship = Schema_GetName(s);
+	}
+
+	return e;
+}
+
+static void _WriteValue
+(
+	SpillFile *f,
+	SIValue v
+) {
+	SIType t = SI_TYPE(v);
+	WRITE(f, t);
+
+	switch(t) {
+		case T_NULL:
+			break;
+		case T_BOOL:
+		case T_INT64:
+		case T_DATETIME:
+		case T_LOCALDATETIME:
+		case T_DATE:
+		case T_TIME:
+		case T_LOCALTIME:
+		case T_DURATION:
+			WRITE(f, v.longval);
+			break;
+		case T_DOUBLE:
+			WRITE(f, v.doubleval);
+			break;
+		case T_POINT:
+			WRITE(f, v.point.latitude);
+			WRITE(f, v.point.longitude);
+			break;
+		case T_PTR:
+			WRITE(f, v.ptrval);
+			break;
+		case T_STRING:
+			_WriteString(f, v.stringval);
+			break;
+		case T_NODE:
+			_WriteNode(f, v.ptrval);
+			break;
+		case T_EDGE:
+			_WriteEdge(f, v.ptrval);
+			break;
+		case T_ARRAY: {
+			uint32_t len = SIArray_Length(v);
+			WRITE(f, len);
+			for(uint32_t i = 0; i < len; i++) _WriteValue(f, v.array[i]);
+			break;
+		}
+		case T_MAP: {
+			uint32_t len = Map_KeyCount(v);
+			WRITE(f, len);
+			for(uint32_t i = 0; i < len; i++) {
+				SIValue key;
+				SIValue val;
+				Map_GetIdx(v, i, &key, &val);
+				_WriteString(f, key.stringval);
+				_WriteValue(f, val);
+			}
+			break;
+		}
+		case T_PATH: {
+			Path *p = v.ptrval;
+			uint32_t node_count = Path_NodeCount(p);
+			uint32_t edge_count = Path_EdgeCount(p);
+			WRITE(f, node_count);
+			WRITE(f, edge_count);
+			for(uint32_t i = 0; i < node_count; i++) {
+				_WriteNode(f, Path_GetNode(p, i));
+			}
+			for(uint32_t i = 0; i < edge_count; i++) {
+				_WriteEdge(f, Path_GetEdge(p, i));
+			}
+			break;
+		}
+		default:
+			ASSERT(false && "unexpected value type");
+			break;
+	}
+}
+
+// reads a value, the returned value owns its allocations
+static SIValue _ReadValue
+(
+	SpillFile *f
+) {
+	SIType t;
+	SIValue v = SI_NullVal();
+	READ(f, t);
+
+	switch(t) {
+		case T_NULL:
+			break;
+		case T_BOOL:
+		case T_INT64:
+		case T_DATETIME:
+		case T_LOCALDATETIME:
+		case T_DATE:
+		case T_TIME:
+		case T_LOCALTIME:
+		case T_DURATION:
+			v.type = t;
+			v.allocation = M_NONE;
+			READ(f, v.longval);
+			break;
+		case T_DOUBLE:
+			v.type = t;
+			v.allocation = M_NONE;
+			READ(f, v.doubleval);
+			break;
+		case T_POINT:
+			v.type = t;
+			v.allocation = M_NONE;
+			READ(f, v.point.latitude);
+			READ(f, v.point.longitude);
+			break;
+		case T_PTR:
+			READ(f, v.ptrval);
+			v = SI_PtrVal(v.ptrval);
+			break;
+		case T_STRING:
+			v = SI_TransferStringVal(_ReadString(f));
+			break;
+		case T_NODE: {
+			Node n = _ReadNode(f);
+			v = SI_CloneValue(SI_Node(&n));
+			break;
+		}
+		case T_EDGE: {
+			Edge e = _ReadEdge(f);
+			v = SI_CloneValue(SI_Edge(&e));
+			break;
+		}
+		case T_ARRAY: {
+			uint32_t len;
+			READ(f, len);
+			v = SIArray_New(len);
+			for(uint32_t i = 0; i < len; i++) {
+				SIValue elem = _ReadValue(f);
+				SIArray_Append(&v, elem);
+				SIValue_Free(elem);
+			}
+			break;
+		}
+		case T_MAP: {
+			uint32_t len;
+			READ(f, len);
+			v = Map_New(len);
+			for(uint32_t i = 0; i < len; i++) {
+				SIValue key = SI_TransferStringVal(_ReadString(f));
+				SIValue val = _ReadValue(f);
+				Map_Add(&v, key, val);
+				SIValue_Free(key);
+				SIValue_Free(val);
+			}
+			break;
+		}
+		case T_PATH: {
+			uint32_t node_count;
+			uint32_t edge_count;
+			READ(f, node_count);
+			READ(f, edge_count);
+			Path *p = Path_New(node_count);
+			for(uint32_t i = 0; i < node_count; i++) {
+				Path_AppendNode(p, _ReadNode(f));
+			}
+			for(uint32_t i = 0; i < edge_count; i++) {
+				Path_AppendEdge(p, _ReadEdge(f));
+			}
+			v = SIPath_New(p);
+			Path_Free(p);
+			break;
+		}
+		default:
+			ASSERT(false && "unexpected value type");
+			break;
+	}
+
+	return v;
+}
+
+//------------------------------------------------------------------------------
+// spill file
+//------------------------------------------------------------------------------
+
+SpillFile *SpillFile_New(void) {
+	// temporary file is removed once closed
+	FILE *fp = tmpfile();
+	if(fp == NULL) ErrorCtx_RaiseRuntimeException("Failed to create spill file");
+
+	SpillFile *f = rm_malloc(sizeof(SpillFile));
+
+	f->fp    = fp;
+	f->read  = 0;
+	f->count = 0;
+
+	return f;
+}
+
+void SpillFile_WriteRecord
+(
+	SpillFile *f,
+	Record r
+) {
+	ASSERT(f != NULL);
+	ASSERT(r != NULL);
+
+	// records are recreated by their owning execution plan
+	uint32_t len = Record_length(r);
+	WRITE(f, r->owner);
+	WRITE(f, len);
+
+	for(uint32_t i = 0; i < len; i++) {
+		RecordEntryType t = Record_GetType(r, i);
+		WRITE(f, t);
+
+		switch(t) {
+			case REC_TYPE_UNKNOWN:
+				break;
+			case REC_TYPE_NODE:
+				_WriteNode(f, Record_GetNode(r, i));
+				break;
+			case REC_TYPE_EDGE:
+				_WriteEdge(f, Record_GetEdge(r, i));
+				break;
+			case REC_TYPE_SCALAR:
+				_WriteValue(f, Record_Get(r, i));
+				break;
+			default:
+				ASSERT(false && "unexpected record entry type");
+				break;
+		}
+	}
+
+	f->count++;
+}
+
+void SpillFile_Rewind
+(
+	SpillFile *f
+) {
+	ASSERT(f != NULL);
+
+	f->read = 0;
+	if(fflush(f->fp) != 0 || fseek(f->fp, 0, SEEK_SET) != 0) {
+		ErrorCtx_RaiseRuntimeException("Failed to read from spill file");
+	}
+}
+
+Record SpillFile_ReadRecord
+(
+	SpillFile *f
+) {
+	ASSERT(f != NULL);
+
+	if(f->read == f->count) return NULL;
+	f->read++;
+
+	void *owner;
+	uint32_t len;
+	READ(f, owner);
+	READ(f, len);
+
+	Record r = ExecutionPlan_BorrowRecord(owner);
+	ASSERT(Record_length(r) == len);
+
+	for(uint32_t i = 0; i < len; i++) {
+		RecordEntryType t;
+		READ(f, t);
+
+		switch(t) {
+			case REC_TYPE_UNKNOWN:
+				Record_Remove(r, i);
+				break;
+			case REC_TYPE_NODE:
+				Record_AddNode(r, i, _ReadNode(f));
+				break;
+			case REC_TYPE_EDGE:
+				Record_AddEdge(r, i, _ReadEdge(f));
+				break;
+			case REC_TYPE_SCALAR:
+				Record_AddScalar(r, i, _ReadValue(f));
+				break;
+			default:
+				ASSERT(false && "unexpected record entry type");
+				break;
+		}
+	}
+
+	return r;
+}
+
+uint64_t SpillFile_RecordCount
+(
+	const SpillFile *f
+) {
+	ASSERT(f != NULL);
+	return f->count;
+}
+
+void SpillFile_Free
+(
+	SpillFile *f
+) {
+	ASSERT(f != NULL);
+	fclose(f->fp);
+	rm_free(f);
+}
+
+//------------------------------------------------------------------------------
+// spill partitions
+//------------------------------------------------------------------------------
+
+static inline uint _SpillPartitions_Idx
+(
+	const SpillPartitions *p,
+	XXH64_hash_t hash
+) {
+	return (hash >> (p->depth * SPILL_PARTITION_BITS)) &
+		(SPILL_PARTITION_COUNT - 1);
+}
+
+SpillPartitions *SpillPartitions_New
+(
+	uint depth
+) {
+	ASSERT(depth < SPILL_MAX_DEPTH);
+
+	SpillPartitions *p = rm_calloc(1, sizeof(SpillPartitions));
+	p->depth = depth;
+
+	return p;
+}
+
+void SpillPartitions_Add
+(
+	SpillPartitions *p,
+	XXH64_hash_t hash,
+	Record r
+) {
+	ASSERT(p != NULL);
+
+	uint idx = _SpillPartitions_Idx(p, hash);
+	if(p->files[idx] == NULL) p->files[idx] = SpillFile_New();
+	SpillFile_WriteRecord(p->files[idx], r);
+}
+
+bool SpillPartitions_Contains
+(
+	const SpillPartitions *p,
+	XXH64_hash_t hash
+) {
+	ASSERT(p != NULL);
+	return p->files[_SpillPartitions_Idx(p, hash)] != NULL;
+}
+
+SpillFile *SpillPartitions_Next
+(
+	SpillPartitions *p
+) {
+	ASSERT(p != NULL);
+
+	while(p->next < SPILL_PARTITION_COUNT) {
+		SpillFile *f = SpillPartitions_Take(p, p->next++);
+		if(f != NULL) return f;
+	}
+
+	return NULL;
+}
+
+SpillFile *SpillPartitions_Take
+(
+	SpillPartitions *p,
+	uint idx
+) {
+	ASSERT(p != NULL);
+	ASSERT(idx < SPILL_PARTITION_COUNT);
+
+	SpillFile *f = p->files[idx];
+	if(f == NULL) return NULL;
+
+	p->files[idx] = NULL;
+	SpillFile_Rewind(f);
+	return f;
+}
+
+void SpillPartitions_Free
+(
+	SpillPartitions *p
+) {
+	ASSERT(p != NULL);
+
+	for(uint i = 0; i < SPILL_PARTITION_COUNT; i++) {
+		if(p->files[i] != NULL) SpillFile_Free(p->files[i]);
+	}
+	rm_free(p);
+}
+
+//------------------------------------------------------------------------------
+// spill budget
+//------------------------------------------------------------------------------
+
+void SpillBudget_Init
+(
+	SpillBudget *b
+) {
+	ASSERT(b != NULL);
+
+	int64_t mem_capacity;
+	Config_Option_get(Config_QUERY_MEM_CAPACITY, &mem_capacity);
+
+	b->cap      = 0;
+	b->count    = 0;
+	b->budget   = (mem_capacity != QUERY_MEM_CAPACITY_UNLIMITED) ?
+		mem_capacity / SPILL_MEM_FRACTION : 0;
+	b->baseline = 0;
+}
+
+bool SpillBudget_Add
+(
+	SpillBudget *b
+) {
+	ASSERT(b != NULL);
+
+	b->count++;
+	if(b->budget == 0) return false;
+
+	// threshold is known
+	if(b->cap != 0) return b->count >= b->cap;
+
+	// memory consumption is measured from the first buffered item
+	// excluding memory allocated before the operation started buffering
+	int64_t consumed = rm_get_n_alloced();
+	if(b->count == 1) b->baseline = consumed;
+
+	// memory consumed by buffered items exceeds the budget
+	// use the number of buffered items as the spill threshold
+	if(consumed - b->baseline > b->budget) {
+		b->cap = MAX(b->count, SPILL_MIN_ITEMS);
+		return b->count >= b->cap;
+	}
+
+	return false;
+}
+
+void SpillBudget_Reset
+(
+	SpillBudget *b
+) {
+	ASSERT(b != NULL);
+	b->count = 0;
+}
+
+bool SpillBudget_Enabled
+(
+	const SpillBudget *b
+) {
+	ASSERT(b != NULL);
+	return b->budget != 0;
+}
+
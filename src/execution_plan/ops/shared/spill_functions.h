@@ -0,0 +1,156 @@
+/*
+ * Copyright 2018-2022 Redis Labs Ltd. and Contributors
+ *
+ * This file is available under the Redis Labs Source Available License Agreement
+ */
+
+#pragma once
+
+#include "../../record.h"
+
+// number of hash bits used to pick a partition
+#define SPILL_PARTITION_BITS 4
+// number of partitions records are spilled into
+#define SPILL_PARTITION_COUNT (1 << SPILL_PARTITION_BITS)
+// max partitioning depth, each level consumes SPILL_PARTITION_BITS hash bits
+#define SPILL_MAX_DEPTH ((sizeof(XXH64_hash_t) * 8) / SPILL_PARTITION_BITS)
+
+//------------------------------------------------------------------------------
+// spill file
+//------------------------------------------------------------------------------
+
+// temporary file holding serialized records
+// records are written sequentially and read back in the same order
+typedef struct SpillFile SpillFile;
+
+// creates a new temporary spill file
+SpillFile *SpillFile_New(void);
+
+// serialize record to spill file, record isn't freed
+void SpillFile_WriteRecord
+(
+	SpillFile *f,  // spill file
+	Record r       // record to write
+);
+
+// prepare spill file for reading, no records can be written afterwards
+void SpillFile_Rewind
+(
+	SpillFile *f  // spill file
+);
+
+// read next record from spill file
+// returns NULL once all records were read
+Record SpillFile_ReadRecord
+(
+	SpillFile *f  // spill file
+);
+
+// returns number of records written to spill file
+uint64_t SpillFile_RecordCount
+(
+	const SpillFile *f  // spill file
+);
+
+// closes and removes spill file
+void SpillFile_Free
+(
+	SpillFile *f  // spill file
+);
+
+//------------------------------------------------------------------------------
+// spill partitions
+//------------------------------------------------------------------------------
+
+// records spilled by hash, records sharing a hash share a partition
+typedef struct {
+	uint depth;                               // partitioning depth
+	uint next;                                // next partition to hand out
+	SpillFile *files[SPILL_PARTITION_COUNT];  // partitions, NULL if empty
+} SpillPartitions;
+
+// creates a new set of partitions at the given depth
+SpillPartitions *SpillPartitions_New
+(
+	uint depth  // partitioning depth
+);
+
+// spill record to the partition associated with 'hash'
+void SpillPartitions_Add
+(
+	SpillPartitions *p,  // partitions
+	XXH64_hash_t hash,   // record hash
+	Record r             // record to spill, record isn't freed
+);
+
+// returns true if a record with the given hash was spilled
+bool SpillPartitions_Contains
+(
+	const SpillPartitions *p,  // partitions
+	XXH64_hash_t hash          // record hash
+);
+
+// hands out the next none empty partition, rewound for reading
+// ownership of the partition is transferred to the caller
+// returns NULL once all partitions were handed out
+SpillFile *SpillPartitions_Next
+(
+	SpillPartitions *p  // partitions
+);
+
+// hands out partition 'idx', rewound for reading
+// ownership of the partition is transferred to the caller
+// returns NULL if partition is empty or was already handed out
+SpillFile *SpillPartitions_Take
+(
+	SpillPartitions *p,  // partitions
+	uint idx             // partition index
+);
+
+// frees partitions which weren't handed out
+void SpillPartitions_Free
+(
+	SpillPartitions *p  // partitions
+);
+
+//------------------------------------------------------------------------------
+// spill budget
+//------------------------------------------------------------------------------
+
+// decides when an operation buffering items (records, groups) should spill
+// the budget is a fraction of QUERY_MEM_CAPACITY, once the memory consumed
+// since buffering started exceeds the budget the number of buffered items
+// is recorded and used as the spill threshold from there on
+// spilling is disabled when QUERY_MEM_CAPACITY is unlimited
+typedef struct {
+	int64_t budget;    // max number of bytes to buffer, 0 if disabled
+	int64_t baseline;  // memory consumption once the first item was buffered
+	uint64_t count;    // number of buffered items
+	uint64_t cap;      // max number of buffered items, 0 if unknown
+} SpillBudget;
+
+// initialize spill budget
+void SpillBudget_Init
+(
+	SpillBudget *b  // budget to initialize
+);
+
+// accounts for a newly buffered item
+// returns true if buffered items should be spilled
+bool SpillBudget_Add
+(
+	SpillBudget *b  // budget
+);
+
+// reset buffered items count, called once buffered items were spilled
+void SpillBudget_Reset
+(
+	SpillBudget *b  // budget
+);
+
+// returns true if spilling is enabled
+bool SpillBudget_Enabled
+(
+	const SpillBudget *b  // budget
+);
+
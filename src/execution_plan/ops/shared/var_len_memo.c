@@ -0,0 +1,231 @@
+/*
+ * Copyright 2018-2022 Redis Labs Ltd. and Contributors
+ *
+ * This file is available under the Redis Labs Source Available License Agreement
+ */
+
+#include "RG.h"
+#include "var_len_memo.h"
+#include "../../../util/arr.h"
+#include "../../../util/rmalloc.h"
+#include "../../../configuration/config.h"
+
+static void _VarLenMemoEntry_Free
+(
+	VarLenMemoEntry *e
+) {
+	if(e->dests != NULL) array_free(e->dests);
+	if(e->paths != NULL) {
+		uint n = array_len(e->paths);
+		for(uint i = 0; i < n; i++) Path_Free(e->paths[i]);
+		array_free(e->paths);
+	}
+	rm_free(e);
+}
+
+// detach entry from the recently used list
+static void _VarLenMemo_Unlink
+(
+	VarLenMemo *memo,
+	VarLenMemoEntry *e
+) {
+	if(e->prev != NULL) e->prev->next = e->next;
+	else memo->head = e->next;
+
+	if(e->next != NULL) e->next->prev = e->prev;
+	else memo->tail = e->prev;
+
+	e->prev = NULL;
+	e->next = NULL;
+}
+
+// attach entry as the most recently used one
+static void _VarLenMemo_PushFront
+(
+	VarLenMemo *memo,
+	VarLenMemoEntry *e
+) {
+	e->prev = NULL;
+	e->next = memo->head;
+
+	if(memo->head != NULL) memo->head->prev = e;
+	else memo->tail = e;
+
+	memo->head = e;
+}
+
+// evict the least recently used entry
+static void _VarLenMemo_Evict
+(
+	VarLenMemo *memo
+) {
+	VarLenMemoEntry *e = memo->tail;
+	ASSERT(e != NULL);
+
+	_VarLenMemo_Unlink(memo, e);
+	raxRemove(memo->lookup, (unsigned char *)&e->src, sizeof(e->src), NULL);
+
+	memo->size -= e->size;
+	memo->evictions++;
+	_VarLenMemoEntry_Free(e);
+}
+
+// accounts for additional bytes held by the entry being recorded
+// recording is dropped once it can't fit within the memo
+static void _VarLenMemo_Grow
+(
+	VarLenMemo *memo,
+	size_t n
+) {
+	memo->recording->size += n;
+	if(memo->recording->size > memo->cap) VarLenMemo_Abort(memo);
+}
+
+VarLenMemo *VarLenMemo_New(void) {
+	int64_t mem_capacity;
+	Config_Option_get(Config_QUERY_MEM_CAPACITY, &mem_capacity);
+
+	size_t cap = VAR_LEN_MEMO_CAPACITY;
+	if(mem_capacity != QUERY_MEM_CAPACITY_UNLIMITED) {
+		cap = MIN(cap, mem_capacity / VAR_LEN_MEMO_MEM_FRACTION);
+	}
+
+	VarLenMemo *memo = rm_calloc(1, sizeof(VarLenMemo));
+	memo->cap    = cap;
+	memo->lookup = raxNew();
+
+	return memo;
+}
+
+VarLenMemoEntry *VarLenMemo_Lookup
+(
+	VarLenMemo *memo,
+	EntityID src
+) {
+	ASSERT(memo != NULL);
+
+	VarLenMemo_Abort(memo);
+
+	VarLenMemoEntry *e = raxFind(memo->lookup, (unsigned char *)&src,
+			sizeof(src));
+	if(e == raxNotFound) {
+		memo->misses++;
+		return NULL;
+	}
+
+	memo->hits++;
+
+	// mark entry as most recently used
+	_VarLenMemo_Unlink(memo, e);
+	_VarLenMemo_PushFront(memo, e);
+
+	return e;
+}
+
+void VarLenMemo_Record
+(
+	VarLenMemo *memo,
+	EntityID src
+) {
+	ASSERT(memo            != NULL);
+	ASSERT(memo->recording == NULL);
+
+	// sources don't seem to repeat, avoid the cost of recording
+	if(memo->hits == 0 && memo->misses > VAR_LEN_MEMO_PROBE) return;
+
+	VarLenMemoEntry *e = rm_calloc(1, sizeof(VarLenMemoEntry));
+	e->src  = src;
+	e->size = sizeof(VarLenMemoEntry);
+
+	memo->recording = e;
+}
+
+void VarLenMemo_RecordDestination
+(
+	VarLenMemo *memo,
+	EntityID dest
+) {
+	ASSERT(memo != NULL);
+
+	VarLenMemoEntry *e = memo->recording;
+	if(e == NULL) return;
+
+	if(e->dests == NULL) e->dests = array_new(EntityID, 1);
+	array_append(e->dests, dest);
+
+	_VarLenMemo_Grow(memo, sizeof(EntityID));
+}
+
+void VarLenMemo_RecordPath
+(
+	VarLenMemo *memo,
+	const Path *p
+) {
+	ASSERT(p    != NULL);
+	ASSERT(memo != NULL);
+
+	VarLenMemoEntry *e = memo->recording;
+	if(e == NULL) return;
+
+	if(e->paths == NULL) e->paths = array_new(Path *, 1);
+	array_append(e->paths, Path_Clone(p));
+
+	_VarLenMemo_Grow(memo, sizeof(Path *) + sizeof(Path) +
+			Path_NodeCount(p) * sizeof(Node) +
+			Path_EdgeCount(p) * sizeof(Edge));
+}
+
+void VarLenMemo_Commit
+(
+	VarLenMemo *memo
+) {
+	ASSERT(memo != NULL);
+
+	VarLenMemoEntry *e = memo->recording;
+	if(e == NULL) return;
+
+	memo->recording = NULL;
+
+	// make room for entry
+	while(memo->size + e->size > memo->cap) _VarLenMemo_Evict(memo);
+
+	int inserted = raxInsert(memo->lookup, (unsigned char *)&e->src,
+			sizeof(e->src), e, NULL);
+	UNUSED(inserted);
+	ASSERT(inserted == 1);
+
+	_VarLenMemo_PushFront(memo, e);
+	memo->size += e->size;
+}
+
+void VarLenMemo_Abort
+(
+	VarLenMemo *memo
+) {
+	ASSERT(memo != NULL);
+
+	if(memo->recording == NULL) return;
+
+	_VarLenMemoEntry_Free(memo->recording);
+	memo->recording = NULL;
+}
+
+void VarLenMemo_Free
+(
+	VarLenMemo *memo
+) {
+	ASSERT(memo != NULL);
+
+	VarLenMemo_Abort(memo);
+
+	VarLenMemoEntry *e = memo->head;
+	while(e != NULL) {
+		VarLenMemoEntry *next = e->next;
+		_VarLenMemoEntry_Free(e);
+		e = next;
+	}
+
+	raxFree(memo->lookup);
+	rm_free(memo);
+}
+
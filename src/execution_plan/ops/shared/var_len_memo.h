@@ -0,0 +1,98 @@
+/*
+ * Copyright 2018-2022 Redis Labs Ltd. and Contributors
+ *
+ * This file is available under the Redis Labs Source Available License Agreement
+ */
+
+#pragma once
+
+#include "rax.h"
+#include "../../../graph/entities/node.h"
+#include "../../../datatypes/path/path.h"
+
+// default max number of bytes memoized by a single operation
+#define VAR_LEN_MEMO_CAPACITY (32 * 1024 * 1024)
+// fraction of QUERY_MEM_CAPACITY a memo may occupy
+#define VAR_LEN_MEMO_MEM_FRACTION 8
+// number of lookups after which recording stops if none were hits
+#define VAR_LEN_MEMO_PROBE 256
+
+// traversal results of a single source node
+// either destination IDs or paths are held, depending on the traversal
+typedef struct VarLenMemoEntry {
+	EntityID src;                   // source node ID
+	EntityID *dests;                // destinations, in discovery order
+	Path **paths;                   // paths, in discovery order
+	size_t size;                    // estimated number of bytes held
+	struct VarLenMemoEntry *prev;   // more recently used entry
+	struct VarLenMemoEntry *next;   // less recently used entry
+} VarLenMemoEntry;
+
+// memo of traversal results keyed by source node ID
+// used by a variable length traversal to avoid re-traversing
+// from a source node which was already traversed from
+// results are recorded while being produced, entries are evicted
+// least recently used first once the memo exceeds its capacity
+typedef struct {
+	rax *lookup;                 // source node ID to entry
+	VarLenMemoEntry *head;       // most recently used entry
+	VarLenMemoEntry *tail;       // least recently used entry
+	VarLenMemoEntry *recording;  // entry being recorded, NULL if none
+	size_t size;                 // estimated number of bytes held
+	size_t cap;                  // max number of bytes held
+	uint64_t hits;               // number of lookups served from memo
+	uint64_t misses;             // number of lookups missing from memo
+	uint64_t evictions;          // number of evicted entries
+} VarLenMemo;
+
+// create a new memo, capacity is derived from QUERY_MEM_CAPACITY
+VarLenMemo *VarLenMemo_New(void);
+
+// returns memoized entry of src, NULL if src isn't memoized
+// discards any incomplete recording
+VarLenMemoEntry *VarLenMemo_Lookup
+(
+	VarLenMemo *memo,  // memo
+	EntityID src       // source node ID
+);
+
+// begin recording traversal results of src
+// recording is skipped when lookups rarely hit
+void VarLenMemo_Record
+(
+	VarLenMemo *memo,  // memo
+	EntityID src       // source node ID
+);
+
+// record a destination of the source being recorded
+void VarLenMemo_RecordDestination
+(
+	VarLenMemo *memo,  // memo
+	EntityID dest      // destination node ID
+);
+
+// record a path from the source being recorded, path is cloned
+void VarLenMemo_RecordPath
+(
+	VarLenMemo *memo,  // memo
+	const Path *p      // path
+);
+
+// store recorded results, called once all results of the source were recorded
+// evicts least recently used entries to make room
+void VarLenMemo_Commit
+(
+	VarLenMemo *memo  // memo
+);
+
+// discard incomplete recording
+void VarLenMemo_Abort
+(
+	VarLenMemo *memo  // memo
+);
+
+void VarLenMemo_Free
+(
+	VarLenMemo *memo  // memo
+);
+
@@ -5,17 +5,27 @@
 */
 
 #include "../../util/arr.h"
+#include "../../query_ctx.h"
 #include "../ops/op_filter.h"
+#include "../ops/op_node_by_id_seek.h"
+#include "../ops/op_node_by_index_scan.h"
+#include "../ops/op_node_by_label_scan.h"
 #include "../ops/op_value_hash_join.h"
 #include "../../util/rax_extensions.h"
 #include "../ops/op_cartesian_product.h"
 #include "../execution_plan_build/execution_plan_modify.h"
 
 #define NOT_RESOLVED -1
+// stream cardinality couldn't be estimated
+#define UNKNOWN_CARDINALITY -1
+// estimated fraction of records passing a filter
+#define FILTER_SELECTIVITY 0.5
+// estimated fraction of labeled nodes matching an index query
+#define INDEX_SELECTIVITY 0.1
 
 /* applyJoin will try to locate situations where two disjoint
  * streams can be joined on a key attribute, in which case the
- * runtime complaxity is reduced from O(n^2) to O(nlogn + 2n)
+ * runtime complaxity is reduced from O(n^2) to O(2n)
  * consider MATCH (a), (b) where a.v = b.v RETURN a,b
  * prior to this optimization a and b will be combined via a
  * cartesian product O(n^2) because a and b are related,
@@ -69,18 +79,74 @@ static OpFilter **_locate_filters(OpBase *cp) {
 	return filters;
 }
 
+// Estimate the number of records produced by a stream
+// based on label cardinality of the stream's scan operations.
+// Returns UNKNOWN_CARDINALITY if the stream's cardinality can't be estimated.
+static double _estimate_stream_cardinality(const OpBase *op) {
+	const Graph *g = QueryCtx_GetGraph();
+	double child_cardinality;
+
+	switch(op->type) {
+		case OPType_ALL_NODE_SCAN:
+			return Graph_NodeCount(g);
+		case OPType_NODE_BY_LABEL_SCAN: {
+			const NodeByLabelScan *scan = (const NodeByLabelScan *)op;
+			// label doesn't exists
+			if(scan->n.label_id == GRAPH_UNKNOWN_LABEL) return 0;
+			return Graph_LabeledNodeCount(g, scan->n.label_id);
+		}
+		case OPType_NODE_BY_INDEX_SCAN: {
+			const IndexScan *scan = (const IndexScan *)op;
+			return Graph_LabeledNodeCount(g, scan->n.label_id) * INDEX_SELECTIVITY;
+		}
+		case OPType_NODE_BY_ID_SEEK: {
+			const NodeByIdSeek *seek = (const NodeByIdSeek *)op;
+			if(seek->maxId < seek->minId) return 0;
+			return MIN((double)seek->maxId - seek->minId + 1, Graph_NodeCount(g));
+		}
+		case OPType_FILTER:
+			child_cardinality = _estimate_stream_cardinality(op->children[0]);
+			if(child_cardinality == UNKNOWN_CARDINALITY) return UNKNOWN_CARDINALITY;
+			return child_cardinality * FILTER_SELECTIVITY;
+		case OPType_CARTESIAN_PRODUCT: {
+			double cardinality = 1;
+			for(int i = 0; i < op->childCount; i++) {
+				child_cardinality = _estimate_stream_cardinality(op->children[i]);
+				if(child_cardinality == UNKNOWN_CARDINALITY) return UNKNOWN_CARDINALITY;
+				cardinality *= child_cardinality;
+			}
+			return cardinality;
+		}
+		default:
+			// stream's source is not a scan, e.g. UNWIND
+			if(op->childCount == 0) return UNKNOWN_CARDINALITY;
+			// assume operation produces a record per input record
+			return _estimate_stream_cardinality(op->children[0]);
+	}
+}
+
 // This function builds a Hash Join operation given its left and right branches and join criteria.
 static OpBase *_build_hash_join_op(const ExecutionPlan *plan, OpBase *left_branch,
 								   OpBase *right_branch, AR_ExpNode *lhs_join_exp, AR_ExpNode *rhs_join_exp) {
 	OpBase *value_hash_join;
 
-	/* The Value Hash Join will cache its left-hand stream. To reduce the cache size,
-	 * prefer to cache the stream which will produce the smallest number of records.
-	 * Our current heuristic for this is to prefer a stream which contains a filter operation. */
-	bool left_branch_filtered = (ExecutionPlan_LocateOp(left_branch, OPType_FILTER) != NULL);
-	bool right_branch_filtered = (ExecutionPlan_LocateOp(right_branch, OPType_FILTER) != NULL);
-	if(!left_branch_filtered && right_branch_filtered) {
-		// Only the RHS stream is filtered, swap the input streams and expressions.
+	/* The Value Hash Join builds a hash table over its left-hand stream. To reduce the table size,
+	 * prefer to build from the stream which will produce the smallest number of records.
+	 * Streams are compared by their label cardinality estimates, if either stream can't be
+	 * estimated, prefer a stream which contains a filter operation. */
+	bool swap;
+	double left_cardinality = _estimate_stream_cardinality(left_branch);
+	double right_cardinality = _estimate_stream_cardinality(right_branch);
+	if(left_cardinality != UNKNOWN_CARDINALITY && right_cardinality != UNKNOWN_CARDINALITY) {
+		swap = (right_cardinality < left_cardinality);
+	} else {
+		bool left_branch_filtered = (ExecutionPlan_LocateOp(left_branch, OPType_FILTER) != NULL);
+		bool right_branch_filtered = (ExecutionPlan_LocateOp(right_branch, OPType_FILTER) != NULL);
+		swap = (!left_branch_filtered && right_branch_filtered);
+	}
+
+	if(swap) {
+		// RHS stream is expected to be smaller, swap the input streams and expressions.
 		value_hash_join = NewValueHashJoin(plan, rhs_join_exp, lhs_join_exp);
 		OpBase *t = left_branch;
 		left_branch = right_branch;
@@ -0,0 +1,59 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "../../util/arr.h"
+#include "../ops/op_cond_var_len_traverse.h"
+#include "../execution_plan_build/execution_plan_modify.h"
+
+/* A variable length traversal whose records are eventually consumed
+ * by a distinct operation doesn't have to produce a record per path,
+ * a single record per reachable destination yields the same distinct rows.
+ * this optimization looks for a distinct operation above a variable length
+ * traversal, in which case the traversal is notified, allowing it
+ * to collect reachable destinations by expanding a frontier
+ * rather than enumerating paths. */
+
+// returns true if op maps each of its input records to records
+// independently of the number of times an input record repeats
+static bool _duplicatesInsensitive
+(
+	const OpBase *op
+) {
+	switch(op->type) {
+		case OPType_PROJECT:
+		case OPType_FILTER:
+		case OPType_EXPAND_INTO:
+		case OPType_CONDITIONAL_TRAVERSE:
+		case OPType_CONDITIONAL_VAR_LEN_TRAVERSE:
+		case OPType_CONDITIONAL_VAR_LEN_TRAVERSE_EXPAND_INTO:
+			return true;
+		default:
+			return false;
+	}
+}
+
+void distinctVarLenTraverse(ExecutionPlan *plan) {
+	OpBase **traversals = ExecutionPlan_CollectOps(plan->root,
+			OPType_CONDITIONAL_VAR_LEN_TRAVERSE);
+
+	uint traversal_count = array_len(traversals);
+	for(uint i = 0; i < traversal_count; i++) {
+		CondVarLenTraverse *op = (CondVarLenTraverse *)traversals[i];
+
+		// search for a distinct operation above the traversal
+		OpBase *parent = op->op.parent;
+		while(parent != NULL && _duplicatesInsensitive(parent)) {
+			parent = parent->parent;
+		}
+
+		if(parent != NULL && parent->type == OPType_DISTINCT) {
+			CondVarLenTraverseOp_DistinctDestinations(op);
+		}
+	}
+
+	array_free(traversals);
+}
@@ -16,7 +16,8 @@ void orderExpressions(
 	AlgebraicExpression **exps,     // expressions to order
 	uint *exps_count,               // number of expressions
 	const FT_FilterNode *filters,   // filters
-	rax *bound_vars                 // previously-bound variables
+	rax *bound_vars,                // previously-bound variables
+	double *rows                    // [output] estimated records per step
 );
 
 void compactFilters(ExecutionPlan *plan);
@@ -29,6 +30,7 @@ void applyJoin(ExecutionPlan *plan);
 void reduceFilters(ExecutionPlan *plan);
 void reduceTraversal(ExecutionPlan *plan);
 void reduceDistinct(ExecutionPlan *plan);
+void distinctVarLenTraverse(ExecutionPlan *plan);
 void reduceCount(ExecutionPlan *plan);
 void applyLimit(ExecutionPlan *plan);
 void applySkip(ExecutionPlan *plan);
@@ -52,6 +52,10 @@ void optimizePlan(ExecutionPlan *plan) {
 	// try to reduce distinct if it follows aggregation
 	reduceDistinct(plan);
 
+	// let variable length traversals feeding a distinct operation
+	// produce each reachable destination once
+	distinctVarLenTraverse(plan);
+
 	// try to reduce execution plan incase it perform node or edge counting
 	reduceCount(plan);
 
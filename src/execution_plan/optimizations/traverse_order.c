@@ -199,6 +199,174 @@ static void _order_expressions
 	ASSERT(res == true);
 }
 
+//------------------------------------------------------------------------------
+// cost based arrangement
+//------------------------------------------------------------------------------
+
+// estimate the number of records produced by evaluating 'exps' in order
+// starting by scanning 'start'
+// 'rows[0]' is set to the number of scanned records
+// 'rows[i + 1]' to the number of records produced by 'exps[i]'
+// returns the total number of records produced
+static double _arrangement_cost
+(
+	const QueryGraph *qg,
+	AlgebraicExpression **exps,
+	uint nexp,
+	const char *start,
+	rax *bound_vars,
+	rax *filtered_entities,
+	double *rows
+) {
+	rax *resolved = raxNew();
+	TraverseOrder_ResolveScan(start, resolved);
+
+	double r = TraverseOrder_NodeCardinality(qg, start, bound_vars,
+			filtered_entities);
+	double cost = r;
+	rows[0] = r;
+
+	for(uint i = 0; i < nexp; i++) {
+		r = TraverseOrder_ExpressionRows(qg, exps[i], r, resolved,
+				filtered_entities);
+		TraverseOrder_ResolveExpression(qg, exps[i], resolved);
+		cost += r;
+		rows[i + 1] = r;
+	}
+
+	raxFree(resolved);
+	return cost;
+}
+
+// greedily arrange expressions starting by scanning 'start'
+// at each step picking the connected expression producing the fewest records
+// ties are broken in favor of the higher scored expression
+// returns the total number of records produced
+static double _greedy_arrangement
+(
+	AlgebraicExpression **arrangement,  // [output] arrangement of expressions
+	const QueryGraph *qg,
+	const ScoredExp *exps,              // expressions sorted by score
+	uint nexp,
+	const char *start,
+	rax *bound_vars,
+	rax *filtered_entities
+) {
+	rax *resolved = raxNew();
+	TraverseOrder_ResolveScan(start, resolved);
+
+	double r = TraverseOrder_NodeCardinality(qg, start, bound_vars,
+			filtered_entities);
+	double cost = r;
+
+	bool used[nexp];
+	memset(used, 0, sizeof(used));
+
+	for(uint i = 0; i < nexp; i++) {
+		int best = -1;
+		double best_rows = 0;
+
+		for(uint j = 0; j < nexp; j++) {
+			if(used[j]) continue;
+
+			AlgebraicExpression *exp = exps[j].exp;
+			const char *src  = AlgebraicExpression_Src(exp);
+			const char *dest = AlgebraicExpression_Dest(exp);
+			if(raxFind(resolved, (unsigned char *)src, strlen(src))
+					== raxNotFound &&
+			   raxFind(resolved, (unsigned char *)dest, strlen(dest))
+					== raxNotFound) {
+				continue;
+			}
+
+			double next = TraverseOrder_ExpressionRows(qg, exp, r, resolved,
+					filtered_entities);
+			if(best == -1 || next < best_rows) {
+				best      = j;
+				best_rows = next;
+			}
+		}
+
+		// expressions form a connected component
+		ASSERT(best != -1);
+
+		used[best]     = true;
+		arrangement[i] = exps[best].exp;
+		TraverseOrder_ResolveExpression(qg, arrangement[i], resolved);
+
+		r = best_rows;
+		cost += r;
+	}
+
+	raxFree(resolved);
+	return cost;
+}
+
+// replace the score based arrangement 'exps' with a cheaper arrangement
+// if one is found, all nodes referred to by 'exps' are considered as
+// starting points, unless some are bound in which case only those are
+static void _cost_based_arrangement
+(
+	const QueryGraph *qg,
+	AlgebraicExpression **exps,
+	const ScoredExp *scored_exps,
+	uint nexp,
+	rax *bound_vars,
+	rax *filtered_entities
+) {
+	double rows[nexp + 1];
+	double cost = _arrangement_cost(qg, exps, nexp,
+			AlgebraicExpression_Src(exps[0]), bound_vars, filtered_entities,
+			rows);
+
+	// collect candidate starting points
+	bool has_bound = false;
+	const char *candidates[nexp * 2];
+	uint candidate_count = 0;
+	for(uint i = 0; i < nexp; i++) {
+		const char *ends[2] = {AlgebraicExpression_Src(exps[i]),
+			AlgebraicExpression_Dest(exps[i])};
+		for(uint j = 0; j < 2; j++) {
+			const char *alias = ends[j];
+			bool bound = bound_vars && raxFind(bound_vars,
+					(unsigned char *)alias, strlen(alias)) != raxNotFound;
+			// bound aliases take precedence over unbound ones
+			if(bound && !has_bound) {
+				has_bound = true;
+				candidate_count = 0;
+			}
+			if(has_bound && !bound) continue;
+			candidates[candidate_count++] = alias;
+		}
+	}
+
+	const char *best_start = NULL;
+	AlgebraicExpression *arrangement[nexp];
+	AlgebraicExpression *best_arrangement[nexp];
+
+	for(uint i = 0; i < candidate_count; i++) {
+		double c = _greedy_arrangement(arrangement, qg, scored_exps, nexp,
+				candidates[i], bound_vars, filtered_entities);
+		// require a strict improvement
+		// ties are resolved in favor of the score based arrangement
+		if(c < cost) {
+			cost = c;
+			best_start = candidates[i];
+			memcpy(best_arrangement, arrangement, sizeof(arrangement));
+		}
+	}
+
+	if(best_start == NULL) return;
+
+	memcpy(exps, best_arrangement, sizeof(best_arrangement));
+
+	// make sure the opening expression starts at 'best_start'
+	if(strcmp(AlgebraicExpression_Src(exps[0]), best_start) != 0) {
+		AlgebraicExpression_Transpose(exps);
+	}
+	_resolve_winning_sequence(exps, nexp);
+}
+
 static int _score_cmp
 (
 	const ScoredExp *a,
@@ -209,19 +377,23 @@ static int _score_cmp
 
 // given a set of algebraic expressions representing a graph traversal
 // we pick the order in which the expressions will be evaluated
-// taking into account filters and transposes
+// taking into account filters, transposes and estimated cardinalities
 // 'exps' will be reordered
+// 'rows' is populated with the estimated number of records produced
+// by the opening scan followed by each expression
 void orderExpressions
 (
 	const QueryGraph *qg,
 	AlgebraicExpression **exps,
 	uint *exp_count,
 	const FT_FilterNode *ft,
-	rax *bound_vars
+	rax *bound_vars,
+	double *rows
 ) {
 	// Validate inputs
 	ASSERT(qg          != NULL);
 	ASSERT(exps        != NULL);
+	ASSERT(rows        != NULL);
 	ASSERT(exp_count   != NULL);
 
 	uint _exp_count = *exp_count;
@@ -268,6 +440,11 @@ void orderExpressions
 		AlgebraicExpression_Transpose(exps);
 	}
 
+	// prefer an arrangement expected to produce fewer intermediate records
+	// based on label and relationship counts
+	_cost_based_arrangement(qg, exps, scored_exps, _exp_count, bound_vars,
+			filtered_entities);
+
 	// remove redundent operands from expressions
 	// MATCH (a:A)-[:R]->(b:B), (a)-[:R]->(c:C), (a:A)-[:R]->(d:D)
 	// will result in 2 expressions:
@@ -283,6 +460,10 @@ void orderExpressions
 	_AlgebraicExpression_RemoveRedundentOperands(exps, qg);
 	*exp_count = array_len(exps);
 
+	// estimate the number of records produced by each step
+	_arrangement_cost(qg, exps, *exp_count, AlgebraicExpression_Src(exps[0]),
+			bound_vars, filtered_entities, rows);
+
 	if(filtered_entities) {
 		raxFree(filtered_entities);
 	}
@@ -5,9 +5,15 @@
  */
 
 #include "RG.h"
+#include "../../query_ctx.h"
 #include "../../util/arr.h"
 #include "traverse_order_utils.h"
 
+#include <math.h>
+
+// fraction of entities assumed to pass each independent filter
+#define FILTER_SELECTIVITY 0.1
+
 static bool _AlgebraicExpression_IsVarLen
 (
 	const AlgebraicExpression *exp,
@@ -308,3 +314,237 @@ void TraverseOrder_ScoreExpressions
 	}
 }
 
+//------------------------------------------------------------------------------
+// Cost estimation
+//------------------------------------------------------------------------------
+
+// marks resolved aliases whose labels were accounted for
+#define LABELS_APPLIED ((void *)1)
+
+// fraction of 'alias' entities passing the independent filters applied to it
+static double _FilterSelectivity
+(
+	const char *alias,
+	rax *filtered_entities
+) {
+	if(!filtered_entities) return 1.0;
+
+	void *frequency = raxFind(filtered_entities, (unsigned char *)alias,
+			strlen(alias));
+	if(frequency == raxNotFound) return 1.0;
+
+	return pow(FILTER_SELECTIVITY, (int64_t)frequency);
+}
+
+// number of nodes carrying all of 'n' labels
+// bounded by the least populated label
+static double _LabeledNodeCount
+(
+	const QGNode *n,
+	const Graph *g
+) {
+	double count = Graph_NodeCount(g);
+
+	uint label_count = QGNode_LabelCount(n);
+	for(uint i = 0; i < label_count; i++) {
+		int label_id = QGNode_GetLabelID(n, i);
+		if(label_id == GRAPH_UNKNOWN_LABEL) return 0;
+		count = MIN(count, Graph_LabeledNodeCount(g, label_id));
+	}
+
+	return count;
+}
+
+// number of edges of relationship type 'relation'
+// all edges if 'relation' is NULL
+static double _RelationEdgeCount
+(
+	GraphContext *gc,
+	const char *relation
+) {
+	if(relation == NULL) return Graph_EdgeCount(gc->g);
+
+	Schema *s = GraphContext_GetSchema(gc, relation, SCHEMA_EDGE);
+	if(s == NULL) return 0;
+
+	return Graph_RelationEdgeCount(gc->g, Schema_GetID(s));
+}
+
+static inline bool _Resolved
+(
+	rax *resolved,
+	const char *alias
+) {
+	return raxFind(resolved, (unsigned char *)alias, strlen(alias))
+		!= raxNotFound;
+}
+
+// estimate the factor by which 'exp' multiplies the number of records
+// relationship operands contribute their average degree
+// label operands the fraction of nodes carrying the label
+// unless the label was already accounted for
+static double _ExpressionFanout
+(
+	GraphContext *gc,
+	AlgebraicExpression *exp,
+	rax *resolved,
+	double node_count
+) {
+	if(exp->type == AL_OPERATION) {
+		uint child_count = AlgebraicExpression_ChildCount(exp);
+		bool add = (exp->operation.op == AL_EXP_ADD);
+		double fanout = add ? 0 : 1;
+		for(uint i = 0; i < child_count; i++) {
+			double f = _ExpressionFanout(gc, exp->operation.children[i],
+					resolved, node_count);
+			fanout = add ? fanout + f : fanout * f;
+		}
+		return fanout;
+	}
+
+	// zero length traversal
+	if(exp->operand.matrix == IDENTITY_MATRIX) return 1;
+
+	if(exp->operand.diagonal) {
+		const char *alias = exp->operand.src;
+		void *labeled = raxFind(resolved, (unsigned char *)alias,
+				strlen(alias));
+		if(labeled == LABELS_APPLIED) return 1;
+
+		Schema *s = GraphContext_GetSchema(gc, exp->operand.label,
+				SCHEMA_NODE);
+		if(s == NULL) return 0;
+		return Graph_LabeledNodeCount(gc->g, Schema_GetID(s)) / node_count;
+	}
+
+	return _RelationEdgeCount(gc, exp->operand.label) / node_count;
+}
+
+void TraverseOrder_ResolveScan
+(
+	const char *alias,
+	rax *resolved
+) {
+	ASSERT(alias    != NULL);
+	ASSERT(resolved != NULL);
+
+	raxInsert(resolved, (unsigned char *)alias, strlen(alias),
+			LABELS_APPLIED, NULL);
+}
+
+// mark the aliases of 'exp' label operands as labeled
+static void _ResolveLabels
+(
+	AlgebraicExpression *exp,
+	rax *resolved
+) {
+	if(exp->type == AL_OPERATION) {
+		uint child_count = AlgebraicExpression_ChildCount(exp);
+		for(uint i = 0; i < child_count; i++) {
+			_ResolveLabels(exp->operation.children[i], resolved);
+		}
+		return;
+	}
+
+	if(exp->operand.diagonal && exp->operand.matrix != IDENTITY_MATRIX) {
+		TraverseOrder_ResolveScan(exp->operand.src, resolved);
+	}
+}
+
+void TraverseOrder_ResolveExpression
+(
+	const QueryGraph *qg,
+	AlgebraicExpression *exp,
+	rax *resolved
+) {
+	ASSERT(qg       != NULL);
+	ASSERT(exp      != NULL);
+	ASSERT(resolved != NULL);
+
+	_ResolveLabels(exp, resolved);
+
+	const char *aliases[2] = {AlgebraicExpression_Src(exp),
+		AlgebraicExpression_Dest(exp)};
+	for(uint i = 0; i < 2; i++) {
+		const char *alias = aliases[i];
+		// keep labeled mark
+		if(_Resolved(resolved, alias)) continue;
+		raxInsert(resolved, (unsigned char *)alias, strlen(alias), NULL, NULL);
+	}
+}
+
+double TraverseOrder_NodeCardinality
+(
+	const QueryGraph *qg,
+	const char *alias,
+	rax *bound_vars,
+	rax *filtered_entities
+) {
+	ASSERT(qg    != NULL);
+	ASSERT(alias != NULL);
+
+	if(bound_vars && _Resolved(bound_vars, alias)) return 1;
+
+	const Graph *g = QueryCtx_GetGraph();
+	QGNode *n = QueryGraph_GetNodeByAlias(qg, alias);
+	ASSERT(n != NULL);
+
+	return _LabeledNodeCount(n, g) * _FilterSelectivity(alias,
+			filtered_entities);
+}
+
+// estimates are based on the average degree of the traversed relationships
+// assuming edges are spread uniformly across nodes:
+// traversing from N nodes reaches N * avg_degree nodes
+// of which the fraction carrying the destination's labels is retained
+double TraverseOrder_ExpressionRows
+(
+	const QueryGraph *qg,
+	AlgebraicExpression *exp,
+	double rows,
+	rax *resolved,
+	rax *filtered_entities
+) {
+	ASSERT(qg       != NULL);
+	ASSERT(exp      != NULL);
+	ASSERT(resolved != NULL);
+
+	GraphContext *gc   = QueryCtx_GetGraphCtx();
+	const char   *src  = AlgebraicExpression_Src(exp);
+	const char   *dest = AlgebraicExpression_Dest(exp);
+	bool src_resolved  = _Resolved(resolved, src);
+	bool dest_resolved = _Resolved(resolved, dest);
+	ASSERT(src_resolved || dest_resolved);
+
+	double node_count = MAX(Graph_NodeCount(gc->g), 1);
+
+	// the alias this expression resolves
+	const char *to = src_resolved ? dest : src;
+	double filter_selectivity = _FilterSelectivity(to, filtered_entities);
+
+	if(_AlgebraicExpression_IsVarLen(exp, qg)) {
+		// each hop multiplies by the average degree
+		// up to the entire graph being reachable
+		// endpoints labels are resolved by dedicated expressions
+		QGEdge *e = QueryGraph_GetEdgeByAlias(qg, AlgebraicExpression_Edge(exp));
+		double degree = _ExpressionFanout(gc, exp, resolved, node_count);
+		uint hops = MAX(e->minHops, 1);
+		double reachable = MIN(pow(degree, hops), node_count);
+		if(e->minHops == 0) reachable += 1;
+		if(src_resolved && dest_resolved) {
+			return rows * MIN(1.0, reachable / node_count);
+		}
+		return rows * reachable * filter_selectivity;
+	}
+
+	double fanout = _ExpressionFanout(gc, exp, resolved, node_count);
+
+	// both ends are resolved
+	// fraction of pairs connected by the traversed pattern
+	if(src_resolved && dest_resolved) {
+		if(strcmp(src, dest) == 0) return rows * fanout;
+		return rows * MIN(1.0, fanout / node_count);
+	}
+
+	return rows * fanout * filter_selectivity;
+}
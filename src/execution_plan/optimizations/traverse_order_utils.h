@@ -39,3 +39,39 @@ void TraverseOrder_ScoreExpressions
 	const QueryGraph *qg         // query graph
 );
 
+// estimated number of nodes 'alias' resolves to when it is scanned
+// bound aliases resolve to a single node
+double TraverseOrder_NodeCardinality
+(
+	const QueryGraph *qg,        // query graph
+	const char *alias,           // node alias
+	rax *bound_vars,             // map of bounded entities
+	rax *filtered_entities       // map of filtered entities
+);
+
+// estimated number of records produced by evaluating 'exp'
+// over 'rows' records, in which the aliases in 'resolved' are resolved
+// either the expression's source or destination must be resolved
+double TraverseOrder_ExpressionRows
+(
+	const QueryGraph *qg,        // query graph
+	AlgebraicExpression *exp,    // expression to evaluate
+	double rows,                 // number of input records
+	rax *resolved,               // map of resolved aliases
+	rax *filtered_entities       // map of filtered entities
+);
+
+// mark 'alias' as resolved by a scan in 'resolved'
+void TraverseOrder_ResolveScan
+(
+	const char *alias,           // scanned node alias
+	rax *resolved                // map of resolved aliases
+);
+
+// mark 'exp' source and destination as resolved in 'resolved'
+void TraverseOrder_ResolveExpression
+(
+	const QueryGraph *qg,        // query graph
+	AlgebraicExpression *exp,    // evaluated expression
+	rax *resolved                // map of resolved aliases
+);
@@ -8,8 +8,11 @@
 #include "../../value.h"
 #include "../../util/arr.h"
 #include "../../query_ctx.h"
+#include "../ops/op_sort.h"
 #include "../ops/op_filter.h"
+#include "../ops/op_project.h"
 #include "../../ast/ast_shared.h"
+#include "../../ast/ast_build_op_contexts.h"
 #include "../../datatypes/array.h"
 #include "../../datatypes/point.h"
 #include "../ops/op_node_by_label_scan.h"
@@ -279,6 +282,130 @@ static FT_FilterNode *_Concat_Filters(OpFilter **filter_ops) {
 	return root;
 }
 
+//------------------------------------------------------------------------------
+// Selectivity estimation
+//------------------------------------------------------------------------------
+
+// estimated fraction of entities passing an equality predicate
+#define EQUALITY_SELECTIVITY 0.1
+// estimated fraction of entities passing a range predicate
+#define RANGE_SELECTIVITY 0.33
+
+// retrieve statistics of the attribute a normalized predicate filters on
+// returns NULL if there are none
+static const AttributeStatistics *_predicateStatistics
+(
+	const FT_FilterNode *filter,
+	const LabelStatistics *stats
+) {
+	if(stats == NULL) return NULL;
+
+	char *attr;
+	if(!AR_EXP_IsAttribute(filter->pred.lhs, &attr)) return NULL;
+
+	GraphContext *gc = QueryCtx_GetGraphCtx();
+	Attribute_ID attr_id = GraphContext_GetAttributeID(gc, attr);
+	if(attr_id == ATTRIBUTE_ID_NONE) return NULL;
+
+	return LabelStatistics_GetAttribute(stats, attr_id);
+}
+
+// estimate the fraction of entities passing a predicate
+// using the filtered attribute's statistics
+static double _predicateSelectivity
+(
+	const FT_FilterNode *filter,
+	const AttributeStatistics *attr
+) {
+	if(filter->pred.op == OP_EQUAL) {
+		return AttributeStatistics_EqualitySelectivity(attr);
+	}
+
+	SIValue v;
+	if(!AR_EXP_ReduceToScalar(filter->pred.rhs, true, &v) ||
+	   !(SI_TYPE(v) & SI_NUMERIC)) {
+		return RANGE_SELECTIVITY;
+	}
+
+	double d = SI_GET_NUMERIC(v);
+	switch(filter->pred.op) {
+		case OP_LT:
+		case OP_LE:
+			return AttributeStatistics_RangeSelectivity(attr, -INFINITY, d);
+		case OP_GT:
+		case OP_GE:
+			return AttributeStatistics_RangeSelectivity(attr, d, INFINITY);
+		default:
+			return RANGE_SELECTIVITY;
+	}
+}
+
+// estimate the fraction of indexed entities passing an applicable filter
+// 'stats' are the statistics of the indexed label, NULL if not analyzed
+static double _filterSelectivity
+(
+	FT_FilterNode *filter,
+	const LabelStatistics *stats
+) {
+	if(isInFilter(filter)) {
+		// each list element is an equality
+		AR_ExpNode *list = filter->exp.exp->op.children[1];
+		uint list_len = 1;
+		if(AR_EXP_IsConstant(list) &&
+		   SI_TYPE(list->operand.constant) == T_ARRAY) {
+			list_len = SIArray_Length(list->operand.constant);
+		}
+
+		double equality = EQUALITY_SELECTIVITY;
+		char *attr_name;
+		AR_ExpNode *lhs = filter->exp.exp->op.children[0];
+		if(stats != NULL && AR_EXP_IsAttribute(lhs, &attr_name)) {
+			GraphContext *gc = QueryCtx_GetGraphCtx();
+			const AttributeStatistics *attr = LabelStatistics_GetAttribute(
+					stats, GraphContext_GetAttributeID(gc, attr_name));
+			if(attr != NULL) {
+				equality = AttributeStatistics_EqualitySelectivity(attr);
+			}
+		}
+		return MIN(1.0, list_len * equality);
+	}
+
+	if(isDistanceFilter(filter)) return RANGE_SELECTIVITY;
+
+	switch(filter->t) {
+	case FT_N_COND: {
+		double l = _filterSelectivity(filter->cond.left, stats);
+		double r = _filterSelectivity(filter->cond.right, stats);
+		// assume predicates are independent
+		if(filter->cond.op == OP_AND) return l * r;
+		return MIN(1.0, l + r);
+	}
+	case FT_N_PRED: {
+		const AttributeStatistics *attr = _predicateStatistics(filter, stats);
+		if(attr != NULL) return _predicateSelectivity(filter, attr);
+		if(filter->pred.op == OP_EQUAL) return EQUALITY_SELECTIVITY;
+		return RANGE_SELECTIVITY;
+	}
+	default:
+		return 1.0;
+	}
+}
+
+// estimate the fraction of indexed entities passing all filters
+static double _filtersSelectivity
+(
+	OpFilter **filters,
+	const LabelStatistics *stats
+) {
+	double selectivity = 1.0;
+	uint count = array_len(filters);
+	for(uint i = 0; i < count; i++) {
+		selectivity *= _filterSelectivity(filters[i]->filterTree, stats);
+	}
+
+	return selectivity;
+}
+
 // try to replace given Label Scan operation and a set of Filter operations with
 // a single Index Scan operation
 void reduce_scan_op
@@ -293,10 +420,10 @@ void reduce_scan_op
 	QueryGraph   *qg  =  scan->op.plan->query_graph;
 
 	// find label with filtered indexed properties
-	// that has the minimum NNZ entries
+	// that is expected to match the fewest entries
 	int         min_label_id;                 // tracks min label ID
-	uint64_t    min_nnz        = UINT64_MAX;  // tracks min entries
-	RSIndex     *rs_idx        = NULL;        // the index to be applied
+	double      min_rows       = INFINITY;    // tracks min expected entries
+	Index       *min_idx       = NULL;        // the index to be applied
 	OpFilter    **filters      = NULL;        // tracks indexed filters to apply
 	uint        filters_count  = 0;           // number of matching filters
 	const char  *min_label_str = NULL;        // tracks min label name
@@ -318,17 +445,13 @@ void reduce_scan_op
 
 		idx = GraphContext_GetIndexByID(gc, label_id, NULL, IDX_EXACT_MATCH, SCHEMA_NODE);
 
-		// no index for current label
-		if(idx == NULL) continue;
+		// no index for current label, or index is still being populated
+		if(idx == NULL || !Index_Enabled(idx)) continue;
 
 		// get all applicable filter for index
-		RSIndex *cur_idx = idx->idx;
 		// TODO switch to reusable array
 		OpFilter **cur_filters = _applicableFilters((OpBase *)scan, scan->n.alias, idx);
 
-		// TODO consider heuristic which combines max
-		// number / restrictiveness of applicable filters
-		// vs. the label's NNZ?
 		uint cur_filters_count = array_len(cur_filters);
 		if(cur_filters_count == 0) {
 			// no filters
@@ -336,10 +459,14 @@ void reduce_scan_op
 			continue;
 		}
 
+		// estimate number of entities the index query matches
 		nnz = Graph_LabeledNodeCount(g, label_id);
-		if(min_nnz > nnz) {
-			rs_idx         =  cur_idx;
-			min_nnz        =  nnz;
+		const LabelStatistics *stats =
+			GraphContext_GetLabelStatistics(gc, label_id);
+		double rows = nnz * _filtersSelectivity(cur_filters, stats);
+		if(min_rows > rows) {
+			min_idx        =  idx;
+			min_rows       =  rows;
 			min_label_str  =  label;
 			min_label_id   =  label_id;
 
@@ -348,11 +475,13 @@ void reduce_scan_op
 			array_free(filters);
 			filters = cur_filters;
 			filters_count = cur_filters_count;
+		} else {
+			array_free(cur_filters);
 		}
 	}
 
 	// no label possessed indexed and filtered attributes, return early
-	if(rs_idx == NULL) goto cleanup;
+	if(min_idx == NULL) goto cleanup;
 
 	// did we found a better label to utilize? if so swap
 	if(scan->n.label_id != min_label_id) {
@@ -386,7 +515,7 @@ void reduce_scan_op
 	}
 
 	FT_FilterNode *root = _Concat_Filters(filters);
-	OpBase *indexOp = NewIndexScanOp(scan->op.plan, scan->g, scan->n, rs_idx,
+	OpBase *indexOp = NewIndexScanOp(scan->op.plan, scan->g, scan->n, min_idx,
 			root);
 
 	// replace the redundant scan op with the newly-constructed Index Scan
@@ -420,10 +549,9 @@ void reduce_cond_op(ExecutionPlan *plan, OpCondTraverse *cond) {
 	const char *label = QGEdge_Relation(e, 0);
 	GraphContext *gc = QueryCtx_GetGraphCtx();
 	Index *idx = GraphContext_GetIndex(gc, label, NULL, IDX_EXACT_MATCH, SCHEMA_EDGE);
-	if(idx == NULL) return;
+	if(idx == NULL || !Index_Enabled(idx)) return;
 
 	// get all applicable filter for index
-	RSIndex *rs_idx = idx->idx;
 	OpFilter **filters = _applicableFilters((OpBase *)cond, edge, idx);
 
 	// no filters, return
@@ -431,7 +559,7 @@ void reduce_cond_op(ExecutionPlan *plan, OpCondTraverse *cond) {
 	if(filters_count == 0) goto cleanup;
 
 	FT_FilterNode *root = _Concat_Filters(filters);
-	OpBase *indexOp = NewEdgeIndexScanOp(cond->op.plan, cond->graph, e, rs_idx,
+	OpBase *indexOp = NewEdgeIndexScanOp(cond->op.plan, cond->graph, e, idx,
 			root);
 
 	// The OPType_ALL_NODE_SCAN operation is redundant
@@ -495,6 +623,138 @@ cleanup:
 	array_free(filters);
 }
 
+//------------------------------------------------------------------------------
+// Index ordering
+//------------------------------------------------------------------------------
+
+// search filter for a predicate restricting 'alias.attr' to numeric values
+// only predicates along AND conditions are considered
+// returns the attribute name as it appears in the filter, NULL if not found
+static const char *_numericBoundAttribute
+(
+	FT_FilterNode *filter,
+	const char *alias,
+	const char *attr
+) {
+	if(filter->t == FT_N_COND) {
+		if(filter->cond.op != OP_AND) return NULL;
+		const char *res = _numericBoundAttribute(filter->cond.left, alias, attr);
+		if(res == NULL) {
+			res = _numericBoundAttribute(filter->cond.right, alias, attr);
+		}
+		return res;
+	}
+
+	if(filter->t != FT_N_PRED) return NULL;
+
+	switch(filter->pred.op) {
+		case OP_LT:
+		case OP_LE:
+		case OP_GT:
+		case OP_GE:
+		case OP_EQUAL:
+			break;
+		default:
+			return NULL;
+	}
+
+	// filters are normalized, attribute lookup is on the left hand side
+	char *pred_attr;
+	AR_ExpNode *lhs = filter->pred.lhs;
+	if(!AR_EXP_IsAttribute(lhs, &pred_attr)) return NULL;
+	if(strcmp(pred_attr, attr) != 0) return NULL;
+
+	AR_ExpNode *entity = lhs->op.children[0];
+	if(!AR_EXP_IsVariadic(entity) ||
+	   strcmp(entity->operand.variadic.entity_alias, alias) != 0) {
+		return NULL;
+	}
+
+	SIValue v;
+	if(!AR_EXP_ReduceToScalar(filter->pred.rhs, true, &v)) return NULL;
+	if(!(SI_TYPE(v) & SI_NUMERIC)) return NULL;
+
+	return pred_attr;
+}
+
+// resolve the expression a sort operation orders by
+// following projected aliases, e.g. RETURN n.v AS x ORDER BY x
+static AR_ExpNode *_sortExpression
+(
+	const OpSort *sort,
+	const OpProject *project
+) {
+	AR_ExpNode *exp = sort->exps[0];
+	if(AR_EXP_IsAttribute(exp, NULL)) return exp;
+	if(project == NULL || !AR_EXP_IsVariadic(exp)) return NULL;
+
+	const char *alias = exp->operand.variadic.entity_alias;
+	for(uint i = 0; i < project->exp_count; i++) {
+		if(strcmp(project->exps[i]->resolved_name, alias) == 0) {
+			return project->exps[i];
+		}
+	}
+
+	return NULL;
+}
+
+// try to replace a sort operation with an index scan producing nodes in order
+// applicable when:
+// 1. the sort is followed by a limit
+// 2. sort orders by a single attribute of a node scanned by an index scan
+// 3. the index scan's filter restricts the attribute to numeric values
+// 4. only order preserving operations reside between the scan and the sort
+static void _utilizeIndexOrder
+(
+	ExecutionPlan *plan,
+	OpSort *sort
+) {
+	if(array_len(sort->exps) != 1) return;
+
+	// ordering only pays off when not all records are consumed
+	OpBase *parent = sort->op.parent;
+	while(parent != NULL && parent->type == OPType_SKIP) parent = parent->parent;
+	if(parent == NULL || parent->type != OPType_LIMIT) return;
+
+	// locate index scan, skipping projections and filters
+	OpProject *project = NULL;
+	OpBase *op = sort->op.children[0];
+	while(op->type == OPType_PROJECT || op->type == OPType_FILTER) {
+		if(op->type == OPType_PROJECT) {
+			// a projection might rename the scanned alias
+			if(project != NULL) return;
+			project = (OpProject *)op;
+		}
+		op = op->children[0];
+	}
+
+	if(op->type != OPType_NODE_BY_INDEX_SCAN || op->childCount != 0) return;
+	IndexScan *scan = (IndexScan *)op;
+
+	AR_ExpNode *exp = _sortExpression(sort, project);
+	if(exp == NULL) return;
+
+	// projected expression might not be an attribute, e.g. RETURN id(n) AS i
+	char *attr;
+	if(!AR_EXP_IsAttribute(exp, &attr)) return;
+	AR_ExpNode *entity = exp->op.children[0];
+	if(!AR_EXP_IsVariadic(entity) ||
+	   strcmp(entity->operand.variadic.entity_alias, scan->n.alias) != 0) {
+		return;
+	}
+
+	// nodes lacking the attribute or holding none numeric values
+	// aren't reachable through numeric ranges
+	const char *bound_attr = _numericBoundAttribute(scan->filter,
+			scan->n.alias, attr);
+	if(bound_attr == NULL) return;
+
+	// scan produces nodes in order, sort is redundant
+	IndexScanOp_SetOrder(scan, bound_attr, sort->directions[0] == DIR_ASC);
+	ExecutionPlan_RemoveOp(plan, (OpBase *)sort);
+	OpBase_Free((OpBase *)sort);
+}
+
 void utilizeIndices
 (
 	ExecutionPlan *plan
@@ -533,8 +793,18 @@ void utilizeIndices
 		reduce_cond_op(plan, condOp);
 	}
 
+	// collect all sort operations
+	OpBase **sortOps = ExecutionPlan_CollectOps(plan->root, OPType_SORT);
+
+	uint sortOpCount = array_len(sortOps);
+	for(uint i = 0; i < sortOpCount; i++) {
+		// try to have an index scan produce records in order
+		_utilizeIndexOrder(plan, (OpSort *)sortOps[i]);
+	}
+
 	// cleanup
 	array_free(scanOps);
 	array_free(condOps);
+	array_free(sortOps);
 }
 
@@ -224,16 +224,92 @@ static RSQNode *_concat_query_nodes
 	return root;
 }
 
+// append value 'field' is restricted to by an equality to composite key
+// returns false if 'field' isn't restricted by an equality
+static bool _composite_key_append
+(
+	sds *key,            // composite key
+	const char *field,   // field to append
+	rax *string_ranges,  // string ranges
+	rax *numeric_ranges  // numerical ranges
+) {
+	uint len = strlen(field);
+
+	NumericRange *nr = raxFind(numeric_ranges, (unsigned char *)field, len);
+	if(nr != raxNotFound) {
+		if(nr->min != nr->max || !nr->include_min || !nr->include_max) {
+			return false;
+		}
+		return Index_CompositeKeyAppend(key, SI_DoubleVal(nr->min));
+	}
+
+	StringRange *sr = raxFind(string_ranges, (unsigned char *)field, len);
+	if(sr != raxNotFound) {
+		if(sr->min == NULL || sr->max == NULL || strcmp(sr->min, sr->max) != 0 ||
+		   !sr->include_min || !sr->include_max) {
+			return false;
+		}
+		return Index_CompositeKeyAppend(key, SI_ConstStringVal(sr->min));
+	}
+
+	return false;
+}
+
+// replace equalities on the index's leading fields with a single lookup
+// of their composite key, returns NULL if less than two leading fields
+// are restricted by equalities
+static RSQNode *_composite_key_query_node
+(
+	const Index *idx,    // index to query
+	rax *string_ranges,  // string ranges
+	rax *numeric_ranges  // numerical ranges
+) {
+	uint prefix_len = 0;
+	sds  key        = sdsempty();
+
+	while(prefix_len < idx->composite_len &&
+		  _composite_key_append(&key, idx->fields[prefix_len].name,
+			  string_ranges, numeric_ranges)) {
+		prefix_len++;
+	}
+
+	RSQNode *node = NULL;
+	if(prefix_len > 1) {
+		// composite key lookup replaces ranges of leading fields
+		for(uint i = 0; i < prefix_len; i++) {
+			void *range;
+			const char *field = idx->fields[i].name;
+			uint len = strlen(field);
+			if(raxRemove(numeric_ranges, (unsigned char *)field, len, &range)) {
+				NumericRange_Free(range);
+			} else if(raxRemove(string_ranges, (unsigned char *)field, len,
+						&range)) {
+				StringRange_Free(range);
+			}
+		}
+
+		node = RediSearch_CreateTagNode(idx->idx, INDEX_FIELD_COMPOSITE_KEY);
+		RSQNode *child = RediSearch_CreateTagTokenNode(idx->idx, key);
+		RediSearch_QueryNodeAddChild(node, child);
+	}
+
+	sdsfree(key);
+	return node;
+}
+
 // compose index query from ranges
 static RSQNode *_ranges_to_query_nodes
 (
-	RSIndex *idx,        // index to query
+	const Index *index,  // index to query
 	rax *string_ranges,  // string ranges
 	rax *numeric_ranges  // numerical ranges
 ) {
+	ASSERT(index          != NULL);
 	ASSERT(string_ranges  != NULL);
 	ASSERT(numeric_ranges != NULL);
 
+	RSIndex *idx = index->idx;
+
 	// build RediSearch query tree
 	// convert each range object to RediSearch query node
 	raxIterator it;
@@ -282,15 +358,23 @@ static RSQNode *_ranges_to_query_nodes
 
 	if(valid == false) return RediSearch_CreateEmptyNode(idx);
 
+	//--------------------------------------------------------------------------
+	// construct composite key query
+	//--------------------------------------------------------------------------
+
+	uint i = 0;
+	RSQNode *composite = _composite_key_query_node(index, string_ranges,
+			numeric_ranges);
+
 	//--------------------------------------------------------------------------
 	// construct index range queries
 	//--------------------------------------------------------------------------
 
 	// detemine number of ranges
-	uint i = 0;
 	char query_field_name[1024];
 	uint range_count = raxSize(numeric_ranges) + raxSize(string_ranges);
-	RSQNode *rsqnodes[range_count];
+	RSQNode *rsqnodes[range_count + 1];
+	if(composite != NULL) rsqnodes[i++] = composite;
 
 	raxSeek(&it, "^", NULL, 0);
 	while(raxNext(&it)) {
@@ -317,7 +401,7 @@ static RSQNode *_ranges_to_query_nodes
 	}
 	raxStop(&it);
 
-	RSQNode *root = _concat_query_nodes(idx, rsqnodes, range_count);
+	RSQNode *root = _concat_query_nodes(idx, rsqnodes, i);
 	return root;
 }
 
@@ -540,12 +624,14 @@ RSQNode *FilterTreeToQueryNode
 (
 	FT_FilterNode **none_converted_filters, // [output] none convertable filters
 	const FT_FilterNode *tree,              // filter tree to convert
-	RSIndex *idx                            // index to query
+	const Index *index                      // index to query
 ) {
-	ASSERT(idx != NULL);
+	ASSERT(index != NULL);
 	ASSERT(tree != NULL);
 	ASSERT(none_converted_filters != NULL);
 
+	RSIndex *idx = index->idx;
+
 	// clone filter tree, as it is about to be modified
 	FT_FilterNode  *t       =  FilterTree_Clone(tree);
 	RSQNode        **nodes  =  array_new(RSQNode*, 1);  // intermidate nodes
@@ -559,7 +645,8 @@ RSQNode *FilterTreeToQueryNode
 	rax *numeric_ranges = raxNew();
 	_compose_ranges(trees, string_ranges, numeric_ranges);
 	if(raxSize(string_ranges) > 0 || raxSize(numeric_ranges) > 0) {
-		RSQNode *ranges = _ranges_to_query_nodes(idx, string_ranges, numeric_ranges);
+		RSQNode *ranges = _ranges_to_query_nodes(index, string_ranges,
+				numeric_ranges);
 		// TODO: check for empty node RediSearch_CreateEmptyNode
 		array_append(nodes, ranges);
 	}
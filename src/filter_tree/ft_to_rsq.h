@@ -7,9 +7,11 @@
 #pragma once
 
 #include "filter_tree.h"
+#include "../index/index.h"
 #include "../../deps/RediSearch/src/redisearch_api.h"
 
 // construct a RediSearch query node from filter tree
+// equalities on the index's leading fields are resolved by a composite key
 RSQNode *FilterTreeToQueryNode(FT_FilterNode **none_converted_filters,
-		const FT_FilterNode *tree, RSIndex *idx);
+		const FT_FilterNode *tree, const Index *idx);
 
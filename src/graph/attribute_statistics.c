@@ -0,0 +1,267 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "attribute_statistics.h"
+#include "../util/arr.h"
+#include "../util/rmalloc.h"
+#include "rg_matrix/rg_matrix_iter.h"
+
+#include <math.h>
+
+// values of a single attribute gathered from the sampled entities
+typedef struct {
+	uint64_t present;  // number of sampled entities holding the attribute
+	uint64_t *hashes;  // hash of each value
+	double *numerics;  // numeric values
+} AttributeSample;
+
+static int _CompareHashes(const void *a, const void *b) {
+	uint64_t x = *(const uint64_t *)a;
+	uint64_t y = *(const uint64_t *)b;
+	return (x > y) - (x < y);
+}
+
+static int _CompareNumerics(const void *a, const void *b) {
+	double x = *(const double *)a;
+	double y = *(const double *)b;
+	return (x > y) - (x < y);
+}
+
+// estimate the number of distinct values among 'population' values
+// given the sorted hashes of a sample of them
+// uses the Duj1 estimator: n * d / (n - f1 + f1 * n / N)
+// where d is the number of distinct sampled values
+// and f1 is the number of values sampled exactly once
+static double _EstimateDistinct
+(
+	uint64_t *hashes,    // sorted sampled value hashes
+	double population    // number of values sampled from
+) {
+	uint64_t n = array_len(hashes);
+	if(n == 0) return 0;
+
+	uint64_t d  = 0;
+	uint64_t f1 = 0;
+	for(uint64_t i = 0; i < n;) {
+		uint64_t j = i + 1;
+		while(j < n && hashes[j] == hashes[i]) j++;
+		d++;
+		if(j - i == 1) f1++;
+		i = j;
+	}
+
+	// entire population was sampled
+	if(population <= n) return d;
+
+	double estimate = (n * d) / (n - f1 + f1 * n / population);
+	return MAX(d, MIN(estimate, population));
+}
+
+// build an equi-depth histogram out of the sorted numeric values
+// returns NULL if there are no values
+static double *_BuildHistogram
+(
+	double *numerics  // sorted numeric values
+) {
+	uint64_t n = array_len(numerics);
+	if(n == 0) return NULL;
+
+	uint buckets = MIN(ATTRIBUTE_STATS_BUCKETS, n);
+	double *histogram = array_new(double, buckets + 1);
+	for(uint i = 0; i <= buckets; i++) {
+		uint64_t pos = MIN((i * n) / buckets, n - 1);
+		array_append(histogram, numerics[pos]);
+	}
+
+	return histogram;
+}
+
+LabelStatistics *LabelStatistics_New
+(
+	uint64_t entity_count,
+	uint64_t sampled
+) {
+	LabelStatistics *stats = rm_malloc(sizeof(LabelStatistics));
+
+	stats->sampled      = sampled;
+	stats->attributes   = array_new(AttributeStatistics, 0);
+	stats->entity_count = entity_count;
+
+	return stats;
+}
+
+LabelStatistics *LabelStatistics_Collect
+(
+	Graph *g,
+	int label_id,
+	uint64_t sample_size
+) {
+	ASSERT(g           != NULL);
+	ASSERT(sample_size >  0);
+
+	uint64_t entity_count = Graph_LabeledNodeCount(g, label_id);
+
+	// sample every step'th node
+	uint64_t step = (entity_count + sample_size - 1) / sample_size;
+	step = MAX(step, 1);
+
+	// samples of each attribute, indexed by attribute ID
+	AttributeSample *samples = array_new(AttributeSample, 0);
+
+	const RG_Matrix m = Graph_GetLabelMatrix(g, label_id);
+	ASSERT(m != NULL);
+
+	RG_MatrixTupleIter it = {0};
+	RG_MatrixTupleIter_attach(&it, m);
+
+	EntityID id;
+	uint64_t i       = 0;  // position of node within label
+	uint64_t sampled = 0;  // number of sampled nodes
+	while(RG_MatrixTupleIter_next_BOOL(&it, &id, NULL, NULL) == GrB_SUCCESS) {
+		if(i++ % step != 0) continue;
+
+		Node n;
+		Graph_GetNode(g, id, &n);
+		sampled++;
+
+		AttributeSet set = *n.attributes;
+		uint attr_count = ATTRIBUTE_SET_COUNT(set);
+		for(uint j = 0; j < attr_count; j++) {
+			Attribute_ID attr_id;
+			SIValue v = AttributeSet_GetIdx(set, j, &attr_id);
+
+			while(array_len(samples) <= attr_id) {
+				AttributeSample empty = {0};
+				array_append(samples, empty);
+			}
+
+			AttributeSample *sample = samples + attr_id;
+			if(sample->hashes == NULL) {
+				sample->hashes   = array_new(uint64_t, 0);
+				sample->numerics = array_new(double, 0);
+			}
+
+			sample->present++;
+			array_append(sample->hashes, SIValue_HashCode(v));
+			if(SI_TYPE(v) & SI_NUMERIC) {
+				array_append(sample->numerics, SI_GET_NUMERIC(v));
+			}
+		}
+	}
+
+	RG_MatrixTupleIter_detach(&it);
+
+	LabelStatistics *stats = LabelStatistics_New(entity_count, sampled);
+
+	uint sample_count = array_len(samples);
+	for(Attribute_ID attr_id = 0; attr_id < sample_count; attr_id++) {
+		AttributeSample *sample = samples + attr_id;
+		if(sample->present == 0) continue;
+
+		uint64_t *hashes = sample->hashes;
+		double *numerics = sample->numerics;
+		qsort(hashes, array_len(hashes), sizeof(uint64_t), _CompareHashes);
+		qsort(numerics, array_len(numerics), sizeof(double), _CompareNumerics);
+
+		double present_fraction = (double)sample->present / sampled;
+		AttributeStatistics attr = {
+			.id               = attr_id,
+			.null_fraction    = 1.0 - present_fraction,
+			.numeric_fraction = (double)array_len(numerics) / sample->present,
+			.distinct         = _EstimateDistinct(hashes,
+					present_fraction * entity_count),
+			.histogram        = _BuildHistogram(numerics),
+		};
+		array_append(stats->attributes, attr);
+
+		array_free(hashes);
+		array_free(numerics);
+	}
+	array_free(samples);
+
+	return stats;
+}
+
+const AttributeStatistics *LabelStatistics_GetAttribute
+(
+	const LabelStatistics *stats,
+	Attribute_ID id
+) {
+	ASSERT(stats != NULL);
+
+	uint n = array_len(stats->attributes);
+	for(uint i = 0; i < n; i++) {
+		if(stats->attributes[i].id == id) return stats->attributes + i;
+	}
+
+	return NULL;
+}
+
+double AttributeStatistics_EqualitySelectivity
+(
+	const AttributeStatistics *stats
+) {
+	ASSERT(stats != NULL);
+
+	return (1.0 - stats->null_fraction) / MAX(stats->distinct, 1.0);
+}
+
+// estimated fraction of numeric values smaller than 'v'
+static double _HistogramCDF
+(
+	double *histogram,
+	double v
+) {
+	uint buckets = array_len(histogram) - 1;
+	if(v <= histogram[0]) return 0.0;
+	if(v >= histogram[buckets]) return 1.0;
+
+	// locate bucket containing v, interpolating within it
+	uint i = 0;
+	while(histogram[i + 1] <= v) i++;
+
+	double width = histogram[i + 1] - histogram[i];
+	double offset = (width > 0) ? (v - histogram[i]) / width : 1.0;
+	return (i + offset) / buckets;
+}
+
+double AttributeStatistics_RangeSelectivity
+(
+	const AttributeStatistics *stats,
+	double lo,
+	double hi
+) {
+	ASSERT(stats != NULL);
+
+	if(stats->histogram == NULL || lo > hi) return 0.0;
+
+	double fraction = _HistogramCDF(stats->histogram, hi) -
+		_HistogramCDF(stats->histogram, lo);
+
+	// a range over a single value, e.g. x >= 5 AND x <= 5
+	if(fraction == 0 && lo == hi) {
+		return AttributeStatistics_EqualitySelectivity(stats);
+	}
+
+	return (1.0 - stats->null_fraction) * stats->numeric_fraction * fraction;
+}
+
+void LabelStatistics_Free
+(
+	LabelStatistics *stats
+) {
+	ASSERT(stats != NULL);
+
+	uint n = array_len(stats->attributes);
+	for(uint i = 0; i < n; i++) {
+		if(stats->attributes[i].histogram != NULL) {
+			array_free(stats->attributes[i].histogram);
+		}
+	}
+	array_free(stats->attributes);
+	rm_free(stats);
+}
@@ -0,0 +1,74 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#pragma once
+
+#include "graph.h"
+#include "entities/attribute_set.h"
+
+// max number of entities sampled per label
+#define ATTRIBUTE_STATS_SAMPLE_SIZE 10000
+
+// number of buckets of an attribute's histogram
+#define ATTRIBUTE_STATS_BUCKETS 32
+
+// statistics of a single attribute's values, over a label's entities
+typedef struct {
+	Attribute_ID id;          // attribute ID
+	double null_fraction;     // fraction of entities missing the attribute
+	double numeric_fraction;  // fraction of present values which are numeric
+	double distinct;          // estimated number of distinct values
+	double *histogram;        // equi-depth bucket bounds of numeric values
+} AttributeStatistics;
+
+// attribute statistics of a label, collected by sampling its entities
+typedef struct {
+	uint64_t entity_count;            // number of entities once collected
+	uint64_t sampled;                 // number of sampled entities
+	AttributeStatistics *attributes;  // statistics of each sampled attribute
+} LabelStatistics;
+
+// collect attribute statistics of label by sampling up to
+// 'sample_size' of its nodes, evenly spread over the label
+LabelStatistics *LabelStatistics_Collect
+(
+	Graph *g,                 // graph
+	int label_id,             // label to sample
+	uint64_t sample_size      // max number of nodes to sample
+);
+
+// create an empty label statistics, populated by the RDB decoder
+LabelStatistics *LabelStatistics_New
+(
+	uint64_t entity_count,  // number of entities once collected
+	uint64_t sampled        // number of sampled entities
+);
+
+// returns statistics of attribute, NULL if attribute wasn't sampled
+const AttributeStatistics *LabelStatistics_GetAttribute
+(
+	const LabelStatistics *stats,
+	Attribute_ID id
+);
+
+// estimated fraction of entities whose attribute equals a given value
+double AttributeStatistics_EqualitySelectivity
+(
+	const AttributeStatistics *stats
+);
+
+// estimated fraction of entities whose attribute is within [lo, hi]
+double AttributeStatistics_RangeSelectivity
+(
+	const AttributeStatistics *stats,
+	double lo,  // range lower bound, -INFINITY if unbounded
+	double hi   // range upper bound, INFINITY if unbounded
+);
+
+void LabelStatistics_Free
+(
+	LabelStatistics *stats
+);
@@ -61,6 +61,7 @@ void Graph_AcquireReadLock(Graph *g) {
 void Graph_AcquireWriteLock(Graph *g) {
 	pthread_rwlock_wrlock(&g->_rwlock);
 	g->_writelocked = true;
+	g->_write_epoch++;
 }
 
 // Release the held lock
@@ -79,6 +80,15 @@ void Graph_ReleaseLock
 	pthread_rwlock_unlock(&g->_rwlock);
 }
 
+// returns the number of times the graph's write lock was acquired
+uint64_t Graph_GetWriteEpoch
+(
+	const Graph *g
+) {
+	ASSERT(g != NULL);
+	return g->_write_epoch;
+}
+
 //------------------------------------------------------------------------------
 // Graph utility functions
 //------------------------------------------------------------------------------
@@ -398,7 +408,8 @@ Graph *Graph_New
 
 	// initialize a read-write lock scoped to the individual graph
 	_CreateRWLock(g);
-	g->_writelocked = false;
+	g->_writelocked  = false;
+	g->_write_epoch  = 0;
 
 	// force GraphBLAS updates and resize matrices to node count by default
 	Graph_SetMatrixPolicy(g, SYNC_POLICY_FLUSH_RESIZE);
@@ -443,6 +454,27 @@ uint64_t Graph_RelationEdgeCount(const Graph *g, int relation_idx) {
 	return GraphStatistics_EdgeCount(&g->stats, relation_idx);
 }
 
+uint64_t Graph_TripleEdgeCount
+(
+	const Graph *g,
+	int src_label,
+	int relation_idx,
+	int dest_label
+) {
+	ASSERT(g != NULL);
+	return GraphStatistics_TripleCount(&g->stats, src_label, relation_idx,
+			dest_label);
+}
+
+TripleCount *Graph_RelationTriples
+(
+	const Graph *g,
+	int relation_idx
+) {
+	ASSERT(g != NULL);
+	return GraphStatistics_RelationTriples(&g->stats, relation_idx);
+}
+
 uint Graph_DeletedEdgeCount(const Graph *g) {
 	ASSERT(g);
 	return DataBlock_DeletedItemsCount(g->edges);
@@ -636,6 +668,40 @@ void Graph_CreateNode
 	if(label_count > 0) _Graph_LabelNode(g, n->id, labels, label_count);
 }
 
+// update the triple statistics of 'n' edges of type 'r'
+// connecting 'src' to 'dest', for each pair of their labels
+static void _Graph_UpdateTripleStatistics
+(
+	Graph *g,
+	NodeID src,
+	NodeID dest,
+	int r,
+	int64_t n
+) {
+	uint label_count = Graph_LabelTypeCount(g);
+	if(label_count == 0) return;
+
+	LabelID src_labels[label_count];
+	LabelID dest_labels[label_count];
+
+	Node node = GE_NEW_NODE();
+	node.id = src;
+	uint src_label_count = Graph_GetNodeLabels(g, &node, src_labels,
+			label_count);
+	if(src_label_count == 0) return;
+
+	node.id = dest;
+	uint dest_label_count = Graph_GetNodeLabels(g, &node, dest_labels,
+			label_count);
+
+	for(uint i = 0; i < src_label_count; i++) {
+		for(uint j = 0; j < dest_label_count; j++) {
+			GraphStatistics_UpdateTripleCount(&g->stats, src_labels[i], r,
+					dest_labels[j], n);
+		}
+	}
+}
+
 bool Graph_FormConnection
 (
 	Graph *g,
@@ -696,6 +762,8 @@ void Graph_CreateEdge
 
 
 	Graph_FormConnection(g, src, dest, id, r);
+
+	_Graph_UpdateTripleStatistics(g, src, dest, r, 1);
 }
 
 // retrieves all either incoming or outgoing edges
@@ -904,6 +972,7 @@ int Graph_DeleteEdge
 
 	// an edge of type r has just been deleted, update statistics
 	GraphStatistics_DecEdgeCount(&g->stats, r, 1);
+	_Graph_UpdateTripleStatistics(g, src_id, dest_id, r, -1);
 
 	// single edge of type R connecting src to dest, delete entry
 	info = RG_Matrix_removeEntry(R, src_id, dest_id, ENTITY_GET_ID(e));
@@ -1082,6 +1151,37 @@ RG_Matrix Graph_GetAdjacencyMatrix
 	return Graph_GetRelationMatrix(g, GRAPH_NO_RELATION, transposed);
 }
 
+void Graph_ComputeTripleStatistics
+(
+	Graph *g
+) {
+	ASSERT(g != NULL);
+
+	GraphStatistics_ResetTripleCounts(&g->stats);
+
+	int relation_count = Graph_RelationTypeCount(g);
+	for(int r = 0; r < relation_count; r++) {
+		RG_Matrix R = Graph_GetRelationMatrix(g, r, false);
+
+		RG_MatrixTupleIter it = {0};
+		GrB_Info info = RG_MatrixTupleIter_attach(&it, R);
+		ASSERT(info == GrB_SUCCESS);
+
+		NodeID   src;
+		NodeID   dest;
+		uint64_t edge_id;
+		while(RG_MatrixTupleIter_next_UINT64(&it, &src, &dest, &edge_id)
+				== GrB_SUCCESS) {
+			// multi-edge entries hold an array of edge IDs
+			int64_t n = SINGLE_EDGE(edge_id) ?
+				1 : array_len((EdgeID *)(CLEAR_MSB(edge_id)));
+			_Graph_UpdateTripleStatistics(g, src, dest, r, n);
+		}
+
+		RG_MatrixTupleIter_detach(&it);
+	}
+}
+
 // returns true if relationship matrix 'r' contains multi-edge entries,
 // false otherwise
 bool Graph_RelationshipContainsMultiEdge
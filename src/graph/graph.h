@@ -53,6 +53,7 @@ struct Graph {
 	RG_Matrix _zero_matrix;             // zero matrix
 	pthread_rwlock_t _rwlock;           // read-write lock scoped to this specific graph
 	bool _writelocked;                  // true if the read-write lock was acquired by a writer
+	uint64_t _write_epoch;              // number of times the write lock was acquired
 	SyncMatrixFunc SynchronizeMatrix;   // function pointer to matrix synchronization routine
 	GraphStatistics stats;              // graph related statistics
 };
@@ -78,6 +79,13 @@ void Graph_ReleaseLock
 	Graph *g
 );
 
+// returns the number of times the graph's write lock was acquired
+// a change in this value indicates the graph might have been modified
+uint64_t Graph_GetWriteEpoch
+(
+	const Graph *g
+);
+
 // choose the current matrix synchronization policy
 void Graph_SetMatrixPolicy
 (
@@ -262,6 +270,31 @@ uint64_t Graph_RelationEdgeCount
 	int relation_idx
 );
 
+// returns number of edges of a specific relation type
+// connecting nodes with label 'src_label' to nodes with label 'dest_label'
+uint64_t Graph_TripleEdgeCount
+(
+	const Graph *g,
+	int src_label,
+	int relation_idx,
+	int dest_label
+);
+
+// returns the label pairs connected by edges of a specific relation type
+// along with their edge count, array should be freed by the caller
+TripleCount *Graph_RelationTriples
+(
+	const Graph *g,
+	int relation_idx
+);
+
+// recompute per (src label, relation, dest label) edge counts
+// from the relationship matrices, e.g. once the graph is decoded
+void Graph_ComputeTripleStatistics
+(
+	Graph *g
+);
+
 // returns number of deleted edges in the graph
 uint Graph_DeletedEdgeCount
 (
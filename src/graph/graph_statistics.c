@@ -5,12 +5,16 @@
 */
 
 #include "graph_statistics.h"
+#include "RG.h"
+
+#include <string.h>
 
 // Initialize the node_count and edge_count arrays
 void GraphStatistics_init(GraphStatistics *stats) {
 	ASSERT(stats);
 	stats->node_count = array_new(uint64_t, 0);
 	stats->edge_count = array_new(uint64_t, 0);
+	stats->triple_count = raxNew();
 }
 
 void GraphStatistics_IntroduceRelationship(GraphStatistics *stats) {
@@ -23,6 +27,100 @@ void GraphStatistics_IntroduceLabel(GraphStatistics *stats) {
 	array_append(stats->node_count, 0);
 }
 
+// triple key, relationship first such that a relationship's triples
+// share a common prefix, encoded big-endian to keep them ordered
+#define TRIPLE_KEY_LEN 12
+
+static void _GraphStatistics_TripleKey(unsigned char *key, int relation_idx,
+									   int src_label, int dest_label) {
+	uint32_t parts[3] = {relation_idx, src_label, dest_label};
+	for(int i = 0; i < 3; i++) {
+		key[i * 4 + 0] = (parts[i] >> 24) & 0xFF;
+		key[i * 4 + 1] = (parts[i] >> 16) & 0xFF;
+		key[i * 4 + 2] = (parts[i] >> 8) & 0xFF;
+		key[i * 4 + 3] = parts[i] & 0xFF;
+	}
+}
+
+static int _GraphStatistics_KeyPart(const unsigned char *key, int i) {
+	return (key[i * 4 + 0] << 24) | (key[i * 4 + 1] << 16) |
+		(key[i * 4 + 2] << 8) | key[i * 4 + 3];
+}
+
+void GraphStatistics_UpdateTripleCount(GraphStatistics *stats, int src_label,
+									   int relation_idx, int dest_label,
+									   int64_t delta) {
+	ASSERT(stats && stats->triple_count);
+	ASSERT(src_label >= 0 && dest_label >= 0 && relation_idx >= 0);
+
+	unsigned char key[TRIPLE_KEY_LEN];
+	_GraphStatistics_TripleKey(key, relation_idx, src_label, dest_label);
+
+	uint64_t count = 0;
+	void *v = raxFind(stats->triple_count, key, TRIPLE_KEY_LEN);
+	if(v != raxNotFound) count = (uint64_t)(uintptr_t)v;
+
+	ASSERT(delta >= 0 || count >= (uint64_t)(-delta));
+	count += delta;
+
+	if(count == 0) {
+		raxRemove(stats->triple_count, key, TRIPLE_KEY_LEN, NULL);
+	} else {
+		raxInsert(stats->triple_count, key, TRIPLE_KEY_LEN,
+				(void *)(uintptr_t)count, NULL);
+	}
+}
+
+uint64_t GraphStatistics_TripleCount(const GraphStatistics *stats,
+									 int src_label, int relation_idx,
+									 int dest_label) {
+	ASSERT(stats && stats->triple_count);
+
+	if(src_label < 0 || dest_label < 0 || relation_idx < 0) return 0;
+
+	unsigned char key[TRIPLE_KEY_LEN];
+	_GraphStatistics_TripleKey(key, relation_idx, src_label, dest_label);
+
+	void *v = raxFind(stats->triple_count, key, TRIPLE_KEY_LEN);
+	if(v == raxNotFound) return 0;
+	return (uint64_t)(uintptr_t)v;
+}
+
+TripleCount *GraphStatistics_RelationTriples(const GraphStatistics *stats,
+											 int relation_idx) {
+	ASSERT(stats && stats->triple_count);
+
+	TripleCount *triples = array_new(TripleCount, 0);
+	if(relation_idx < 0) return triples;
+
+	// seek to the first triple of the relationship
+	unsigned char prefix[TRIPLE_KEY_LEN];
+	_GraphStatistics_TripleKey(prefix, relation_idx, 0, 0);
+
+	raxIterator it;
+	raxStart(&it, stats->triple_count);
+	raxSeek(&it, ">=", prefix, TRIPLE_KEY_LEN);
+	while(raxNext(&it)) {
+		if(memcmp(it.key, prefix, 4) != 0) break;
+		TripleCount t = {
+			.src_label  = _GraphStatistics_KeyPart(it.key, 1),
+			.dest_label = _GraphStatistics_KeyPart(it.key, 2),
+			.edge_count = (uint64_t)(uintptr_t)it.data,
+		};
+		array_append(triples, t);
+	}
+	raxStop(&it);
+
+	return triples;
+}
+
+void GraphStatistics_ResetTripleCounts(GraphStatistics *stats) {
+	ASSERT(stats && stats->triple_count);
+
+	raxFree(stats->triple_count);
+	stats->triple_count = raxNew();
+}
+
 uint64_t GraphStatistics_EdgeCount(const GraphStatistics *stats,
 								   int relation_idx) {
 	ASSERT(stats);
@@ -43,5 +141,6 @@ void GraphStatistics_FreeInternals(GraphStatistics *stats) {
 	ASSERT(stats);
 	if(stats->node_count) array_free(stats->node_count);
 	if(stats->edge_count) array_free(stats->edge_count);
+	if(stats->triple_count) raxFree(stats->triple_count);
 }
 
@@ -8,14 +8,23 @@
 
 #include <stdint.h>
 #include "../util/arr.h"
+#include "../../deps/rax/rax.h"
 
 // Graph related statistics
 
 typedef struct {
 	uint64_t *node_count; // Array of node count per label matrix
 	uint64_t *edge_count; // Array of edge count per relationship matrix
+	rax *triple_count;    // Edge count per (relationship, src label, dest label)
 } GraphStatistics;
 
+// Number of edges of a relationship connecting two labels
+typedef struct {
+	int src_label;        // Source node label
+	int dest_label;       // Destination node label
+	uint64_t edge_count;  // Number of edges
+} TripleCount;
+
 // Initialize the node_count and edge_count arrays
 void GraphStatistics_init(GraphStatistics *stats);
 
@@ -55,6 +64,26 @@ static inline void GraphStatistics_DecNodeCount(GraphStatistics *stats,
 	stats->node_count[label_idx] -= amount;
 }
 
+// Update the number of edges of relationship type 'relation_idx'
+// connecting nodes labeled 'src_label' to nodes labeled 'dest_label'
+void GraphStatistics_UpdateTripleCount(GraphStatistics *stats, int src_label,
+									   int relation_idx, int dest_label,
+									   int64_t delta);
+
+// Retrieves the number of edges of relationship type 'relation_idx'
+// connecting nodes labeled 'src_label' to nodes labeled 'dest_label'
+uint64_t GraphStatistics_TripleCount(const GraphStatistics *stats,
+									 int src_label, int relation_idx,
+									 int dest_label);
+
+// Retrieves the label pairs connected by relationship type 'relation_idx'
+// returned array should be freed by the caller
+TripleCount *GraphStatistics_RelationTriples(const GraphStatistics *stats,
+											 int relation_idx);
+
+// Discard all triple counts
+void GraphStatistics_ResetTripleCounts(GraphStatistics *stats);
+
 // Retrieves edge count for given relationship type
 uint64_t GraphStatistics_EdgeCount(const GraphStatistics *stats,
 								   int relation_idx);
@@ -10,6 +10,7 @@
 #include "../RG.h"
 #include "../util/arr.h"
 #include "../util/uuid.h"
+#include "../errors.h"
 #include "../query_ctx.h"
 #include "../redismodule.h"
 #include "../util/rmalloc.h"
@@ -20,6 +21,8 @@
 // Global array tracking all extant GraphContexts (defined in module.c)
 extern GraphContext **graphs_in_keyspace;
 extern uint aux_field_counter;
+// Flag indicating whether the running process is a child.
+extern bool process_is_child;
 // GraphContext type as it is registered at Redis.
 extern RedisModuleType *GraphContextRedisModuleType;
 
@@ -92,6 +95,8 @@ GraphContext *GraphContext_New
 	gc->string_mapping   = array_new(char *, 64);
 	gc->encoding_context = GraphEncodeContext_New();
 	gc->decoding_context = GraphDecodeContext_New();
+	gc->label_stats      = array_new(LabelStatistics *, 0);
+	gc->relation_stats   = array_new(RelationStatistics *, 0);
 
 	// read NODE_CREATION_BUFFER size from configuration
 	// this value controls how much extra room we're willing to spend for:
@@ -493,6 +498,104 @@ int GraphContext_DeleteIndex
 	return res;
 }
 
+typedef struct {
+	GraphContext *gc;          // graph context
+	SchemaType schema_type;    // type of indexed schema
+	int label_id;              // indexed label ID
+	IndexType type;            // index type
+	uint64_t construction_id;  // index construction being populated
+} IndexConstructCtx;
+
+// populate the next batch of an index under the graph's locks
+// returns true once there's nothing left to populate
+static bool _GraphContext_PopulateIndexBatch
+(
+	IndexConstructCtx *ctx
+) {
+	bool populated = true;
+	GraphContext *gc = ctx->gc;
+	RedisModuleCtx *rm_ctx = RedisModule_GetThreadSafeContext(NULL);
+
+	// GIL need to be acquired because RediSearch changes Redis global data
+	RedisModule_ThreadSafeContextLock(rm_ctx);
+
+	// make sure graph wasn't deleted
+	RedisModuleString *graphID = RedisModule_CreateString(rm_ctx,
+			gc->graph_name, strlen(gc->graph_name));
+	RedisModuleKey *key = RedisModule_OpenKey(rm_ctx, graphID, REDISMODULE_READ);
+	RedisModule_FreeString(rm_ctx, graphID);
+
+	if(RedisModule_ModuleTypeGetType(key) == GraphContextRedisModuleType &&
+	   RedisModule_ModuleTypeGetValue(key) == gc) {
+		Graph_AcquireWriteLock(gc->g);
+
+		// make sure index wasn't dropped or reconstructed
+		Index *idx = NULL;
+		Schema *s = GraphContext_GetSchemaByID(gc, ctx->label_id,
+				ctx->schema_type);
+		if(s != NULL) idx = Schema_GetIndex(s, NULL, ctx->type);
+
+		if(idx != NULL && idx->construction_id == ctx->construction_id) {
+			populated = Index_Populate(idx, gc->g, INDEX_CONSTRUCT_BATCH_SIZE);
+		}
+
+		Graph_ReleaseLock(gc->g);
+	}
+
+	RedisModule_CloseKey(key);
+	RedisModule_ThreadSafeContextUnlock(rm_ctx);
+	RedisModule_FreeThreadSafeContext(rm_ctx);
+
+	return populated;
+}
+
+static void _GraphContext_PopulateIndex(void *args) {
+	IndexConstructCtx *ctx = args;
+
+	while(!_GraphContext_PopulateIndexBatch(ctx)) {
+		// continue on the readers queue, letting queued queries run
+		// if the queue is full, populate the next batch right away
+		if(ThreadPools_AddWorkReader(_GraphContext_PopulateIndex, ctx) !=
+				THPOOL_QUEUE_FULL) {
+			return;
+		}
+	}
+
+	GraphContext_DecreaseRefCount(ctx->gc);
+	rm_free(ctx);
+}
+
+void GraphContext_ConstructIndex
+(
+	GraphContext *gc,
+	Index *idx
+) {
+	ASSERT(gc  != NULL);
+	ASSERT(idx != NULL);
+
+	Index_ConstructEmpty(idx);
+
+	// populate the first batch right away, small indices are ready at once
+	if(Index_Populate(idx, gc->g, INDEX_CONSTRUCT_BATCH_SIZE)) return;
+
+	IndexConstructCtx *ctx = rm_malloc(sizeof(IndexConstructCtx));
+	ctx->gc              = gc;
+	ctx->type            = idx->type;
+	ctx->label_id        = idx->label_id;
+	ctx->schema_type     = (idx->entity_type == GETYPE_NODE) ? SCHEMA_NODE :
+		SCHEMA_EDGE;
+	ctx->construction_id = idx->construction_id;
+
+	GraphContext_IncreaseRefCount(gc);
+	if(ThreadPools_AddWorkReader(_GraphContext_PopulateIndex, ctx) ==
+			THPOOL_QUEUE_FULL) {
+		// readers are busy, populate the index in full
+		Index_Populate(idx, gc->g, UINT64_MAX);
+		GraphContext_DecreaseRefCount(gc);
+		rm_free(ctx);
+	}
+}
+
 //------------------------------------------------------------------------------
 // Functions for globally tracking GraphContexts
 //------------------------------------------------------------------------------
@@ -533,6 +636,74 @@ SlowLog *GraphContext_GetSlowLog(const GraphContext *gc) {
 	return gc->slowlog;
 }
 
+//------------------------------------------------------------------------------
+// Statistics API
+//------------------------------------------------------------------------------
+
+void GraphContext_SetLabelStatistics
+(
+	GraphContext *gc,
+	int label_id,
+	LabelStatistics *stats
+) {
+	ASSERT(gc       != NULL);
+	ASSERT(stats    != NULL);
+	ASSERT(label_id >= 0);
+
+	while(array_len(gc->label_stats) <= label_id) {
+		array_append(gc->label_stats, NULL);
+	}
+
+	if(gc->label_stats[label_id] != NULL) {
+		LabelStatistics_Free(gc->label_stats[label_id]);
+	}
+	gc->label_stats[label_id] = stats;
+}
+
+const LabelStatistics *GraphContext_GetLabelStatistics
+(
+	const GraphContext *gc,
+	int label_id
+) {
+	ASSERT(gc != NULL);
+
+	if(label_id < 0 || label_id >= array_len(gc->label_stats)) return NULL;
+	return gc->label_stats[label_id];
+}
+
+void GraphContext_SetRelationStatistics
+(
+	GraphContext *gc,
+	int relation_id,
+	RelationStatistics *stats
+) {
+	ASSERT(gc          != NULL);
+	ASSERT(stats       != NULL);
+	ASSERT(relation_id >= 0);
+
+	while(array_len(gc->relation_stats) <= relation_id) {
+		array_append(gc->relation_stats, NULL);
+	}
+
+	if(gc->relation_stats[relation_id] != NULL) {
+		RelationStatistics_Free(gc->relation_stats[relation_id]);
+	}
+	gc->relation_stats[relation_id] = stats;
+}
+
+const RelationStatistics *GraphContext_GetRelationStatistics
+(
+	const GraphContext *gc,
+	int relation_id
+) {
+	ASSERT(gc != NULL);
+
+	if(relation_id < 0 || relation_id >= array_len(gc->relation_stats)) {
+		return NULL;
+	}
+	return gc->relation_stats[relation_id];
+}
+
 //------------------------------------------------------------------------------
 // Cache API
 //------------------------------------------------------------------------------
@@ -543,6 +714,72 @@ Cache *GraphContext_GetCache(const GraphContext *gc) {
 	return gc->cache;
 }
 
+static void _GraphContext_CollectQuery(const char *key, void *value,
+		void *pdata) {
+	char ***queries = pdata;
+	ExecutionCtx *exec_ctx = value;
+	if(exec_ctx->query != NULL) {
+		array_append(*queries, rm_strdup(exec_ctx->query));
+	}
+}
+
+// returns the n most frequently used cached queries
+char **GraphContext_CachedQueries(GraphContext *gc, uint n) {
+	ASSERT(gc != NULL);
+
+	char **queries = array_new(char *, n);
+	if(n == 0) return queries;
+
+	// a forked process doesn't own the cache locks
+	Cache_VisitMostFrequent(gc->cache, n, !process_is_child,
+			_GraphContext_CollectQuery, &queries);
+
+	return queries;
+}
+
+typedef struct {
+	GraphContext *gc;  // graph context
+	char *query;       // query to plan
+} CacheWarmupCtx;
+
+// build the execution plan of a query, populating the cache
+static void _GraphContext_PlanQuery(void *args) {
+	CacheWarmupCtx *ctx = args;
+
+	QueryCtx_SetGraphCtx(ctx->gc);
+	ExecutionCtx *exec_ctx = ExecutionCtx_FromQuery(ctx->query);
+	ExecutionCtx_Free(exec_ctx);
+	ErrorCtx_Clear();
+	QueryCtx_Free();
+
+	GraphContext_DecreaseRefCount(ctx->gc);
+	rm_free(ctx->query);
+	rm_free(ctx);
+}
+
+void GraphContext_WarmupCache(GraphContext *gc, char **queries) {
+	ASSERT(gc != NULL);
+	ASSERT(queries != NULL);
+
+	// plan each query on a reader thread, taking ownership over the queries
+	uint n = array_len(queries);
+	for(uint i = 0; i < n; i++) {
+		CacheWarmupCtx *ctx = rm_malloc(sizeof(CacheWarmupCtx));
+		ctx->gc = gc;
+		ctx->query = queries[i];
+
+		GraphContext_IncreaseRefCount(gc);
+		if(ThreadPools_AddWorkReader(_GraphContext_PlanQuery, ctx) ==
+				THPOOL_QUEUE_FULL) {
+			// readers are busy, skip warmup
+			GraphContext_DecreaseRefCount(gc);
+			rm_free(ctx->query);
+			rm_free(ctx);
+		}
+	}
+	array_free(queries);
+}
+
 //------------------------------------------------------------------------------
 // Free routine
 //------------------------------------------------------------------------------
@@ -622,6 +859,22 @@ static void _GraphContext_Free(void *arg) {
 
 	if(gc->cache) Cache_Free(gc->cache);
 
+	//--------------------------------------------------------------------------
+	// Free statistics
+	//--------------------------------------------------------------------------
+
+	len = array_len(gc->label_stats);
+	for(uint32_t i = 0; i < len; i ++) {
+		if(gc->label_stats[i]) LabelStatistics_Free(gc->label_stats[i]);
+	}
+	array_free(gc->label_stats);
+
+	len = array_len(gc->relation_stats);
+	for(uint32_t i = 0; i < len; i ++) {
+		if(gc->relation_stats[i]) RelationStatistics_Free(gc->relation_stats[i]);
+	}
+	array_free(gc->relation_stats);
+
 	GraphEncodeContext_Free(gc->encoding_context);
 	GraphDecodeContext_Free(gc->decoding_context);
 	rm_free(gc->graph_name);
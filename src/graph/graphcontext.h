@@ -11,6 +11,8 @@
 #include "../schema/schema.h"
 #include "../slow_log/slow_log.h"
 #include "graph.h"
+#include "attribute_statistics.h"
+#include "relation_statistics.h"
 #include "../serializers/encode_context.h"
 #include "../serializers/decode_context.h"
 #include "../util/cache/cache.h"
@@ -39,6 +41,8 @@ typedef struct {
 	GraphEncodeContext *encoding_context;   // encode context of the graph
 	GraphDecodeContext *decoding_context;   // decode context of the graph
 	Cache *cache;                           // global cache of execution plans
+	LabelStatistics **label_stats;          // attribute statistics per label, NULL if not analyzed
+	RelationStatistics **relation_stats;    // degree statistics per relation, NULL if not analyzed
 	XXH32_hash_t version;                   // graph version
 } GraphContext;
 
@@ -240,6 +244,15 @@ int GraphContext_DeleteIndex
 	IndexType type
 );
 
+// constructs index, populating it in batches on the reader threads
+// the graph's locks are released between batches
+// and the index is disabled until populated
+void GraphContext_ConstructIndex
+(
+	GraphContext *gc,
+	Index *idx
+);
+
 // remove a single node from all indices that refer to it
 void GraphContext_DeleteNodeFromIndices
 (
@@ -276,6 +289,42 @@ SlowLog *GraphContext_GetSlowLog
 	const GraphContext *gc
 );
 
+//------------------------------------------------------------------------------
+// Statistics API
+//------------------------------------------------------------------------------
+
+// set label's attribute statistics, replacing previous statistics
+// graph context takes ownership over 'stats'
+void GraphContext_SetLabelStatistics
+(
+	GraphContext *gc,
+	int label_id,
+	LabelStatistics *stats
+);
+
+// returns label's attribute statistics, NULL if label wasn't analyzed
+const LabelStatistics *GraphContext_GetLabelStatistics
+(
+	const GraphContext *gc,
+	int label_id
+);
+
+// set relation's degree statistics, replacing previous statistics
+// graph context takes ownership over 'stats'
+void GraphContext_SetRelationStatistics
+(
+	GraphContext *gc,
+	int relation_id,
+	RelationStatistics *stats
+);
+
+// returns relation's degree statistics, NULL if relation wasn't analyzed
+const RelationStatistics *GraphContext_GetRelationStatistics
+(
+	const GraphContext *gc,
+	int relation_id
+);
+
 //------------------------------------------------------------------------------
 // Cache API
 //------------------------------------------------------------------------------
@@ -286,3 +335,20 @@ Cache *GraphContext_GetCache
 	const GraphContext *gc
 );
 
+// returns the queries of the n most frequently used cached execution plans
+// caller is responsible for freeing the returned array and its queries
+char **GraphContext_CachedQueries
+(
+	GraphContext *gc,  // graph context
+	uint n             // maximum number of queries to return
+);
+
+// plans each query in the background on the reader threads
+// populating the graph's execution plans cache
+// takes ownership over the queries array
+void GraphContext_WarmupCache
+(
+	GraphContext *gc,  // graph context
+	char **queries     // queries to plan
+);
+
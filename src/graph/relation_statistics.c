@@ -0,0 +1,133 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "RG.h"
+#include "relation_statistics.h"
+#include "../util/rmalloc.h"
+#include "rg_matrix/rg_matrix_iter.h"
+
+// histogram bucket of a positive degree, floor(log2(degree))
+static inline uint _DegreeBucket
+(
+	uint64_t degree
+) {
+	ASSERT(degree > 0);
+	return 63 - __builtin_clzll(degree);
+}
+
+// collect the degree of each of the matrix rows
+static void _CollectDegrees
+(
+	DegreeStatistics *stats,
+	RG_Matrix M,
+	uint64_t node_count
+) {
+	RG_MatrixTupleIter it = {0};
+	GrB_Info info = RG_MatrixTupleIter_attach(&it, M);
+	ASSERT(info == GrB_SUCCESS);
+
+	for(NodeID id = 0; id < node_count; id++) {
+		info = RG_MatrixTupleIter_iterate_row(&it, id);
+		ASSERT(info == GrB_SUCCESS);
+
+		uint64_t degree = 0;
+		while(RG_MatrixTupleIter_next_BOOL(&it, NULL, NULL, NULL)
+				== GrB_SUCCESS) {
+			degree++;
+		}
+
+		if(degree > 0) DegreeStatistics_Add(stats, degree);
+	}
+
+	RG_MatrixTupleIter_detach(&it);
+}
+
+RelationStatistics *RelationStatistics_New(void) {
+	return rm_calloc(1, sizeof(RelationStatistics));
+}
+
+RelationStatistics *RelationStatistics_Collect
+(
+	Graph *g,
+	int relation_id
+) {
+	ASSERT(g != NULL);
+	ASSERT(relation_id >= 0 && relation_id < Graph_RelationTypeCount(g));
+
+	RelationStatistics *stats = RelationStatistics_New();
+	uint64_t node_count = Graph_UncompactedNodeCount(g);
+
+	// rows of the relationship matrix are sources
+	// rows of its transpose are destinations
+	RG_Matrix R  = Graph_GetRelationMatrix(g, relation_id, false);
+	RG_Matrix TR = Graph_GetRelationMatrix(g, relation_id, true);
+	_CollectDegrees(&stats->out, R, node_count);
+	_CollectDegrees(&stats->in, TR, node_count);
+
+	return stats;
+}
+
+void DegreeStatistics_Add
+(
+	DegreeStatistics *stats,
+	uint64_t degree
+) {
+	ASSERT(stats  != NULL);
+	ASSERT(degree >  0);
+
+	stats->nodes++;
+	stats->sum += degree;
+	stats->max = MAX(stats->max, degree);
+	stats->buckets[_DegreeBucket(degree)]++;
+}
+
+double DegreeStatistics_Mean
+(
+	const DegreeStatistics *stats
+) {
+	ASSERT(stats != NULL);
+
+	if(stats->nodes == 0) return 0;
+	return (double)stats->sum / stats->nodes;
+}
+
+double DegreeStatistics_Percentile
+(
+	const DegreeStatistics *stats,
+	double p
+) {
+	ASSERT(stats != NULL);
+	ASSERT(p >= 0 && p <= 1);
+
+	if(stats->nodes == 0) return 0;
+
+	// locate the bucket holding the p'th node
+	// interpolating linearly within the bucket's degree range
+	double rank = p * stats->nodes;
+	uint64_t seen = 0;
+	for(uint i = 0; i < DEGREE_STATS_BUCKETS; i++) {
+		uint64_t count = stats->buckets[i];
+		if(count == 0) continue;
+
+		if(seen + count >= rank) {
+			double lo = (double)(1ULL << i);
+			double hi = MIN((double)stats->max, (double)(1ULL << i) * 2 - 1);
+			double offset = (rank - seen) / count;
+			return lo + offset * (MAX(hi, lo) - lo);
+		}
+		seen += count;
+	}
+
+	return stats->max;
+}
+
+void RelationStatistics_Free
+(
+	RelationStatistics *stats
+) {
+	ASSERT(stats != NULL);
+	rm_free(stats);
+}
@@ -0,0 +1,64 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#pragma once
+
+#include "graph.h"
+
+// number of buckets of a degree histogram
+#define DEGREE_STATS_BUCKETS 64
+
+// degree distribution of the nodes connected by a relationship
+// bucket i counts nodes with a degree in [2^i, 2^(i+1))
+typedef struct {
+	uint64_t nodes;                            // nodes with at least one edge
+	uint64_t max;                              // max degree
+	uint64_t sum;                              // sum of degrees
+	uint64_t buckets[DEGREE_STATS_BUCKETS];    // degree histogram
+} DegreeStatistics;
+
+// degree statistics of a relationship
+// a node's degree is the number of distinct nodes it is connected to
+typedef struct {
+	DegreeStatistics out;  // degree of source nodes
+	DegreeStatistics in;   // degree of destination nodes
+} RelationStatistics;
+
+// collect degree statistics of relationship by scanning its matrix
+RelationStatistics *RelationStatistics_Collect
+(
+	Graph *g,                 // graph
+	int relation_id           // relationship to scan
+);
+
+// create an empty relation statistics, populated by the RDB decoder
+RelationStatistics *RelationStatistics_New(void);
+
+// account for a node of degree 'degree'
+void DegreeStatistics_Add
+(
+	DegreeStatistics *stats,
+	uint64_t degree
+);
+
+// mean degree of connected nodes, 0 if there are none
+double DegreeStatistics_Mean
+(
+	const DegreeStatistics *stats
+);
+
+// estimated degree below which 'p' of the connected nodes fall
+// 'p' is within [0, 1]
+double DegreeStatistics_Percentile
+(
+	const DegreeStatistics *stats,
+	double p
+);
+
+void RelationStatistics_Free
+(
+	RelationStatistics *stats
+);
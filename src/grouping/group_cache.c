@@ -5,26 +5,94 @@
 */
 
 #include <stddef.h>
+#include "RG.h"
 #include "group_cache.h"
 #include "../util/rmalloc.h"
 
+// initial number of slots, must be a power of 2
+#define GROUP_CACHE_INITIAL_CAP 64
+
+// locate the slot holding 'key'
+// or the empty slot at which 'key' should be placed
+static inline CacheGroupEntry *_CacheGroupFindSlot
+(
+	const CacheGroup *groups,
+	XXH64_hash_t key
+) {
+	uint64_t pos = key & groups->mask;
+	while(true) {
+		CacheGroupEntry *entry = groups->entries + pos;
+		if(entry->group == NULL || entry->key == key) return entry;
+		pos = (pos + 1) & groups->mask;
+	}
+}
+
+// double the number of slots, rehashing all cached groups
+static void _CacheGroupGrow
+(
+	CacheGroup *groups
+) {
+	uint64_t cap = groups->mask + 1;
+	CacheGroupEntry *entries = groups->entries;
+
+	groups->mask = (cap * 2) - 1;
+	groups->entries = rm_calloc(cap * 2, sizeof(CacheGroupEntry));
+
+	for(uint64_t i = 0; i < cap; i++) {
+		if(entries[i].group == NULL) continue;
+		*_CacheGroupFindSlot(groups, entries[i].key) = entries[i];
+	}
+
+	rm_free(entries);
+}
+
 CacheGroup *CacheGroupNew() {
-	return raxNew();
+	CacheGroup *groups = rm_malloc(sizeof(CacheGroup));
+
+	groups->count   = 0;
+	groups->mask    = GROUP_CACHE_INITIAL_CAP - 1;
+	groups->entries = rm_calloc(GROUP_CACHE_INITIAL_CAP,
+			sizeof(CacheGroupEntry));
+
+	return groups;
 }
 
 void CacheGroupAdd(CacheGroup *groups, XXH64_hash_t key, Group *group) {
-	raxInsert(groups, (unsigned char *)&key, sizeof(key), group, NULL);
+	ASSERT(group != NULL);
+
+	CacheGroupEntry *entry = _CacheGroupFindSlot(groups, key);
+	if(entry->group == NULL) {
+		groups->count++;
+		entry->key = key;
+	}
+	entry->group = group;
+
+	// keep load factor at most 0.5
+	if(groups->count * 2 > groups->mask + 1) _CacheGroupGrow(groups);
 }
 
 // retrives a group, sets group to NULL if key is missing
 Group *CacheGroupGet(CacheGroup *groups, XXH64_hash_t key) {
-	Group *g = raxFind(groups, (unsigned char *)&key, sizeof(key));
-	if(g == raxNotFound) return NULL;
-	return g;
+	return _CacheGroupFindSlot(groups, key)->group;
+}
+
+// returns number of cached groups
+uint64_t CacheGroupCount(const CacheGroup *groups) {
+	return groups->count;
 }
 
 void FreeGroupCache(CacheGroup *groups) {
-	raxFreeWithCallback(groups, (void (*)(void *))FreeGroup);
+	for(uint64_t i = 0; i <= groups->mask; i++) {
+		Group *group = groups->entries[i].group;
+		if(group != NULL) FreeGroup(group);
+	}
+	FreeGroupCacheShallow(groups);
+}
+
+// frees group cache without freeing the cached groups
+void FreeGroupCacheShallow(CacheGroup *groups) {
+	rm_free(groups->entries);
+	rm_free(groups);
 }
 
 // populates an iterator to scan entire group cache
@@ -34,25 +102,28 @@ CacheGroupIterator *CacheGroupIter
 ) {
 	CacheGroupIterator *iter = rm_malloc(sizeof(CacheGroupIterator));
 
-	raxStart(iter, groups);
-	raxSeek(iter, "^", NULL, 0);
+	iter->pos    = 0;
+	iter->groups = groups;
 
 	return iter;
 }
 
 // advance iterator and returns value in current position
 int CacheGroupIterNext(CacheGroupIterator *iter, Group **group) {
-	int res = raxNext(iter);
-	if(res == 0) {
-		*group = NULL;
-	} else {
-		*group = iter->data; // TODO revisit this to fix up
+	const CacheGroup *groups = iter->groups;
+
+	// skip empty slots
+	while(iter->pos <= groups->mask) {
+		*group = groups->entries[iter->pos++].group;
+		if(*group != NULL) return 1;
 	}
-	return res;
+
+	*group = NULL;
+	return 0;
 }
 
 void CacheGroupIterator_Free(CacheGroupIterator *iter) {
 	if(iter == NULL) return;
-	raxStop(iter);
 	rm_free(iter);
 }
+
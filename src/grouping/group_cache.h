@@ -6,12 +6,28 @@
 
 #pragma once
 
-#include "rax.h"
 #include "group.h"
 #include "../../deps/xxHash/xxhash.h"
 
-typedef rax CacheGroup;
-typedef raxIterator CacheGroupIterator;
+// group cache slot
+typedef struct {
+	XXH64_hash_t key;  // group key hash
+	Group *group;      // cached group, NULL if slot is empty
+} CacheGroupEntry;
+
+// open addressing hash table mapping group key hash to group
+// collisions are resolved by linear probing
+// table doubles its size once half of its slots are occupied
+typedef struct {
+	uint64_t count;             // number of cached groups
+	uint64_t mask;              // number of slots - 1
+	CacheGroupEntry *entries;   // slots
+} CacheGroup;
+
+typedef struct {
+	const CacheGroup *groups;   // iterated group cache
+	uint64_t pos;               // next slot to inspect
+} CacheGroupIterator;
 
 CacheGroup *CacheGroupNew(void);
 
@@ -20,8 +36,14 @@ void CacheGroupAdd(CacheGroup *groups, XXH64_hash_t key, Group *group);
 // retrives a group, sets group to NULL if key is missing
 Group *CacheGroupGet(CacheGroup *groups, XXH64_hash_t key);
 
+// returns number of cached groups
+uint64_t CacheGroupCount(const CacheGroup *groups);
+
 void FreeGroupCache(CacheGroup *groups);
 
+// frees group cache without freeing the cached groups
+void FreeGroupCacheShallow(CacheGroup *groups);
+
 // populates an iterator to scan group cache
 CacheGroupIterator *CacheGroupIter(CacheGroup *groups);
 
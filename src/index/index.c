@@ -10,13 +10,84 @@
 #include "../util/arr.h"
 #include "../query_ctx.h"
 #include "../util/rmalloc.h"
+#include "../util/thpool/pools.h"
 #include "../datatypes/point.h"
 #include "../graph/graphcontext.h"
 #include "../graph/entities/node.h"
 #include "../graph/rg_matrix/rg_matrix_iter.h"
+#include "../execution_plan/ops/shared/morsel_functions.h"
 
-extern void populateEdgeIndex(Index *idx, Graph *g); 
-extern void populateNodeIndex(Index *idx, Graph *g);
+#include <math.h>
+
+// creates documents for the entities within a range of matrix rows
+typedef void (*EntityDocumentsFunc)(Index *idx, Graph *g, RG_Matrix m,
+		uint64_t start, uint64_t end, RSDoc ***docs);
+
+extern void nodeDocuments(Index *idx, Graph *g, RG_Matrix m, uint64_t start,
+		uint64_t end, RSDoc ***docs);
+extern void edgeDocuments(Index *idx, Graph *g, RG_Matrix m, uint64_t start,
+		uint64_t end, RSDoc ***docs);
+
+// source of index construction IDs
+static uint64_t _construction_id = 0;
+
+// values are encoded such that a composite key parses unambiguously
+// strings are length prefixed and numerics are terminated
+// numerics and booleans share an encoding, similar to the numeric field
+bool Index_CompositeKeyAppend
+(
+	sds *key,
+	SIValue v
+) {
+	ASSERT(key != NULL);
+
+	SIType t = SI_TYPE(v);
+	if(t == T_STRING) {
+		size_t len = strlen(v.stringval);
+		*key = sdscatprintf(*key, "s%zu:", len);
+		*key = sdscatlen(*key, v.stringval, len);
+	} else if(t & (SI_NUMERIC | T_BOOL)) {
+		double d = SI_GET_NUMERIC(v);
+		if(isnan(d)) return false;
+		if(d == 0) d = 0;  // -0 equals 0
+		*key = sdscatprintf(*key, "n%.17g;", d);
+	} else {
+		return false;
+	}
+
+	return true;
+}
+
+// add a tag to the composite key field for each prefix of leading fields
+// starting at two fields, as a single field is queried directly
+static void _IndexCompositeKey
+(
+	const Index *idx,
+	const GraphEntity *e,
+	RSDoc *doc
+) {
+	char sep  = INDEX_SEPARATOR;
+	sds  key  = sdsempty();  // encoded leading values
+	sds  tags = sdsempty();  // encoded prefixes
+
+	for(uint i = 0; i < idx->composite_len; i++) {
+		SIValue *v = GraphEntity_GetProperty(e, idx->fields[i].id);
+		if(v == ATTRIBUTE_NOTFOUND) break;
+		if(!Index_CompositeKeyAppend(&key, *v)) break;
+		if(i == 0) continue;
+
+		if(sdslen(tags) > 0) tags = sdscatlen(tags, &sep, 1);
+		tags = sdscatsds(tags, key);
+	}
+
+	if(sdslen(tags) > 0) {
+		RediSearch_DocumentAddFieldString(doc, INDEX_FIELD_COMPOSITE_KEY, tags,
+				sdslen(tags), RSFLDTYPE_TAG);
+	}
+
+	sdsfree(key);
+	sdsfree(tags);
+}
 
 RSDoc *Index_IndexGraphEntity
 (
@@ -95,6 +166,8 @@ RSDoc *Index_IndexGraphEntity
 			}
 		}
 
+		_IndexCompositeKey(idx, e, doc);
+
 		// index name of none index fields
 		if(none_indexable_fields_count > 0) {
 			// concat all none indexable field names
@@ -165,14 +238,17 @@ Index *Index_New
 ) {
 	Index *idx = rm_malloc(sizeof(Index));
 
-	idx->idx           =  NULL;
-	idx->type          =  type;
-	idx->label         =  rm_strdup(label);
-	idx->fields        =  array_new(IndexField, 1);
-	idx->label_id      =  label_id;
-	idx->language      =  NULL;
-	idx->stopwords     =  NULL;
-	idx->entity_type   =  entity_type;
+	idx->idx             =  NULL;
+	idx->type            =  type;
+	idx->label           =  rm_strdup(label);
+	idx->fields          =  array_new(IndexField, 1);
+	idx->label_id        =  label_id;
+	idx->language        =  NULL;
+	idx->stopwords       =  NULL;
+	idx->entity_type     =  entity_type;
+	idx->composite_len   =  0;
+	idx->cursor          =  INVALID_ENTITY_ID;
+	idx->construction_id =  0;
 
 	return idx;
 }
@@ -213,7 +289,10 @@ void Index_RemoveField
 		if(field->id == attribute_id) {
 			// free field
 			IndexField_Free(field);
-			array_del_fast(idx->fields, i);
+			// maintain fields order, indexed composite keys of
+			// preceding fields remain valid
+			array_del(idx->fields, i);
+			idx->composite_len = MIN(idx->composite_len, i);
 			break;
 		}
 	}
@@ -226,6 +305,18 @@ void Index_Construct
 	Graph *g
 ) {
 	ASSERT(idx != NULL);
+	ASSERT(g   != NULL);
+
+	Index_ConstructEmpty(idx);
+	Index_Populate(idx, g, UINT64_MAX);
+}
+
+// constructs an empty index
+void Index_ConstructEmpty
+(
+	Index *idx
+) {
+	ASSERT(idx != NULL);
 
 	// RediSearch index already exists, re-construct
 	if(idx->idx) {
@@ -290,11 +381,132 @@ void Index_Construct
 
 		RediSearch_TagFieldSetSeparator(rsIdx, fieldID, INDEX_SEPARATOR);
 		RediSearch_TagFieldSetCaseSensitive(rsIdx, fieldID, 1);
+
+		// fields in order of definition form a composite key
+		// allowing equality on leading fields to be resolved by a single tag
+		idx->composite_len = 0;
+		if(fields_count > 1) {
+			fieldID = RediSearch_CreateField(rsIdx, INDEX_FIELD_COMPOSITE_KEY,
+					RSFLDTYPE_TAG, RSFLDOPT_NONE);
+
+			RediSearch_TagFieldSetSeparator(rsIdx, fieldID, INDEX_SEPARATOR);
+			RediSearch_TagFieldSetCaseSensitive(rsIdx, fieldID, 1);
+			idx->composite_len = fields_count;
+		}
 	}
 
 	idx->idx = rsIdx;
-	if(idx->entity_type == GETYPE_NODE) populateNodeIndex(idx, g);
-	else populateEdgeIndex(idx, g);
+
+	// populate from the first entity, an ongoing population is abandoned
+	idx->cursor = 0;
+	idx->construction_id = __atomic_add_fetch(&_construction_id, 1,
+			__ATOMIC_RELAXED);
+}
+
+// state of a thread creating documents
+typedef struct {
+	Index *idx;             // index being populated
+	Graph *g;               // graph
+	RG_Matrix m;            // scanned matrix
+	uint64_t base;          // first row of the populated chunk
+	EntityDocumentsFunc f;  // document creation function
+	RSDoc **docs;           // created documents
+} PopulateWorker;
+
+static void _Index_PopulateMorsel
+(
+	void *worker,
+	uint64_t start,
+	uint64_t end
+) {
+	PopulateWorker *w = worker;
+	w->f(w->idx, w->g, w->m, w->base + start, w->base + end, &w->docs);
+}
+
+// populates index with the next batch of entities
+// documents of a chunk of rows are created in parallel by the reader
+// threads, and added to the RediSearch index by the calling thread
+bool Index_Populate
+(
+	Index *idx,
+	Graph *g,
+	uint64_t batch
+) {
+	ASSERT(g     != NULL);
+	ASSERT(idx   != NULL);
+	ASSERT(batch >  0);
+
+	if(idx->cursor == INVALID_ENTITY_ID) return true;
+
+	RG_Matrix m;
+	EntityDocumentsFunc f;
+	if(idx->entity_type == GETYPE_NODE) {
+		m = Graph_GetLabelMatrix(g, idx->label_id);
+		f = nodeDocuments;
+	} else {
+		m = Graph_GetRelationMatrix(g, idx->label_id, false);
+		f = edgeDocuments;
+	}
+	ASSERT(m != NULL);
+
+	GrB_Index nrows;
+	GrB_Info info = RG_Matrix_nrows(&nrows, m);
+	ASSERT(info == GrB_SUCCESS);
+
+	uint helpers = ThreadPools_ReadersCount();
+	PopulateWorker *workers = rm_malloc(sizeof(PopulateWorker) *
+			(helpers + 1));
+	void **worker_ptrs = rm_malloc(sizeof(void *) * (helpers + 1));
+	for(uint i = 0; i <= helpers; i++) {
+		workers[i] = (PopulateWorker) {
+			.idx = idx, .g = g, .m = m, .f = f,
+			.docs = array_new(RSDoc *, 0)
+		};
+		worker_ptrs[i] = workers + i;
+	}
+
+	// bound the number of pending documents by populating chunk by chunk
+	while(batch > 0 && idx->cursor < nrows) {
+		uint64_t n = MIN(MIN(batch, INDEX_CONSTRUCT_BATCH_SIZE),
+				nrows - idx->cursor);
+		for(uint i = 0; i <= helpers; i++) workers[i].base = idx->cursor;
+
+		bool success = Morsels_Process(n, helpers, worker_ptrs,
+				_Index_PopulateMorsel, NULL);
+		ASSERT(success);
+		UNUSED(success);
+
+		// RediSearch index is updated by a single thread
+		for(uint i = 0; i <= helpers; i++) {
+			RSDoc **docs = workers[i].docs;
+			uint doc_count = array_len(docs);
+			for(uint j = 0; j < doc_count; j++) {
+				RediSearch_SpecAddDocument(idx->idx, docs[j]);
+			}
+			array_clear(docs);
+		}
+
+		idx->cursor += n;
+		batch -= n;
+	}
+
+	for(uint i = 0; i <= helpers; i++) array_free(workers[i].docs);
+	rm_free(worker_ptrs);
+	rm_free(workers);
+
+	if(idx->cursor < nrows) return false;
+
+	idx->cursor = INVALID_ENTITY_ID;
+	return true;
+}
+
+bool Index_Enabled
+(
+	const Index *idx
+) {
+	ASSERT(idx != NULL);
+
+	return idx->idx != NULL && idx->cursor == INVALID_ENTITY_ID;
 }
 
 // query index
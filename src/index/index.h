@@ -11,11 +11,17 @@
 #include "../graph/entities/graph_entity.h"
 #include "../graph/graph.h"
 #include "redisearch_api.h"
+#include "../util/sds/sds.h"
 
 #define INDEX_OK 1
 #define INDEX_FAIL 0
 #define INDEX_SEPARATOR '\1'  // can't use '\0', RediSearch will terminate on \0
 #define INDEX_FIELD_NONE_INDEXED "NONE_INDEXABLE_FIELDS"
+#define INDEX_FIELD_COMPOSITE_KEY "COMPOSITE_KEY_FIELDS"
+
+// number of entity IDs scanned by a single index construction step
+// entities within a step are indexed by several threads
+#define INDEX_CONSTRUCT_BATCH_SIZE 131072
 
 #define INDEX_FIELD_DEFAULT_WEIGHT 1.0
 #define INDEX_FIELD_DEFAULT_NOSTEM false
@@ -59,6 +65,9 @@ typedef struct {
 	char **stopwords;             // stopwords
 	GraphEntityType entity_type;  // entity type (node/edge) indexed
 	IndexType type;               // index type exact-match / fulltext
+	uint composite_len;           // number of leading fields forming a composite key
+	uint64_t construction_id;     // identifies the index's latest construction
+	EntityID cursor;              // next entity to populate, INVALID_ENTITY_ID once populated
 	RSIndex *idx;                 // rediSearch index
 } Index;
 
@@ -94,6 +103,29 @@ void Index_Construct
 	Graph *g
 );
 
+// constructs an empty index, to be populated by Index_Populate
+// the index is disabled until populated
+void Index_ConstructEmpty
+(
+	Index *idx
+);
+
+// populates index with the entities within the next 'batch' IDs
+// edges are scanned by source node ID
+// returns true once the index is fully populated
+bool Index_Populate
+(
+	Index *idx,
+	Graph *g,
+	uint64_t batch  // number of IDs to scan
+);
+
+// returns true if index is populated and may serve queries
+bool Index_Enabled
+(
+	const Index *idx
+);
+
 // adds field to index
 void Index_AddField
 (
@@ -142,6 +174,14 @@ RSResultsIterator *Index_Query
 	char **err          // [optional] report back error
 );
 
+// appends the composite key encoding of 'v' to 'key'
+// returns false if 'v' can't be part of a composite key
+bool Index_CompositeKeyAppend
+(
+	sds *key,  // composite key
+	SIValue v  // value to append
+);
+
 // returns number of fields indexed
 uint Index_FieldsCount
 (
@@ -7,6 +7,7 @@
 #include "RG.h"
 #include "index.h"
 #include "../query_ctx.h"
+#include "../util/arr.h"
 #include "../graph/graphcontext.h"
 #include "../graph/entities/edge.h"
 #include "../graph/rg_matrix/rg_matrix_iter.h"
@@ -14,15 +15,13 @@
 extern RSDoc *Index_IndexGraphEntity(Index *idx,const GraphEntity *e,
 		const void *key, size_t key_len, uint *doc_field_count);
 
-void Index_IndexEdge
+// create a document for edge
+// returns NULL if edge doesn't possess any indexed attributes
+static RSDoc *_Index_EdgeDocument
 (
 	Index *idx,
 	const Edge *e
 ) {
-	ASSERT(idx  !=  NULL);
-	ASSERT(e    !=  NULL);
-
-	RSIndex   *rsIdx   =  idx->idx;
 	EntityID  src_id   =  Edge_GetSrcNodeID(e);
 	EntityID  dest_id  =  Edge_GetDestNodeID(e);
 	EntityID  edge_id  =  ENTITY_GET_ID(e);
@@ -35,36 +34,61 @@ void Index_IndexEdge
 			idx, (const GraphEntity *)e, (const void *)&key, key_len,
 			&doc_field_count);
 
-	if(doc_field_count > 0) {
-		// add src_node and dest_node fields
-		RediSearch_DocumentAddFieldNumber(doc, "_src_id", src_id,
-				RSFLDTYPE_NUMERIC);
+	if(doc_field_count == 0) {
+		RediSearch_FreeDocument(doc);
+		return NULL;
+	}
 
-		RediSearch_DocumentAddFieldNumber(doc, "_dest_id", dest_id,
-				RSFLDTYPE_NUMERIC);
+	// add src_node and dest_node fields
+	RediSearch_DocumentAddFieldNumber(doc, "_src_id", src_id,
+			RSFLDTYPE_NUMERIC);
 
-		RediSearch_SpecAddDocument(rsIdx, doc);
+	RediSearch_DocumentAddFieldNumber(doc, "_dest_id", dest_id,
+			RSFLDTYPE_NUMERIC);
+
+	return doc;
+}
+
+void Index_IndexEdge
+(
+	Index *idx,
+	const Edge *e
+) {
+	ASSERT(idx  !=  NULL);
+	ASSERT(e    !=  NULL);
+
+	RSDoc *doc = _Index_EdgeDocument(idx, e);
+
+	if(doc != NULL) {
+		RediSearch_SpecAddDocument(idx->idx, doc);
 	} else {
 		// entity doesn't possess any attributes which are indexed
-		// remove entity from index and delete document
+		// remove entity from index
 		Index_RemoveEdge(idx, e);
-		RediSearch_FreeDocument(doc);
 	}
 }
 
-void populateEdgeIndex
+// create documents for the edges within rows [start, end)
+// of relation matrix 'm', appending them to 'docs'
+// edges without indexed attributes are skipped
+// only reads the graph, such that ranges can be processed concurrently
+void edgeDocuments
 (
 	Index *idx,
-	Graph *g
+	Graph *g,
+	RG_Matrix m,
+	uint64_t start,
+	uint64_t end,
+	RSDoc ***docs
 ) {
-	ASSERT(idx != NULL);
-	ASSERT(g != NULL);
-
-	const RG_Matrix m = Graph_GetRelationMatrix(g, idx->label_id, false);
-	ASSERT(m != NULL);
+	ASSERT(g    != NULL);
+	ASSERT(m    != NULL);
+	ASSERT(idx  != NULL);
+	ASSERT(docs != NULL);
 
 	RG_MatrixTupleIter it = {0};
 	RG_MatrixTupleIter_attach(&it, m);
+	RG_MatrixTupleIter_iterate_range(&it, start, end - 1);
 
 	// iterate over each graph entity
 	EntityID  src_id;
@@ -78,7 +102,8 @@ void populateEdgeIndex
 		e.destNodeID  =  dest_id;
 
 		Graph_GetEdge(g, edge_id, &e);
-		Index_IndexEdge(idx, &e);
+		RSDoc *doc = _Index_EdgeDocument(idx, &e);
+		if(doc != NULL) array_append(*docs, doc);
 	}
 
 	RG_MatrixTupleIter_detach(&it);
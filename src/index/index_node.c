@@ -7,6 +7,7 @@
 #include "RG.h"
 #include "index.h"
 #include "../value.h"
+#include "../util/arr.h"
 #include "../query_ctx.h"
 #include "../graph/graphcontext.h"
 #include "../graph/rg_matrix/rg_matrix_iter.h"
@@ -14,15 +15,13 @@
 extern RSDoc *Index_IndexGraphEntity(Index *idx,const GraphEntity *e,
 		const void *key, size_t key_len, uint *doc_field_count);
 
-void Index_IndexNode
+// create a document for node
+// returns NULL if node doesn't possess any indexed attributes
+static RSDoc *_Index_NodeDocument
 (
 	Index *idx,
 	const Node *n
 ) {
-	ASSERT(idx  !=  NULL);
-	ASSERT(n    !=  NULL);
-
-	RSIndex   *rsIdx           =  idx->idx;
 	EntityID  key              =  ENTITY_GET_ID(n);
 	size_t    key_len          =  sizeof(EntityID);
 	uint      doc_field_count  =  0;
@@ -31,36 +30,59 @@ void Index_IndexNode
 			idx, (const GraphEntity *)n, (const void *)&key, key_len,
 			&doc_field_count);
 
-	if(doc_field_count > 0) {
-		RediSearch_SpecAddDocument(rsIdx, doc);
+	if(doc_field_count > 0) return doc;
+
+	RediSearch_FreeDocument(doc);
+	return NULL;
+}
+
+void Index_IndexNode
+(
+	Index *idx,
+	const Node *n
+) {
+	ASSERT(idx  !=  NULL);
+	ASSERT(n    !=  NULL);
+
+	RSDoc *doc = _Index_NodeDocument(idx, n);
+
+	if(doc != NULL) {
+		RediSearch_SpecAddDocument(idx->idx, doc);
 	} else {
 		// entity doesn't poses any attributes which are indexed
-		// remove entity from index and delete document
+		// remove entity from index
 		Index_RemoveNode(idx, n);
-		RediSearch_FreeDocument(doc);
 	}
 }
 
-void populateNodeIndex
+// create documents for the nodes within rows [start, end) of label matrix 'm'
+// appending them to 'docs', nodes without indexed attributes are skipped
+// only reads the graph, such that ranges can be processed concurrently
+void nodeDocuments
 (
 	Index *idx,
-	Graph *g
+	Graph *g,
+	RG_Matrix m,
+	uint64_t start,
+	uint64_t end,
+	RSDoc ***docs
 ) {
-	ASSERT(idx != NULL);
-	ASSERT(g != NULL);
-
-	const RG_Matrix m = Graph_GetLabelMatrix(g, idx->label_id);
-	ASSERT(m != NULL);
+	ASSERT(g    != NULL);
+	ASSERT(m    != NULL);
+	ASSERT(idx  != NULL);
+	ASSERT(docs != NULL);
 
 	RG_MatrixTupleIter it = {0};
 	RG_MatrixTupleIter_attach(&it, m);
+	RG_MatrixTupleIter_iterate_range(&it, start, end - 1);
 
 	// iterate over each graph entity
 	EntityID id;
 	while(RG_MatrixTupleIter_next_BOOL(&it, &id, NULL, NULL) == GrB_SUCCESS) {
 		Node n;
 		Graph_GetNode(g, id, &n);
-		Index_IndexNode(idx, &n);
+		RSDoc *doc = _Index_NodeDocument(idx, &n);
+		if(doc != NULL) array_append(*docs, doc);
 	}
 
 	RG_MatrixTupleIter_detach(&it);
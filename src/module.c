@@ -16,6 +16,7 @@
 #include "redisearch_api.h"
 #include "arithmetic/funcs.h"
 #include "commands/commands.h"
+#include "commands/query_cursor.h"
 #include "util/thpool/pools.h"
 #include "graph/graphcontext.h"
 #include "util/redis_version.h"
@@ -104,6 +105,7 @@ int RedisModule_OnLoad(RedisModuleCtx *ctx, RedisModuleString **argv, int argc)
 	Proc_Register();         // Register procedures.
 	AR_RegisterFuncs();      // Register arithmetic functions.
 	Cron_Start();            // Start CRON
+	QueryCursors_Init();     // Initialize query cursors registry
 	// Set up global lock and variables scoped to the entire module.
 	_PrepareModuleGlobals(ctx, argv, argc);
 
@@ -148,6 +150,11 @@ int RedisModule_OnLoad(RedisModuleCtx *ctx, RedisModuleString **argv, int argc)
 		return REDISMODULE_ERR;
 	}
 
+	if(RedisModule_CreateCommand(ctx, "graph.RO_QUERY_BATCH", Graph_ROQueryBatch, "readonly", 1, 1,
+								 1) == REDISMODULE_ERR) {
+		return REDISMODULE_ERR;
+	}
+
 	if(RedisModule_CreateCommand(ctx, "graph.DELETE", Graph_Delete, "write", 1, 1,
 								 1) == REDISMODULE_ERR) {
 		return REDISMODULE_ERR;
@@ -173,6 +180,16 @@ int RedisModule_OnLoad(RedisModuleCtx *ctx, RedisModuleString **argv, int argc)
 		return REDISMODULE_ERR;
 	}
 
+	if(RedisModule_CreateCommand(ctx, "graph.CURSOR", Graph_Cursor, "readonly", 2, 2,
+								 1) == REDISMODULE_ERR) {
+		return REDISMODULE_ERR;
+	}
+
+	if(RedisModule_CreateCommand(ctx, "graph.CACHE", Graph_Cache, "readonly", 2, 2,
+								 1) == REDISMODULE_ERR) {
+		return REDISMODULE_ERR;
+	}
+
 	if(RedisModule_CreateCommand(ctx, "graph.CONFIG", Graph_Config, "readonly", 0, 0,
 								 0) == REDISMODULE_ERR) {
 		return REDISMODULE_ERR;
@@ -0,0 +1,139 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "proc_analyze.h"
+#include "RG.h"
+#include "../value.h"
+#include "../util/arr.h"
+#include "../query_ctx.h"
+#include "../util/rmalloc.h"
+#include "../graph/graphcontext.h"
+
+// CALL db.stats.analyze()
+// samples the nodes of each label, collecting attribute statistics
+// used by the planner to estimate the selectivity of filters
+// and scans each relationship type, collecting its degree distribution
+
+typedef struct {
+	uint schema_id;     // current schema id
+	GraphContext *gc;   // graph context
+	SIValue *output;    // label, entities, sampled
+} AnalyzeContext;
+
+ProcedureResult Proc_AnalyzeInvoke
+(
+	ProcedureCtx *ctx,
+	const SIValue *args,
+	const char **yield
+) {
+	if(array_len((SIValue *)args) != 0) return PROCEDURE_ERR;
+
+	GraphContext *gc = QueryCtx_GetGraphCtx();
+
+	// collect statistics of every label
+	// invoked while holding the graph's write lock
+	uint label_count = GraphContext_SchemaCount(gc, SCHEMA_NODE);
+	for(uint i = 0; i < label_count; i++) {
+		LabelStatistics *stats = LabelStatistics_Collect(gc->g, i,
+				ATTRIBUTE_STATS_SAMPLE_SIZE);
+		GraphContext_SetLabelStatistics(gc, i, stats);
+	}
+
+	// collect degree statistics of every relationship type
+	uint relation_count = GraphContext_SchemaCount(gc, SCHEMA_EDGE);
+	for(uint i = 0; i < relation_count; i++) {
+		RelationStatistics *stats = RelationStatistics_Collect(gc->g, i);
+		GraphContext_SetRelationStatistics(gc, i, stats);
+	}
+
+	// cached execution plans were built using the previous estimates
+	Cache_Clear(GraphContext_GetCache(gc));
+
+	AnalyzeContext *pdata = rm_malloc(sizeof(AnalyzeContext));
+
+	pdata->schema_id  =  0;
+	pdata->gc         =  gc;
+	pdata->output     =  array_new(SIValue, 3);
+
+	array_append(pdata->output, SI_NullVal());
+	array_append(pdata->output, SI_NullVal());
+	array_append(pdata->output, SI_NullVal());
+
+	ctx->privateData = pdata;
+	return PROCEDURE_OK;
+}
+
+SIValue *Proc_AnalyzeStep
+(
+	ProcedureCtx *ctx
+) {
+	ASSERT(ctx->privateData != NULL);
+
+	AnalyzeContext *pdata = (AnalyzeContext *)ctx->privateData;
+
+	// depleted?
+	if(pdata->schema_id >= GraphContext_SchemaCount(pdata->gc, SCHEMA_NODE))
+		return NULL;
+
+	uint label_id = pdata->schema_id++;
+	Schema *s = GraphContext_GetSchemaByID(pdata->gc, label_id, SCHEMA_NODE);
+	const LabelStatistics *stats =
+		GraphContext_GetLabelStatistics(pdata->gc, label_id);
+	ASSERT(stats != NULL);
+
+	pdata->output[0] = SI_ConstStringVal((char *)Schema_GetName(s));
+	pdata->output[1] = SI_LongVal(stats->entity_count);
+	pdata->output[2] = SI_LongVal(stats->sampled);
+	return pdata->output;
+}
+
+ProcedureResult Proc_AnalyzeFree
+(
+	ProcedureCtx *ctx
+) {
+	// clean up
+	if(ctx->privateData) {
+		AnalyzeContext *pdata = ctx->privateData;
+		array_free(pdata->output);
+		rm_free(ctx->privateData);
+	}
+
+	return PROCEDURE_OK;
+}
+
+ProcedureCtx *Proc_AnalyzeCtx() {
+	void *privateData = NULL;
+	ProcedureOutput *outputs = array_new(ProcedureOutput, 3);
+	ProcedureOutput output;
+
+	// analyzed label
+	output = (ProcedureOutput) {
+		.name = "label", .type = T_STRING
+	};
+	array_append(outputs, output);
+
+	// number of nodes with label
+	output = (ProcedureOutput) {
+		.name = "entities", .type = T_INT64
+	};
+	array_append(outputs, output);
+
+	// number of sampled nodes
+	output = (ProcedureOutput) {
+		.name = "sampled", .type = T_INT64
+	};
+	array_append(outputs, output);
+
+	ProcedureCtx *ctx = ProcCtxNew("db.stats.analyze",
+								   0,
+								   outputs,
+								   Proc_AnalyzeStep,
+								   Proc_AnalyzeInvoke,
+								   Proc_AnalyzeFree,
+								   privateData,
+								   false);
+	return ctx;
+}
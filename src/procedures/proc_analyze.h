@@ -0,0 +1,11 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#pragma once
+
+#include "proc_ctx.h"
+
+ProcedureCtx *Proc_AnalyzeCtx();
@@ -260,7 +260,7 @@ ProcedureResult Proc_FulltextCreateNodeIdxInvoke
 	}
 
 	// build index
-	if(res == INDEX_OK) Index_Construct(idx, gc->g);
+	if(res == INDEX_OK) GraphContext_ConstructIndex(gc, idx);
 
 	return PROCEDURE_OK;
 }
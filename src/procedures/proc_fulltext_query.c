@@ -78,6 +78,14 @@ ProcedureResult Proc_FulltextQueryNodeInvoke
 	Index *idx = Schema_GetIndex(s, NULL, IDX_FULLTEXT);
 	if(!idx) return PROCEDURE_ERR; // TODO: this should cause an error to be emitted
 
+	// a partially populated index would miss results
+	if(!Index_Enabled(idx)) {
+		ErrorCtx_SetError("Full-text index on :%s is under construction",
+				label);
+		ErrorCtx_RaiseRuntimeException(NULL);
+		return PROCEDURE_ERR;
+	}
+
 	ctx->privateData = rm_malloc(sizeof(QueryNodeContext));
 	QueryNodeContext *pdata = ctx->privateData;
 
@@ -27,6 +27,7 @@ typedef struct {
 	SIValue *yield_stopwords;   // yield index stopwords
 	SIValue *yield_entity_type; // yield index entity type
 	SIValue *yield_info;        // yield info
+	SIValue *yield_status;      // yield index status
 } IndexesContext;
 
 static void _process_yield
@@ -41,6 +42,7 @@ static void _process_yield
 	ctx->yield_stopwords   = NULL;
 	ctx->yield_entity_type = NULL;
 	ctx->yield_info        = NULL;
+	ctx->yield_status      = NULL;
 
 	int idx = 0;
 	for(uint i = 0; i < array_len(yield); i++) {
@@ -85,6 +87,12 @@ static void _process_yield
 			idx++;
 			continue;
 		}
+
+		if(strcasecmp("status", yield[i]) == 0) {
+			ctx->yield_status = ctx->out + idx;
+			idx++;
+			continue;
+		}
 	}
 }
 
@@ -109,7 +117,7 @@ ProcedureResult Proc_IndexesInvoke
 
 	IndexesContext *pdata    = rm_malloc(sizeof(IndexesContext));
 	pdata->gc                = gc;
-	pdata->out               = array_new(SIValue, 7);
+	pdata->out               = array_new(SIValue, 8);
 	pdata->type              = IDX_EXACT_MATCH;
 	pdata->node_schema_id    = GraphContext_SchemaCount(gc, SCHEMA_NODE) - 1;
 	pdata->edge_schema_id    = GraphContext_SchemaCount(gc, SCHEMA_EDGE) - 1;
@@ -233,6 +241,14 @@ static bool _EmitIndex
 		RediSearch_IndexInfoFree(&info);
 	}
 
+	if(ctx->yield_status) {
+		if(Index_Enabled(idx)) {
+			*ctx->yield_status = SI_ConstStringVal("OPERATIONAL");
+		} else {
+			*ctx->yield_status = SI_ConstStringVal("UNDER CONSTRUCTION");
+		}
+	}
+
 	return true;
 }
 
@@ -303,7 +319,7 @@ ProcedureResult Proc_IndexesFree
 ProcedureCtx *Proc_IndexesCtx() {
 	void *privateData = NULL;
 	ProcedureOutput output;
-	ProcedureOutput *outputs = array_new(ProcedureOutput, 7);
+	ProcedureOutput *outputs = array_new(ProcedureOutput, 8);
 
 	// index type (exact-match / fulltext)
 	output = (ProcedureOutput) {
@@ -347,6 +363,12 @@ ProcedureCtx *Proc_IndexesCtx() {
 	};
 	array_append(outputs, output);
 
+	// index status (operational / under construction)
+	output = (ProcedureOutput) {
+		.name = "status", .type = T_STRING
+	};
+	array_append(outputs, output);
+
 	ProcedureCtx *ctx = ProcCtxNew("db.indexes",
 								   0,
 								   outputs,
@@ -0,0 +1,252 @@
+/*
+* Copyright 2018-2022 Redis Labs Ltd. and Contributors
+*
+* This file is available under the Redis Labs Source Available License Agreement
+*/
+
+#include "proc_relationship_stats.h"
+#include "RG.h"
+#include "../value.h"
+#include "../util/arr.h"
+#include "../query_ctx.h"
+#include "../util/rmalloc.h"
+#include "../datatypes/map.h"
+#include "../datatypes/array.h"
+#include "../graph/graphcontext.h"
+
+// CALL db.stats.relationships()
+// reports for each relationship type its edge count per
+// (source label, destination label) pair
+// and the degree distribution collected by db.stats.analyze
+
+typedef struct {
+	uint schema_id;            // current schema id
+	GraphContext *gc;          // graph context
+	SIValue *output;           // outputs
+	SIValue *yield_type;       // yield relationship type
+	SIValue *yield_edges;      // yield edge count
+	SIValue *yield_triples;    // yield edge count per label pair
+	SIValue *yield_out_degree; // yield out degree summary
+	SIValue *yield_in_degree;  // yield in degree summary
+} RelationshipStatsContext;
+
+static void _process_yield
+(
+	RelationshipStatsContext *ctx,
+	const char **yield
+) {
+	ctx->yield_type       = NULL;
+	ctx->yield_edges      = NULL;
+	ctx->yield_triples    = NULL;
+	ctx->yield_out_degree = NULL;
+	ctx->yield_in_degree  = NULL;
+
+	int idx = 0;
+	for(uint i = 0; i < array_len(yield); i++) {
+		if(strcasecmp("relationshipType", yield[i]) == 0) {
+			ctx->yield_type = ctx->output + idx;
+			idx++;
+			continue;
+		}
+
+		if(strcasecmp("edges", yield[i]) == 0) {
+			ctx->yield_edges = ctx->output + idx;
+			idx++;
+			continue;
+		}
+
+		if(strcasecmp("triples", yield[i]) == 0) {
+			ctx->yield_triples = ctx->output + idx;
+			idx++;
+			continue;
+		}
+
+		if(strcasecmp("outDegree", yield[i]) == 0) {
+			ctx->yield_out_degree = ctx->output + idx;
+			idx++;
+			continue;
+		}
+
+		if(strcasecmp("inDegree", yield[i]) == 0) {
+			ctx->yield_in_degree = ctx->output + idx;
+			idx++;
+			continue;
+		}
+	}
+}
+
+// list of {source, destination, edges} maps
+static SIValue _Triples
+(
+	GraphContext *gc,
+	int relation_id
+) {
+	TripleCount *triples = Graph_RelationTriples(gc->g, relation_id);
+	uint triple_count = array_len(triples);
+
+	SIValue list = SIArray_New(triple_count);
+	for(uint i = 0; i < triple_count; i++) {
+		Schema *src  = GraphContext_GetSchemaByID(gc, triples[i].src_label,
+				SCHEMA_NODE);
+		Schema *dest = GraphContext_GetSchemaByID(gc, triples[i].dest_label,
+				SCHEMA_NODE);
+
+		SIValue triple = SI_Map(3);
+		Map_Add(&triple, SI_ConstStringVal("source"),
+				SI_ConstStringVal((char *)Schema_GetName(src)));
+		Map_Add(&triple, SI_ConstStringVal("destination"),
+				SI_ConstStringVal((char *)Schema_GetName(dest)));
+		Map_Add(&triple, SI_ConstStringVal("edges"),
+				SI_LongVal(triples[i].edge_count));
+		SIArray_Append(&list, triple);
+		SIValue_Free(triple);
+	}
+	array_free(triples);
+
+	return list;
+}
+
+// {max, mean, p50, p90, p99} map
+static SIValue _DegreeSummary
+(
+	const DegreeStatistics *stats
+) {
+	SIValue map = SI_Map(5);
+	Map_Add(&map, SI_ConstStringVal("max"),  SI_LongVal(stats->max));
+	Map_Add(&map, SI_ConstStringVal("mean"),
+			SI_DoubleVal(DegreeStatistics_Mean(stats)));
+	Map_Add(&map, SI_ConstStringVal("p50"),
+			SI_DoubleVal(DegreeStatistics_Percentile(stats, 0.50)));
+	Map_Add(&map, SI_ConstStringVal("p90"),
+			SI_DoubleVal(DegreeStatistics_Percentile(stats, 0.90)));
+	Map_Add(&map, SI_ConstStringVal("p99"),
+			SI_DoubleVal(DegreeStatistics_Percentile(stats, 0.99)));
+	return map;
+}
+
+ProcedureResult Proc_RelationshipStatsInvoke
+(
+	ProcedureCtx *ctx,
+	const SIValue *args,
+	const char **yield
+) {
+	if(array_len((SIValue *)args) != 0) return PROCEDURE_ERR;
+
+	RelationshipStatsContext *pdata =
+		rm_malloc(sizeof(RelationshipStatsContext));
+
+	pdata->schema_id  =  0;
+	pdata->gc         =  QueryCtx_GetGraphCtx();
+	pdata->output     =  array_new(SIValue, 5);
+
+	_process_yield(pdata, yield);
+
+	ctx->privateData = pdata;
+	return PROCEDURE_OK;
+}
+
+SIValue *Proc_RelationshipStatsStep
+(
+	ProcedureCtx *ctx
+) {
+	ASSERT(ctx->privateData != NULL);
+
+	RelationshipStatsContext *pdata = ctx->privateData;
+	GraphContext *gc = pdata->gc;
+
+	// depleted?
+	if(pdata->schema_id >= GraphContext_SchemaCount(gc, SCHEMA_EDGE)) {
+		return NULL;
+	}
+
+	int relation_id = pdata->schema_id++;
+	Schema *s = GraphContext_GetSchemaByID(gc, relation_id, SCHEMA_EDGE);
+	const RelationStatistics *stats =
+		GraphContext_GetRelationStatistics(gc, relation_id);
+
+	if(pdata->yield_type) {
+		*pdata->yield_type = SI_ConstStringVal((char *)Schema_GetName(s));
+	}
+
+	if(pdata->yield_edges) {
+		*pdata->yield_edges =
+			SI_LongVal(Graph_RelationEdgeCount(gc->g, relation_id));
+	}
+
+	if(pdata->yield_triples) {
+		*pdata->yield_triples = _Triples(gc, relation_id);
+	}
+
+	// degree summaries are available once relationship was analyzed
+	if(pdata->yield_out_degree) {
+		*pdata->yield_out_degree = (stats != NULL) ?
+			_DegreeSummary(&stats->out) : SI_NullVal();
+	}
+
+	if(pdata->yield_in_degree) {
+		*pdata->yield_in_degree = (stats != NULL) ?
+			_DegreeSummary(&stats->in) : SI_NullVal();
+	}
+
+	return pdata->output;
+}
+
+ProcedureResult Proc_RelationshipStatsFree
+(
+	ProcedureCtx *ctx
+) {
+	// clean up
+	if(ctx->privateData) {
+		RelationshipStatsContext *pdata = ctx->privateData;
+		array_free(pdata->output);
+		rm_free(ctx->privateData);
+	}
+
+	return PROCEDURE_OK;
+}
+
+ProcedureCtx *Proc_RelationshipStatsCtx() {
+	void *privateData = NULL;
+	ProcedureOutput *outputs = array_new(ProcedureOutput, 5);
+	ProcedureOutput output;
+
+	// relationship type
+	output = (ProcedureOutput) {
+		.name = "relationshipType", .type = T_STRING
+	};
+	array_append(outputs, output);
+
+	// number of edges of type
+	output = (ProcedureOutput) {
+		.name = "edges", .type = T_INT64
+	};
+	array_append(outputs, output);
+
+	// edge count per (source label, destination label)
+	output = (ProcedureOutput) {
+		.name = "triples", .type = T_ARRAY
+	};
+	array_append(outputs, output);
+
+	// source nodes degree summary
+	output = (ProcedureOutput) {
+		.name = "outDegree", .type = T_MAP | T_NULL
+	};
+	array_append(outputs, output);
+
+	// destination nodes degree summary
+	output = (ProcedureOutput) {
+		.name = "inDegree", .type = T_MAP | T_NULL
+	};
+	array_append(outputs, output);
+
+	ProcedureCtx *ctx = ProcCtxNew("db.stats.relationships",
+								   0,
+								   outputs,
+								   Proc_RelationshipStatsStep,
+								   Proc_RelationshipStatsInvoke,
+								   Proc_RelationshipStatsFree,
+								   privateData,
+								   true);
+	return ctx;
+}
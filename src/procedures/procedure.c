@@ -31,6 +31,8 @@ void Proc_Register() {
 	_procRegister("db.propertyKeys", Proc_PropKeysCtx);
 	_procRegister("dbms.procedures", Proc_ProceduresCtx);
 	_procRegister("db.relationshipTypes", Proc_RelationsCtx);
+	_procRegister("db.stats.analyze", Proc_AnalyzeCtx);
+	_procRegister("db.stats.relationships", Proc_RelationshipStatsCtx);
 
 	// Register graph algorithms.
 	_procRegister("algo.BFS", Proc_BFS_Ctx);
@@ -7,11 +7,13 @@
 #pragma once
 
 #include "proc_bfs.h"
+#include "proc_analyze.h"
 #include "proc_labels.h"
 #include "proc_pagerank.h"
 #include "proc_sp_paths.h"
 #include "proc_ss_paths.h"
 #include "proc_relations.h"
+#include "proc_relationship_stats.h"
 #include "proc_procedures.h"
 #include "proc_list_indexes.h"
 #include "proc_property_keys.h"
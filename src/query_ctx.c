@@ -154,6 +154,11 @@ static void _QueryCtx_ThreadSafeContextUnlock(QueryCtx *ctx) {
 bool QueryCtx_LockForCommit(void) {
 	QueryCtx *ctx = _QueryCtx_GetCreateCtx();
 	if(ctx->internal_exec_ctx.locked_for_commit) return true;
+	// locks are held by an enclosing group commit
+	if(ctx->internal_exec_ctx.group_commit) {
+		ctx->internal_exec_ctx.locked_for_commit = true;
+		return true;
+	}
 	// Lock GIL.
 	RedisModuleCtx *redis_ctx = ctx->global_exec_ctx.redis_ctx;
 	GraphContext *gc = ctx->gc;
@@ -206,6 +211,10 @@ static void _QueryCtx_UnlockCommit(QueryCtx *ctx) {
 	}
 
 	ctx->internal_exec_ctx.locked_for_commit = false;
+
+	// locks are released by the enclosing group commit
+	if(ctx->internal_exec_ctx.group_commit) return;
+
 	// Release graph R/W lock.
 	Graph_ReleaseLock(gc->g);
 
@@ -229,6 +238,11 @@ void QueryCtx_UnlockCommit(OpBase *writer_op) {
 	_QueryCtx_UnlockCommit(ctx);
 }
 
+void QueryCtx_JoinGroupCommit(void) {
+	QueryCtx *ctx = _QueryCtx_GetCreateCtx();
+	ctx->internal_exec_ctx.group_commit = true;
+}
+
 void QueryCtx_ForceUnlockCommit() {
 	QueryCtx *ctx = _QueryCtx_GetCtx();
 	if(!ctx) return;
@@ -261,6 +275,11 @@ void QueryCtx_Free(void) {
 		ctx->query_data.params = NULL;
 	}
 
+	if(ctx->query_data.query_normalized) {
+		rm_free(ctx->query_data.query_normalized);
+		ctx->query_data.query_normalized = NULL;
+	}
+
 	rm_free(ctx);
 	// NULL-set the context for reuse the next time this thread receives a query
 	QueryCtx_RemoveFromTLS();
@@ -23,6 +23,7 @@ typedef struct {
 	rax *params;                  // Query parameters.
 	const char *query;            // Query string.
 	const char *query_no_params;  // Query string without parameters part.
+	char *query_normalized;       // Normalized query string, owned by the context.
 } QueryCtx_QueryData;
 
 typedef struct {
@@ -31,6 +32,7 @@ typedef struct {
 	ResultSet *result_set;      // Save the execution result set.
 	bool locked_for_commit;     // Indicates if a call for QueryCtx_LockForCommit issued before.
 	OpBase *last_writer;        // The last writer operation which indicates the need for commit.
+	bool group_commit;          // Indicates commit locks are held by an enclosing group commit.
 } QueryCtx_InternalExecCtx;
 
 typedef struct {
@@ -118,6 +120,12 @@ bool QueryCtx_LockForCommit(void);
  * 4. Unlock GIL */
 void QueryCtx_UnlockCommit(OpBase *writer_op);
 
+/* Marks the locks required for commit as held by an enclosing group commit,
+ * executing several queries under a single lock acquisition.
+ * The query neither acquires nor releases the locks, but its changes are
+ * still replicated once its last writer commits. */
+void QueryCtx_JoinGroupCommit(void);
+
 /*
  * -------------------------FOR SAFETY ONLY---------------------------
  *
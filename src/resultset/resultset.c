@@ -57,6 +57,60 @@ static void _ResultSet_SetColumns
 	}
 }
 
+// allocate storage for resultset cells
+static inline DataBlock *_ResultSet_NewCells
+(
+	ResultSet *set
+) {
+	// allocate enough space for at least 10 rows
+	uint64_t nrows = set->column_count * 10;
+	return DataBlock_New(16384, nrows, sizeof(SIValue), NULL);
+}
+
+// free resultset cells
+static void _ResultSet_FreeCells
+(
+	ResultSet *set
+) {
+	// NOTE: for large result-set containing only NONE heap allocated values
+	// the following is a bit of a waste as there's no real memory to free
+	// at the moment we can't tell rather or not
+	// calling SIValue_Free is required
+
+	// free individual cells if resultset encountered a heap allocated value
+	if(set->cells_allocation & M_SELF) {
+		uint64_t n = DataBlock_ItemCount(set->cells);
+		for(uint64_t i = 0; i < n; i++) {
+			SIValue *v = DataBlock_GetItem(set->cells, i);
+			SIValue_Free(*v);
+		}
+	}
+	DataBlock_Free(set->cells);
+	set->cells = NULL;
+	set->cells_allocation = M_NONE;
+}
+
+// emit accumulated rows
+static void _ResultSet_ReplyWithRows
+(
+	ResultSet *set
+) {
+	uint64_t row_count = ResultSet_RowCount(set);
+	RedisModule_ReplyWithArray(set->ctx, row_count);
+
+	SIValue *row[set->column_count];
+	uint64_t cells = DataBlock_ItemCount(set->cells);
+	// for each row
+	for(uint64_t i = 0; i < cells; i += set->column_count) {
+		// for each column
+		for(uint j = 0; j < set->column_count; j++) {
+			row[j] = DataBlock_GetItem(set->cells, i + j);
+		}
+
+		set->formatter->EmitRow(set->ctx, set->gc, row, set->column_count);
+	}
+}
+
 // create a new result set
 ResultSet *NewResultSet
 (
@@ -86,9 +140,7 @@ ResultSet *NewResultSet
 	// allocate space for resultset entries only if data is expected
 	if(set->column_count > 0) {
 		// none empty result-set
-		// allocate enough space for at least 10 rows
-		uint64_t nrows = set->column_count * 10;
-		set->cells = DataBlock_New(16384, nrows, sizeof(SIValue), NULL);
+		set->cells = _ResultSet_NewCells(set);
 	}
 
 	return set;
@@ -210,8 +262,6 @@ void ResultSet_Reply
 ) {
 	ASSERT(set != NULL);
 
-	uint64_t row_count = ResultSet_RowCount(set);
-
 	// check to see if we've encountered a run-time error
 	// if so, emit it as the only response
 	if(ErrorCtx_EncounteredError()) {
@@ -223,22 +273,44 @@ void ResultSet_Reply
 	_ResultSet_ReplyWithPreamble(set);
 
 	// emit resultset
+	if(set->column_count > 0) _ResultSet_ReplyWithRows(set);
+
+	ResultSetStat_emit(set->ctx, &set->stats); // response with statistics
+}
+
+// flush accumulated rows to network followed by a cursor ID
+// rows are discarded once emitted
+void ResultSet_ReplyWithCursor
+(
+	ResultSet *set,     // resultset to reply with
+	uint64_t cursor_id  // cursor ID, 0 if the resultset was fully consumed
+) {
+	ASSERT(set != NULL);
+
+	// check to see if we've encountered a run-time error
+	// if so, emit it as the only response
+	if(ErrorCtx_EncounteredError()) {
+		ErrorCtx_EmitException();
+		return;
+	}
+
+	// reply layout: [header, rows, statistics, cursor ID]
+	// or [statistics, cursor ID] if the query doesn't return data
 	if(set->column_count > 0) {
-		RedisModule_ReplyWithArray(set->ctx, row_count);
-		SIValue *row[set->column_count];
-		uint64_t cells = DataBlock_ItemCount(set->cells);
-		// for each row
-		for(uint64_t i = 0; i < cells; i += set->column_count) {
-			// for each column
-			for(uint j = 0; j < set->column_count; j++) {
-				row[j] = DataBlock_GetItem(set->cells, i + j);
-			}
-
-			set->formatter->EmitRow(set->ctx, set->gc, row, set->column_count);
-		}
+		RedisModule_ReplyWithArray(set->ctx, 4);
+		set->formatter->EmitHeader(set->ctx, set->columns,
+				set->columns_record_map);
+		_ResultSet_ReplyWithRows(set);
+
+		// discard emitted rows
+		_ResultSet_FreeCells(set);
+		set->cells = _ResultSet_NewCells(set);
+	} else {
+		RedisModule_ReplyWithArray(set->ctx, 2);
 	}
 
 	ResultSetStat_emit(set->ctx, &set->stats); // response with statistics
+	RedisModule_ReplyWithLongLong(set->ctx, cursor_id);
 }
 
 void ResultSet_Clear(ResultSet *set) {
@@ -262,21 +334,7 @@ void ResultSet_Free
 	}
 
 	// free resultset cells
-	// NOTE: for large result-set containing only NONE heap allocated values
-	// the following is a bit of a waste as there's no real memory to free
-	// at the moment we can't tell rather or not
-	// calling SIValue_Free is required
-	if(set->cells) {
-		// free individual cells if resultset encountered a heap allocated value
-		if(set->cells_allocation & M_SELF) {
-			uint64_t n = DataBlock_ItemCount(set->cells);
-			for(uint64_t i = 0; i < n; i++) {
-				SIValue *v = DataBlock_GetItem(set->cells, i);
-				SIValue_Free(*v);
-			}
-		}
-		DataBlock_Free(set->cells);
-	}
+	if(set->cells) _ResultSet_FreeCells(set);
 
 	rm_free(set);
 }
@@ -84,6 +84,14 @@ void ResultSet_Reply
 	ResultSet *set  // resultset to reply with
 );
 
+// flush accumulated rows to network followed by a cursor ID
+// rows are discarded once emitted
+void ResultSet_ReplyWithCursor
+(
+	ResultSet *set,     // resultset to reply with
+	uint64_t cursor_id  // cursor ID, 0 if the resultset was fully consumed
+);
+
 // clear result set stats
 void ResultSet_Clear
 (
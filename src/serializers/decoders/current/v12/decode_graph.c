@@ -216,6 +216,9 @@ GraphContext *RdbLoadGraphContext_v12
 			GraphStatistics_IncNodeCount(&g->stats, i, nvals);
 		}
 
+		// edge statistics per label pair aren't encoded, recompute them
+		Graph_ComputeTripleStatistics(g);
+
 		// make sure graph doesn't contains may pending changes
 		ASSERT(Graph_Pending(g) == false);
 
@@ -209,6 +209,9 @@ GraphContext *RdbLoadGraphContext_v11
 			GraphStatistics_IncNodeCount(&g->stats, i, nvals);
 		}
 
+		// edge statistics per label pair aren't encoded, recompute them
+		Graph_ComputeTripleStatistics(g);
+
 		// make sure graph doesn't contains may pending changes
 		ASSERT(Graph_Pending(g) == false);
 
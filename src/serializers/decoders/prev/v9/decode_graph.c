@@ -208,6 +208,9 @@ GraphContext *RdbLoadGraphContext_v9(RedisModuleIO *rdb) {
 			if(s->fulltextIdx) Index_Construct(s->fulltextIdx, g);
 		}
 
+		// edge statistics per label pair aren't encoded, recompute them
+		Graph_ComputeTripleStatistics(g);
+
 		// make sure graph doesn't contains may pending changes
 		ASSERT(Graph_Pending(g) == false);
 
@@ -6,6 +6,10 @@
 
 #pragma once
 
-#define GRAPH_ENCODING_VERSION_LATEST 12 // Latest RDB encoding version.
+#define GRAPH_ENCODING_VERSION_LATEST 15 // Latest RDB encoding version.
+#define GRAPH_KEYSPACE_ENCODING_V 12     // Latest version changing the encoding of graph keys, later versions only extend aux fields.
+#define GRAPH_AUX_RECORDS_MIN_V 13       // Lowest version saving graph records (cached queries) after the keyspace.
+#define GRAPH_AUX_LABEL_STATS_MIN_V 14   // Lowest version whose graph records hold label attribute statistics.
+#define GRAPH_AUX_RELATION_STATS_MIN_V 15 // Lowest version whose graph records hold relation degree statistics.
 #define GRAPHCONTEXT_TYPE_DECODE_MIN_V 5 // Lowest version that has backwards-compatibility decoding routines for graphcontext type.
 #define GRAPHMETA_TYPE_DECODE_MIN_V 7    // Lowest version that has backwards-compatibility decoding routines for graphmeta type.
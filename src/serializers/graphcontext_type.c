@@ -10,12 +10,18 @@
 #include "encoder/encode_graph.h"
 #include "decoders/decode_graph.h"
 #include "decoders/decode_previous.h"
+#include "../util/arr.h"
+#include "../util/rmalloc.h"
 #include "../util/redis_version.h"
+#include "../configuration/config.h"
 
 // forward declerations of the module event handler functions
 void ModuleEventHandler_AUXBeforeKeyspaceEvent(void);
 void ModuleEventHandler_AUXAfterKeyspaceEvent(void);
 
+// global array tracking all extant GraphContexts
+extern GraphContext **graphs_in_keyspace;
+
 // declaration of the type for redis registration
 RedisModuleType *GraphContextRedisModuleType;
 
@@ -33,10 +39,10 @@ static void *_GraphContextType_RdbLoad(RedisModuleIO *rdb, int encver) {
 			   REDISGRAPH_MODULE_VERSION, encver);
 		return NULL;
 		// Previous version.
-	} else if(encver < GRAPH_ENCODING_VERSION_LATEST) {
+	} else if(encver < GRAPH_KEYSPACE_ENCODING_V) {
 		gc = Decode_Previous(rdb, encver);
 	} else {
-		// Current version.
+		// Current version, graph keys encoding is shared by later versions.
 		gc = RdbLoadGraph(rdb);
 	}
 	// Add GraphContext to global array of graphs.
@@ -49,17 +55,314 @@ static void _GraphContextType_RdbSave(RedisModuleIO *rdb, void *value) {
 	RdbSaveGraph(rdb, value);
 }
 
-// save an unsigned placeholder before and after the keyspace encoding
+// save label's attribute statistics
+static void _GraphContextType_SaveLabelStatistics
+(
+	RedisModuleIO *rdb,
+	GraphContext *gc,
+	const LabelStatistics *stats
+) {
+	uint attr_count = array_len(stats->attributes);
+
+	RedisModule_SaveUnsigned(rdb, stats->entity_count);
+	RedisModule_SaveUnsigned(rdb, stats->sampled);
+	RedisModule_SaveUnsigned(rdb, attr_count);
+
+	for(uint i = 0; i < attr_count; i++) {
+		AttributeStatistics *attr = stats->attributes + i;
+		const char *attr_name = GraphContext_GetAttributeString(gc, attr->id);
+		uint bounds_count = array_len(attr->histogram);
+
+		RedisModule_SaveStringBuffer(rdb, attr_name, strlen(attr_name) + 1);
+		RedisModule_SaveDouble(rdb, attr->null_fraction);
+		RedisModule_SaveDouble(rdb, attr->numeric_fraction);
+		RedisModule_SaveDouble(rdb, attr->distinct);
+		RedisModule_SaveUnsigned(rdb, bounds_count);
+		for(uint j = 0; j < bounds_count; j++) {
+			RedisModule_SaveDouble(rdb, attr->histogram[j]);
+		}
+	}
+}
+
+// load label's attribute statistics
+// attributes unknown to the graph are skipped
+static LabelStatistics *_GraphContextType_LoadLabelStatistics
+(
+	RedisModuleIO *rdb,
+	GraphContext *gc  // [optional] graph to resolve attributes against
+) {
+	uint64_t entity_count = RedisModule_LoadUnsigned(rdb);
+	uint64_t sampled      = RedisModule_LoadUnsigned(rdb);
+	uint64_t attr_count   = RedisModule_LoadUnsigned(rdb);
+
+	LabelStatistics *stats = LabelStatistics_New(entity_count, sampled);
+
+	for(uint64_t i = 0; i < attr_count; i++) {
+		char *attr_name = RedisModule_LoadStringBuffer(rdb, NULL);
+		AttributeStatistics attr;
+		attr.null_fraction    = RedisModule_LoadDouble(rdb);
+		attr.numeric_fraction = RedisModule_LoadDouble(rdb);
+		attr.distinct         = RedisModule_LoadDouble(rdb);
+		attr.histogram        = NULL;
+
+		uint64_t bounds_count = RedisModule_LoadUnsigned(rdb);
+		if(bounds_count > 0) {
+			attr.histogram = array_new(double, bounds_count);
+			for(uint64_t j = 0; j < bounds_count; j++) {
+				array_append(attr.histogram, RedisModule_LoadDouble(rdb));
+			}
+		}
+
+		attr.id = (gc != NULL) ?
+			GraphContext_GetAttributeID(gc, attr_name) : ATTRIBUTE_ID_NONE;
+		if(attr.id != ATTRIBUTE_ID_NONE) {
+			array_append(stats->attributes, attr);
+		} else if(attr.histogram != NULL) {
+			array_free(attr.histogram);
+		}
+		RedisModule_Free(attr_name);
+	}
+
+	return stats;
+}
+
+// save a relation's degree distribution
+static void _GraphContextType_SaveDegreeStatistics
+(
+	RedisModuleIO *rdb,
+	const DegreeStatistics *stats
+) {
+	RedisModule_SaveUnsigned(rdb, stats->nodes);
+	RedisModule_SaveUnsigned(rdb, stats->max);
+	RedisModule_SaveUnsigned(rdb, stats->sum);
+	RedisModule_SaveUnsigned(rdb, DEGREE_STATS_BUCKETS);
+	for(uint i = 0; i < DEGREE_STATS_BUCKETS; i++) {
+		RedisModule_SaveUnsigned(rdb, stats->buckets[i]);
+	}
+}
+
+// load a relation's degree distribution
+static void _GraphContextType_LoadDegreeStatistics
+(
+	RedisModuleIO *rdb,
+	DegreeStatistics *stats
+) {
+	stats->nodes = RedisModule_LoadUnsigned(rdb);
+	stats->max   = RedisModule_LoadUnsigned(rdb);
+	stats->sum   = RedisModule_LoadUnsigned(rdb);
+
+	uint64_t bucket_count = RedisModule_LoadUnsigned(rdb);
+	for(uint64_t i = 0; i < bucket_count; i++) {
+		uint64_t count = RedisModule_LoadUnsigned(rdb);
+		if(i < DEGREE_STATS_BUCKETS) stats->buckets[i] = count;
+	}
+}
+
+// save the most frequently used cached queries
+// and the attribute and degree statistics of each graph
+static void _GraphContextType_SaveGraphRecords(RedisModuleIO *rdb) {
+	// Format:
+	// #graphs - N
+	// N * Graph:
+	//     Graph name
+	//     #queries - M
+	//     M * Query
+	//     #labels - L
+	//     L * Label statistics:
+	//         Label name
+	//         Entity count
+	//         Sampled count
+	//         #attributes - A
+	//         A * Attribute statistics:
+	//             Attribute name
+	//             Null fraction
+	//             Numeric fraction
+	//             Distinct count
+	//             #histogram bounds - B
+	//             B * Bound
+	//     #relations - R
+	//     R * Relation statistics:
+	//         Relation name
+	//         Out degree statistics, followed by in degree statistics:
+	//             Node count
+	//             Max degree
+	//             Degree sum
+	//             #buckets - D
+	//             D * Bucket count
+
+	uint64_t warmup_size;
+	Config_Option_get(Config_CACHE_WARMUP_SIZE, &warmup_size);
+
+	uint graph_count = array_len(graphs_in_keyspace);
+	if(graph_count == 0) {
+		RedisModule_SaveUnsigned(rdb, 0);
+		return;
+	}
+
+	char **queries[graph_count];
+	uint64_t n = 0;  // number of graphs with cached queries or statistics
+
+	for(uint i = 0; i < graph_count; i++) {
+		GraphContext *gc = graphs_in_keyspace[i];
+		queries[i] = GraphContext_CachedQueries(gc, warmup_size);
+		if(array_len(queries[i]) > 0 || array_len(gc->label_stats) > 0 ||
+				array_len(gc->relation_stats) > 0) n++;
+	}
+
+	RedisModule_SaveUnsigned(rdb, n);
+
+	for(uint i = 0; i < graph_count; i++) {
+		GraphContext *gc = graphs_in_keyspace[i];
+		char **graph_queries = queries[i];
+		uint query_count = array_len(graph_queries);
+		uint label_count = array_len(gc->label_stats);
+		uint relation_count = array_len(gc->relation_stats);
+		if(query_count > 0 || label_count > 0 || relation_count > 0) {
+			const char *graph_name = gc->graph_name;
+			RedisModule_SaveStringBuffer(rdb, graph_name, strlen(graph_name) + 1);
+			RedisModule_SaveUnsigned(rdb, query_count);
+			for(uint j = 0; j < query_count; j++) {
+				RedisModule_SaveStringBuffer(rdb, graph_queries[j],
+						strlen(graph_queries[j]) + 1);
+			}
+
+			uint analyzed = 0;  // number of analyzed labels
+			for(uint j = 0; j < label_count; j++) {
+				if(gc->label_stats[j] != NULL) analyzed++;
+			}
+
+			RedisModule_SaveUnsigned(rdb, analyzed);
+			for(uint j = 0; j < label_count; j++) {
+				const LabelStatistics *stats = gc->label_stats[j];
+				if(stats == NULL) continue;
+
+				Schema *s = GraphContext_GetSchemaByID(gc, j, SCHEMA_NODE);
+				const char *label = Schema_GetName(s);
+				RedisModule_SaveStringBuffer(rdb, label, strlen(label) + 1);
+				_GraphContextType_SaveLabelStatistics(rdb, gc, stats);
+			}
+
+			analyzed = 0;  // number of analyzed relations
+			for(uint j = 0; j < relation_count; j++) {
+				if(gc->relation_stats[j] != NULL) analyzed++;
+			}
+
+			RedisModule_SaveUnsigned(rdb, analyzed);
+			for(uint j = 0; j < relation_count; j++) {
+				const RelationStatistics *stats = gc->relation_stats[j];
+				if(stats == NULL) continue;
+
+				Schema *s = GraphContext_GetSchemaByID(gc, j, SCHEMA_EDGE);
+				const char *relation = Schema_GetName(s);
+				RedisModule_SaveStringBuffer(rdb, relation, strlen(relation) + 1);
+				_GraphContextType_SaveDegreeStatistics(rdb, &stats->out);
+				_GraphContextType_SaveDegreeStatistics(rdb, &stats->in);
+			}
+		}
+		array_free_cb(graph_queries, rm_free);
+	}
+}
+
+// load cached queries and plan them in the background
+// such that the graphs caches are warm before traffic arrives
+// and restore the attribute statistics of each graph
+static void _GraphContextType_LoadGraphRecords
+(
+	RedisModuleIO *rdb,
+	int encver
+) {
+	// records of older encodings lack some or all statistics
+	bool with_label_stats    = (encver >= GRAPH_AUX_LABEL_STATS_MIN_V);
+	bool with_relation_stats = (encver >= GRAPH_AUX_RELATION_STATS_MIN_V);
+
+	uint64_t n = RedisModule_LoadUnsigned(rdb);
+
+	for(uint64_t i = 0; i < n; i++) {
+		char *graph_name = RedisModule_LoadStringBuffer(rdb, NULL);
+		uint64_t query_count = RedisModule_LoadUnsigned(rdb);
+
+		char **queries = array_new(char *, query_count);
+		for(uint64_t j = 0; j < query_count; j++) {
+			char *query = RedisModule_LoadStringBuffer(rdb, NULL);
+			array_append(queries, rm_strdup(query));
+			RedisModule_Free(query);
+		}
+
+		GraphContext *gc = GraphContext_GetRegisteredGraphContext(graph_name);
+
+		uint64_t label_count = with_label_stats ?
+			RedisModule_LoadUnsigned(rdb) : 0;
+		for(uint64_t j = 0; j < label_count; j++) {
+			char *label = RedisModule_LoadStringBuffer(rdb, NULL);
+			LabelStatistics *stats =
+				_GraphContextType_LoadLabelStatistics(rdb, gc);
+
+			Schema *s = (gc != NULL) ?
+				GraphContext_GetSchema(gc, label, SCHEMA_NODE) : NULL;
+			if(s != NULL) {
+				GraphContext_SetLabelStatistics(gc, Schema_GetID(s), stats);
+			} else {
+				LabelStatistics_Free(stats);
+			}
+			RedisModule_Free(label);
+		}
+
+		uint64_t relation_count = with_relation_stats ?
+			RedisModule_LoadUnsigned(rdb) : 0;
+		for(uint64_t j = 0; j < relation_count; j++) {
+			char *relation = RedisModule_LoadStringBuffer(rdb, NULL);
+			RelationStatistics *stats = RelationStatistics_New();
+			_GraphContextType_LoadDegreeStatistics(rdb, &stats->out);
+			_GraphContextType_LoadDegreeStatistics(rdb, &stats->in);
+
+			Schema *s = (gc != NULL) ?
+				GraphContext_GetSchema(gc, relation, SCHEMA_EDGE) : NULL;
+			if(s != NULL) {
+				GraphContext_SetRelationStatistics(gc, Schema_GetID(s), stats);
+			} else {
+				RelationStatistics_Free(stats);
+			}
+			RedisModule_Free(relation);
+		}
+
+		if(gc != NULL && query_count > 0) {
+			GraphContext_WarmupCache(gc, queries);
+		} else {
+			array_free_cb(queries, rm_free);
+		}
+		RedisModule_Free(graph_name);
+	}
+}
+
+// save an unsigned placeholder before the keyspace encoding
+// and the cached queries and statistics of each graph after it
 static void _GraphContextType_AuxSave(RedisModuleIO *rdb, int when) {
-	RedisModule_SaveUnsigned(rdb, 0);
+	if(when == REDISMODULE_AUX_BEFORE_RDB) RedisModule_SaveUnsigned(rdb, 0);
+	else _GraphContextType_SaveGraphRecords(rdb);
 }
 
-// decode the unsigned placeholders saved before and after the keyspace values
+// decode the aux fields saved before and after the keyspace values
 // and call the module event handler
 static int _GraphContextType_AuxLoad(RedisModuleIO *rdb, int encver, int when) {
-	RedisModule_LoadUnsigned(rdb);
-	if(when == REDISMODULE_AUX_BEFORE_RDB) ModuleEventHandler_AUXBeforeKeyspaceEvent();
-	else ModuleEventHandler_AUXAfterKeyspaceEvent();
+	if(encver > GRAPH_ENCODING_VERSION_LATEST) {
+		// Not forward compatible.
+		printf("Failed loading Graph aux fields, RedisGraph version (%d) is not forward compatible.\n",
+			   REDISGRAPH_MODULE_VERSION);
+		return REDISMODULE_ERR;
+	}
+
+	if(when == REDISMODULE_AUX_BEFORE_RDB) {
+		RedisModule_LoadUnsigned(rdb);
+		ModuleEventHandler_AUXBeforeKeyspaceEvent();
+	} else {
+		ModuleEventHandler_AUXAfterKeyspaceEvent();
+		if(encver < GRAPH_AUX_RECORDS_MIN_V) {
+			// older encodings saved an unsigned placeholder
+			RedisModule_LoadUnsigned(rdb);
+		} else {
+			_GraphContextType_LoadGraphRecords(rdb, encver);
+		}
+	}
 	return REDISMODULE_OK;
 }
 
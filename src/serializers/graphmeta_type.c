@@ -28,10 +28,10 @@ static void *_GraphMetaType_RdbLoad(RedisModuleIO *rdb, int encver) {
 			   REDISGRAPH_MODULE_VERSION, encver);
 		return NULL;
 		// Previous version.
-	} else if(encver < GRAPH_ENCODING_VERSION_LATEST) {
+	} else if(encver < GRAPH_KEYSPACE_ENCODING_V) {
 		gc = Decode_Previous(rdb, encver);
 	} else {
-		// Current version.
+		// Current version, graph keys encoding is shared by later versions.
 		gc = RdbLoadGraph(rdb);
 	}
 	// Add GraphContext to global array of graphs.
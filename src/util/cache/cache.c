@@ -6,50 +6,102 @@
 
 #include "cache.h"
 #include "RG.h"
+#include "xxhash.h"
+#include "../arr.h"
 #include "../rmalloc.h"
 #include "cache_array.h"
+#include "../simple_timer.h"
 #include <pthread.h>
 
-static CacheEntry *_CacheEvictLRU(Cache *cache) {
-	CacheEntry *entry = CacheArray_FindMinLRU(cache->arr, cache->cap);
+#define STAT_ADD(field, v) __atomic_add_fetch(&(field), (v), __ATOMIC_RELAXED)
+
+// copy value, tracking the time spent copying
+static void *_Cache_CopyValue(Cache *cache, void *value) {
+	double tic[2];
+	simple_tic(tic);
+	void *copy = cache->copy_item(value);
+	STAT_ADD(cache->stats.copy_time, (uint64_t)(simple_toc(tic) * 1000000));
+	return copy;
+}
+
+// returns the shard holding key
+static inline CacheShard *_Cache_GetShard(Cache *cache, const char *key,
+		size_t key_len) {
+	XXH64_hash_t h = XXH64(key, key_len, 0);
+	return cache->shards + (h % CACHE_SHARD_COUNT);
+}
+
+// acquire WRITE lock on all shards
+// shards are always locked in the same order to avoid deadlocks
+static void _Cache_LockAll(Cache *cache) {
+	for(uint i = 0; i < CACHE_SHARD_COUNT; i++) {
+		int res = pthread_rwlock_wrlock(&cache->shards[i]._shard_rwlock);
+		UNUSED(res);
+		ASSERT(res == 0);
+	}
+}
+
+// release all shards locks
+static void _Cache_UnlockAll(Cache *cache) {
+	for(uint i = 0; i < CACHE_SHARD_COUNT; i++) {
+		int res = pthread_rwlock_unlock(&cache->shards[i]._shard_rwlock);
+		UNUSED(res);
+		ASSERT(res == 0);
+	}
+}
+
+// evict the entry with the lowest priority
+// expects all shards to be locked
+static CacheEntry *_CacheEvict(Cache *cache) {
+	CacheEntry *entry = CacheArray_FindMinPriority(cache->arr, cache->cap);
+
+	// age remaining entries, new entries are prioritized on top of the
+	// evicted entry priority
+	cache->clock = entry->priority;
+	STAT_ADD(cache->stats.evictions, 1);
+
 	// Remove evicted element from the rax.
-	raxRemove(cache->lookup, (unsigned  char *)entry->key,
-	  strlen(entry->key), NULL);
+	size_t key_len = strlen(entry->key);
+	CacheShard *shard = _Cache_GetShard(cache, entry->key, key_len);
+	raxRemove(shard->lookup, (unsigned  char *)entry->key, key_len, NULL);
 	CacheArray_CleanEntry(entry, cache->free_item);
 
 	return entry;
 }
 
+// expects all shards to be locked
 static bool _Cache_SetValue(Cache *cache, const char *key, void *value,
-  		size_t key_len) {
+  		size_t key_len, uint64_t cost) {
 	ASSERT(key != NULL);
 	ASSERT(cache != NULL);
 
+	CacheShard *shard = _Cache_GetShard(cache, key, key_len);
+
 	/* in case that another working thread had already inserted the item to the
 	 * cache, no need to re-insert it */
-	CacheEntry *entry = raxFind(cache->lookup, (unsigned char *)key, key_len);
+	CacheEntry *entry = raxFind(shard->lookup, (unsigned char *)key, key_len);
 	if(entry != raxNotFound) {
 		return false;
 	}
 
 	// key is not in cache! test to see if cache is full?
 	if(cache->size == cache->cap) {
-		/* the cache is full, evict the least-recently-used element
+		/* the cache is full, evict the lowest priority element
 		 * and reuse its space for the new element */
-		entry = _CacheEvictLRU(cache);
+		entry = _CacheEvict(cache);
 	} else {
 		// the array has space left in it, use the next available entry
 		entry = cache->arr + cache->size++;
 	}
 
-	// populate the entry
+	// populate the entry, every entry costs at least 1
 	char *k = rm_strdup(key);
-	cache->counter++;
-	CacheArray_PopulateEntry(cache->counter, entry, k, value);
-
+	cost = (cost > 0) ? cost : 1;
+	long long counter = __atomic_add_fetch(&cache->counter, 1, __ATOMIC_RELAXED);
+	CacheArray_PopulateEntry(counter, entry, k, value, cost, cache->clock);
 
 	// Add the new entry to the rax.
-	raxInsert(cache->lookup, (unsigned char *)key, key_len, entry, NULL);
+	raxInsert(shard->lookup, (unsigned char *)key, key_len, entry, NULL);
 
 	return true;
 }
@@ -61,16 +113,26 @@ Cache *Cache_New(uint cap, CacheEntryFreeFunc freeFunc, CacheEntryCopyFunc copyF
 	Cache *cache     = rm_malloc(sizeof(Cache));
 	cache->cap       = cap;
 	cache->size      = 0;
-	cache->lookup    = raxNew();       // Instantiate key entry mapping.
+	cache->clock     = 0;
 	cache->counter   = 0;             // Initialize counter to zero.
+	memset(&cache->stats, 0, sizeof(CacheStats));
 	cache->copy_item = copyFunc;
 	cache->free_item = freeFunc;
 	cache->arr = rm_calloc(cap, sizeof(CacheEntry)); // Array of cached values.
 
-	// Initialize the read-write lock to protect access to the cache.
-	int res = pthread_rwlock_init(&cache->_cache_rwlock, NULL);
-	UNUSED(res);
-	ASSERT(res == 0);
+	for(uint i = 0; i < CACHE_SHARD_COUNT; i++) {
+		CacheShard *shard = cache->shards + i;
+		shard->lookup = raxNew();       // Instantiate key entry mapping.
+
+		// Initialize the read-write lock to protect access to the shard.
+		int res = pthread_rwlock_init(&shard->_shard_rwlock, NULL);
+		UNUSED(res);
+		ASSERT(res == 0);
+
+		// Initialize the mutex to protect access to entries pools.
+		res = pthread_mutex_init(&shard->_pool_lock, NULL);
+		ASSERT(res == 0);
+	}
 
 	return cache;
 }
@@ -80,88 +142,228 @@ void *Cache_GetValue(Cache *cache, const char *key) {
 
 	ASSERT(cache != NULL);
 
-	int res = pthread_rwlock_rdlock(&cache->_cache_rwlock);
+	size_t key_len = strlen(key);
+	CacheShard *shard = _Cache_GetShard(cache, key, key_len);
+
+	int res = pthread_rwlock_rdlock(&shard->_shard_rwlock);
 	UNUSED(res);
 	ASSERT(res == 0);
 
-	size_t key_len = strlen(key);
-	CacheEntry *entry = raxFind(cache->lookup, (unsigned char *)key, key_len);
+	CacheEntry *entry = raxFind(shard->lookup, (unsigned char *)key, key_len);
 
-	if(entry == raxNotFound) goto cleanup;
+	if(entry == raxNotFound) {
+		STAT_ADD(cache->stats.misses, 1);
+		goto cleanup;
+	}
 
-	/* element is now the most recently used; update its LRU
+	STAT_ADD(cache->stats.hits, 1);
+
+	/* element is now the most recently used; update its LRU and priority
 	 * note that multiple threads can be here simultaneously */
-	cache->counter++;
-	entry->LRU = cache->counter;
+	uint64_t hits  = __atomic_add_fetch(&entry->hits, 1, __ATOMIC_RELAXED);
+	uint64_t clock = __atomic_load_n(&cache->clock, __ATOMIC_RELAXED);
+	__atomic_store_n(&entry->priority, clock + hits * entry->cost,
+			__ATOMIC_RELAXED);
+	entry->LRU = __atomic_add_fetch(&cache->counter, 1, __ATOMIC_RELAXED);
+
+	// hand out a pooled copy if one is available
+	pthread_mutex_lock(&shard->_pool_lock);
+	if(array_len(entry->pool) > 0) item = array_pop(entry->pool);
+	pthread_mutex_unlock(&shard->_pool_lock);
 
 	// return a copy of element
-	item = cache->copy_item(entry->value);
+	if(item == NULL) item = _Cache_CopyValue(cache, entry->value);
 
 cleanup:
-	res = pthread_rwlock_unlock(&cache->_cache_rwlock);
+	res = pthread_rwlock_unlock(&shard->_shard_rwlock);
 	ASSERT(res == 0);
 	return item;
 }
 
-void Cache_SetValue(Cache *cache, const char *key, void *value) {
+bool Cache_Replenish(Cache *cache, const char *key, uint depth) {
 	ASSERT(key != NULL);
 	ASSERT(cache != NULL);
 
+	void *item = NULL;
+	bool added = false;
+	if(depth == 0) return added;
+
 	size_t key_len = strlen(key);
+	CacheShard *shard = _Cache_GetShard(cache, key, key_len);
 
-	// Acquire WRITE lock
-	int res = pthread_rwlock_wrlock(&cache->_cache_rwlock);
+	// acquire READ lock, entry can't be evicted while it is being copied
+	int res = pthread_rwlock_rdlock(&shard->_shard_rwlock);
 	UNUSED(res);
 	ASSERT(res == 0);
 
-	// Insert the value to the cache.
-	_Cache_SetValue(cache, key, value, key_len);
+	CacheEntry *entry = raxFind(shard->lookup, (unsigned char *)key, key_len);
+	if(entry == raxNotFound) goto cleanup;
+
+	pthread_mutex_lock(&shard->_pool_lock);
+	bool full = (array_len(entry->pool) >= depth);
+	pthread_mutex_unlock(&shard->_pool_lock);
+	if(full) goto cleanup;
+
+	item = _Cache_CopyValue(cache, entry->value);
 
-	res = pthread_rwlock_unlock(&cache->_cache_rwlock);
+	// pool might have been replenished by a different thread in the meantime
+	pthread_mutex_lock(&shard->_pool_lock);
+	if(array_len(entry->pool) < depth) {
+		array_append(entry->pool, item);
+		added = true;
+	}
+	pthread_mutex_unlock(&shard->_pool_lock);
+
+	if(!added) cache->free_item(item);
+
+cleanup:
+	res = pthread_rwlock_unlock(&shard->_shard_rwlock);
 	ASSERT(res == 0);
+	return added;
 }
 
-void *Cache_SetGetValue(Cache *cache, const char *key, void *value) {
+void Cache_SetValue(Cache *cache, const char *key, void *value, uint64_t cost) {
+	ASSERT(key != NULL);
+	ASSERT(cache != NULL);
+
+	size_t key_len = strlen(key);
+
+	// Acquire WRITE lock, eviction might affect any of the shards
+	_Cache_LockAll(cache);
+
+	// Insert the value to the cache.
+	_Cache_SetValue(cache, key, value, key_len, cost);
+
+	_Cache_UnlockAll(cache);
+}
+
+void *Cache_SetGetValue(Cache *cache, const char *key, void *value,
+		uint64_t cost) {
 	ASSERT(key != NULL);
 	ASSERT(cache != NULL);
 
 	size_t key_len = strlen(key);
 	void *value_to_return = value;
 
-	// acquire WRITE lock
-	int res = pthread_rwlock_wrlock(&cache->_cache_rwlock);
-	UNUSED(res);
-	ASSERT(res == 0);
+	// acquire WRITE lock, eviction might affect any of the shards
+	_Cache_LockAll(cache);
 
 	// return true if value was added, false if value already in cache
-	if(_Cache_SetValue(cache, key, value, key_len)) {
+	if(_Cache_SetValue(cache, key, value, key_len, cost)) {
 		// return a copy of original value
-		value_to_return = cache->copy_item(value);
+		value_to_return = _Cache_CopyValue(cache, value);
 	}
 
-	res = pthread_rwlock_unlock(&cache->_cache_rwlock);
-	ASSERT(res == 0);
+	_Cache_UnlockAll(cache);
 
 	return value_to_return;
 }
 
+void Cache_TrackBuildTime(Cache *cache, uint64_t parse_time,
+		uint64_t plan_time) {
+	ASSERT(cache != NULL);
+
+	STAT_ADD(cache->stats.parse_time, parse_time);
+	STAT_ADD(cache->stats.plan_time, plan_time);
+}
+
+void Cache_GetStats(Cache *cache, CacheStats *stats, uint *size) {
+	ASSERT(cache != NULL);
+	ASSERT(stats != NULL);
+	ASSERT(size  != NULL);
+
+	stats->hits       = __atomic_load_n(&cache->stats.hits,       __ATOMIC_RELAXED);
+	stats->misses     = __atomic_load_n(&cache->stats.misses,     __ATOMIC_RELAXED);
+	stats->evictions  = __atomic_load_n(&cache->stats.evictions,  __ATOMIC_RELAXED);
+	stats->copy_time  = __atomic_load_n(&cache->stats.copy_time,  __ATOMIC_RELAXED);
+	stats->parse_time = __atomic_load_n(&cache->stats.parse_time, __ATOMIC_RELAXED);
+	stats->plan_time  = __atomic_load_n(&cache->stats.plan_time,  __ATOMIC_RELAXED);
+	*size = __atomic_load_n(&cache->size, __ATOMIC_RELAXED);
+}
+
+void Cache_ResetStats(Cache *cache) {
+	ASSERT(cache != NULL);
+
+	__atomic_store_n(&cache->stats.hits,       0, __ATOMIC_RELAXED);
+	__atomic_store_n(&cache->stats.misses,     0, __ATOMIC_RELAXED);
+	__atomic_store_n(&cache->stats.evictions,  0, __ATOMIC_RELAXED);
+	__atomic_store_n(&cache->stats.copy_time,  0, __ATOMIC_RELAXED);
+	__atomic_store_n(&cache->stats.parse_time, 0, __ATOMIC_RELAXED);
+	__atomic_store_n(&cache->stats.plan_time,  0, __ATOMIC_RELAXED);
+}
+
+void Cache_Clear(Cache *cache) {
+	ASSERT(cache != NULL);
+
+	// acquire WRITE lock, entries are removed from all shards
+	_Cache_LockAll(cache);
+
+	for(uint i = 0; i < cache->size; i++) {
+		CacheEntry *entry = cache->arr + i;
+		size_t key_len = strlen(entry->key);
+		CacheShard *shard = _Cache_GetShard(cache, entry->key, key_len);
+		raxRemove(shard->lookup, (unsigned char *)entry->key, key_len, NULL);
+		CacheArray_CleanEntry(entry, cache->free_item);
+	}
+
+	cache->size  = 0;
+	cache->clock = 0;
+
+	_Cache_UnlockAll(cache);
+}
+
+// order cache entries by descending hit count
+static int _Cache_CompareHits(const void *a, const void *b) {
+	uint64_t hits_a = (*(const CacheEntry **)a)->hits;
+	uint64_t hits_b = (*(const CacheEntry **)b)->hits;
+	return (hits_a < hits_b) - (hits_a > hits_b);
+}
+
+void Cache_VisitMostFrequent(Cache *cache, uint n, bool lock,
+		CacheEntryVisitFunc visit, void *pdata) {
+	ASSERT(cache != NULL);
+	ASSERT(visit != NULL);
+
+	// acquire WRITE lock, entries can't be evicted while visited
+	if(lock) _Cache_LockAll(cache);
+
+	uint size = cache->size;
+	CacheEntry **entries = rm_malloc(sizeof(CacheEntry *) * size);
+	for(uint i = 0; i < size; i++) entries[i] = cache->arr + i;
+	qsort(entries, size, sizeof(CacheEntry *), _Cache_CompareHits);
+
+	n = (n < size) ? n : size;
+	for(uint i = 0; i < n; i++) {
+		visit(entries[i]->key, entries[i]->value, pdata);
+	}
+
+	if(lock) _Cache_UnlockAll(cache);
+
+	rm_free(entries);
+}
+
 void Cache_Free(Cache *cache) {
 	ASSERT(cache != NULL);
 
 	// free cache entries
 	for(size_t i = 0; i < cache->size; i++) {
 		CacheEntry *entry = cache->arr + i;
-		rm_free(entry->key);
-		cache->free_item(entry->value);
+		CacheArray_CleanEntry(entry, cache->free_item);
 	}
 
 	rm_free(cache->arr);
-	raxFree(cache->lookup);
 
-	int res = pthread_rwlock_destroy(&cache->_cache_rwlock);
-	UNUSED(res);
-	ASSERT(res == 0);
+	for(uint i = 0; i < CACHE_SHARD_COUNT; i++) {
+		CacheShard *shard = cache->shards + i;
+		raxFree(shard->lookup);
+
+		int res = pthread_rwlock_destroy(&shard->_shard_rwlock);
+		UNUSED(res);
+		ASSERT(res == 0);
+
+		res = pthread_mutex_destroy(&shard->_pool_lock);
+		ASSERT(res == 0);
+	}
 
 	rm_free(cache);
 }
-
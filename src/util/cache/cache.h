@@ -8,20 +8,50 @@
 
 #include "cache_array.h"
 #include "rax.h"
+#include <pthread.h>
+
+// number of shards a cache is split into
+#define CACHE_SHARD_COUNT 16
+
+/**
+ * @brief Cache shard, a subset of the cache keys guarded by its own lock.
+ */
+typedef struct {
+	rax *lookup;                       // Mapping between keys to entries, for fast lookups.
+	pthread_rwlock_t _shard_rwlock;    // Read-write lock to protect access to the shard.
+	pthread_mutex_t _pool_lock;        // Mutex to protect access to the shard's entries pools.
+} CacheShard;
 
 /**
- * @brief Key-value cache, uses LRU policy for eviction.
+ * @brief Cache usage statistics, times are reported in microseconds.
+ */
+typedef struct {
+	uint64_t hits;        // Number of lookups served from the cache.
+	uint64_t misses;      // Number of lookups for keys missing from the cache.
+	uint64_t evictions;   // Number of evicted entries.
+	uint64_t copy_time;   // Time spent copying cached values on lookups.
+	uint64_t parse_time;  // Time spent parsing queries missing from the cache.
+	uint64_t plan_time;   // Time spent building values missing from the cache.
+} CacheStats;
+
+/**
+ * @brief Key-value cache, uses a cost aware LFU policy (GDSF) for eviction.
+ * Each entry is prioritized by clock + hits * cost, where clock is the
+ * priority of the last evicted entry, such that expensive and frequently used
+ * entries are retained while stale entries age out.
+ * Keys are spread across shards, lookups only lock the key's shard.
  * Assumes owership over stored objects.
  */
 typedef struct Cache {
-	uint cap;                          // Cache capacity.
-	uint size;                         // Cache current size.
-	long long counter;                 // Atomic counter for number of reads.
-	rax *lookup;                       // Mapping between keys to entries, for fast lookups.
-	CacheEntry *arr;                   // Array of cache elements.
-	CacheEntryFreeFunc free_item;      // Callback function that free cached value.
-	CacheEntryCopyFunc copy_item;      // Callback function that copies cached value.
-	pthread_rwlock_t _cache_rwlock;    // Read-write lock to protect access to the cache.
+	uint cap;                              // Cache capacity.
+	uint size;                             // Cache current size.
+	long long counter;                     // Atomic counter for number of reads.
+	uint64_t clock;                        // Priority of the last evicted entry.
+	CacheEntry *arr;                       // Array of cache elements.
+	CacheEntryFreeFunc free_item;          // Callback function that free cached value.
+	CacheEntryCopyFunc copy_item;          // Callback function that copies cached value.
+	CacheStats stats;                      // Usage statistics, updated atomically.
+	CacheShard shards[CACHE_SHARD_COUNT];  // Cache shards.
 } Cache;
 
 /**
@@ -35,20 +65,34 @@ Cache *Cache_New(uint size, CacheEntryFreeFunc freeFunc, CacheEntryCopyFunc copy
 
 /**
  * @brief  Returns a copy of value if it is cached, NULL otherwise.
+ * @note   Pooled copies are handed out first, a new copy is made otherwise.
  * @param  *cache: cache pointer.
  * @param  *key: Key to look for.
  * @retval  pointer with the cached answer, NULL if the key isn't cached.
  */
 void *Cache_GetValue(Cache *cache, const char *key);
 
+/**
+ * @brief  Adds a copy of the value stored under key to the entry's pool,
+ *         such that later lookups are served without copying.
+ * @note   The copy is made outside of the pool lock, callers are expected to
+ *         invoke this function off the latency sensitive path.
+ * @param  *cache: cache pointer.
+ * @param  *key: Key to replenish.
+ * @param  depth: Maximum number of pooled copies for the entry.
+ * @retval True if a copy was added to the entry's pool.
+ */
+bool Cache_Replenish(Cache *cache, const char *key, uint depth);
+
 /**
  * @brief  Stores value under key within the cache.
  * @note   In case the cache is full, this operation causes a cache eviction.
  * @param  *cache: cache pointer.
  * @param  *key: Key for associating with value.
  * @param  *value: pointer with the relevant value.
+ * @param  cost: Cost of producing value, costly entries are retained longer.
  */
-void Cache_SetValue(Cache *cache, const char *key, void *item);
+void Cache_SetValue(Cache *cache, const char *key, void *item, uint64_t cost);
 
 /**
  * @brief  Stores value under key within the cache, and return a copy of that value.
@@ -56,9 +100,51 @@ void Cache_SetValue(Cache *cache, const char *key, void *item);
  * @param  *cache: cache pointer.
  * @param  *key: Key for associating with value.
  * @param  *value: pointer with the relevant value.
+ * @param  cost: Cost of producing value, costly entries are retained longer.
  * @retval A copy of the given value if a new item was added to the cache, the original value if it was already exist.
  */
-void *Cache_SetGetValue(Cache *cache, const char *key, void *value);
+void *Cache_SetGetValue(Cache *cache, const char *key, void *value, uint64_t cost);
+
+/**
+ * @brief  Accumulates the time spent producing a value missing from the cache.
+ * @param  *cache: cache pointer.
+ * @param  parse_time: Time spent parsing, in microseconds.
+ * @param  plan_time: Time spent building the value, in microseconds.
+ */
+void Cache_TrackBuildTime(Cache *cache, uint64_t parse_time, uint64_t plan_time);
+
+/**
+ * @brief  Retrieves cache usage statistics.
+ * @param  *cache: cache pointer.
+ * @param  *stats: [output] cache statistics.
+ * @param  *size: [output] number of cached entries.
+ */
+void Cache_GetStats(Cache *cache, CacheStats *stats, uint *size);
+
+/**
+ * @brief  Resets cache usage statistics, cached entries are retained.
+ * @param  *cache: cache pointer.
+ */
+void Cache_ResetStats(Cache *cache);
+
+/**
+ * @brief  Evicts all cached entries, usage statistics are retained.
+ * @param  *cache: cache pointer.
+ */
+void Cache_Clear(Cache *cache);
+
+/**
+ * @brief  Invokes visit on the n most frequently accessed entries,
+ *         in descending order of their hit count.
+ * @note   Values are only valid within the visit callback.
+ * @param  *cache: cache pointer.
+ * @param  n: Maximum number of entries to visit.
+ * @param  lock: Acquire the cache locks, should be false within a forked process.
+ * @param  visit: Callback invoked for each visited entry.
+ * @param  *pdata: Private data passed to visit.
+ */
+void Cache_VisitMostFrequent(Cache *cache, uint n, bool lock,
+		CacheEntryVisitFunc visit, void *pdata);
 
 /**
  * @brief  Destroys the cache and free all stored items.
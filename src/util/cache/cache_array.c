@@ -5,30 +5,37 @@
  */
 
 #include "cache_array.h"
+#include "../arr.h"
 #include "../rmalloc.h"
 #include "../../RG.h"
 
-CacheEntry *CacheArray_FindMinLRU(CacheEntry *cache_arr, uint cap) {
+CacheEntry *CacheArray_FindMinPriority(CacheEntry *cache_arr, uint cap) {
 	ASSERT(cache_arr != NULL);
 
-	CacheEntry *min_LRU_entry = cache_arr;
+	CacheEntry *min_entry = cache_arr;
 
 	for(size_t i = 1; i < cap; i++) {
 		CacheEntry *current_entry = cache_arr + i;
-		if(current_entry->LRU < min_LRU_entry->LRU) {
-			min_LRU_entry = current_entry;
+		if(current_entry->priority < min_entry->priority ||
+		   (current_entry->priority == min_entry->priority &&
+			current_entry->LRU < min_entry->LRU)) {
+			min_entry = current_entry;
 		}
 	}
 
-	return min_LRU_entry;
+	return min_entry;
 }
 
 CacheEntry *CacheArray_PopulateEntry(long long counter, CacheEntry *entry, char *key,
-  									void *value) {
+  									void *value, uint64_t cost, uint64_t clock) {
 
-	entry->key   = key;
-	entry->value = value;
-	entry->LRU   = counter;
+	entry->key      = key;
+	entry->value    = value;
+	entry->pool     = array_new(void *, 0);
+	entry->cost     = cost;
+	entry->hits     = 1;
+	entry->priority = clock + cost;
+	entry->LRU      = counter;
 
 	return entry;
 }
@@ -47,6 +54,14 @@ void CacheArray_CleanEntry(CacheEntry *entry, CacheEntryFreeFunc free_entry) {
 		entry->value = NULL;
 	}
 
-	entry->LRU = 0;
+	if(entry->pool != NULL) {
+		array_free_cb(entry->pool, free_entry);
+		entry->pool = NULL;
+	}
+
+	entry->LRU      = 0;
+	entry->cost     = 0;
+	entry->hits     = 0;
+	entry->priority = 0;
 }
 
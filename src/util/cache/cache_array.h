@@ -21,22 +21,31 @@ typedef void (*CacheEntryFreeFunc)(void *);
 // cache entry duplicate function
 typedef void *(*CacheEntryCopyFunc)(void *);
 
+// cache entry visit function
+typedef void (*CacheEntryVisitFunc)(const char *key, void *value, void *pdata);
+
 /**
  * @brief  A struct for an entry in cache array with a key and value.
  */
 typedef struct CacheEntry_t {
-	char *key;      // Entry key.
-	void *value;    // Entry stored value.
-	long long LRU;  // Indicates the time when the entry was last recently used.
+	char *key;          // Entry key.
+	void *value;        // Entry stored value.
+	void **pool;        // Pre-made copies of value, ready to be handed out.
+	uint64_t cost;      // Cost of producing the stored value.
+	uint64_t hits;      // Number of times the entry was accessed.
+	uint64_t priority;  // Eviction priority, lowest priority is evicted first.
+	long long LRU;      // Indicates the time when the entry was last recently used.
 } CacheEntry;
 
 
-// Returns a pointer to the entry in the cache array with the minimum LRU.
-CacheEntry *CacheArray_FindMinLRU(CacheEntry *cache_arr, uint cap);
+// Returns a pointer to the entry in the cache array with the lowest priority,
+// ties are broken in favor of the least recently used entry.
+CacheEntry *CacheArray_FindMinPriority(CacheEntry *cache_arr, uint cap);
 
 // Assign new values to the fields of a cache entry.
+// 'clock' is the cache inflation value, on top of which priority is computed.
 CacheEntry *CacheArray_PopulateEntry(long long counter, CacheEntry *entry, char *key,
-  			void *value);
+  			void *value, uint64_t cost, uint64_t clock);
 
 // Free the fields of a cache entry to prepare it for reuse.
 void CacheArray_CleanEntry(CacheEntry *entry, CacheEntryFreeFunc free_entry);
@@ -31,6 +31,10 @@ void rm_reset_n_alloced() {
 	n_alloced = 0;
 }
 
+int64_t rm_get_n_alloced() {
+	return n_alloced;
+}
+
 // removes n_bytes from thread memory consumption
 static inline void _nmalloc_decrement(int64_t n_bytes) {
 	n_alloced -= n_bytes;
@@ -120,6 +124,10 @@ void rm_set_mem_capacity(int64_t cap) {
 void rm_reset_n_alloced() {
 }
 
+int64_t rm_get_n_alloced() {
+	return 0;
+}
+
 void rm_set_mem_capacity(int64_t cap) {
 }
 
@@ -18,6 +18,10 @@ void rm_set_mem_capacity(int64_t cap);
 // reset thread memory consumption counter to 0 (no memory consumed)
 void rm_reset_n_alloced();
 
+// returns thread memory consumption counter
+// counter is only maintained while a memory capacity is set
+int64_t rm_get_n_alloced();
+
 static inline void *rm_malloc(size_t n) {
 	return RedisModule_Alloc(n);
 }
@@ -318,3 +318,47 @@ class testAllShortestPaths():
 
         actual_result = self.cyclic_graph.query(query)
         self.env.assertEqual(actual_result.result_set, expected_result)
+
+    def test07_all_shortest_grid(self):
+        # a 4x4 grid, each node connected to its right and lower neighbours
+        # every monotone path from the top-left corner to the bottom-right
+        # corner is a shortest path, there are C(6, 3) = 20 of them
+        grid = Graph(self.env.getConnection(), "all_shortest_paths_grid")
+        grid.query("""UNWIND range(0, 3) AS r UNWIND range(0, 3) AS c
+                      CREATE (:G {r: r, c: c})""")
+        grid.query("""MATCH (a:G), (b:G)
+                      WHERE (b.r = a.r AND b.c = a.c + 1) OR
+                            (b.c = a.c AND b.r = a.r + 1)
+                      CREATE (a)-[:N]->(b)""")
+
+        query = """MATCH (a:G {r: 0, c: 0}), (b:G {r: 3, c: 3})
+                   WITH a, b
+                   MATCH p = allShortestPaths((a)-[*]->(b))
+                   RETURN count(p), min(length(p)), max(length(p)),
+                          count(DISTINCT nodes(p))"""
+        actual_result = grid.query(query)
+        self.env.assertEqual(actual_result.result_set, [[20, 6, 6, 20]])
+
+        # undirected traversal yields the same paths
+        query = """MATCH (a:G {r: 0, c: 0}), (b:G {r: 3, c: 3})
+                   WITH a, b
+                   MATCH p = allShortestPaths((a)-[*]-(b))
+                   RETURN count(p), min(length(p)), max(length(p))"""
+        actual_result = grid.query(query)
+        self.env.assertEqual(actual_result.result_set, [[20, 6, 6]])
+
+        # right-to-left traversal from the opposite corner
+        query = """MATCH (a:G {r: 0, c: 0}), (b:G {r: 3, c: 3})
+                   WITH a, b
+                   MATCH p = allShortestPaths((b)<-[*]-(a))
+                   RETURN count(p)"""
+        actual_result = grid.query(query)
+        self.env.assertEqual(actual_result.result_set, [[20]])
+
+        # paths longer than the maximal length are discarded
+        query = """MATCH (a:G {r: 0, c: 0}), (b:G {r: 3, c: 3})
+                   WITH a, b
+                   MATCH p = allShortestPaths((a)-[*..5]->(b))
+                   RETURN count(p)"""
+        actual_result = grid.query(query)
+        self.env.assertEqual(actual_result.result_set, [[0]])
@@ -0,0 +1,82 @@
+from common import *
+
+GRAPH_ID = "auto_parameterize"
+redis_con = None
+redis_graph = None
+
+
+class testAutoParameterize(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True, moduleArgs='AUTO_PARAMETERIZE yes')
+        global redis_con
+        global redis_graph
+
+        redis_con = self.env.getConnection()
+        redis_graph = Graph(redis_con, GRAPH_ID)
+        self.populate_graph()
+
+    def populate_graph(self):
+        redis_graph.query("UNWIND range(1, 10) AS x CREATE (:N {v: x, s: toString(x)})")
+
+    def test01_shared_plan(self):
+        # queries differing only by their literals share a cached plan
+        res = redis_graph.query("MATCH (n:N {v: 1}) RETURN n.v")
+        self.env.assertFalse(res.cached_execution)
+        self.env.assertEquals(res.result_set, [[1]])
+
+        res = redis_graph.query("MATCH (n:N {v: 2}) RETURN n.v")
+        self.env.assertTrue(res.cached_execution)
+        self.env.assertEquals(res.result_set, [[2]])
+
+        # whitespaces and comments are ignored
+        res = redis_graph.query("MATCH  (n:N {v: 3}) // comment\n RETURN n.v")
+        self.env.assertTrue(res.cached_execution)
+        self.env.assertEquals(res.result_set, [[3]])
+
+        # string literals are lifted as well
+        res = redis_graph.query("MATCH (n:N) WHERE n.s = '4' RETURN n.v")
+        self.env.assertFalse(res.cached_execution)
+        res = redis_graph.query("MATCH (n:N) WHERE n.s = '5' RETURN n.v")
+        self.env.assertTrue(res.cached_execution)
+        self.env.assertEquals(res.result_set, [[5]])
+
+    def test02_user_parameters(self):
+        # lifted literals are combined with user provided parameters
+        q = "MATCH (n:N) WHERE n.v > $min AND n.v < 4 RETURN n.v ORDER BY n.v"
+        res = redis_graph.query(q, {'min': 1})
+        self.env.assertEquals(res.result_set, [[2], [3]])
+
+        q = "MATCH (n:N) WHERE n.v > $min AND n.v < 5 RETURN n.v ORDER BY n.v"
+        res = redis_graph.query(q, {'min': 2})
+        self.env.assertTrue(res.cached_execution)
+        self.env.assertEquals(res.result_set, [[3], [4]])
+
+    def test03_projections_preserved(self):
+        # literals within projections are kept, as columns are named after them
+        res = redis_graph.query("RETURN 1 + 2, 'a'")
+        self.env.assertEquals(res.header[0][1], "1 + 2")
+        self.env.assertEquals(res.header[1][1], "'a'")
+        self.env.assertEquals(res.result_set, [[3, 'a']])
+
+        res = redis_graph.query("RETURN 1 + 3, 'b'")
+        self.env.assertFalse(res.cached_execution)
+        self.env.assertEquals(res.header[0][1], "1 + 3")
+        self.env.assertEquals(res.result_set, [[4, 'b']])
+
+    def test04_skip_limit(self):
+        q = "MATCH (n:N) RETURN n.v ORDER BY n.v SKIP 1 LIMIT 2"
+        res = redis_graph.query(q)
+        self.env.assertEquals(res.result_set, [[2], [3]])
+
+        q = "MATCH (n:N) RETURN n.v ORDER BY n.v SKIP 2 LIMIT 3"
+        res = redis_graph.query(q)
+        self.env.assertTrue(res.cached_execution)
+        self.env.assertEquals(res.result_set, [[3], [4], [5]])
+
+    def test05_disable(self):
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "AUTO_PARAMETERIZE", "no")
+        res = redis_graph.query("MATCH (n:N {v: 6}) RETURN n.v")
+        self.env.assertFalse(res.cached_execution)
+        res = redis_graph.query("MATCH (n:N {v: 7}) RETURN n.v")
+        self.env.assertFalse(res.cached_execution)
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "AUTO_PARAMETERIZE", "yes")
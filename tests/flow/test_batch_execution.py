@@ -0,0 +1,57 @@
+from common import *
+
+GRAPH_ID = "batch_execution"
+redis_con = None
+redis_graph = None
+
+# number of nodes, spans multiple record batches
+NODE_COUNT = 1000
+
+
+class testBatchExecution(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True)
+        global redis_con
+        global redis_graph
+
+        redis_con = self.env.getConnection()
+        redis_graph = Graph(redis_con, GRAPH_ID)
+        self.populate_graph()
+
+    def populate_graph(self):
+        q = "UNWIND range(0, %d) AS x CREATE (:N {v: x})" % (NODE_COUNT - 1)
+        redis_graph.query(q)
+
+    def test01_filter_project(self):
+        # filter and projection applied across batch boundaries
+        q = "MATCH (n:N) WHERE n.v % 3 = 0 RETURN n.v * 2 ORDER BY n.v"
+        res = redis_graph.query(q)
+        expected = [[x * 2] for x in range(0, NODE_COUNT, 3)]
+        self.env.assertEquals(res.result_set, expected)
+
+        # filter discarding entire batches
+        q = "MATCH (n) WHERE n.v >= %d RETURN n.v" % (NODE_COUNT - 1)
+        res = redis_graph.query(q)
+        self.env.assertEquals(res.result_set, [[NODE_COUNT - 1]])
+
+    def test02_aggregate(self):
+        q = "MATCH (n:N) WHERE n.v < 500 RETURN count(n), sum(n.v)"
+        res = redis_graph.query(q)
+        self.env.assertEquals(res.result_set, [[500, sum(range(500))]])
+
+    def test03_result_set_size_limit(self):
+        # result-set size limit is enforced mid batch
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "RESULTSET_SIZE", 130)
+        res = redis_graph.query("MATCH (n:N) RETURN n.v")
+        self.env.assertEquals(len(res.result_set), 130)
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "RESULTSET_SIZE", -1)
+
+    def test04_profile(self):
+        # profiled operations report accurate record counts
+        q = "MATCH (n:N) WHERE n.v < 200 RETURN n.v"
+        profile = redis_con.execute_command("GRAPH.PROFILE", GRAPH_ID, q)
+        profile = [x[0:x.index(',')].strip() for x in profile]
+        self.env.assertIn("Results | Records produced: 200", profile)
+        self.env.assertIn("Project | Records produced: 200", profile)
+        self.env.assertIn("Filter | Records produced: 200", profile)
+        self.env.assertIn("Node By Label Scan | (n:N) | Records produced: 1000", profile)
@@ -1,3 +1,4 @@
+import time
 from common import *
 
 redis_con = None
@@ -243,3 +244,100 @@ class testCache(FlowTestsBase):
         cached_result = graph.query(query, params)
         self.env.assertEqual(expected_result, cached_result.result_set)
         self.env.assertTrue(cached_result.cached_execution)
+
+    def test13_plan_pool(self):
+        # pre-cloned execution plans must respect the parameters of the
+        # query they end up serving, rather than those of the query
+        # which was executing at the time they were cloned
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "PLAN_POOL_SIZE", 2)
+        graph = Graph(redis_con, 'Cache_Plan_Pool')
+        query = "UNWIND range(1, 10) AS x WITH x WHERE x > $min RETURN x ORDER BY x SKIP $s LIMIT $l"
+
+        for i in range(6):
+            params = {'min': i, 's': i % 2, 'l': i + 1}
+            expected = [[x] for x in range(i + 1, 11)][i % 2:][:i + 1]
+            result = graph.query(query, params)
+            self.env.assertEqual(expected, result.result_set)
+            self.env.assertEqual(i > 0, result.cached_execution)
+
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "PLAN_POOL_SIZE", 0)
+        graph.delete()
+
+    def test14_cache_stats(self):
+        graph = Graph(redis_con, 'Cache_Stats')
+        graph.query("RETURN 1")
+
+        res = redis_con.execute_command("GRAPH.CACHE", "RESET", 'Cache_Stats')
+        self.env.assertEqual(res, "OK")
+
+        def stats():
+            res = redis_con.execute_command("GRAPH.CACHE", "STATS", 'Cache_Stats')
+            return {name: value for name, value in res}
+
+        s = stats()
+        self.env.assertEqual(s['hits'], 0)
+        self.env.assertEqual(s['misses'], 0)
+        self.env.assertEqual(s['evictions'], 0)
+        self.env.assertEqual(s['size'], 1)
+        self.env.assertEqual(s['capacity'], CACHE_SIZE)
+
+        # miss followed by a hit
+        graph.query("MATCH (n) RETURN n")
+        graph.query("MATCH (n) RETURN n")
+        s = stats()
+        self.env.assertEqual(s['hits'], 1)
+        self.env.assertEqual(s['misses'], 1)
+        self.env.assertEqual(s['size'], 2)
+        self.env.assertGreater(float(s['plan_time']), 0)
+
+        # overflow the cache
+        for i in range(CACHE_SIZE):
+            graph.query("RETURN {i}".format(i=i + 2))
+        s = stats()
+        self.env.assertEqual(s['size'], CACHE_SIZE)
+        self.env.assertEqual(s['evictions'], 2)
+
+        # unknown subcommand
+        try:
+            redis_con.execute_command("GRAPH.CACHE", "FOO", 'Cache_Stats')
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Unknown subcommand", str(e))
+
+        graph.delete()
+
+    def test15_cache_warmup(self):
+        graph = Graph(redis_con, 'Cache_Warmup')
+        graph.query("CREATE (:N {v: 1})")
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "CACHE_WARMUP_SIZE", 2)
+
+        # q1 is the most frequently used query, followed by q2
+        q1 = "MATCH (n:N) RETURN n.v"
+        q2 = "MATCH (n:N) WHERE n.v > $v RETURN count(n)"
+        q3 = "MATCH (n) RETURN count(n)"
+        for i in range(3):
+            graph.query(q1)
+        for i in range(2):
+            graph.query(q2, {'v': 0})
+        graph.query(q3)
+
+        # cached queries are persisted and planned once loaded
+        self.env.dumpAndReload()
+
+        def cache_size():
+            res = redis_con.execute_command("GRAPH.CACHE", "STATS", 'Cache_Warmup')
+            return {name: value for name, value in res}['size']
+
+        # warmup is done in the background
+        for i in range(50):
+            if cache_size() == 2:
+                break
+            time.sleep(0.1)
+        self.env.assertEqual(cache_size(), 2)
+
+        self.env.assertTrue(graph.query(q1).cached_execution)
+        self.env.assertTrue(graph.query(q2, {'v': 1}).cached_execution)
+        self.env.assertFalse(graph.query(q3).cached_execution)
+
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "CACHE_WARMUP_SIZE", 0)
+        graph.delete()
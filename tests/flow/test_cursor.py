@@ -0,0 +1,133 @@
+from common import *
+
+GRAPH_ID = "cursor_test"
+redis_con = None
+redis_graph = None
+
+
+class testCursor(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True)
+        global redis_con
+        global redis_graph
+
+        redis_con = self.env.getConnection()
+        redis_graph = Graph(redis_con, GRAPH_ID)
+        self.populate_graph()
+
+    def populate_graph(self):
+        redis_graph.query("UNWIND range(1, 10) AS x CREATE (:N {v: x})")
+
+    def read(self, cursor_id, count=None):
+        if count is None:
+            return redis_con.execute_command("GRAPH.CURSOR", "READ", GRAPH_ID, cursor_id)
+        return redis_con.execute_command("GRAPH.CURSOR", "READ", GRAPH_ID, cursor_id, "COUNT", count)
+
+    def test01_read_in_batches(self):
+        q = "MATCH (n:N) RETURN n.v ORDER BY n.v"
+        res = redis_con.execute_command("GRAPH.RO_QUERY", GRAPH_ID, q, "CURSOR", "COUNT", 4)
+
+        # reply: header, rows, statistics, cursor ID
+        self.env.assertEquals(len(res), 4)
+        self.env.assertEquals(res[0], ["n.v"])
+        self.env.assertEquals(res[1], [[1], [2], [3], [4]])
+        cursor_id = res[3]
+        self.env.assertGreater(cursor_id, 0)
+
+        # read using the cursor's default count
+        res = self.read(cursor_id)
+        self.env.assertEquals(res[1], [[5], [6], [7], [8]])
+        self.env.assertEquals(res[3], cursor_id)
+
+        # read remaining records, cursor should be depleted
+        res = self.read(cursor_id, 10)
+        self.env.assertEquals(res[1], [[9], [10]])
+        self.env.assertEquals(res[3], 0)
+
+        # depleted cursor is discarded
+        try:
+            self.read(cursor_id)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Cursor not found", str(e))
+
+    def test02_small_result_set(self):
+        # result-set fits within a single batch, no cursor is created
+        q = "MATCH (n:N) RETURN count(n)"
+        res = redis_con.execute_command("GRAPH.QUERY", GRAPH_ID, q, "CURSOR")
+        self.env.assertEquals(res[1], [[10]])
+        self.env.assertEquals(res[3], 0)
+
+    def test03_delete_cursor(self):
+        q = "MATCH (n:N) RETURN n.v"
+        res = redis_con.execute_command("GRAPH.RO_QUERY", GRAPH_ID, q, "CURSOR", "COUNT", 1)
+        cursor_id = res[3]
+        self.env.assertGreater(cursor_id, 0)
+
+        res = redis_con.execute_command("GRAPH.CURSOR", "DEL", GRAPH_ID, cursor_id)
+        self.env.assertEquals(res, "OK")
+
+        # cursor no longer exists
+        try:
+            redis_con.execute_command("GRAPH.CURSOR", "DEL", GRAPH_ID, cursor_id)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Cursor not found", str(e))
+
+    def test04_invalidated_cursor(self):
+        q = "MATCH (n:N) RETURN n.v"
+        res = redis_con.execute_command("GRAPH.RO_QUERY", GRAPH_ID, q, "CURSOR", "COUNT", 1)
+        cursor_id = res[3]
+        self.env.assertGreater(cursor_id, 0)
+
+        # modify graph, invalidating the cursor
+        redis_graph.query("CREATE (:N {v: 11})")
+
+        try:
+            self.read(cursor_id)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Cursor invalidated", str(e))
+
+        # invalidated cursor is discarded
+        try:
+            self.read(cursor_id)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Cursor not found", str(e))
+
+    def test05_invalid_usage(self):
+        # cursors are restricted to read-only queries
+        try:
+            redis_con.execute_command("GRAPH.QUERY", GRAPH_ID, "CREATE ()", "CURSOR")
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("CURSOR is only supported for read-only queries", str(e))
+
+        # COUNT without CURSOR
+        try:
+            redis_con.execute_command("GRAPH.QUERY", GRAPH_ID, "RETURN 1", "COUNT", 2)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("COUNT is only valid in combination with CURSOR", str(e))
+
+        # invalid count
+        try:
+            redis_con.execute_command("GRAPH.QUERY", GRAPH_ID, "RETURN 1", "CURSOR", "COUNT", 0)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Failed to parse cursor count value", str(e))
+
+        # unknown cursor
+        try:
+            self.read(123456)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Cursor not found", str(e))
+
+        # unknown subcommand
+        try:
+            redis_con.execute_command("GRAPH.CURSOR", "FOO", GRAPH_ID, 1)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("Unknown subcommand", str(e))
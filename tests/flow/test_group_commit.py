@@ -0,0 +1,88 @@
+from common import *
+from pathos.pools import ProcessPool as Pool
+from pathos.helpers import mp as pathos_multiprocess
+
+GRAPH_ID = "group_commit"
+CLIENT_COUNT = 16                   # Number of concurrent connections.
+
+
+def thread_run_query(query, barrier):
+    env = Env(decodeResponses=True)
+    conn = env.getConnection()
+    graph = Graph(conn, GRAPH_ID)
+
+    if barrier is not None:
+        barrier.wait()
+
+    try:
+        result = graph.query(query)
+        return { "nodes_created": result.nodes_created }
+    except ResponseError as e:
+        return str(e)
+
+def run_concurrent(queries, f):
+    pool = Pool(nodes=CLIENT_COUNT)
+    manager = pathos_multiprocess.Manager()
+
+    barrier = manager.Barrier(CLIENT_COUNT)
+    barriers = [barrier] * CLIENT_COUNT
+
+    # invoke queries
+    return pool.map(f, queries, barriers)
+
+class testGroupCommit(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True, moduleArgs='GROUP_COMMIT_SIZE 8')
+        # skip test if we're running under Valgrind
+        if self.env.envRunner.debugger is not None:
+            self.env.skip() # valgrind is not working correctly with multi processing
+
+        self.conn = self.env.getConnection()
+        self.graph = Graph(self.conn, GRAPH_ID)
+
+    def tearDown(self):
+        self.conn.flushall()
+
+    def test01_concurrent_writes(self):
+        queries = ["CREATE (:N {v: %d})" % i for i in range(CLIENT_COUNT)]
+        results = run_concurrent(queries, thread_run_query)
+
+        # every write reports its own statistics
+        for result in results:
+            self.env.assertEquals(result["nodes_created"], 1)
+
+        result = self.graph.query("MATCH (n:N) RETURN count(n), sum(n.v)")
+        expected = sum(range(CLIENT_COUNT))
+        self.env.assertEquals(result.result_set[0], [CLIENT_COUNT, expected])
+
+    def test02_failing_writes(self):
+        # half of the writes fail, only their modifications are rolled back
+        queries = []
+        for i in range(CLIENT_COUNT):
+            if i % 2 == 0:
+                queries.append("CREATE (:N {v: %d})" % i)
+            else:
+                queries.append("CREATE (:F {v: %d}) WITH 1 AS x RETURN 1 * 'a'" % i)
+
+        results = run_concurrent(queries, thread_run_query)
+        for i, result in enumerate(results):
+            if i % 2 == 0:
+                self.env.assertEquals(result["nodes_created"], 1)
+            else:
+                self.env.assertTrue(isinstance(result, str))
+
+        result = self.graph.query("MATCH (n:N) RETURN count(n)")
+        self.env.assertEquals(result.result_set[0][0], CLIENT_COUNT // 2)
+        result = self.graph.query("MATCH (n:F) RETURN count(n)")
+        self.env.assertEquals(result.result_set[0][0], 0)
+
+    def test03_disable(self):
+        self.conn.execute_command("GRAPH.CONFIG", "SET", "GROUP_COMMIT_SIZE", 1)
+        queries = ["CREATE (:N)"] * CLIENT_COUNT
+        results = run_concurrent(queries, thread_run_query)
+        for result in results:
+            self.env.assertEquals(result["nodes_created"], 1)
+
+        result = self.graph.query("MATCH (n:N) RETURN count(n)")
+        self.env.assertEquals(result.result_set[0][0], CLIENT_COUNT)
+        self.conn.execute_command("GRAPH.CONFIG", "SET", "GROUP_COMMIT_SIZE", 8)
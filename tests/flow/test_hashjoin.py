@@ -35,3 +35,31 @@ class testHashJoin(FlowTestsBase):
 
         self.env.assertEquals(actual_result.result_set, expected_result)
 
+
+    def test_multi_match_join(self):
+        graph = Graph(self.env.getConnection(), "multi_match")
+        graph.query("UNWIND range(0, 99) AS x CREATE (:A {v: x % 10})")
+        graph.query("UNWIND range(0, 9) AS x CREATE (:B {v: toFloat(x)})")
+
+        # each B node joins with 10 A nodes, integer and float values are equal
+        q = "MATCH (a:A), (b:B) WHERE a.v = b.v RETURN b.v, count(a) ORDER BY b.v"
+        plan = graph.execution_plan(q)
+        self.env.assertIn("Value Hash Join", plan)
+
+        expected_result = [[float(x), 10] for x in range(10)]
+        actual_result = graph.query(q)
+        self.env.assertEquals(actual_result.result_set, expected_result)
+
+    def test_build_side_selection(self):
+        graph = Graph(self.env.getConnection(), "build_side")
+        graph.query("UNWIND range(0, 99) AS x CREATE (:Large {v: x})")
+        graph.query("UNWIND range(0, 4) AS x CREATE (:Small {v: x})")
+
+        # hash table is built from the smaller stream regardless of pattern order
+        for q in ["MATCH (l:Large), (s:Small) WHERE l.v = s.v RETURN count(l)",
+                  "MATCH (s:Small), (l:Large) WHERE l.v = s.v RETURN count(l)"]:
+            plan = graph.execution_plan(q)
+            self.env.assertLess(plan.index("(s:Small)"), plan.index("(l:Large)"))
+
+            actual_result = graph.query(q)
+            self.env.assertEquals(actual_result.result_set, [[5]])
@@ -1,4 +1,5 @@
 from common import *
+import time
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../../demo/social')
 import social_utils
@@ -662,4 +663,228 @@ class testIndexScanFlow():
             redis_graph.query("MATCH (u:User) WHERE distance(point({latitude:40.5, longitude: 30.4}, u.loc)) < 20000 RETURN u")
             self.env.assertTrue(False)
         except redis.exceptions.ResponseError as e:
-            self.env.assertIn("Received 2 arguments to function 'point', expected at most 1", str(e))
\ No newline at end of file
+            self.env.assertIn("Received 2 arguments to function 'point', expected at most 1", str(e))
+
+    def test22_index_ordered_scan(self):
+        redis_graph = Graph(self.env.getConnection(), 'ordered_scan')
+        redis_graph.query("CREATE INDEX ON :User(created)")
+
+        # values span multiple ranges, negative, fractional and duplicates
+        n = 5000
+        q = """UNWIND range(0, %d) AS x
+               CREATE (:User {id: x, created: ((x * 7919) %% %d) - 2500.5})""" % (n - 1, n)
+        redis_graph.query(q)
+        redis_graph.query("CREATE (:User {id: -1, created: -2500.5})")
+        redis_graph.query("CREATE (:User {id: -2, created: 'none numeric'})")
+        redis_graph.query("CREATE (:User {id: -3})")
+
+        created = sorted([((x * 7919) % n) - 2500.5 for x in range(n)] + [-2500.5])
+
+        # sort is replaced by an ordered index scan
+        q = """MATCH (u:User) WHERE u.created > -10000
+               RETURN u.created ORDER BY u.created DESC LIMIT 20"""
+        plan = redis_graph.execution_plan(q)
+        self.env.assertNotIn("Sort", plan)
+        self.env.assertIn("Ordered by u.created DESC", plan)
+
+        result = redis_graph.query(q)
+        expected = [[x] for x in created[::-1][:20]]
+        self.env.assertEquals(result.result_set, expected)
+
+        # ascending, ordering by a projected alias, with skip
+        q = """MATCH (u:User) WHERE u.created >= -10000
+               RETURN u.created AS c ORDER BY c SKIP 3 LIMIT 20"""
+        plan = redis_graph.execution_plan(q)
+        self.env.assertNotIn("Sort", plan)
+
+        result = redis_graph.query(q)
+        expected = [[x] for x in created[3:23]]
+        self.env.assertEquals(result.result_set, expected)
+
+        # bounded range
+        q = """MATCH (u:User) WHERE u.created > 0 AND u.created < 100
+               RETURN u.created ORDER BY u.created LIMIT 1000"""
+        result = redis_graph.query(q)
+        expected = [[x] for x in created if 0 < x < 100]
+        self.env.assertEquals(result.result_set, expected)
+
+        # without a numeric restriction nodes lacking the attribute
+        # or holding none numeric values must be considered, sort remains
+        q = """MATCH (u:User) WHERE u.created = 'none numeric'
+               RETURN u.created ORDER BY u.created DESC LIMIT 20"""
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Node By Index Scan", plan)
+        self.env.assertIn("Sort", plan)
+
+        result = redis_graph.query(q)
+        self.env.assertEquals(result.result_set, [['none numeric']])
+
+        # ordering by an expression which isn't an attribute, sort remains
+        q = """MATCH (u:User) WHERE u.created > 0
+               RETURN u ORDER BY u LIMIT 1"""
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Sort", plan)
+
+        result = redis_graph.query(q)
+        self.env.assertEquals(len(result.result_set), 1)
+
+        q = """MATCH (u:User) WHERE u.created > 0
+               RETURN id(u) AS i ORDER BY i LIMIT 1"""
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Sort", plan)
+
+        # node IDs follow creation order, node 1 is the first with created > 0
+        result = redis_graph.query(q)
+        self.env.assertEquals(result.result_set, [[1]])
+
+        # no limit, sort remains
+        q = """MATCH (u:User) WHERE u.created > -10000
+               RETURN u.created ORDER BY u.created"""
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Sort", plan)
+
+    def test23_composite_index(self):
+        redis_graph = Graph(self.env.getConnection(), 'composite_index')
+        redis_graph.query("CREATE INDEX FOR (p:Person) ON (p.name, p.city, p.age)")
+        redis_graph.query("""UNWIND range(0, 99) AS x
+                             CREATE (:Person {name: 'n' + toString(x % 5),
+                                              city: 'c' + toString(x % 4),
+                                              age: x % 3})""")
+        # numeric equality is type agnostic, missing leading property
+        redis_graph.query("CREATE (:Person {name: 'n0', city: 1, age: 1.0})")
+        redis_graph.query("CREATE (:Person {name: 'n0', city: 1.0, age: 1})")
+        redis_graph.query("CREATE (:Person {city: 'c0', age: 0})")
+
+        def expected(name, city, age=None):
+            return len([x for x in range(100) if 'n' + str(x % 5) == name and
+                        'c' + str(x % 4) == city and
+                        (age is None or x % 3 == age)])
+
+        queries = [
+            # full key
+            ("""MATCH (p:Person) WHERE p.name = 'n1' AND p.city = 'c1'
+                AND p.age = 1 RETURN count(p)""", expected('n1', 'c1', 1)),
+            # leading prefix
+            ("""MATCH (p:Person) WHERE p.name = 'n2' AND p.city = 'c2'
+                RETURN count(p)""", expected('n2', 'c2')),
+            # leading prefix and range
+            ("""MATCH (p:Person {name: 'n3', city: 'c3'}) WHERE p.age > 0
+                RETURN count(p)""", expected('n3', 'c3', 1) + expected('n3', 'c3', 2)),
+            # none leading properties
+            ("""MATCH (p:Person) WHERE p.city = 'c0' AND p.age = 0
+                RETURN count(p)""", len([x for x in range(100)
+                                         if x % 4 == 0 and x % 3 == 0]) + 1),
+            ("""MATCH (p:Person) WHERE p.name = 'n0' AND p.city = 1
+                AND p.age = 1 RETURN count(p)""", 2),
+            ("""MATCH (p:Person) WHERE p.name = 'n0' AND p.city = 'c0'
+                AND p.city = 'c1' RETURN count(p)""", 0),
+        ]
+
+        for q, count in queries:
+            plan = redis_graph.execution_plan(q)
+            self.env.assertIn("Node By Index Scan", plan)
+            result = redis_graph.query(q)
+            self.env.assertEquals(result.result_set, [[count]])
+
+        # dropping a property keeps keys of preceding properties valid
+        redis_graph.query("DROP INDEX ON :Person(city)")
+        q = """MATCH (p:Person) WHERE p.name = 'n4' AND p.age = 2
+               RETURN count(p)"""
+        result = redis_graph.query(q)
+        count = len([x for x in range(100) if x % 5 == 4 and x % 3 == 2])
+        self.env.assertEquals(result.result_set, [[count]])
+
+    def test24_index_selectivity(self):
+        redis_graph = Graph(self.env.getConnection(), 'index_selectivity')
+        redis_graph.query("CREATE INDEX FOR (n:A) ON (n.v)")
+        redis_graph.query("CREATE INDEX FOR (n:B) ON (n.id)")
+        redis_graph.query("UNWIND range(1, 100) AS x CREATE (:A:B {v: x, id: x})")
+        redis_graph.query("UNWIND range(1, 100) AS x CREATE (:B {id: x})")
+
+        # :A holds fewer nodes, but the equality on :B's index is more selective
+        q = "MATCH (n:A:B) WHERE n.v > 10 AND n.id = 20 RETURN n.v"
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Node By Index Scan | (n:B)", plan)
+
+        result = redis_graph.query(q)
+        self.env.assertEquals(result.result_set, [[20]])
+
+    def test25_background_index_construction(self):
+        redis_graph = Graph(self.env.getConnection(), 'background_index')
+        redis_graph.query("UNWIND range(0, 299999) AS x CREATE (:A {v: x})")
+
+        # index is populated in batches, writes proceed during construction
+        redis_graph.query("CREATE INDEX FOR (n:A) ON (n.v)")
+        redis_graph.query("UNWIND range(300000, 300099) AS x CREATE (:A {v: x})")
+        redis_graph.query("MATCH (n:A) WHERE n.v < 100 DELETE n")
+
+        q = "CALL db.indexes() YIELD label, status WHERE label = 'A' RETURN status"
+        status = redis_graph.query(q).result_set[0][0]
+        self.env.assertIn(status, ['UNDER CONSTRUCTION', 'OPERATIONAL'])
+
+        # wait for the index to be populated
+        while status != 'OPERATIONAL':
+            time.sleep(0.1)
+            status = redis_graph.query(q).result_set[0][0]
+
+        q = "MATCH (n:A) WHERE n.v >= 0 RETURN count(n)"
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Node By Index Scan", plan)
+
+        result = redis_graph.query(q)
+        self.env.assertEquals(result.result_set, [[300000]])
+
+    def test26_parallel_index_population(self):
+        redis_graph = Graph(self.env.getConnection(), 'parallel_index')
+        redis_graph.query("""UNWIND range(0, 49999) AS x
+                             CREATE (:A {v: x})-[:R {v: x}]->(:B {v: x})""")
+
+        # entities spanning multiple morsels are indexed by several threads
+        redis_graph.query("CREATE INDEX FOR (n:A) ON (n.v)")
+        redis_graph.query("CREATE INDEX FOR ()-[e:R]-() ON (e.v)")
+
+        q = "CALL db.indexes() YIELD status RETURN collect(DISTINCT status)"
+        status = redis_graph.query(q).result_set[0][0]
+        while status != ['OPERATIONAL']:
+            time.sleep(0.1)
+            status = redis_graph.query(q).result_set[0][0]
+
+        q = "MATCH (n:A) WHERE n.v % 1000 = 0 AND n.v >= 0 RETURN count(n)"
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Node By Index Scan", plan)
+        result = redis_graph.query(q)
+        self.env.assertEquals(result.result_set, [[50]])
+
+        q = "MATCH ()-[e:R]->() WHERE e.v >= 49990 RETURN count(e)"
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Edge By Index Scan", plan)
+        result = redis_graph.query(q)
+        self.env.assertEquals(result.result_set, [[10]])
+
+    def test27_analyzed_index_selectivity(self):
+        redis_graph = Graph(self.env.getConnection(), 'analyzed_selectivity')
+        redis_graph.query("CREATE INDEX FOR (n:A) ON (n.v)")
+        redis_graph.query("CREATE INDEX FOR (n:B) ON (n.id)")
+        # every :A node shares the same 'v', while each 'id' is unique
+        redis_graph.query("UNWIND range(1, 500) AS x CREATE (:A:B {v: 1, id: x})")
+        redis_graph.query("UNWIND range(501, 1500) AS x CREATE (:B {id: x})")
+
+        # without statistics the smaller label's index is used
+        q = "MATCH (n:A:B) WHERE n.v = 1 AND n.id = 20 RETURN n.id"
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Node By Index Scan | (n:A)", plan)
+
+        result = redis_graph.query("CALL db.stats.analyze() YIELD label, entities, sampled RETURN label, entities, sampled ORDER BY label")
+        self.env.assertEquals(result.result_set, [['A', 500, 500], ['B', 1500, 1500]])
+
+        # analyzed statistics reveal 'v' doesn't discriminate between nodes
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Node By Index Scan | (n:B)", plan)
+
+        result = redis_graph.query(q)
+        self.env.assertEquals(result.result_set, [[20]])
+
+        # statistics survive a reload
+        self.env.dumpAndReload()
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Node By Index Scan | (n:B)", plan)
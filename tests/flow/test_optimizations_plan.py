@@ -369,7 +369,7 @@ class testOptimizationsPlan(FlowTestsBase):
         profile = [x[0:x.index(',')].strip() for x in profile]
 
         # make sure 'a' to 'b' traversal operation is aware of limit
-        self.env.assertIn("Conditional Traverse | (a)->(b) | Records produced: 1", profile)
+        self.env.assertIn("Conditional Traverse | (a)->(b) | Batch size: 1 | Records produced: 1", profile)
 
         # query with LIMIT 1
         query = """CYPHER l=1 MATCH (a), (b) WITH a AS a, b AS b
@@ -392,7 +392,7 @@ class testOptimizationsPlan(FlowTestsBase):
         profile = [x[0:x.index(',')].strip() for x in profile]
 
         # traversal from a to b shouldn't be effected by the limit.
-        self.env.assertNotIn("Conditional Traverse | (a)->(b) | Records produced: 64", profile)
+        self.env.assertNotIn("Conditional Traverse | (a)->(b) | Batch size: 1", profile)
 
     # "WHERE true" predicates should not build filter ops.
     def test24_compact_true_predicates(self):
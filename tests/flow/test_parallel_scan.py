@@ -0,0 +1,104 @@
+from common import *
+
+GRAPH_ID = "parallel_scan"
+NODE_COUNT = 50000                  # spans multiple morsels
+redis_con = None
+redis_graph = None
+
+
+class testParallelScan(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True, moduleArgs='THREAD_COUNT 4 PARALLEL_SCAN_THREADS 4')
+        global redis_con
+        global redis_graph
+
+        redis_con = self.env.getConnection()
+        redis_graph = Graph(redis_con, GRAPH_ID)
+        self.populate_graph()
+
+    def populate_graph(self):
+        redis_graph.query("UNWIND range(1, %d) AS x CREATE (:Person {age: x %% 100, group: x %% 7})" % NODE_COUNT)
+        redis_graph.query("UNWIND range(1, %d) AS x CREATE (:Other {age: x})" % NODE_COUNT)
+
+    def set_parallel_scan_threads(self, threads):
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "PARALLEL_SCAN_THREADS", threads)
+
+    # compare query results computed in parallel to serially computed results
+    def compare(self, query):
+        self.set_parallel_scan_threads(4)
+        parallel = redis_graph.query(query).result_set
+
+        self.set_parallel_scan_threads(1)
+        serial = redis_graph.query(query).result_set
+        self.set_parallel_scan_threads(4)
+
+        self.env.assertEquals(parallel, serial)
+        return parallel
+
+    def test01_label_scan_count(self):
+        q = "MATCH (n:Person) WHERE n.age > 30 RETURN count(n)"
+        res = self.compare(q)
+        expected = len([x for x in range(1, NODE_COUNT + 1) if x % 100 > 30])
+        self.env.assertEquals(res[0][0], expected)
+
+    def test02_all_node_scan(self):
+        q = "MATCH (n) WHERE n.age < 10 RETURN count(n), sum(n.age), min(n.age), max(n.age)"
+        self.compare(q)
+
+        q = "MATCH (n) RETURN count(n)"
+        res = self.compare(q)
+        self.env.assertEquals(res[0][0], NODE_COUNT * 2)
+
+    def test03_grouping(self):
+        q = """MATCH (n:Person)
+               RETURN n.group, count(n), sum(n.age), min(n.age), max(n.age), avg(n.age)
+               ORDER BY n.group"""
+        res = self.compare(q)
+        self.env.assertEquals(len(res), 7)
+        self.env.assertEquals(sum([row[1] for row in res]), NODE_COUNT)
+
+    def test04_non_mergeable_aggregations(self):
+        # collected and distinct aggregations are computed serially
+        q = "MATCH (n:Person) RETURN count(DISTINCT n.age), size(collect(n.age))"
+        res = self.compare(q)
+        self.env.assertEquals(res[0], [100, NODE_COUNT])
+
+    def test05_parameters(self):
+        q = "MATCH (n:Person) WHERE n.age > $min RETURN count(n)"
+        parallel = redis_graph.query(q, {'min': 90}).result_set
+        expected = len([x for x in range(1, NODE_COUNT + 1) if x % 100 > 90])
+        self.env.assertEquals(parallel[0][0], expected)
+
+    def test06_deleted_nodes(self):
+        redis_graph.query("MATCH (n:Other) WHERE n.age % 2 = 0 DELETE n")
+
+        q = "MATCH (n) RETURN count(n)"
+        res = self.compare(q)
+        self.env.assertEquals(res[0][0], NODE_COUNT + NODE_COUNT // 2)
+
+        q = "MATCH (n:Other) RETURN count(n), min(n.age)"
+        res = self.compare(q)
+        self.env.assertEquals(res[0], [NODE_COUNT // 2, 1])
+
+    def test07_runtime_error(self):
+        # a run-time error raised by one of the threads fails the query
+        try:
+            redis_graph.query("MATCH (n:Person) WHERE n.age * 'a' > 1 RETURN count(n)")
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertContains("Type mismatch", str(e))
+
+        # server remains responsive
+        res = redis_graph.query("MATCH (n:Person) RETURN count(n)")
+        self.env.assertEquals(res.result_set[0][0], NODE_COUNT)
+
+    def test08_id_range(self):
+        # Person nodes were created first, holding IDs [0, NODE_COUNT)
+        # ID predicates are folded into the label scan's ID range
+        q = "MATCH (n:Person) WHERE id(n) > 100 RETURN count(n)"
+        res = self.compare(q)
+        self.env.assertEquals(res[0][0], NODE_COUNT - 101)
+
+        q = "MATCH (n:Person) WHERE id(n) >= 20000 AND id(n) < 40000 RETURN count(n)"
+        res = self.compare(q)
+        self.env.assertEquals(res[0][0], 20000)
@@ -371,5 +371,7 @@ class testProcedures(FlowTestsBase):
                            ["READ", "db.labels"],
                            ["READ", "db.propertyKeys"],
                            ["READ", "db.relationshipTypes"],
+                           ["WRITE", "db.stats.analyze"],
+                           ["READ", "db.stats.relationships"],
                            ["READ", "dbms.procedures"]]
         self.env.assertEquals(actual_resultset, expected_result)
@@ -39,3 +39,19 @@ class testProfile(FlowTestsBase):
         self.env.assertIn("Update | Records produced: 0", profile)
         self.env.assertIn("Conditional Variable Length Traverse | (a:L)-[anon_1*1..INF]->(anon_0) | Records produced: 0", profile)
         self.env.assertIn("Node By Label Scan | (a:L) | Records produced: 0", profile)
+
+    def test03_profile_traverse_batch_size(self):
+        # traversal batch size grows while child keeps producing records
+        q = """UNWIND range(1, 100) AS x CREATE (:S)-[:R]->(:D), (:D)"""
+        redis_graph.query(q)
+
+        q = "MATCH (s:S)-[r:R]->(d:D) RETURN count(d)"
+        profile = redis_con.execute_command("GRAPH.PROFILE", GRAPH_ID, q)
+        profile = [x[0:x.index(',')].strip() for x in profile]
+        self.env.assertIn("Conditional Traverse | (s:S)-[r:R]->(d:D) | Batch size: 64 | Records produced: 100", profile)
+
+        # batch size is bounded by limit
+        q = "MATCH (s:S)-[r:R]->(d:D) RETURN d LIMIT 1"
+        profile = redis_con.execute_command("GRAPH.PROFILE", GRAPH_ID, q)
+        profile = [x[0:x.index(',')].strip() for x in profile]
+        self.env.assertIn("Conditional Traverse | (s:S)-[r:R]->(d:D) | Batch size: 1 | Records produced: 1", profile)
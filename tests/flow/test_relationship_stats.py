@@ -0,0 +1,93 @@
+from common import *
+
+GRAPH_ID = "relationship_stats"
+redis_graph = None
+
+
+class testRelationshipStats(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True)
+        global redis_graph
+        redis_con = self.env.getConnection()
+        redis_graph = Graph(redis_con, GRAPH_ID)
+        self.populate_graph()
+
+    def populate_graph(self):
+        # 'a' holds two labels, counting towards both label pairs
+        redis_graph.query("""CREATE (a:A:C {v: 'a'}), (b:B {v: 'b'}),
+                             (b2:B {v: 'b2'}), (c:A {v: 'c'}),
+                             (a)-[:R]->(b), (a)-[:R]->(b2), (c)-[:R]->(b),
+                             (b)-[:S]->(a)""")
+
+    def triples(self):
+        q = """CALL db.stats.relationships()
+               YIELD relationshipType, edges, triples
+               RETURN relationshipType, edges, triples
+               ORDER BY relationshipType"""
+        result = redis_graph.query(q).result_set
+        return [[row[0], row[1],
+                 sorted([[t['source'], t['destination'], t['edges']] for t in row[2]])]
+                for row in result]
+
+    def test01_triple_counts(self):
+        # 'c' only connects :A to :B
+        expected = [['R', 3, [['A', 'B', 3], ['C', 'B', 2]]],
+                    ['S', 1, [['B', 'A', 1], ['B', 'C', 1]]]]
+        self.env.assertEquals(self.triples(), expected)
+
+    def test02_triple_counts_after_deletion(self):
+        redis_graph.query("MATCH (:A {v: 'c'})-[e:R]->() DELETE e")
+        expected = [['R', 2, [['A', 'B', 2], ['C', 'B', 2]]],
+                    ['S', 1, [['B', 'A', 1], ['B', 'C', 1]]]]
+        self.env.assertEquals(self.triples(), expected)
+
+        # deleting a node removes its edges
+        redis_graph.query("MATCH (n {v: 'b2'}) DELETE n")
+        expected = [['R', 1, [['A', 'B', 1], ['C', 'B', 1]]],
+                    ['S', 1, [['B', 'A', 1], ['B', 'C', 1]]]]
+        self.env.assertEquals(self.triples(), expected)
+
+    def test03_degree_summaries(self):
+        q = """CALL db.stats.relationships()
+               YIELD relationshipType, outDegree
+               RETURN relationshipType, outDegree
+               ORDER BY relationshipType"""
+
+        # degree summaries require analyzing the graph
+        result = redis_graph.query(q).result_set
+        self.env.assertEquals(result, [['R', None], ['S', None]])
+
+        # add a high degree source
+        redis_graph.query("""MATCH (a {v: 'a'})
+                             UNWIND range(1, 10) AS x
+                             CREATE (a)-[:R]->(:B)""")
+        redis_graph.query("CALL db.stats.analyze()")
+
+        result = redis_graph.query(q).result_set
+        out_degree = result[0][1]
+        self.env.assertEquals(out_degree['max'], 11)
+        self.env.assertEquals(out_degree['mean'], 11)
+        self.env.assertGreaterEqual(out_degree['p99'], 8)
+        self.env.assertLessEqual(out_degree['p99'], 11)
+
+        q = """CALL db.stats.relationships()
+               YIELD relationshipType, inDegree
+               WHERE relationshipType = 'R'
+               RETURN inDegree"""
+        in_degree = redis_graph.query(q).result_set[0][0]
+        self.env.assertEquals(in_degree['max'], 1)
+        self.env.assertEquals(in_degree['mean'], 1)
+        self.env.assertEquals(in_degree['p50'], 1)
+
+    def test04_statistics_survive_reload(self):
+        expected = self.triples()
+        q = """CALL db.stats.relationships()
+               YIELD relationshipType, outDegree
+               RETURN relationshipType, outDegree
+               ORDER BY relationshipType"""
+        degrees = redis_graph.query(q).result_set
+
+        self.env.dumpAndReload()
+
+        self.env.assertEquals(self.triples(), expected)
+        self.env.assertEquals(redis_graph.query(q).result_set, degrees)
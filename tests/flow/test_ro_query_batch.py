@@ -0,0 +1,81 @@
+from common import *
+
+GRAPH_ID = "ro_query_batch"
+redis_con = None
+redis_graph = None
+
+
+class testROQueryBatch(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True)
+        global redis_con
+        global redis_graph
+
+        redis_con = self.env.getConnection()
+        redis_graph = Graph(redis_con, GRAPH_ID)
+        self.populate_graph()
+
+    def populate_graph(self):
+        redis_graph.query("UNWIND range(1, 5) AS x CREATE (:N {v: x})")
+
+    def batch(self, *queries):
+        return redis_con.execute_command("GRAPH.RO_QUERY_BATCH", GRAPH_ID, *queries)
+
+    def test01_batch(self):
+        res = self.batch("MATCH (n:N) RETURN count(n)",
+                         "CYPHER v=3 MATCH (n:N) WHERE n.v > $v RETURN n.v ORDER BY n.v",
+                         "RETURN 1")
+
+        # a result-set per query
+        self.env.assertEquals(len(res), 3)
+        self.env.assertEquals(res[0][0], ["count(n)"])
+        self.env.assertEquals(res[0][1], [[5]])
+        self.env.assertEquals(res[1][0], ["n.v"])
+        self.env.assertEquals(res[1][1], [[4], [5]])
+        self.env.assertEquals(res[2][1], [[1]])
+
+    def test02_cached_plans(self):
+        q = "CYPHER v=1 MATCH (n:N) WHERE n.v = $v RETURN n.v"
+        self.batch(q)
+
+        # batch reuses the cached execution plan, with different parameters
+        res = self.batch("CYPHER v=2 MATCH (n:N) WHERE n.v = $v RETURN n.v")
+        self.env.assertEquals(res[0][1], [[2]])
+        self.env.assertIn("Cached execution: 1", res[0][2])
+
+        # plans are shared with GRAPH.RO_QUERY
+        res = redis_graph.query(q)
+        self.env.assertTrue(res.cached_execution)
+
+    def test03_errors(self):
+        # failing queries are replied with an error in their position
+        res = self.batch("RETURN 1", "CREATE ()", "MATCH (n RETURN n", "RETURN 2")
+        self.env.assertEquals(len(res), 4)
+        self.env.assertEquals(res[0][1], [[1]])
+        self.env.assertTrue(isinstance(res[1], ResponseError))
+        self.env.assertIn("only on read-only queries", str(res[1]))
+        self.env.assertTrue(isinstance(res[2], ResponseError))
+        self.env.assertEquals(res[3][1], [[2]])
+
+        # write query wasn't executed
+        res = redis_graph.query("MATCH (n) RETURN count(n)")
+        self.env.assertEquals(res.result_set, [[5]])
+
+    def test04_compact(self):
+        res = self.batch("RETURN 1", "--compact")
+        self.env.assertEquals(len(res), 1)
+        # compact header holds column type and name
+        self.env.assertEquals(res[0][0], [[1, "1"]])
+
+    def test05_invalid_usage(self):
+        try:
+            redis_con.execute_command("GRAPH.RO_QUERY_BATCH", GRAPH_ID)
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("wrong number of arguments", str(e))
+
+        try:
+            redis_con.execute_command("GRAPH.RO_QUERY_BATCH", GRAPH_ID, "--compact")
+            self.env.assertTrue(False)
+        except ResponseError as e:
+            self.env.assertIn("wrong number of arguments", str(e))
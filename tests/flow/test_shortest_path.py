@@ -135,3 +135,33 @@ class testShortestPath(FlowTestsBase):
         # The longer traversal will be found
         expected_result = [[1], [2], [3], [4]]
         self.env.assertEqual(actual_result.result_set, expected_result)
+
+    def test07_long_shortest_path(self):
+        # a chain of 30 nodes, with a shortcut from the 5th node to the 25th
+        # both ends of the chain are far apart from where the searches meet
+        chain = Graph(self.env.getConnection(), "shortest_path_chain")
+        chain.query("UNWIND range(0, 29) AS i CREATE (:C {v: i})")
+        chain.query("""MATCH (a:C), (b:C) WHERE b.v = a.v + 1
+                       CREATE (a)-[:E]->(b)""")
+        chain.query("""MATCH (a:C {v: 5}), (b:C {v: 25})
+                       CREATE (a)-[:E]->(b)""")
+
+        query = """MATCH (a:C {v: 0}), (b:C {v: 29})
+                   WITH shortestPath((a)-[*]->(b)) AS p
+                   UNWIND nodes(p) AS n RETURN n.v"""
+        actual_result = chain.query(query)
+        expected_result = [[0], [1], [2], [3], [4], [5], [25], [26], [27], [28], [29]]
+        self.env.assertEqual(actual_result.result_set, expected_result)
+
+        # the path spans 10 hops
+        query = """MATCH (a:C {v: 0}), (b:C {v: 29})
+                   RETURN length(shortestPath((a)-[*..10]->(b))),
+                          shortestPath((a)-[*..9]->(b))"""
+        actual_result = chain.query(query)
+        self.env.assertEqual(actual_result.result_set, [[10, None]])
+
+        # no path leads backwards
+        query = """MATCH (a:C {v: 29}), (b:C {v: 0})
+                   RETURN shortestPath((a)-[*]->(b))"""
+        actual_result = chain.query(query)
+        self.env.assertEqual(actual_result.result_set, [[None]])
@@ -0,0 +1,78 @@
+from common import *
+
+GRAPH_ID = "spill"
+redis_con = None
+redis_graph = None
+
+# number of nodes, buffering all of them exceeds the memory capacity
+NODE_COUNT = 50000
+# number of distinct groups
+GROUP_COUNT = 20000
+# 2 megabytes query memory capacity
+MEM_CAPACITY = 2 * 1024 * 1024
+
+
+class testSpill(FlowTestsBase):
+    def __init__(self):
+        self.env = Env(decodeResponses=True)
+        # skip test if we're running under Valgrind
+        if self.env.envRunner.debugger is not None:
+            self.env.skip()
+
+        global redis_con
+        global redis_graph
+
+        redis_con = self.env.getConnection()
+        redis_graph = Graph(redis_con, GRAPH_ID)
+        self.populate_graph()
+
+        # limit query memory, forcing buffering operations to spill
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "QUERY_MEM_CAPACITY",
+                                  MEM_CAPACITY)
+
+    def populate_graph(self):
+        # v is a permutation of [0, NODE_COUNT)
+        q = """UNWIND range(0, %d) AS x
+               CREATE (:N {v: (x * 7919) %% %d})""" % (NODE_COUNT - 1, NODE_COUNT)
+        redis_graph.query(q)
+
+    def test01_sort(self):
+        # external merge sort, last records depend on all spilled runs
+        q = """MATCH (n:N) WITH n.v AS v ORDER BY v SKIP %d
+               RETURN v""" % (NODE_COUNT - 5)
+        res = redis_graph.query(q)
+        expected = [[x] for x in range(NODE_COUNT - 5, NODE_COUNT)]
+        self.env.assertEquals(res.result_set, expected)
+
+        q = """MATCH (n:N) WITH n.v AS v ORDER BY v DESC SKIP %d
+               RETURN v""" % (NODE_COUNT - 5)
+        res = redis_graph.query(q)
+        expected = [[x] for x in range(4, -1, -1)]
+        self.env.assertEquals(res.result_set, expected)
+
+    def test02_aggregate(self):
+        # group count exceeds memory budget, groups are aggregated in partitions
+        # projecting n.v prevents a parallel in-memory aggregation
+        q = """MATCH (n:N) WITH n.v AS v
+               WITH v %% %d AS k, count(v) AS c
+               RETURN count(k), sum(k), sum(c), min(c), max(c)""" % GROUP_COUNT
+        res = redis_graph.query(q)
+        expected = [[GROUP_COUNT, sum(range(GROUP_COUNT)), NODE_COUNT, 2, 3]]
+        self.env.assertEquals(res.result_set, expected)
+
+    def test03_distinct(self):
+        q = """MATCH (n:N) WITH DISTINCT n.v %% %d AS k
+               RETURN count(k), sum(k)""" % GROUP_COUNT
+        res = redis_graph.query(q)
+        self.env.assertEquals(res.result_set,
+                              [[GROUP_COUNT, sum(range(GROUP_COUNT))]])
+
+    def test04_value_hash_join(self):
+        # build side exceeds memory budget, spilled partitions are joined
+        q = """MATCH (a:N), (b:N) WHERE a.v = b.v
+               RETURN count(a), sum(a.v - b.v)"""
+        plan = redis_graph.execution_plan(q)
+        self.env.assertIn("Value Hash Join", plan)
+
+        res = redis_graph.query(q)
+        self.env.assertEquals(res.result_set, [[NODE_COUNT, 0]])
@@ -150,3 +150,21 @@ class testTraversalConstruction():
         self.env.assertTrue("Node By Label Scan | (a:L)" in ops[0]) # scan A
         self.env.assertTrue("Filter" in ops[1]) # filter A
         self.env.assertTrue("Conditional Variable Length Traverse" in ops[2]) # bidirectional var-len traverse from A to B
+
+    def test_cost_based_starting_point(self):
+        g = Graph(self.env.getConnection(), "TraversalCost")
+        g.query("UNWIND range(1, 1000) AS x CREATE (:Big)-[:R]->(:Mid {v: x})")
+        g.query("""UNWIND range(1, 10) AS x
+                   MATCH (m:Mid {v: x})
+                   CREATE (m)-[:S]->(:Small)""")
+
+        # both ends are labeled, start from the least populated label
+        q = "MATCH (a:Big)-[:R]->(b)-[:S]->(c:Small) RETURN count(a)"
+        plan = g.execution_plan(q)
+        ops = plan.split(os.linesep)
+        ops.reverse()
+        self.env.assertTrue("Node By Label Scan | (c:Small) | Estimated rows: 10" in ops[0])
+        self.env.assertTrue("Estimated rows" in ops[1])
+
+        result = g.query(q)
+        self.env.assertEquals(result.result_set[0][0], 10)
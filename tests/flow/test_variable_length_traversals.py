@@ -3,6 +3,7 @@ from common import *
 dis_redis = None
 redis_graph = None
 redis_con = None
+layered_graph = None
 node_names = ["A", "B", "C", "D"]
 
 # A can reach 3 nodes, B can reach 2 nodes, C can reach 1 node
@@ -17,6 +18,7 @@ class testVariableLengthTraversals(FlowTestsBase):
         redis_con = self.env.getConnection()
         redis_graph = Graph(redis_con, "G")
         self.populate_graph()
+        self.populate_layered_graph()
 
     def populate_graph(self):
         global redis_graph
@@ -35,6 +37,20 @@ class testVariableLengthTraversals(FlowTestsBase):
 
         redis_graph.commit()
 
+    def populate_layered_graph(self):
+        global layered_graph
+
+        # layered graph, multiple paths lead to each node
+        # and a cycle leads back to the source
+        # (1)->(2), (1)->(3), (2|3)->(4), (2|3)->(5), (4|5)->(6), (6)->(1)
+        # from (1): 2 paths of length 1, 4 of length 2 and 4 of length 3
+        layered_graph = Graph(redis_con, "layered")
+        layered_graph.query("""UNWIND range(1, 6) AS v CREATE (:L {v: v})""")
+        layered_graph.query("""UNWIND [[1, 2], [1, 3], [2, 4], [2, 5], [3, 4], [3, 5],
+                                       [4, 6], [5, 6], [6, 1]] AS e
+                               MATCH (a:L {v: e[0]}), (b:L {v: e[1]})
+                               CREATE (a)-[:R]->(b)""")
+
     # Sanity check against single-hop traversal
     def test01_conditional_traverse(self):
         query = """MATCH (a)-[e]->(b) RETURN a.name, e.connects, b.name ORDER BY a.name, b.name"""
@@ -182,3 +198,109 @@ class testVariableLengthTraversals(FlowTestsBase):
         actual_result = redis_graph.query(query)
         expected_result = [['A', 'B']]
         self.env.assertEquals(actual_result.result_set, expected_result)
+
+    # profiled variable-length traversal of a query
+    def profile_traversal(self, graph_id, query):
+        profile = redis_con.execute_command("GRAPH.PROFILE", graph_id, query)
+        profile = [x[0:x.index(',')].strip() for x in profile]
+        return [x for x in profile if x.startswith("Conditional Variable Length Traverse")][0]
+
+    # number of records produced by the variable-length traversal of a query
+    def traversal_records(self, graph_id, query):
+        op = self.profile_traversal(graph_id, query)
+        return int(op.split("Records produced: ")[1])
+
+    # number of memo hits and evictions of the variable-length traversal of a query
+    def traversal_memo(self, graph_id, query):
+        op = self.profile_traversal(graph_id, query)
+        hits = int(op.split("Memo hits: ")[1].split(" ")[0])
+        evictions = int(op.split("Memo evictions: ")[1].split(" ")[0])
+        return hits, evictions
+
+    # Test distinct destinations of variable-length traversals
+    def test11_distinct_destinations(self):
+        g = layered_graph
+        queries = [
+            ("MATCH (a:L {v: 1})-[:R*1..3]->(b) RETURN DISTINCT b.v ORDER BY b.v", [2, 3, 4, 5, 6]),
+            ("MATCH (a:L {v: 1})-[:R*1..4]->(b) RETURN DISTINCT b.v ORDER BY b.v", [1, 2, 3, 4, 5, 6]),
+            ("MATCH (a:L {v: 1})-[:R*0..1]->(b) RETURN DISTINCT b.v ORDER BY b.v", [1, 2, 3]),
+            ("MATCH (a:L {v: 1})<-[:R*1..2]-(b) RETURN DISTINCT b.v ORDER BY b.v", [4, 5, 6]),
+            ("MATCH (a:L {v: 1})-[:R*2..3]->(b) RETURN DISTINCT b.v ORDER BY b.v", [4, 5, 6]),
+            # undirected traversals may not use an edge twice
+            ("MATCH (a:L {v: 1})-[:R*1..2]-(b) RETURN DISTINCT b.v ORDER BY b.v", [2, 3, 4, 5, 6]),
+            # distinct after further projection
+            ("MATCH (a:L {v: 1})-[:R*]->(b) WITH DISTINCT b WHERE b.v > 3 RETURN b.v ORDER BY b.v", [4, 5, 6]),
+            ("MATCH (a:L {v: 1})-[:R*1..2]->(b)-[:R]->(c) RETURN DISTINCT c.v ORDER BY c.v", [4, 5, 6]),
+        ]
+        for q, expected in queries:
+            actual = g.query(q).result_set
+            self.env.assertEquals(actual, [[v] for v in sorted(expected)])
+
+        # without distinct, every path produces a record
+        q = "MATCH (a:L {v: 1})-[:R*1..3]->(b) RETURN count(b)"
+        self.env.assertEquals(g.query(q).result_set[0][0], 10)
+
+        # traversal produces a record per path
+        q = "MATCH (a:L {v: 1})-[:R*1..3]->(b) RETURN b"
+        self.env.assertEquals(self.traversal_records("layered", q), 10)
+
+        # traversal produces a record per reachable node
+        q = "MATCH (a:L {v: 1})-[:R*1..3]->(b) RETURN DISTINCT b"
+        self.env.assertEquals(self.traversal_records("layered", q), 5)
+
+    # Test traversals from repeated source nodes
+    def test12_repeated_sources(self):
+        g = layered_graph
+
+        queries = [
+            # destinations only
+            ("UNWIND range(1, 5) AS x MATCH (a:L {v: 1})-[:R*1..3]->(b) RETURN count(b)", 50),
+            ("UNWIND [1, 2, 1, 2, 1] AS x MATCH (a:L {v: x})-[:R*1..2]->(b) RETURN count(b)", 26),
+            # distinct destinations
+            ("UNWIND range(1, 5) AS x MATCH (a:L {v: 1})-[:R*1..3]->(b) WITH DISTINCT x, b RETURN count(b)", 25),
+            # paths
+            ("UNWIND range(1, 5) AS x MATCH p = (a:L {v: 1})-[:R*1..3]->(b) RETURN sum(length(p))", 110),
+            ("UNWIND [1, 1] AS x MATCH (a:L {v: x})-[e:R*1..3]->(b) RETURN sum(size(e))", 44),
+            # traversal is reset for each record
+            ("UNWIND [1, 1, 1] AS x MATCH (a:L {v: x}) OPTIONAL MATCH (a)-[:R*1..3]->(b) RETURN count(b)", 30),
+            ("UNWIND [1, 1, 1] AS x MATCH (a:L {v: x}) OPTIONAL MATCH p = (a)-[:R*1..3]->(b) RETURN sum(length(p))", 66),
+        ]
+        for q, expected in queries:
+            actual = g.query(q).result_set[0][0]
+            self.env.assertEquals(actual, expected)
+
+        # results are consistent with a traversal interrupted by a limit
+        q = "UNWIND [1, 1] AS x MATCH (a:L {v: x})-[:R*1..3]->(b) WITH x, b LIMIT 13 RETURN count(b)"
+        self.env.assertEquals(g.query(q).result_set[0][0], 13)
+
+        # each repeated source is served from the memo
+        q = "MATCH (a:L) WHERE a.v <= 2 UNWIND range(1, 3) AS x MATCH (a)-[:R*1..3]->(b) RETURN count(b)"
+        self.env.assertEquals(self.traversal_memo("layered", q), (4, 0))
+
+    # Test memoized traversals exceeding the memo capacity
+    def test13_memo_eviction(self):
+        # chain of nodes, (1)->(2)->...->(n)
+        n = 400
+        g = Graph(redis_con, "chain")
+        g.query("UNWIND range(1, %d) AS v CREATE (:C {v: v})" % n)
+        g.query("""MATCH (a:C), (b:C) WHERE b.v = a.v + 1
+                   CREATE (a)-[:N]->(b)""")
+
+        # memo is capped by a fraction of the query memory capacity
+        redis_con.execute_command("GRAPH.CONFIG", "SET", "QUERY_MEM_CAPACITY", 2 * 1024 * 1024)
+        try:
+            q = "UNWIND range(1, 2) AS x MATCH (a:C) MATCH (a)-[:N*]->(b) RETURN count(b)"
+            self.env.assertEquals(g.query(q).result_set[0][0], n * (n - 1))
+
+            hits, evictions = self.traversal_memo("chain", q)
+            self.env.assertGreater(evictions, 0)
+
+            # results of sources repeating before eviction are replayed
+            q = "MATCH (a:C) UNWIND range(1, 2) AS x MATCH (a)-[:N*]->(b) RETURN count(b)"
+            self.env.assertEquals(g.query(q).result_set[0][0], n * (n - 1))
+
+            hits, evictions = self.traversal_memo("chain", q)
+            self.env.assertEquals(hits, n)
+            self.env.assertGreater(evictions, 0)
+        finally:
+            redis_con.execute_command("GRAPH.CONFIG", "SET", "QUERY_MEM_CAPACITY", 0)
@@ -292,3 +292,47 @@ TEST_F(AggregateTest, AverageLongOverflowTest) {
 	AR_EXP_Free(max);
 }
 
+TEST_F(AggregateTest, MergeTest) {
+	const char *funcs[5] = {"count", "sum", "min", "max", "avg"};
+	SIValue expected[5] = {SI_LongVal(10), SI_DoubleVal(45), SI_LongVal(0),
+		SI_LongVal(9), SI_DoubleVal(4.5)};
+
+	for(int i = 0; i < 5; i++) {
+		char query[64];
+		sprintf(query, "RETURN %s(1)", funcs[i]);
+
+		// aggregate [0..4] and [5..9] separately
+		AR_ExpNode *a = _exp_from_query(query);
+		AR_ExpNode *b = _exp_from_query(query);
+		ASSERT_TRUE(AR_EXP_AggregationsMergeable(a));
+
+		AR_ExpNode *a_arg = a->op.children[0];
+		AR_ExpNode *b_arg = b->op.children[0];
+		for(int j = 0; j < 10; j++) {
+			AR_ExpNode *v = AR_EXP_NewConstOperandNode(SI_LongVal(j));
+			AR_ExpNode *exp = (j < 5) ? a : b;
+			exp->op.children[0] = v;
+			AR_EXP_Aggregate(exp, NULL);
+			AR_EXP_Free(v);
+		}
+		a->op.children[0] = a_arg;
+		b->op.children[0] = b_arg;
+
+		// merge partial aggregations
+		AR_EXP_MergeAggregations(a, b);
+		SIValue res = AR_EXP_FinalizeAggregations(a, NULL);
+		ASSERT_EQ(SIValue_Compare(res, expected[i], NULL), 0);
+
+		AR_EXP_Free(a);
+		AR_EXP_Free(b);
+	}
+
+	// distinct and collected aggregations can't be merged
+	AR_ExpNode *exp = _exp_from_query("RETURN count(DISTINCT 1)");
+	ASSERT_FALSE(AR_EXP_AggregationsMergeable(exp));
+	AR_EXP_Free(exp);
+
+	exp = _exp_from_query("RETURN collect(1)");
+	ASSERT_FALSE(AR_EXP_AggregationsMergeable(exp));
+	AR_EXP_Free(exp);
+}
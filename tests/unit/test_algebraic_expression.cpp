@@ -99,6 +99,8 @@ class AlgebraicExpressionTest: public ::testing::Test {
 		gc->string_mapping = (char **)array_new(char *, 64);
 		gc->node_schemas = (Schema **)array_new(Schema *, GRAPH_DEFAULT_LABEL_CAP);
 		gc->relation_schemas = (Schema **)array_new(Schema *, GRAPH_DEFAULT_RELATION_TYPE_CAP);
+		gc->label_stats = NULL;
+		gc->relation_stats = NULL;
 
 		GraphContext_AddSchema(gc, "Person", SCHEMA_NODE);
 		GraphContext_AddSchema(gc, "City", SCHEMA_NODE);
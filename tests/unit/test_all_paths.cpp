@@ -106,7 +106,7 @@ TEST_F(AllPathsTest, NoPaths) {
 
 	int relationships[] = {GRAPH_NO_RELATION};
 	AllPathsCtx *ctx = AllPathsCtx_New(&src, NULL, g, relationships, 1, GRAPH_EDGE_DIR_OUTGOING, minLen,
-									   maxLen, NULL, NULL, 0, false);
+									   maxLen, NULL, NULL, 0, false, NULL, NULL);
 	Path *p = AllPathsCtx_NextPath(ctx);
 
 	ASSERT_TRUE(p == NULL);
@@ -126,7 +126,7 @@ TEST_F(AllPathsTest, LongestPaths) {
 	unsigned int maxLen = UINT_MAX - 2;
 	int relationships[] = {GRAPH_NO_RELATION};
 	AllPathsCtx *ctx = AllPathsCtx_New(&src, NULL, g, relationships, 1, GRAPH_EDGE_DIR_OUTGOING, minLen,
-									   maxLen, NULL, NULL, 0, false);
+									   maxLen, NULL, NULL, 0, false, NULL, NULL);
 	Path *path;
 
 	unsigned int longestPath = 0;
@@ -155,7 +155,7 @@ TEST_F(AllPathsTest, UpToThreeLegsPaths) {
 	uint pathsCount = 0;
 	int relationships[] = {GRAPH_NO_RELATION};
 	AllPathsCtx *ctx = AllPathsCtx_New(&src, NULL, g, relationships, 1, GRAPH_EDGE_DIR_OUTGOING, minLen,
-									   maxLen, NULL, NULL, 0, false);
+									   maxLen, NULL, NULL, 0, false, NULL, NULL);
 
 	/* Connections:
 	 * 0 -> 1
@@ -231,7 +231,7 @@ TEST_F(AllPathsTest, TwoLegPaths) {
 	unsigned int pathsCount = 0;
 	int relationships[] = {GRAPH_NO_RELATION};
 	AllPathsCtx *ctx = AllPathsCtx_New(&src, NULL, g, relationships, 1, GRAPH_EDGE_DIR_OUTGOING, minLen,
-									   maxLen, NULL, NULL, 0, false);
+									   maxLen, NULL, NULL, 0, false, NULL, NULL);
 	/* Connections:
 	 * 0 -> 1
 	 * 0 -> 2
@@ -294,7 +294,7 @@ TEST_F(AllPathsTest, DestinationSpecificPaths) {
 	unsigned int pathsCount = 0;
 	int relationships[] = {GRAPH_NO_RELATION};
 	AllPathsCtx *ctx = AllPathsCtx_New(&src, &src, g, relationships, 1, GRAPH_EDGE_DIR_OUTGOING,
-									   minLen, maxLen, NULL, NULL, 0, false);
+									   minLen, maxLen, NULL, NULL, 0, false, NULL, NULL);
 
 	while((path = AllPathsCtx_NextPath(ctx))) {
 		ASSERT_LT(pathsCount, 5);
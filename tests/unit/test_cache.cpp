@@ -72,7 +72,7 @@ TEST_F(CacheTest, ExecutionPlanCache) {
 	//--------------------------------------------------------------------------
 
 	CacheObj *from_cache = NULL;
-	Cache_SetValue(cache, key1, item1);
+	Cache_SetValue(cache, key1, item1, 1);
 	from_cache = (CacheObj*)Cache_GetValue(cache, key1);
 	ASSERT_TRUE(CacheObj_EQ(item1, from_cache));
 	CacheObj_Free(from_cache);
@@ -81,24 +81,163 @@ TEST_F(CacheTest, ExecutionPlanCache) {
 	// Set multiple items
 	//--------------------------------------------------------------------------
 
-	CacheObj* to_cache = (CacheObj*)Cache_SetGetValue(cache, key2, item2);
+	CacheObj* to_cache = (CacheObj*)Cache_SetGetValue(cache, key2, item2, 1);
 	from_cache = (CacheObj*)Cache_GetValue(cache, key2);
 	ASSERT_TRUE(CacheObj_EQ(item2, from_cache));
 	CacheObj_Free(to_cache);
 	CacheObj_Free(from_cache);
 
 	// Fill up cache
-	to_cache = (CacheObj*)Cache_SetGetValue(cache, key3, item3);
+	to_cache = (CacheObj*)Cache_SetGetValue(cache, key3, item3, 1);
 	CacheObj_Free(to_cache);
-	to_cache = (CacheObj*)Cache_SetGetValue(cache, key4, item4);
+	to_cache = (CacheObj*)Cache_SetGetValue(cache, key4, item4, 1);
 	CacheObj_Free(to_cache);
 
-	// Verify that oldest entry do not exists - queue is [ 4 | 3 | 2 ].
+	// Verify that the least frequently used entry was evicted,
+	// entries 1 and 2 were accessed twice while entry 3 was accessed once.
+	ASSERT_TRUE(Cache_GetValue(cache, key3) == NULL);
+	from_cache = (CacheObj*)Cache_GetValue(cache, key1);
+	ASSERT_TRUE(CacheObj_EQ(item1, from_cache));
+	CacheObj_Free(from_cache);
+
+	Cache_Free(cache);
+
+	// Expecting CacheObjFree to be called 10 times.
+	ASSERT_EQ(free_count, 10);
+}
+
+TEST_F(CacheTest, CacheCostAwareEviction) {
+	free_count = 0;
+	Cache *cache = Cache_New(2, (CacheEntryFreeFunc)CacheObj_Free,
+			(CacheEntryCopyFunc)CacheObj_Dup);
+
+	const char *expensive = "MATCH (a)-[]->(b)-[]->(c) RETURN a, b, c";
+	const char *cheap1    = "RETURN 1";
+	const char *cheap2    = "RETURN 2";
+	const char *cheap3    = "RETURN 3";
+
+	Cache_SetValue(cache, expensive, CacheObj_New("expensive"), 10);
+	Cache_SetValue(cache, cheap1, CacheObj_New("cheap1"), 1);
+
+	// cheap entries are evicted before the expensive one
+	Cache_SetValue(cache, cheap2, CacheObj_New("cheap2"), 1);
+	ASSERT_TRUE(Cache_GetValue(cache, cheap1) == NULL);
+	Cache_SetValue(cache, cheap3, CacheObj_New("cheap3"), 1);
+	ASSERT_TRUE(Cache_GetValue(cache, cheap2) == NULL);
+
+	CacheObj *from_cache = (CacheObj*)Cache_GetValue(cache, expensive);
+	ASSERT_STREQ(from_cache->str, "expensive");
+	CacheObj_Free(from_cache);
+
+	// frequently accessed cheap entries eventually outweigh
+	// the expensive entry, which ages out
+	for(int i = 0; i < 20; i++) {
+		from_cache = (CacheObj*)Cache_GetValue(cache, cheap3);
+		CacheObj_Free(from_cache);
+	}
+	Cache_SetValue(cache, cheap1, CacheObj_New("cheap1"), 1);
+	ASSERT_TRUE(Cache_GetValue(cache, expensive) == NULL);
+	from_cache = (CacheObj*)Cache_GetValue(cache, cheap3);
+	ASSERT_STREQ(from_cache->str, "cheap3");
+	CacheObj_Free(from_cache);
+
+	Cache_Free(cache);
+}
+
+
+TEST_F(CacheTest, CachePool) {
+	free_count = 0;
+	Cache *cache = Cache_New(2, (CacheEntryFreeFunc)CacheObj_Free,
+			(CacheEntryCopyFunc)CacheObj_Dup);
+
+	const char *key1 = "MATCH (a) RETURN a";
+	const char *key2 = "MATCH (b) RETURN b";
+	const char *key3 = "MATCH (c) RETURN c";
+
+	// replenishing a missing key has no effect
+	ASSERT_FALSE(Cache_Replenish(cache, key1, 2));
+
+	Cache_SetValue(cache, key1, CacheObj_New("1"), 1);
+
+	// pool is limited by depth
+	ASSERT_FALSE(Cache_Replenish(cache, key1, 0));
+	ASSERT_TRUE(Cache_Replenish(cache, key1, 2));
+	ASSERT_TRUE(Cache_Replenish(cache, key1, 2));
+	ASSERT_FALSE(Cache_Replenish(cache, key1, 2));
+
+	// pooled copies are handed out first
+	CacheObj *a = (CacheObj *)Cache_GetValue(cache, key1);
+	CacheObj *b = (CacheObj *)Cache_GetValue(cache, key1);
+	CacheObj *c = (CacheObj *)Cache_GetValue(cache, key1);
+	ASSERT_STREQ(a->str, "1");
+	ASSERT_STREQ(b->str, "1");
+	ASSERT_STREQ(c->str, "1");
+	ASSERT_TRUE(a != b && b != c && a != c);
+	CacheObj_Free(a);
+	CacheObj_Free(b);
+	CacheObj_Free(c);
+	ASSERT_EQ(free_count, 3);
+
+	// evicted entries free their pooled copies
+	ASSERT_TRUE(Cache_Replenish(cache, key1, 2));
+	Cache_SetValue(cache, key2, CacheObj_New("2"), 10);
+	Cache_SetValue(cache, key3, CacheObj_New("3"), 10);
 	ASSERT_TRUE(Cache_GetValue(cache, key1) == NULL);
+	ASSERT_EQ(free_count, 5);
 
 	Cache_Free(cache);
+	ASSERT_EQ(free_count, 7);
+}
 
-	// Expecting CacheObjFree to be called 9 times.
-	ASSERT_EQ(free_count, 9);
+static void CollectKey(const char *key, void *value, void *pdata) {
+	const char **keys = (const char **)pdata;
+	while(*keys != NULL) keys++;
+	*keys = ((CacheObj *)value)->str;
 }
 
+TEST_F(CacheTest, CacheMostFrequent) {
+	Cache *cache = Cache_New(3, (CacheEntryFreeFunc)CacheObj_Free,
+			(CacheEntryCopyFunc)CacheObj_Dup);
+
+	Cache_SetValue(cache, "RETURN 1", CacheObj_New("1"), 1);
+	Cache_SetValue(cache, "RETURN 2", CacheObj_New("2"), 1);
+	Cache_SetValue(cache, "RETURN 3", CacheObj_New("3"), 1);
+
+	// access entries such that 3 is the most frequent, followed by 1
+	for(int i = 0; i < 3; i++) CacheObj_Free((CacheObj *)Cache_GetValue(cache, "RETURN 3"));
+	CacheObj_Free((CacheObj *)Cache_GetValue(cache, "RETURN 1"));
+
+	const char *keys[4] = {NULL, NULL, NULL, NULL};
+	Cache_VisitMostFrequent(cache, 2, true, CollectKey, keys);
+	ASSERT_STREQ(keys[0], "3");
+	ASSERT_STREQ(keys[1], "1");
+	ASSERT_TRUE(keys[2] == NULL);
+
+	// visiting more entries than cached
+	memset(keys, 0, sizeof(keys));
+	Cache_VisitMostFrequent(cache, 10, true, CollectKey, keys);
+	ASSERT_STREQ(keys[2], "2");
+	ASSERT_TRUE(keys[3] == NULL);
+
+	Cache_Free(cache);
+}
+
+TEST_F(CacheTest, CacheClear) {
+	Cache *cache = Cache_New(3, (CacheEntryFreeFunc)CacheObj_Free,
+			(CacheEntryCopyFunc)CacheObj_Dup);
+
+	Cache_SetValue(cache, "RETURN 1", CacheObj_New("1"), 1);
+	Cache_SetValue(cache, "RETURN 2", CacheObj_New("2"), 1);
+
+	Cache_Clear(cache);
+	ASSERT_TRUE(Cache_GetValue(cache, "RETURN 1") == NULL);
+	ASSERT_TRUE(Cache_GetValue(cache, "RETURN 2") == NULL);
+
+	// cache is usable once cleared
+	Cache_SetValue(cache, "RETURN 1", CacheObj_New("1"), 1);
+	CacheObj *obj = (CacheObj *)Cache_GetValue(cache, "RETURN 1");
+	ASSERT_STREQ(obj->str, "1");
+	CacheObj_Free(obj);
+
+	Cache_Free(cache);
+}
@@ -60,6 +60,8 @@ class ExecutionPlanCloneTest: public ::testing::Test {
 		gc->string_mapping = (char **)array_new(char *, 64);
 		gc->node_schemas = (Schema **)array_new(Schema *, GRAPH_DEFAULT_LABEL_CAP);
 		gc->relation_schemas = (Schema **)array_new(Schema *, GRAPH_DEFAULT_RELATION_TYPE_CAP);
+		gc->label_stats = NULL;
+		gc->relation_stats = NULL;
 		QueryCtx_SetGraphCtx(gc);
 	}
 
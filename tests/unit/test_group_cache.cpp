@@ -0,0 +1,85 @@
+#include "gtest.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include "../../src/util/rmalloc.h"
+#include "../../src/grouping/group_cache.h"
+#ifdef __cplusplus
+}
+#endif
+
+class GroupCacheTest: public ::testing::Test {
+  protected:
+	static void SetUpTestCase() {
+		// use the malloc family for allocations
+		Alloc_Reset();
+	}
+};
+
+static Group *_NewGroup() {
+	return NewGroup(NULL, 0, NULL, 0, NULL);
+}
+
+TEST_F(GroupCacheTest, AddGet) {
+	CacheGroup *groups = CacheGroupNew();
+	uint64_t n = 10000;
+	Group **added = (Group **)rm_malloc(sizeof(Group *) * n);
+
+	// keys differing only in their high bits collide on the same slot
+	for(uint64_t i = 0; i < n; i++) {
+		XXH64_hash_t key = (i % 2 == 0) ? i : (i << 32);
+		ASSERT_TRUE(CacheGroupGet(groups, key) == NULL);
+		added[i] = _NewGroup();
+		CacheGroupAdd(groups, key, added[i]);
+	}
+
+	ASSERT_EQ(CacheGroupCount(groups), n);
+
+	// all groups are retrievable after the table had grown
+	for(uint64_t i = 0; i < n; i++) {
+		XXH64_hash_t key = (i % 2 == 0) ? i : (i << 32);
+		ASSERT_EQ(CacheGroupGet(groups, key), added[i]);
+	}
+
+	// missing key
+	ASSERT_TRUE(CacheGroupGet(groups, n + 1) == NULL);
+
+	FreeGroupCache(groups);
+	rm_free(added);
+}
+
+TEST_F(GroupCacheTest, Iterate) {
+	CacheGroup *groups = CacheGroupNew();
+	uint64_t n = 500;
+
+	for(uint64_t i = 0; i < n; i++) CacheGroupAdd(groups, i * 7, _NewGroup());
+
+	// each group is visited exactly once
+	Group *group;
+	uint64_t visited = 0;
+	CacheGroupIterator *it = CacheGroupIter(groups);
+	while(CacheGroupIterNext(it, &group)) {
+		ASSERT_TRUE(group != NULL);
+		visited++;
+	}
+	ASSERT_TRUE(group == NULL);
+	ASSERT_EQ(visited, n);
+
+	CacheGroupIterator_Free(it);
+	FreeGroupCache(groups);
+}
+
+TEST_F(GroupCacheTest, Empty) {
+	CacheGroup *groups = CacheGroupNew();
+	ASSERT_EQ(CacheGroupCount(groups), 0);
+
+	Group *group;
+	CacheGroupIterator *it = CacheGroupIter(groups);
+	ASSERT_EQ(CacheGroupIterNext(it, &group), 0);
+	ASSERT_TRUE(group == NULL);
+
+	CacheGroupIterator_Free(it);
+	FreeGroupCacheShallow(groups);
+}
+